@@ -7,6 +7,7 @@ from astropy.cosmology import default_cosmology
 from lenstronomy.Util import class_creator
 from lenstronomy.Util import constants as const
 from lenstronomy.Cosmo.lens_cosmo import LensCosmo
+from lenstronomy.Cosmo.lcdm import LCDM
 from lenstronomy.Analysis.kinematics_api import KinematicAPI
 
 
@@ -133,3 +134,51 @@ class TDCosmography(KinematicAPI):
         Ds_Dds = self.Ds_Dds_from_kinematics(sigma_v_measured, J, kappa_s=kappa_s, kappa_ds=kappa_ds)
         Dd = D_dt / Ds_Dds / (1 + self._z_lens)
         return D_dt, Dd
+
+    def distances_from_cosmology(self, H_0, Om0, Ode0=None):
+        """
+        time-delay distances and angular diameter distances to the deflector for arrays of LCDM cosmological parameters
+        (vectorized, see LCDM.distances)
+
+        :param H_0: Hubble parameter [km/s/Mpc], float or numpy array
+        :param Om0: normalized matter density at present time, float or numpy array
+        :param Ode0: normalized dark energy density at present time. If None, a flat universe is assumed.
+        :return: D_dt, D_d [Mpc]
+        """
+        lcdm = LCDM(z_lens=self._z_lens, z_source=self._z_source, flat=Ode0 is None)
+        D_d, D_s, D_ds, D_dt = lcdm.distances(H_0, Om0, Ode0=Ode0)
+        return D_dt, D_d
+
+    def logL_distances(self, D_dt, D_d, d_fermat_model, dt_measured, dt_sigma, J=None, sigma_v_measured=None,
+                       sigma_v_sigma=None, kappa_ext=0):
+        """
+        vectorized log likelihood of distances given the modeled relative Fermat potentials and the dimensionless
+        kinematics J, and the measured time delays and velocity dispersion. All arrays are broadcast against each
+        other, e.g. arrays of shape (n,) of distances drawn from cosmological parameters (see
+        distances_from_cosmology()) and lens model posterior samples of d_fermat_model with shape (n, num_delays).
+
+        :param D_dt: time-delay distance [Mpc]
+        :param D_d: angular diameter distance to the deflector [Mpc] (only needed with kinematics)
+        :param d_fermat_model: relative Fermat potentials [arcsec^2] of the measured time delays, shape (num_delays,)
+         or (n, num_delays)
+        :param dt_measured: measured relative time delays [days]
+        :param dt_sigma: 1-sigma Gaussian uncertainties of the measured time delays [days]
+        :param J: modeled dimensionless kinematic estimate (see velocity_dispersion_dimension_less()). If None, the
+         kinematics are not considered.
+        :param sigma_v_measured: measured velocity dispersion [km/s]
+        :param sigma_v_sigma: 1-sigma Gaussian uncertainty of the measured velocity dispersion [km/s]
+        :param kappa_ext: external convergence, scales the time delays and the squared velocity dispersion by
+         (1 - kappa_ext)
+        :return: log likelihood, shape of the broadcast distances
+        """
+        D_dt = np.array(D_dt, dtype=float) * (1. - np.array(kappa_ext, dtype=float))
+        d_fermat_model = np.array(d_fermat_model, dtype=float)
+        dt_model = const.delay_arcsec2days(d_fermat_model, D_dt[..., np.newaxis])
+        logL = np.sum(-(dt_model - np.array(dt_measured)) ** 2 / (2 * np.array(dt_sigma) ** 2), axis=-1)
+        if J is not None:
+            if sigma_v_measured is None or sigma_v_sigma is None:
+                raise ValueError('sigma_v_measured and sigma_v_sigma need to be specified together with J.')
+            Ds_Dds = np.array(D_dt, dtype=float) / np.array(D_d, dtype=float) / (1 + self._z_lens)
+            sigma_v_model = np.sqrt(Ds_Dds * np.array(J, dtype=float)) * const.c / 1000
+            logL = logL - (sigma_v_model - sigma_v_measured) ** 2 / (2 * sigma_v_sigma ** 2)
+        return logL
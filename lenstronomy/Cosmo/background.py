@@ -9,10 +9,13 @@ class Background(object):
     """
     class to compute cosmological distances
     """
-    def __init__(self, cosmo=None):
+    def __init__(self, cosmo=None, interp=False, **kwargs_interp):
         """
 
         :param cosmo: instance of astropy.cosmology
+        :param interp: bool, if True, the distances are computed from an interpolation of the comoving distance
+         (see CosmoInterp) instead of the astropy.cosmology routines
+        :param kwargs_interp: keyword arguments of CosmoInterp (z_stop, num_interp)
         :return: Background class with instance of astropy.cosmology
         """
         from astropy.cosmology import default_cosmology
@@ -20,6 +23,11 @@ class Background(object):
         if cosmo is None:
             cosmo = default_cosmology.get()
         self.cosmo = cosmo
+        if interp is True:
+            from lenstronomy.Cosmo.cosmo_interp import CosmoInterp
+            self._cosmo_interp = CosmoInterp(cosmo, **kwargs_interp)
+        else:
+            self._cosmo_interp = None
 
     def a_z(self, z):
         """
@@ -36,6 +44,8 @@ class Background(object):
         :param z_source: source redshift
         :return: angular diameter distance in units of Mpc
         """
+        if self._cosmo_interp is not None:
+            return self._cosmo_interp.angular_diameter_distance_z1z2(z_observer, z_source)
         D_xy = self.cosmo.angular_diameter_distance_z1z2(z_observer, z_source)
         return D_xy.value
 
@@ -0,0 +1,80 @@
+__author__ = 'sibirrer'
+
+import numpy as np
+from scipy import interpolate
+
+
+class CosmoInterp(object):
+    """
+    class which interpolates the comoving distance of an astropy.cosmology instance and computes the distances between
+    any pair of redshifts from it. The interpolation is set up once per cosmology and avoids the overhead of the
+    numerical integrals and astropy.units quantities of the astropy.cosmology distance routines. All distances are
+    returned in units of Mpc and support scalar and array redshifts.
+    """
+    def __init__(self, cosmo, z_stop=5, num_interp=100):
+        """
+
+        :param cosmo: astropy.cosmology instance
+        :param z_stop: maximum redshift of the interpolation. The interpolation is extended when higher redshifts are
+         requested.
+        :param num_interp: number of interpolation points between redshift 0 and z_stop
+        """
+        self._cosmo = cosmo
+        self._num_interp = int(num_interp)
+        self._hubble_distance = cosmo.hubble_distance.value
+        self._Ok0 = cosmo.Ok0
+        self._interpolate_comoving_distance(z_stop)
+
+    def _interpolate_comoving_distance(self, z_stop):
+        """
+        interpolates the comoving distance as the integral of a spline of 1/E(z)
+
+        :param z_stop: maximum redshift of the interpolation
+        :return: None
+        """
+        self._z_stop = z_stop
+        z_array = np.linspace(0, z_stop, self._num_interp)
+        inv_efunc = self._cosmo.inv_efunc(z_array)
+        self._comoving_distance_interp = interpolate.InterpolatedUnivariateSpline(z_array, inv_efunc,
+                                                                                 k=3).antiderivative()
+
+    def comoving_distance(self, z):
+        """
+        line of sight comoving distance
+
+        :param z: redshift
+        :return: comoving distance in units of Mpc
+        """
+        z_max = np.max(z)
+        if z_max > self._z_stop:
+            self._interpolate_comoving_distance(2 * z_max)
+        d_c = self._hubble_distance * self._comoving_distance_interp(z)
+        if np.ndim(d_c) == 0:
+            return float(d_c)
+        return d_c
+
+    def comoving_transverse_distance_z1z2(self, z1, z2):
+        """
+        transverse comoving distance between two redshifts, accounting for the curvature of the universe
+
+        :param z1: observer redshift
+        :param z2: source redshift
+        :return: transverse comoving distance in units of Mpc
+        """
+        d_c = self.comoving_distance(z2) - self.comoving_distance(z1)
+        if self._Ok0 == 0:
+            return d_c
+        sqrt_Ok0 = np.sqrt(np.abs(self._Ok0))
+        if self._Ok0 > 0:
+            return self._hubble_distance / sqrt_Ok0 * np.sinh(sqrt_Ok0 * d_c / self._hubble_distance)
+        return self._hubble_distance / sqrt_Ok0 * np.sin(sqrt_Ok0 * d_c / self._hubble_distance)
+
+    def angular_diameter_distance_z1z2(self, z1, z2):
+        """
+        angular diameter distance between two redshifts
+
+        :param z1: observer redshift
+        :param z2: source redshift
+        :return: angular diameter distance in units of Mpc
+        """
+        return self.comoving_transverse_distance_z1z2(z1, z2) / (1. + np.array(z2, dtype=float))
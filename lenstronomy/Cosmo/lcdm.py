@@ -1,7 +1,9 @@
 __author__ = 'sibirrer'
 
+import numpy as np
 from astropy.cosmology import FlatLambdaCDM, LambdaCDM
 from lenstronomy.Cosmo.lens_cosmo import LensCosmo
+import lenstronomy.Util.constants as const
 
 
 class LCDM(object):
@@ -74,3 +76,47 @@ class LCDM(object):
         """
         lensCosmo = self._get_cosom(H_0, Om0, Ode0)
         return lensCosmo.D_dt
+
+    def distances(self, H_0, Om0, Ode0=None, num_quad=20):
+        """
+        vectorized angular diameter distances and time-delay distance for arrays of cosmological parameters. The
+        comoving distances are integrated with a Gauss-Legendre quadrature of the inverse expansion rate of a LCDM
+        cosmology (without radiation) instead of setting up an astropy.cosmology instance per set of parameters.
+
+        :param H_0: Hubble parameter [km/s/Mpc], float or numpy array
+        :param Om0: normalized matter density at present time, float or numpy array
+        :param Ode0: normalized dark energy density at present time (only used when flat=False)
+        :param num_quad: number of quadrature points of the integrals
+        :return: D_d, D_s, D_ds, D_dt [Mpc]
+        """
+        H_0 = np.array(H_0, dtype=float)
+        Om0 = np.array(Om0, dtype=float)
+        if self._flat is True or Ode0 is None:
+            Ode0 = 1. - Om0
+        Ode0 = np.array(Ode0, dtype=float)
+        Ok0 = 1. - Om0 - Ode0
+        hubble_distance = const.c / 1000. / H_0  # [Mpc]
+        x, w = np.polynomial.legendre.leggauss(num_quad)
+
+        def _comoving_distance(z_1, z_2):
+            # integral of 1/E(z) from z_1 to z_2 in units of the Hubble distance
+            z = z_1 + (z_2 - z_1) / 2. * (x + 1)
+            zp1 = 1. + z
+            E = np.sqrt(np.multiply.outer(Om0, zp1 ** 3) + np.multiply.outer(Ok0, zp1 ** 2) +
+                        np.multiply.outer(Ode0, np.ones_like(z)))
+            return (z_2 - z_1) / 2. * np.sum(w / E, axis=-1)
+
+        def _transverse(d_c):
+            # transverse comoving distance in units of the Hubble distance accounting for the curvature
+            sqrt_Ok0 = np.sqrt(np.abs(Ok0))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(Ok0 > 0, np.sinh(sqrt_Ok0 * d_c) / sqrt_Ok0,
+                                np.where(Ok0 < 0, np.sin(sqrt_Ok0 * d_c) / sqrt_Ok0, d_c))
+
+        d_c_lens = _comoving_distance(0, self.z_lens)
+        d_c_lens_source = _comoving_distance(self.z_lens, self.z_source)
+        D_d = hubble_distance * _transverse(d_c_lens) / (1. + self.z_lens)
+        D_s = hubble_distance * _transverse(d_c_lens + d_c_lens_source) / (1. + self.z_source)
+        D_ds = hubble_distance * _transverse(d_c_lens_source) / (1. + self.z_source)
+        D_dt = (1. + self.z_lens) * D_d * D_s / D_ds
+        return D_d, D_s, D_ds, D_dt
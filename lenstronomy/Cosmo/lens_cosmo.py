@@ -12,17 +12,20 @@ class LensCosmo(object):
     """
     class to manage the physical units and distances present in a single plane lens with fixed input cosmology
     """
-    def __init__(self, z_lens, z_source, cosmo=None):
+    def __init__(self, z_lens, z_source, cosmo=None, interp=False, **kwargs_interp):
         """
 
         :param z_lens: redshift of lens
         :param z_source: redshift of source
         :param cosmo: astropy.cosmology instance
+        :param interp: bool, if True, the distances are computed from an interpolation of the comoving distance
+         (see CosmoInterp)
+        :param kwargs_interp: keyword arguments of CosmoInterp (z_stop, num_interp)
         """
 
         self.z_lens = z_lens
         self.z_source = z_source
-        self.background = Background(cosmo=cosmo)
+        self.background = Background(cosmo=cosmo, interp=interp, **kwargs_interp)
         self.nfw_param = NFWParam()
 
     def a_z(self, z):
@@ -1,8 +1,12 @@
 import numpy as np
 import lenstronomy.Util.kernel_util as kernel_util
 import lenstronomy.Util.util as util
+from lenstronomy.Util import cache_util
 import warnings
 
+# version of the supersampled kernels in the on-disk cache, to be increased when _subgrid_kernel() changes its output
+_CACHE_VERSION = 1
+
 
 class PSF(object):
     """
@@ -100,15 +104,16 @@ class PSF(object):
 
             elif self.psf_type == 'PIXEL':
 
-                kernel = kernel_util.subgrid_kernel(self.kernel_point_source, supersampling_factor, odd=True, num_iter=5)
-                n = len(self.kernel_point_source)
-                n_new = n * supersampling_factor
-                if n_new % 2 == 0:
-                    n_new -= 1
                 if hasattr(self, '_kernel_point_source_supersampled'):
                     warnings.warn("Super-sampled point source kernel over-written due to different subsampling"
                                   " size requested.", Warning)
-                kernel_point_source_supersampled = kernel_util.cut_psf(kernel, psf_size=n_new)
+                # the iterative sub-sampling is re-used from the on-disk cache if enabled
+                key = cache_util.hash_key('kernel_point_source_supersampled', _CACHE_VERSION,
+                                          self.kernel_point_source, supersampling_factor)
+                kernel_point_source_supersampled = cache_util.cached(key, ['kernel'], self._subgrid_kernel,
+                                                                     self.kernel_point_source, supersampling_factor)
+                # (writable) copy of the memory-mapped kernel
+                kernel_point_source_supersampled = np.array(kernel_point_source_supersampled)
             elif self.psf_type == 'NONE':
                 kernel_point_source_supersampled = self._kernel_point_source
             else:
@@ -118,6 +123,21 @@ class PSF(object):
                 self._point_source_supersampling_factor = supersampling_factor
         return kernel_point_source_supersampled
 
+    @staticmethod
+    def _subgrid_kernel(kernel_point_source, supersampling_factor):
+        """
+
+        :param kernel_point_source: pixelized point source kernel
+        :param supersampling_factor: int, supersampling factor
+        :return: supersampled kernel, cut to the size of the regular kernel
+        """
+        kernel = kernel_util.subgrid_kernel(kernel_point_source, supersampling_factor, odd=True, num_iter=5)
+        n = len(kernel_point_source)
+        n_new = n * supersampling_factor
+        if n_new % 2 == 0:
+            n_new -= 1
+        return kernel_util.cut_psf(kernel, psf_size=n_new)
+
     def set_pixel_size(self, deltaPix):
         """
         update pixel size
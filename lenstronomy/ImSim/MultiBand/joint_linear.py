@@ -37,10 +37,30 @@ class JointLinear(MultiLinear):
         A = self.linear_response_matrix(kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_extinction, kwargs_special)
         C_D_response, model_error_list = self.error_response(kwargs_lens, kwargs_ps)
         d = self.data_response
-        param, cov_param, wls_model = de_lens.get_param_WLS(A.T, 1 / C_D_response, d, inv_bool=inv_bool)
-        wls_list = self._array2image_list(wls_model)
+        wls_list, model_error_list, cov_param, param, _ = self._image_linear_solve_log_det(kwargs_lens, kwargs_source,
+                                                                                          kwargs_lens_light, kwargs_ps,
+                                                                                          kwargs_extinction,
+                                                                                          kwargs_special,
+                                                                                          inv_bool=inv_bool)
         return wls_list, model_error_list, cov_param, param
 
+    def _image_linear_solve_log_det(self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None,
+                                    kwargs_ps=None, kwargs_extinction=None, kwargs_special=None, inv_bool=False):
+        """
+        same as image_linear_solve() but also returns the log determinant of the covariance matrix of the linear
+        parameters, computed from the same Cholesky factorization as the linear solution.
+
+        :return: list of model images, list of model errors, covariance matrix (or None), linear parameters,
+         log determinant of the covariance matrix (None if ill-conditioned)
+        """
+        A = self.linear_response_matrix(kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_extinction, kwargs_special)
+        C_D_response, model_error_list = self.error_response(kwargs_lens, kwargs_ps)
+        d = self.data_response
+        param, cov_param, wls_model, log_det = de_lens.get_param_WLS_cholesky(A.T, 1 / C_D_response, d,
+                                                                             inv_bool=inv_bool)
+        wls_list = self._array2image_list(wls_model)
+        return wls_list, model_error_list, cov_param, param, log_det
+
     def linear_response_matrix(self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None, kwargs_ps=None,
                                kwargs_extinction=None, kwargs_special=None):
         """
@@ -127,10 +147,9 @@ class JointLinear(MultiLinear):
         :return: log likelihood (natural logarithm) (sum of the log likelihoods of the individual images)
         """
         # generate image
-        im_sim_list, model_error_list, cov_matrix, param = self.image_linear_solve(kwargs_lens, kwargs_source,
-                                                                                   kwargs_lens_light, kwargs_ps,
-                                                                                   kwargs_extinction, kwargs_special,
-                                                                                   inv_bool=source_marg)
+        im_sim_list, model_error_list, cov_matrix, param, log_det = self._image_linear_solve_log_det(
+            kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_extinction, kwargs_special,
+            inv_bool=source_marg)
         # compute X^2
         logL = 0
         index = 0
@@ -139,6 +158,43 @@ class JointLinear(MultiLinear):
                 logL += self._imageModel_list[i].Data.log_likelihood(im_sim_list[index], self._imageModel_list[i].likelihood_mask, model_error_list[index])
                 index += 1
         if cov_matrix is not None and source_marg:
-            marg_const = de_lens.marginalization_new(cov_matrix, d_prior=linear_prior)
+            marg_const = de_lens.marginalization_new(cov_matrix, d_prior=linear_prior, log_det=log_det)
             logL += marg_const
         return logL
+
+    def likelihood_data_given_model_batch(self, kwargs_lens_list=None, kwargs_source_list=None,
+                                          kwargs_lens_light_list=None, kwargs_ps_list=None,
+                                          kwargs_extinction_list=None, kwargs_special_list=None, source_marg=False,
+                                          linear_prior=None, point_source_cache_list=None):
+        """
+        computes the likelihood of the data for a batch of N non-linear parameter sets. The joint linear inversion of
+        all bands is solved for each parameter set separately.
+
+        :param kwargs_lens_list: list of length N of kwargs_lens lists (or None)
+        :param kwargs_source_list: list of length N of kwargs_source lists (or None)
+        :param kwargs_lens_light_list: list of length N of kwargs_lens_light lists (or None)
+        :param kwargs_ps_list: list of length N of kwargs_ps lists (or None)
+        :param kwargs_extinction_list: list of length N of kwargs_extinction lists (or None)
+        :param kwargs_special_list: list of length N of kwargs_special dictionaries (or None)
+        :param source_marg: bool, performs a marginalization over the linear parameters
+        :param linear_prior: linear prior width in eigenvalues
+        :param point_source_cache_list: list of length N of point source positions already solved with the full lens
+         and point source models (see PointSource.lens_model_cache()) or None
+        :return: 1d numpy array of length N of log likelihoods (natural logarithm)
+        """
+        kwargs_batch = [kwargs_lens_list, kwargs_source_list, kwargs_lens_light_list, kwargs_ps_list,
+                        kwargs_extinction_list, kwargs_special_list]
+        num = max([len(kwargs) for kwargs in kwargs_batch if kwargs is not None] + [0])
+        kwargs_batch = [[None] * num if kwargs is None else kwargs for kwargs in kwargs_batch]
+        logL = np.zeros(num)
+        for i in range(num):
+            # the point source cache only refers to a single parameter set and is reset for each of them
+            for imageModel in self._imageModel_list:
+                cache_list = imageModel.select_point_source_cache(point_source_cache_list)
+                if cache_list is None:
+                    imageModel.PointSource.delete_lens_model_cache()
+                else:
+                    imageModel.PointSource.set_lens_model_cache(cache_list[i])
+            logL[i] = self.likelihood_data_given_model(*[kwargs[i] for kwargs in kwargs_batch], source_marg=source_marg,
+                                                       linear_prior=linear_prior)
+        return logL
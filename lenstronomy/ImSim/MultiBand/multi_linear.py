@@ -69,3 +69,38 @@ class MultiLinear(MultiDataBase):
                                                                              source_marg=source_marg,
                                                                              linear_prior=linear_prior[i])
         return logL
+
+    def likelihood_data_given_model_batch(self, kwargs_lens_list=None, kwargs_source_list=None,
+                                          kwargs_lens_light_list=None, kwargs_ps_list=None,
+                                          kwargs_extinction_list=None, kwargs_special_list=None, source_marg=False,
+                                          linear_prior=None, point_source_cache_list=None):
+        """
+        computes the likelihood of the data for a batch of N non-linear parameter sets. The linear inversions of the N
+        parameter sets are solved together in each band (see ImageLinearFit.likelihood_data_given_model_batch()).
+
+        :param kwargs_lens_list: list of length N of kwargs_lens lists (or None)
+        :param kwargs_source_list: list of length N of kwargs_source lists (or None)
+        :param kwargs_lens_light_list: list of length N of kwargs_lens_light lists (or None)
+        :param kwargs_ps_list: list of length N of kwargs_ps lists (or None)
+        :param kwargs_extinction_list: list of length N of kwargs_extinction lists (or None)
+        :param kwargs_special_list: list of length N of kwargs_special dictionaries (or None)
+        :param source_marg: bool, performs a marginalization over the linear parameters
+        :param linear_prior: list of linear prior widths in eigenvalues of the bands
+        :param point_source_cache_list: list of length N of point source positions already solved with the full lens
+         and point source models (see PointSource.lens_model_cache()) or None
+        :return: log likelihoods (natural logarithm) of the N parameter sets (sum over the individual images)
+        """
+        logL = 0
+        if linear_prior is None:
+            linear_prior = [None for i in range(self._num_bands)]
+        for i in range(self._num_bands):
+            if self._compute_bool[i] is True:
+                logL += self._imageModel_list[i].likelihood_data_given_model_batch(kwargs_lens_list, kwargs_source_list,
+                                                                                   kwargs_lens_light_list,
+                                                                                   kwargs_ps_list,
+                                                                                   kwargs_extinction_list,
+                                                                                   kwargs_special_list,
+                                                                                   source_marg=source_marg,
+                                                                                   linear_prior=linear_prior[i],
+                                                                                   point_source_cache_list=point_source_cache_list)
+        return logL
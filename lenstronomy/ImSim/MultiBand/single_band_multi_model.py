@@ -87,6 +87,53 @@ class SingleBandMultiModel(ImageLinearFit):
                                                  linear_prior=linear_prior)
         return logL
 
+    def likelihood_data_given_model_batch(self, kwargs_lens_list=None, kwargs_source_list=None,
+                                          kwargs_lens_light_list=None, kwargs_ps_list=None,
+                                          kwargs_extinction_list=None, kwargs_special_list=None, source_marg=False,
+                                          linear_prior=None, point_source_cache_list=None):
+        """
+        computes the likelihood of the data for a batch of N non-linear parameter sets, with the kwargs of each
+        parameter set selected for this band (see ImageLinearFit.likelihood_data_given_model_batch())
+
+        :param kwargs_lens_list: list of length N of kwargs_lens lists (or None)
+        :param kwargs_source_list: list of length N of kwargs_source lists (or None)
+        :param kwargs_lens_light_list: list of length N of kwargs_lens_light lists (or None)
+        :param kwargs_ps_list: list of length N of kwargs_ps lists (or None)
+        :param kwargs_extinction_list: list of length N of kwargs_extinction lists (or None)
+        :param kwargs_special_list: list of length N of kwargs_special dictionaries (or None)
+        :param source_marg: bool, performs a marginalization over the linear parameters
+        :param linear_prior: linear prior width in eigenvalues
+        :param point_source_cache_list: list of length N of point source positions already solved with the full lens
+         and point source models (see PointSource.lens_model_cache()) or None
+        :return: 1d numpy array of length N of log likelihoods (natural logarithm)
+        """
+        kwargs_batch = [kwargs_lens_list, kwargs_source_list, kwargs_lens_light_list, kwargs_ps_list,
+                        kwargs_extinction_list]
+        num = max([len(kwargs) for kwargs in kwargs_batch if kwargs is not None] + [0])
+        kwargs_batch = [[None] * num if kwargs is None else kwargs for kwargs in kwargs_batch]
+        kwargs_selected = [[], [], [], [], []]
+        for i in range(num):
+            kwargs_i = self.select_kwargs(*[kwargs[i] for kwargs in kwargs_batch])
+            for selected, kwargs in zip(kwargs_selected, kwargs_i):
+                selected.append(kwargs)
+        kwargs_lens_i, kwargs_source_i, kwargs_lens_light_i, kwargs_ps_i, kwargs_extinction_i = kwargs_selected
+        return super(SingleBandMultiModel, self).likelihood_data_given_model_batch(
+            kwargs_lens_i, kwargs_source_i, kwargs_lens_light_i, kwargs_ps_i, kwargs_extinction_i,
+            kwargs_special_list, source_marg=source_marg, linear_prior=linear_prior,
+            point_source_cache_list=self.select_point_source_cache(point_source_cache_list))
+
+    def select_point_source_cache(self, point_source_cache_list):
+        """
+        point source positions solved with the full lens and point source models can only be re-used if this band
+        evaluates all of them
+
+        :param point_source_cache_list: list of point source positions (see PointSource.lens_model_cache()) or None
+        :return: point_source_cache_list or None
+        """
+        if self._index_lens_model is None and self._index_point_source is None:
+            return point_source_cache_list
+        return None
+
     def num_param_linear(self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None, kwargs_ps=None):
         """
 
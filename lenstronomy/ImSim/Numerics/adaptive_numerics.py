@@ -2,6 +2,7 @@ from lenstronomy.ImSim.Numerics.numba_convolution import SubgridNumbaConvolution
 from lenstronomy.ImSim.Numerics.convolution import PixelKernelConvolution
 from lenstronomy.Util import kernel_util
 from lenstronomy.Util import image_util
+import numpy as np
 
 
 class AdaptiveConvolution(object):
@@ -18,7 +19,7 @@ class AdaptiveConvolution(object):
 
     """
     def __init__(self, kernel_super, supersampling_factor, conv_supersample_pixels, supersampling_kernel_size=None,
-                 compute_pixels=None, nopython=True, cache=True, parallel=False):
+                 compute_pixels=None, nopython=True, cache=True, parallel=False, precision='float64', num_threads=None):
         """
 
         :param kernel_super: convolution kernel in units of super sampled pixels provided, odd length per axis
@@ -29,10 +30,15 @@ class AdaptiveConvolution(object):
         :param compute_pixels: bool array of size of image, these pixels (if True) will get blurred light from other pixels
         :param nopython: bool, numba jit setting to use python or compiled.
         :param cache: bool, numba jit setting to use cache
-        :param parallel: bool, numba jit setting to use parallel mode
+        :param parallel: bool, if True, the partial (numba) convolutions are performed with multi-threaded loops
+        :param precision: 'float64' or 'float32', floating point precision of the convolved images. The partial
+         (numba) convolutions of the supersampled pixels are always computed in double precision.
+        :param num_threads: int or None, number of threads of the partial convolutions in parallel mode. None or -1
+         uses all threads of the numba thread pool.
         """
+        self._dtype = np.dtype(precision)
         kernel = kernel_util.degrade_kernel(kernel_super, degrading_factor=supersampling_factor)
-        self._low_res_conv = PixelKernelConvolution(kernel, convolution_type='fft')
+        self._low_res_conv = PixelKernelConvolution(kernel, convolution_type='fft', precision=precision)
         if supersampling_kernel_size is None:
             supersampling_kernel_size = len(kernel)
 
@@ -43,10 +49,11 @@ class AdaptiveConvolution(object):
         kernel_cut = kernel_util.degrade_kernel(kernel_super_cut, degrading_factor=supersampling_factor)
 
         self._low_res_partial = NumbaConvolution(kernel_cut, conv_supersample_pixels, compute_pixels=compute_pixels,
-                                                 nopython=nopython, cache=cache, parallel=parallel, memory_raise=True)
+                                                 nopython=nopython, cache=cache, parallel=parallel, memory_raise=True,
+                                                 num_threads=num_threads)
         self._hig_res_partial = SubgridNumbaConvolution(kernel_super_cut, supersampling_factor, conv_supersample_pixels,
                                                         compute_pixels=compute_pixels, nopython=nopython, cache=cache,
-                                                        parallel=parallel)#, kernel_size=len(kernel_cut))
+                                                        parallel=parallel, num_threads=num_threads)
         self._supersampling_factor = supersampling_factor
 
     def re_size_convolve(self, image_low_res, image_high_res):
@@ -56,9 +63,23 @@ class AdaptiveConvolution(object):
         :return: convolved and re-sized image
         """
         image_low_res_conv = self._low_res_conv.convolution2d(image_low_res)
-        image_low_res_partial_conv = self._low_res_partial.convolve2d(image_low_res)
-        image_high_res_partial_conv = self._hig_res_partial.convolve2d(image_high_res)
-        return image_low_res_conv + image_high_res_partial_conv - image_low_res_partial_conv
+        image_low_res_partial_conv = self._low_res_partial.convolve2d(np.asarray(image_low_res, dtype=float))
+        image_high_res_partial_conv = self._hig_res_partial.convolve2d(np.asarray(image_high_res, dtype=float))
+        image_conv = image_low_res_conv + image_high_res_partial_conv - image_low_res_partial_conv
+        return image_conv.astype(self._dtype, copy=False)
+
+    def re_size_convolve_many(self, image_low_res, image_high_res):
+        """
+
+        :param image_low_res: 3d array (k, nx, ny), stack of regular sampled images
+        :param image_high_res: 3d array, stack of supersampled images to be convolved on a regular pixel grid
+        :return: 3d array of convolved and re-sized images
+        """
+        image_low_res_conv = self._low_res_conv.convolution2d_many(image_low_res)
+        for i in range(len(image_low_res)):
+            image_low_res_conv[i] += self._hig_res_partial.convolve2d(np.asarray(image_high_res[i], dtype=float)) - \
+                                     self._low_res_partial.convolve2d(np.asarray(image_low_res[i], dtype=float))
+        return image_low_res_conv
 
     def convolve2d(self, image_high_res):
         """
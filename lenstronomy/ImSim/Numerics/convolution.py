@@ -1,14 +1,25 @@
 from scipy import fftpack, ndimage, signal
 import numpy as np
+import hashlib
 import threading
-from scipy._lib._version import NumpyVersion
-_rfft_mt_safe = (NumpyVersion(np.__version__) >= '1.9.0.dev-e24486e')
-_rfft_lock = threading.Lock()
+from collections import OrderedDict
+try:
+    # scipy >= 1.4 provides pocketfft with multi-threading support
+    import scipy.fft as scipy_fft
+    _scipy_fft_bool = True
+except ImportError:
+    _scipy_fft_bool = False
 
 import lenstronomy.Util.kernel_util as kernel_util
 import lenstronomy.Util.util as util
 import lenstronomy.Util.image_util as image_util
 
+# cache of Fourier transformed kernels shared between all FFTConvolution instances, keyed by
+# (padded fft shape, kernel shape, precision, kernel content)
+_kernel_spectrum_cache = OrderedDict()
+_kernel_spectrum_cache_size = 32
+_kernel_spectrum_cache_lock = threading.Lock()
+
 
 def _centered(arr, newshape):
     # Return the center newshape portion of the array.
@@ -20,21 +31,183 @@ def _centered(arr, newshape):
     return arr[tuple(myslice)]
 
 
+def _next_fast_len(n):
+    """
+
+    :param n: minimal length of the transform
+    :return: next length >= n that can be transformed efficiently with a real FFT
+    """
+    if _scipy_fft_bool is True:
+        return scipy_fft.next_fast_len(int(n), real=True)
+    return fftpack.next_fast_len(int(n))
+
+
+class FFTConvolution(object):
+    """
+    real-to-real FFT convolution with a fixed kernel.
+    The Fourier transformed kernel is computed once for each image shape and kept in a cache shared between all
+    instances (keyed by the kernel content and the padded shape), such that e.g. different bands or re-initialized
+    numerics with the same PSF kernel and supersampling do not repeat the computation. The zero-padded work buffers
+    are re-used between calls (one per thread).
+    With precision='float32', buffers and kernel spectrum are kept in single precision (complex64), which halves the
+    memory traffic of the transforms (single precision transforms require scipy >= 1.4).
+    """
+    def __init__(self, kernel, workers=None, precision='float64'):
+        """
+
+        :param kernel: 2d array, convolution kernel
+        :param workers: int or None, number of threads used by the FFTs (requires scipy >= 1.4, ignored otherwise).
+         None uses a single thread, -1 all available cores.
+        :param precision: 'float64' or 'float32', floating point precision of the convolution
+        """
+        self._dtype = np.dtype(precision)
+        self._kernel = np.asarray(kernel, dtype=self._dtype)
+        self._kernel_hash = hashlib.sha1(np.ascontiguousarray(self._kernel).view(np.uint8)).hexdigest()
+        self._workers = workers
+        self._spectrum_list = {}
+        # the buffers are held in thread-local storage and are released together with their thread
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # buffers are thread specific and are not passed on when pickling (e.g. to other processes)
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def convolve(self, image, mode='same'):
+        """
+
+        :param image: 2d numpy array to be convolved
+        :param mode: 'same', 'full' or 'valid' (see scipy.signal.fftconvolve)
+        :return: convolved image
+        """
+        image = np.asarray(image)
+        s1 = image.shape
+        fshape, fslice, sp2 = self._spectrum(s1)
+        buffer = self._buffer(s1, fshape)
+        buffer[:s1[0], :s1[1]] = image
+        sp1 = self._rfftn(buffer)
+        sp1 *= sp2
+        ret = self._irfftn(sp1, fshape)[fslice]
+        return self._crop(ret, s1, mode)
+
+    def convolve_many(self, images, mode='same'):
+        """
+        convolves a stack of images of the same shape in one broadcasted FFT sharing the kernel spectrum
+
+        :param images: 3d numpy array (k, nx, ny) of k images to be convolved
+        :param mode: 'same', 'full' or 'valid' (see scipy.signal.fftconvolve)
+        :return: 3d numpy array of convolved images
+        """
+        images = np.asarray(images)
+        num = len(images)
+        s1 = images.shape[1:]
+        fshape, fslice, sp2 = self._spectrum(s1)
+        sp1 = self._rfftn(images, fshape)
+        sp1 *= sp2
+        ret = self._irfftn(sp1, fshape)[(slice(None),) + fslice]
+        return self._crop(ret, s1, mode, num=num)
+
+    def _crop(self, ret, s1, mode, num=None):
+        """
+
+        :param ret: full convolution (or stack of them)
+        :param s1: shape of the convolved image
+        :param mode: 'same', 'full' or 'valid'
+        :param num: number of images in the stack, None for a single image
+        :return: copy of the cropped convolution
+        """
+        lead = [] if num is None else [num]
+        if mode == "full":
+            return ret.copy()
+        elif mode == "same":
+            return _centered(ret, lead + list(s1)).copy()
+        elif mode == "valid":
+            return _centered(ret, lead + list(np.array(s1) - np.array(self._kernel.shape) + 1)).copy()
+        else:
+            raise ValueError("Acceptable mode flags are 'valid',"
+                             " 'same', or 'full'.")
+
+    def _spectrum(self, image_shape):
+        """
+        Fourier transformed kernel and shape quantities for a given image shape
+
+        :param image_shape: shape of the image to be convolved
+        :return: padded fft shape, slice of the full convolution, Fourier transformed kernel
+        """
+        image_shape = tuple(image_shape)
+        if image_shape not in self._spectrum_list:
+            s1 = np.array(image_shape)
+            s2 = np.array(self._kernel.shape)
+            shape = s1 + s2 - 1
+            # Speed up FFT by padding to optimal size for a real FFT
+            fshape = tuple([_next_fast_len(d) for d in shape])
+            fslice = tuple([slice(0, int(sz)) for sz in shape])
+            key = (fshape, self._kernel.shape, self._dtype.str, self._kernel_hash)
+            with _kernel_spectrum_cache_lock:
+                sp2 = _kernel_spectrum_cache.pop(key, None)
+            if sp2 is None:
+                sp2 = self._rfftn(self._kernel, fshape)
+            with _kernel_spectrum_cache_lock:
+                _kernel_spectrum_cache[key] = sp2
+                while len(_kernel_spectrum_cache) > _kernel_spectrum_cache_size:
+                    _kernel_spectrum_cache.popitem(last=False)
+            self._spectrum_list[image_shape] = fshape, fslice, sp2
+        return self._spectrum_list[image_shape]
+
+    def _buffer(self, image_shape, fshape):
+        """
+        zero-padded work buffer of the current thread. Only the image area gets overwritten in each call.
+
+        :param image_shape: shape of the image to be convolved
+        :param fshape: padded fft shape
+        :return: 2d array of shape fshape
+        """
+        buffer_list = getattr(self._local, 'buffer_list', None)
+        if buffer_list is None:
+            buffer_list = self._local.buffer_list = {}
+        image_shape = tuple(image_shape)
+        if image_shape not in buffer_list:
+            buffer_list[image_shape] = np.zeros(fshape, dtype=self._dtype)
+        return buffer_list[image_shape]
+
+    def _rfftn(self, a, s=None):
+        # transforms act on the last two axes, leading axes are broadcasted
+        axes = (-2, -1)
+        if _scipy_fft_bool is True:
+            return scipy_fft.rfftn(a, s, axes=axes, workers=self._workers)
+        return np.fft.rfftn(a, s, axes=axes).astype(np.result_type(self._dtype, np.complex64), copy=False)
+
+    def _irfftn(self, a, s):
+        axes = (-2, -1)
+        if _scipy_fft_bool is True:
+            return scipy_fft.irfftn(a, s, axes=axes, workers=self._workers)
+        return np.fft.irfftn(a, s, axes=axes).astype(self._dtype, copy=False)
+
+
 class PixelKernelConvolution(object):
     """
     class to compute convolutions for a given pixelized kernel (fft, grid)
     """
-    def __init__(self, kernel, convolution_type='fft_static'):
+    def __init__(self, kernel, convolution_type='fft_static', fft_workers=None, precision='float64'):
         """
 
         :param kernel: 2d array, convolution kernel
         :param convolution_type: string, 'fft', 'grid', 'fft_static' mode of 2d convolution
+        :param fft_workers: int or None, number of threads of the FFTs in 'fft_static' mode (requires scipy >= 1.4)
+        :param precision: 'float64' or 'float32', floating point precision of the convolved images
         """
-        self._kernel = kernel
+        self._dtype = np.dtype(precision)
+        self._kernel = np.asarray(kernel, dtype=self._dtype)
         if convolution_type not in ['fft', 'grid', 'fft_static']:
             raise ValueError('convolution_type %s not supported!' % convolution_type)
         self._type = convolution_type
-        self._pre_computed = False
+        if self._type == 'fft_static':
+            self._fft_conv = FFTConvolution(kernel, workers=fft_workers, precision=precision)
 
     def convolution2d(self, image):
         """
@@ -45,108 +218,28 @@ class PixelKernelConvolution(object):
         if self._type == 'fft':
             image_conv = signal.fftconvolve(image, self._kernel, mode='same')
         elif self._type == 'fft_static':
-            image_conv = self._static_fft(image, mode='same')
+            image_conv = self._fft_conv.convolve(image, mode='same')
         elif self._type == 'grid':
             image_conv = signal.convolve2d(image, self._kernel, mode='same')
         else:
             raise ValueError('convolution_type %s not supported!' % self._type)
-        return image_conv
+        return image_conv.astype(self._dtype, copy=False)
 
-    def _static_fft(self, image, mode='same'):
+    def convolution2d_many(self, images):
         """
-        scipy fft convolution with saved static fft kernel
 
-        :param image: 2d numpy array to be convolved
-        :return:
+        :param images: 3d array (k, nx, ny) of images to be convolved
+        :return: 3d array of convolved images
         """
-        in1 = image
-        in1 = np.asarray(in1)
-        if self._pre_computed is False:
-            self._s1, self._s2, self._complex_result, self._shape, self._fshape, self._fslice, self._sp2 = self._static_pre_compute(image)
-            self._pre_computed = True
-        s1, s2, complex_result, shape, fshape, fslice, sp2 = self._s1, self._s2, self._complex_result, self._shape, self._fshape, self._fslice, self._sp2
-        #if in1.ndim == in2.ndim == 0:  # scalar inputs
-        #    return in1 * in2
-        #elif not in1.ndim == in2.ndim:
-        #    raise ValueError("in1 and in2 should have the same dimensionality")
-        #elif in1.size == 0 or in2.size == 0:  # empty arrays
-        #    return np.array([])
-
-
-        # Check that input sizes are compatible with 'valid' mode
-        #if _inputs_swap_needed(mode, s1, s2):
-            # Convolution is commutative; order doesn't have any effect on output
-            # only applicable for 'valid' mode
-        #    in1, s1, in2, s2 = in2, s2, in1, s1
-
-        # Pre-1.9 NumPy FFT routines are not threadsafe.  For older NumPys, make
-        # sure we only call rfftn/irfftn from one thread at a time.
-        if not complex_result and (_rfft_mt_safe or _rfft_lock.acquire(False)):
-            try:
-                sp1 = np.fft.rfftn(in1, fshape)
-                ret = (np.fft.irfftn(sp1 * sp2, fshape)[fslice].copy())
-            finally:
-                if not _rfft_mt_safe:
-                    _rfft_lock.release()
-        else:
-            # If we're here, it's either because we need a complex result, or we
-            # failed to acquire _rfft_lock (meaning rfftn isn't threadsafe and
-            # is already in use by another thread).  In either case, use the
-            # (threadsafe but slower) SciPy complex-FFT routines instead.
-            sp1 = fftpack.fftn(in1, fshape)
-            ret = fftpack.ifftn(sp1 * sp2)[fslice].copy()
-            if not complex_result:
-                ret = ret.real
-
-        if mode == "full":
-            return ret
-        elif mode == "same":
-            return _centered(ret, s1)
-        elif mode == "valid":
-            return _centered(ret, s1 - s2 + 1)
-        else:
-            raise ValueError("Acceptable mode flags are 'valid',"
-                             " 'same', or 'full'.")
-
-    def _static_pre_compute(self, image):
-        """
-        pre-compute Fourier transformed kernel and shape quantities to speed up convolution
-
-        :param image: 2d numpy array
-        :return:
-        """
-        in1 = image
-        in2 = self._kernel
-        s1 = np.array(in1.shape)
-        s2 = np.array(in2.shape)
-        complex_result = (np.issubdtype(in1.dtype, np.complexfloating) or
-                          np.issubdtype(in2.dtype, np.complexfloating))
-        shape = s1 + s2 - 1
-
-        # Check that input sizes are compatible with 'valid' mode
-        # if _inputs_swap_needed(mode, s1, s2):
-        # Convolution is commutative; order doesn't have any effect on output
-        # only applicable for 'valid' mode
-        #    in1, s1, in2, s2 = in2, s2, in1, s1
-
-        # Speed up FFT by padding to optimal size for FFTPACK
-        fshape = [fftpack.helper.next_fast_len(int(d)) for d in shape]
-        fslice = tuple([slice(0, int(sz)) for sz in shape])
-        # Pre-1.9 NumPy FFT routines are not threadsafe.  For older NumPys, make
-        # sure we only call rfftn/irfftn from one thread at a time.
-        if not complex_result and (_rfft_mt_safe or _rfft_lock.acquire(False)):
-            try:
-                sp2 = np.fft.rfftn(in2, fshape)
-            finally:
-                if not _rfft_mt_safe:
-                    _rfft_lock.release()
+        if self._type == 'fft':
+            images_conv = signal.fftconvolve(images, self._kernel[np.newaxis, :, :], mode='same')
+        elif self._type == 'fft_static':
+            images_conv = self._fft_conv.convolve_many(images, mode='same')
+        elif self._type == 'grid':
+            images_conv = np.array([signal.convolve2d(image, self._kernel, mode='same') for image in images])
         else:
-            # If we're here, it's either because we need a complex result, or we
-            # failed to acquire _rfft_lock (meaning rfftn isn't threadsafe and
-            # is already in use by another thread).  In either case, use the
-            # (threadsafe but slower) SciPy complex-FFT routines instead.
-            sp2 = fftpack.fftn(in2, fshape)
-        return s1, s2, complex_result, shape, fshape, fslice, sp2
+            raise ValueError('convolution_type %s not supported!' % self._type)
+        return images_conv.astype(self._dtype, copy=False)
 
     def re_size_convolve(self, image_low_res, image_high_res=None):
         """
@@ -156,18 +249,31 @@ class PixelKernelConvolution(object):
         """
         return self.convolution2d(image_low_res)
 
+    def re_size_convolve_many(self, image_low_res, image_high_res=None):
+        """
+
+        :param image_low_res: 3d array (k, nx, ny), stack of regular sampled images to be convolved
+        :param image_high_res: stack of supersampled images (not used)
+        :return: 3d array of convolved images
+        """
+        return self.convolution2d_many(image_low_res)
+
 
 class SubgridKernelConvolution(object):
     """
     class to compute the convolution on a supersampled grid with partial convolution computed on the regular grid
     """
-    def __init__(self, kernel_supersampled, supersampling_factor, supersampling_kernel_size=None, convolution_type='fft_static'):
+    def __init__(self, kernel_supersampled, supersampling_factor, supersampling_kernel_size=None,
+                 convolution_type='fft_static', fft_workers=None, precision='float64'):
         """
 
         :param kernel_supersampled: kernel in supersampled pixels
         :param supersampling_factor: supersampling factor relative to the image pixel grid
         :param supersampling_kernel_size: number of pixels (in units of the image pixels) that are convolved with the
         supersampled kernel
+        :param convolution_type: string, 'fft', 'grid', 'fft_static' mode of 2d convolution
+        :param fft_workers: int or None, number of threads of the FFTs in 'fft_static' mode (requires scipy >= 1.4)
+        :param precision: 'float64' or 'float32', floating point precision of the convolved images
         """
         n_high = len(kernel_supersampled)
         self._supersampling_factor = supersampling_factor
@@ -183,8 +289,10 @@ class SubgridKernelConvolution(object):
             kernel_low_res, kernel_high_res = kernel_util.split_kernel(kernel_supersampled, supersampling_kernel_size,
                                                                        self._supersampling_factor)
             self._low_res_convolution = True
-        self._low_res_conv = PixelKernelConvolution(kernel_low_res, convolution_type=convolution_type)
-        self._high_res_conv = PixelKernelConvolution(kernel_high_res, convolution_type=convolution_type)
+        self._low_res_conv = PixelKernelConvolution(kernel_low_res, convolution_type=convolution_type,
+                                                    fft_workers=fft_workers, precision=precision)
+        self._high_res_conv = PixelKernelConvolution(kernel_high_res, convolution_type=convolution_type,
+                                                     fft_workers=fft_workers, precision=precision)
 
     def convolution2d(self, image):
         """
@@ -212,6 +320,19 @@ class SubgridKernelConvolution(object):
             image_resized_conv += self._low_res_conv.convolution2d(image_low_res)
         return image_resized_conv
 
+    def re_size_convolve_many(self, image_low_res, image_high_res):
+        """
+
+        :param image_low_res: 3d array (k, nx, ny), stack of regular sampled images
+        :param image_high_res: 3d array, stack of supersampled images to be convolved on a regular pixel grid
+        :return: 3d array of convolved and re-sized images
+        """
+        image_high_res_conv = self._high_res_conv.convolution2d_many(image_high_res)
+        image_resized_conv = image_util.re_size(image_high_res_conv, self._supersampling_factor)
+        if self._low_res_convolution is True:
+            image_resized_conv += self._low_res_conv.convolution2d_many(image_low_res)
+        return image_resized_conv
+
 
 class MultiGaussianConvolution(object):
     """
@@ -221,7 +342,7 @@ class MultiGaussianConvolution(object):
     """
 
     def __init__(self, sigma_list, fraction_list, pixel_scale, supersampling_factor=1, supersampling_convolution=False,
-                 truncation=2):
+                 truncation=2, precision='float64'):
         """
 
         :param sigma_list: list of std value of Gaussian kernel
@@ -229,7 +350,9 @@ class MultiGaussianConvolution(object):
         :param pixel_scale: scale of pixel width (to convert sigmas into units of pixels)
         :param truncation: float. Truncate the filter at this many standard deviations.
         Default is 4.0.
+        :param precision: 'float64' or 'float32', floating point precision of the convolved images
         """
+        self._dtype = np.dtype(precision)
         self._num_gaussians = len(sigma_list)
         self._sigmas_scaled = np.array(sigma_list) / pixel_scale
         if supersampling_convolution is True:
@@ -248,15 +371,37 @@ class MultiGaussianConvolution(object):
         :param image: 2d numpy array, image to be convolved
         :return: convolved image, 2d numpy array
         """
+        return self._convolution(image, many=False)
+
+    def convolution2d_many(self, images):
+        """
+        2d convolution of a stack of images
+
+        :param images: 3d numpy array (k, nx, ny), images to be convolved
+        :return: convolved images, 3d numpy array
+        """
+        return self._convolution(images, many=True)
+
+    def _convolution(self, image, many=False):
+        """
+
+        :param image: 2d numpy array or 3d stack of images (if many=True)
+        :param many: bool, if True, no smoothing is applied along the first (stacking) axis
+        :return: convolved image(s)
+        """
+        image = np.asarray(image, dtype=self._dtype)
         image_conv = None
         for i in range(self._num_gaussians):
+            sigma = self._sigmas_scaled[i]
+            if many is True:
+                sigma = (0, sigma, sigma)
             if image_conv is None:
-                image_conv = ndimage.filters.gaussian_filter(image, self._sigmas_scaled[i], mode='nearest',
+                image_conv = ndimage.filters.gaussian_filter(image, sigma, mode='nearest',
                                                              truncate=self._truncation) * self._fraction_list[i]
             else:
-                image_conv += ndimage.filters.gaussian_filter(image, self._sigmas_scaled[i], mode='nearest',
+                image_conv += ndimage.filters.gaussian_filter(image, sigma, mode='nearest',
                                                               truncate=self._truncation) * self._fraction_list[i]
-        return image_conv
+        return image_conv.astype(self._dtype, copy=False)
 
     def re_size_convolve(self, image_low_res, image_high_res):
         """
@@ -271,6 +416,20 @@ class MultiGaussianConvolution(object):
             image_resized_conv = self.convolution2d(image_low_res)
         return image_resized_conv
 
+    def re_size_convolve_many(self, image_low_res, image_high_res):
+        """
+
+        :param image_low_res: 3d array (k, nx, ny), stack of regular sampled images
+        :param image_high_res: 3d array, stack of supersampled images
+        :return: 3d array of convolved and re-sized images
+        """
+        if self._supersampling_convolution is True:
+            image_high_res_conv = self.convolution2d_many(image_high_res)
+            image_resized_conv = image_util.re_size(image_high_res_conv, self._supersampling_factor)
+        else:
+            image_resized_conv = self.convolution2d_many(image_low_res)
+        return image_resized_conv
+
     def pixel_kernel(self, num_pix):
         """
         computes a pixelized kernel from the MGE parameters
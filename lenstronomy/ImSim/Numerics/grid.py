@@ -9,7 +9,7 @@ class AdaptiveGrid(Coordinates1D):
     manages a super-sampled grid on the partial image
     """
     def __init__(self, nx, ny, transform_pix2angle, ra_at_xy_0, dec_at_xy_0, supersampling_indexes,
-                 supersampling_factor, flux_evaluate_indexes=None):
+                 supersampling_factor, flux_evaluate_indexes=None, precision='float64'):
         """
 
         :param nx: number of pixels in x-axis
@@ -21,10 +21,12 @@ class AdaptiveGrid(Coordinates1D):
         :param supersampling_factor: int, factor (per axis) of super-sampling
         :param flux_evaluate_indexes: bool array of shape nx x ny, corresponding to pixels being evaluated
         (for both low and high res). Default is None, replaced by setting all pixels to being evaluated.
+        :param precision: 'float64' or 'float32', floating point precision of the coordinates and images
         """
         super(AdaptiveGrid, self).__init__(transform_pix2angle, ra_at_xy_0, dec_at_xy_0)
         self._nx = nx
         self._ny = ny
+        self._dtype = np.dtype(precision)
         self._x_grid, self._y_grid = self.coordinate_grid(nx, ny)
         if flux_evaluate_indexes is None:
             flux_evaluate_indexes = np.ones_like(self._x_grid, dtype=bool)
@@ -33,8 +35,8 @@ class AdaptiveGrid(Coordinates1D):
         self._low_res_indexes1d = (np.invert(supersampled_indexes1d)) & (flux_evaluate_indexes)
         self._supersampling_factor = supersampling_factor
         self._num_sub = supersampling_factor * supersampling_factor
-        self._x_low_res = self._x_grid[self._low_res_indexes1d]
-        self._y_low_res = self._y_grid[self._low_res_indexes1d]
+        self._x_low_res = self._x_grid[self._low_res_indexes1d].astype(self._dtype)
+        self._y_low_res = self._y_grid[self._low_res_indexes1d].astype(self._dtype)
         self._num_low_res = len(self._x_low_res)
 
     @property
@@ -80,7 +82,7 @@ class AdaptiveGrid(Coordinates1D):
         :return: 2d image
         """
 
-        array = np.zeros_like(self._x_grid)
+        array = np.zeros_like(self._x_grid, dtype=self._dtype)
         array[self._low_res_indexes1d] = low_res_values
         array_low_res_partial = self._average_subgrid(supersampled_values)
         array[self._high_res_indexes1d] = array_low_res_partial
@@ -92,7 +94,8 @@ class AdaptiveGrid(Coordinates1D):
         :param supersampled_values: 1d array of supersampled values corresponding to coordinates
         :return: 2d array of supersampled image (zeros outside supersampled frame)
         """
-        high_res = np.zeros((self._nx * self._supersampling_factor, self._ny * self._supersampling_factor))
+        high_res = np.zeros((self._nx * self._supersampling_factor, self._ny * self._supersampling_factor),
+                            dtype=self._dtype)
         count = 0
         for i in range(self._supersampling_factor):
             for j in range(self._supersampling_factor):
@@ -121,8 +124,8 @@ class AdaptiveGrid(Coordinates1D):
                 x_sub_grid[count::self._num_sub] = x_grid_select + delta_ra - delta_ra0
                 y_sub_grid[count::self._num_sub] = y_grid_select + delta_dec - delta_dec_0
                 count += 1
-        self._x_high_res = x_sub_grid
-        self._y_high_res = y_sub_grid
+        self._x_high_res = x_sub_grid.astype(self._dtype)
+        self._y_high_res = y_sub_grid.astype(self._dtype)
 
     def _average_subgrid(self, subgrid_values):
         """
@@ -140,7 +143,7 @@ class AdaptiveGrid(Coordinates1D):
         :param array: 1d array
         :return: 2d array
         """
-        grid1d = np.zeros(self._nx * self._ny)
+        grid1d = np.zeros(self._nx * self._ny, dtype=self._dtype)
         grid1d[self._high_res_indexes1d] = array
         grid2d = util.array2image(grid1d, self._nx, self._ny)
         return grid2d
@@ -151,7 +154,7 @@ class RegularGrid(Coordinates1D):
     manages a super-sampled grid on the partial image
     """
     def __init__(self, nx, ny, transform_pix2angle, ra_at_xy_0, dec_at_xy_0, supersampling_factor=1,
-                 flux_evaluate_indexes=None):
+                 flux_evaluate_indexes=None, precision='float64'):
         """
 
         :param nx: number of pixels in x-axis
@@ -163,9 +166,11 @@ class RegularGrid(Coordinates1D):
         :param supersampling_factor: int, factor (per axis) of super-sampling
         :param flux_evaluate_indexes: bool array of shape nx x ny, corresponding to pixels being evaluated
         (for both low and high res). Default is None, replaced by setting all pixels to being evaluated.
+        :param precision: 'float64' or 'float32', floating point precision of the coordinates and images
         """
         super(RegularGrid, self).__init__(transform_pix2angle, ra_at_xy_0, dec_at_xy_0)
         self._supersampling_factor = supersampling_factor
+        self._dtype = np.dtype(precision)
         self._nx = nx
         self._ny = ny
         self._x_grid, self._y_grid = self.coordinate_grid(nx, ny)
@@ -176,8 +181,8 @@ class RegularGrid(Coordinates1D):
         self._compute_indexes = self._subgrid_index(flux_evaluate_indexes, self._supersampling_factor, self._nx, self._ny)
 
         x_grid_sub, y_grid_sub = util.make_subgrid(self._x_grid, self._y_grid, self._supersampling_factor)
-        self._ra_subgrid = x_grid_sub[self._compute_indexes]
-        self._dec_subgrid = y_grid_sub[self._compute_indexes]
+        self._ra_subgrid = x_grid_sub[self._compute_indexes].astype(self._dtype)
+        self._dec_subgrid = y_grid_sub[self._compute_indexes].astype(self._dtype)
 
     @property
     def coordinates_evaluate(self):
@@ -226,7 +231,7 @@ class RegularGrid(Coordinates1D):
         :return:
         """
         nx, ny = self._nx * self._supersampling_factor, self._ny * self._supersampling_factor
-        grid1d = np.zeros((nx * ny))
+        grid1d = np.zeros((nx * ny), dtype=self._dtype)
         grid1d[self._compute_indexes] = array
         grid2d = util.array2image(grid1d, nx, ny)
         return grid2d
\ No newline at end of file
@@ -1,8 +1,13 @@
 import numpy as np
+from numba import prange
 
 from lenstronomy.Util import numba_util
 from lenstronomy.ImSim.Numerics.partial_image import PartialImage
 from lenstronomy.Util import image_util
+from lenstronomy.Util import cache_util
+
+# version of the frame kernels in the on-disk cache, to be increased when _build_frame_kernels() changes its output
+_CACHE_VERSION = 1
 
 
 class NumbaConvolution(object):
@@ -11,7 +16,8 @@ class NumbaConvolution(object):
 
     the convolution is inspired by pyautolens: https://github.com/Jammy2211/PyAutoLens
     """
-    def __init__(self, kernel, conv_pixels, compute_pixels=None, nopython=True, cache=True, parallel=False, memory_raise=True):
+    def __init__(self, kernel, conv_pixels, compute_pixels=None, nopython=True, cache=True, parallel=False, memory_raise=True,
+                 num_threads=None):
         """
 
         :param kernel: convolution kernel in units of the image pixels provided, odd length per axis
@@ -19,13 +25,17 @@ class NumbaConvolution(object):
         :param compute_pixels: bool array of size of image, these pixels (if True) will get blurred light from other pixels
         :param nopython: bool, numba jit setting to use python or compiled.
         :param cache: bool, numba jit setting to use cache
-        :param parallel: bool, numba jit setting to use parallel mode
+        :param parallel: bool, if True, the set-up and the convolution are performed with multi-threaded compiled loops
         :param memory_raise: bool, if True, checks whether memory required to store the convolution kernel is within certain bounds
+        :param num_threads: int or None, number of threads in parallel mode (set at every call). None or -1 uses all
+         threads of the numba thread pool.
         """
         #numba_util.nopython = nopython
         #numba_util.cache = cache
         #numba_util.parallel = parallel
         self._memory_raise = memory_raise
+        self._parallel = parallel
+        self._num_threads = num_threads
         self._kernel = kernel
         self._conv_pixels = conv_pixels
         self._nx, self._ny = np.shape(conv_pixels)
@@ -36,31 +46,40 @@ class NumbaConvolution(object):
         self._mask = compute_pixels
         self._partialInput = PartialImage(partial_read_bools=conv_pixels)
         self._partialOutput = PartialImage(partial_read_bools=compute_pixels)
-        index_array_out = self._partialOutput.index_array
-        index_array_input = self._partialInput.index_array
         kernel_shape = kernel.shape
         self.kernel_max_size = kernel_shape[0] * kernel_shape[1]
 
-        image_index = 0
         if self._partialInput.num_partial * self.kernel_max_size > 10 ** 9 and self._memory_raise is True:
             raise ValueError("kernel length %s combined with data size %s requires %s memory elements, which might"
                              "exceed the memory limit and thus gives a raise. If you wish to ignore this raise, set"
                              " memory_raise=False" % (self.kernel_max_size, self._partialInput.num_partial, self._partialInput.num_partial * self.kernel_max_size))
-        self._image_frame_indexes = np.zeros((self._partialInput.num_partial, self.kernel_max_size), dtype='int')
-        self._image_frame_psfs = np.zeros((self._partialInput.num_partial, self.kernel_max_size))
-        self._image_frame_lengths = np.zeros((self._partialInput.num_partial), dtype='int')
-        for x in range(index_array_input.shape[0]):
-            for y in range(index_array_input.shape[1]):
-                if conv_pixels[x][y]:
-                    image_frame_psfs, image_frame_indexes, frame_length = self._pre_compute_frame_kernel((x, y),
-                                                                                                        self._kernel[:, :],
-                                                                                                         compute_pixels,
-                                                                                                         index_array_out)
-
-                    self._image_frame_indexes[image_index, :] = image_frame_indexes
-                    self._image_frame_psfs[image_index, :] = image_frame_psfs
-                    self._image_frame_lengths[image_index] = frame_length
-                    image_index += 1
+        # the frame kernels only depend on the kernel and the masks and are re-used from the on-disk cache if enabled
+        key = cache_util.hash_key('NumbaConvolution', _CACHE_VERSION, np.asarray(kernel, dtype=float),
+                                  np.asarray(conv_pixels, dtype=bool), np.asarray(compute_pixels, dtype=bool))
+        self._image_frame_indexes, self._image_frame_psfs, self._image_frame_lengths = cache_util.cached(
+            key, ['image_frame_indexes', 'image_frame_psfs', 'image_frame_lengths'], self._build_frame_kernels,
+            kernel, conv_pixels, compute_pixels, self._partialOutput, parallel)
+
+    @staticmethod
+    def _build_frame_kernels(kernel, conv_pixels, compute_pixels, partial_output, parallel=False):
+        """
+        pre-computes for each pixel to be convolved the kernel values and the 1d indexes of the pixels receiving them
+
+        :param kernel: convolution kernel, 2d rectangular array
+        :param conv_pixels: bool array same size as data, pixels to be convolved and their light to be blurred
+        :param compute_pixels: bool array of size of image, these pixels will get blurred light from other pixels
+        :param partial_output: PartialImage instance of compute_pixels
+        :param parallel: bool, if True, builds the tables with a multi-threaded compiled loop
+        :return: frame indexes, frame kernels (both 2d num_partial x kernel size) and 1d frame lengths
+        """
+        # pixels to be convolved in the same (row-major) order as the partial 1d array
+        x_pixels, y_pixels = np.where(np.asarray(conv_pixels, dtype=bool))
+        index_array_out = np.asarray(partial_output.index_array, dtype=np.int64)
+        kernel = np.asarray(kernel, dtype=float)
+        mask = np.asarray(compute_pixels, dtype=bool)
+        if parallel is True:
+            return _frame_kernels_parallel(kernel, x_pixels, y_pixels, mask, index_array_out)
+        return _frame_kernels_serial(kernel, x_pixels, y_pixels, mask, index_array_out)
 
     def convolve2d(self, image):
         """
@@ -70,48 +89,19 @@ class NumbaConvolution(object):
         :return: convolved image, 2d numpy array
         """
         image_array_partial = self._partialInput.partial_array(image)
-        conv_array = self._convolve_jit(image_array_partial, num_data=self._partialOutput.num_partial,
-                                        image_frame_kernels=self._image_frame_psfs,
-                                        image_frame_indexes=self._image_frame_indexes,
-                                        image_frame_lengths=self._image_frame_lengths)
+        if self._parallel is True:
+            numba_util.set_num_threads(self._num_threads)
+            conv_array = _convolve_parallel(image_array_partial, self._partialOutput.num_partial,
+                                            self._image_frame_psfs, self._image_frame_indexes,
+                                            self._image_frame_lengths, numba_util.get_num_threads())
+        else:
+            conv_array = self._convolve_jit(image_array_partial, num_data=self._partialOutput.num_partial,
+                                            image_frame_kernels=self._image_frame_psfs,
+                                            image_frame_indexes=self._image_frame_indexes,
+                                            image_frame_lengths=self._image_frame_lengths)
         conv_image = self._partialOutput.image_from_partial(conv_array)
         return conv_image
 
-    @staticmethod
-    @numba_util.jit()
-    def _pre_compute_frame_kernel(image_index, kernel, mask, index_array):
-        """
-
-        :param image_index: (int, int) index of pixels
-        :param kernel: kernel, 2d rectangular array
-        :param mask: mask (size of full image)
-        :return:
-        frame_kernels: values of kernel
-        frame_indexes: (int) 1d index corresponding to the pixel receiving the kernel value
-        frame_counter: number of pixels with non-zero addition due to kernel convolution
-        """
-        kernel_shape = kernel.shape
-        i0, j0 = image_index
-        kx, ky = kernel_shape[0], kernel_shape[1]
-        mask_shape = index_array.shape
-        nx, ny = mask_shape[0], mask_shape[1]
-        kx2 = int((kx - 1) / 2)
-        ky2 = int((ky - 1) / 2)
-        frame_counter = 0
-        frame_kernels = np.zeros(kx*ky)
-        frame_indexes = np.zeros(kx*ky)
-
-        for i in range(kx):
-            for j in range(ky):
-                x = i0 + i - kx2
-                y = j0 + j - ky2
-                if 0 <= x < nx and 0 <= y < ny:
-                    if mask[x, y]:
-                        frame_indexes[frame_counter] = index_array[x, y]
-                        frame_kernels[frame_counter] = kernel[i, j]
-                        frame_counter += 1
-        return frame_kernels, frame_indexes, frame_counter
-
     @staticmethod
     @numba_util.jit()
     def _convolve_jit(image_array, num_data, image_frame_kernels, image_frame_indexes, image_frame_lengths):
@@ -143,7 +133,8 @@ class SubgridNumbaConvolution(object):
     This makes use of the regualr NumbaConvolution class as a loop through the different sub-pixel positions
     """
 
-    def __init__(self, kernel_super, supersampling_factor, conv_pixels, compute_pixels=None, kernel_size=None, nopython=True, cache=True, parallel=False):
+    def __init__(self, kernel_super, supersampling_factor, conv_pixels, compute_pixels=None, kernel_size=None, nopython=True, cache=True, parallel=False,
+                 num_threads=None):
         """
 
         :param kernel_super: convolution kernel in units of super sampled pixels provided, odd length per axis
@@ -152,7 +143,9 @@ class SubgridNumbaConvolution(object):
         :param compute_pixels: bool array of size of image, these pixels (if True) will get blurred light from other pixels
         :param nopython: bool, numba jit setting to use python or compiled.
         :param cache: bool, numba jit setting to use cache
-        :param parallel: bool, numba jit setting to use parallel mode
+        :param parallel: bool, if True, the set-up and the convolution are performed with multi-threaded compiled loops
+        :param num_threads: int or None, number of threads in parallel mode. None or -1 uses all threads of the numba
+         thread pool.
         """
         self._nx, self._ny = conv_pixels.shape
         self._supersampling_factor = supersampling_factor
@@ -168,7 +161,8 @@ class SubgridNumbaConvolution(object):
                 kernel = self._partial_kernel(kernel_super, i, j)
                 if kernel_size is not None:
                     kernel = image_util.cut_edges(kernel, kernel_size)
-                numba_conv = NumbaConvolution(kernel, conv_pixels, compute_pixels=compute_pixels, nopython=nopython, cache=cache, parallel=parallel)
+                numba_conv = NumbaConvolution(kernel, conv_pixels, compute_pixels=compute_pixels, nopython=nopython,
+                                              cache=cache, parallel=parallel, num_threads=num_threads)
                 self._numba_conv_list.append(numba_conv)
 
     def convolve2d(self, image_high_res):
@@ -217,3 +211,74 @@ class SubgridNumbaConvolution(object):
         #kernel_super_match = image_util.cut_edges(kernel_super_match, numPix=n)
         kernel = image_util.re_size(kernel_super_match, factor=self._supersampling_factor)
         return kernel
+
+
+def _frame_kernels(kernel, x_pixels, y_pixels, mask, index_array):
+    """
+    frame kernel tables of NumbaConvolution for all pixels to be convolved. Each pixel is independent, such that the
+    outer loop can be distributed over threads.
+
+    :param kernel: kernel, 2d rectangular array
+    :param x_pixels: 1d array of first axis indexes of the pixels to be convolved
+    :param y_pixels: 1d array of second axis indexes of the pixels to be convolved
+    :param mask: bool mask (size of full image) of pixels receiving flux
+    :param index_array: 2d int array with the 1d indexes of the pixels receiving flux, -1 when masked
+    :return: frame indexes, frame kernels (both 2d num_pixels x kernel size) and 1d frame lengths
+    """
+    kx, ky = kernel.shape[0], kernel.shape[1]
+    nx, ny = index_array.shape[0], index_array.shape[1]
+    kx2 = int((kx - 1) / 2)
+    ky2 = int((ky - 1) / 2)
+    num = len(x_pixels)
+    frame_indexes = np.zeros((num, kx * ky), dtype=np.int64)
+    frame_kernels = np.zeros((num, kx * ky))
+    frame_lengths = np.zeros(num, dtype=np.int64)
+    for k in prange(num):
+        i0, j0 = x_pixels[k], y_pixels[k]
+        frame_counter = 0
+        for i in range(kx):
+            for j in range(ky):
+                x = i0 + i - kx2
+                y = j0 + j - ky2
+                if 0 <= x < nx and 0 <= y < ny:
+                    if mask[x, y]:
+                        frame_indexes[k, frame_counter] = index_array[x, y]
+                        frame_kernels[k, frame_counter] = kernel[i, j]
+                        frame_counter += 1
+        frame_lengths[k] = frame_counter
+    return frame_indexes, frame_kernels, frame_lengths
+
+
+_frame_kernels_serial = numba_util.jit(parallel=False)(_frame_kernels)
+# the numba cache does not distinguish the parallel from the serial compilation of the same function
+_frame_kernels_parallel = numba_util.jit(cache=False, parallel=True)(_frame_kernels)
+
+
+@numba_util.jit(parallel=True)
+def _convolve_parallel(image_array, num_data, image_frame_kernels, image_frame_indexes, image_frame_lengths,
+                       num_chunks):
+    """
+    multi-threaded version of NumbaConvolution._convolve_jit(). The pixels to be blurred are split in num_chunks
+    chunks with their own output array each (to avoid concurrent writes), which are summed in the end.
+
+    :param image_array: selected subset of image in 1d array conventions
+    :param num_data: number of 1d data that get convolved light and are output
+    :param image_frame_kernels: list of indexes that have a response for certain pixel (as a list
+    :param image_frame_indexes: indexes of image (in 1d convention) those pixels get convolved
+    :param image_frame_lengths: length of image_frame_kernels
+    :param num_chunks: number of chunks processed in parallel (typically the number of threads)
+    :return: 1d convolved array
+    """
+    num = len(image_array)
+    chunk_size = (num + num_chunks - 1) // num_chunks
+    conv_arrays = np.zeros((num_chunks, num_data))
+    for chunk in prange(num_chunks):
+        for image_index in range(chunk * chunk_size, min((chunk + 1) * chunk_size, num)):
+            value = image_array[image_index]
+            for kernel_index in range(image_frame_lengths[image_index]):
+                vector_index = image_frame_indexes[image_index, kernel_index]
+                conv_arrays[chunk, vector_index] += value * image_frame_kernels[image_index, kernel_index]
+    conv_array = np.zeros(num_data)
+    for chunk in range(num_chunks):
+        conv_array += conv_arrays[chunk]
+    return conv_array
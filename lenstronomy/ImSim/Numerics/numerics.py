@@ -14,7 +14,8 @@ class Numerics(PointSourceRendering):
     def __init__(self, pixel_grid, psf, supersampling_factor=1, compute_mode='regular', supersampling_convolution=False,
                  supersampling_kernel_size=5, flux_evaluate_indexes=None, supersampled_indexes=None,
                  compute_indexes=None, point_source_supersampling_factor=1, convolution_kernel_size=None,
-                 convolution_type='fft_static', truncation=4):
+                 convolution_type='fft_static', truncation=4, fft_workers=None,
+                 precision='float64', num_threads=None):
         """
 
         :param pixel_grid: PixelGrid() class instance
@@ -37,7 +38,17 @@ class Numerics(PointSourceRendering):
         :param point_source_supersampling_factor: super-sampling resolution of the point source placing
         :param convolution_kernel_size: int, odd number, size of convolution kernel. If None, takes size of point_source_kernel
         :param convolution_type: string, 'fft', 'grid', 'fft_static' mode of 2d convolution
+        :param fft_workers: int or None, number of threads used by the FFTs in 'fft_static' convolution (requires
+        scipy >= 1.4). None uses a single thread, -1 all available cores.
+        :param precision: 'float64' or 'float32', floating point precision of the coordinates to be evaluated, the
+        ray-shooting (single plane), the surface brightness and the convolution. 'float32' reduces memory and bandwidth at the cost of accuracy (of order
+        1e-7 relative); linear inversions are always performed in double precision.
+        :param num_threads: int or None, number of threads of the multi-threaded (numba) convolution in the adaptive
+        supersampling convolution. None performs it single threaded, -1 uses all available threads.
         """
+        if precision not in ['float64', 'float32']:
+            raise ValueError("precision %s not supported! Chose either 'float64' or 'float32'." % precision)
+        self._dtype = np.dtype(precision)
         # if no super sampling, turn the supersampling convolution off
         self._psf_type = psf.psf_type
         if not isinstance(supersampling_factor, int):
@@ -52,10 +63,10 @@ class Numerics(PointSourceRendering):
             supersampled_indexes = np.zeros((nx, ny), dtype=bool)
         if compute_mode == 'adaptive':  # or (compute_mode == 'regular' and supersampling_convolution is False and supersampling_factor > 1):
             self._grid = AdaptiveGrid(nx, ny, transform_pix2angle, ra_at_xy_0, dec_at_xy_0, supersampled_indexes,
-                                      supersampling_factor, flux_evaluate_indexes)
+                                      supersampling_factor, flux_evaluate_indexes, precision=precision)
         else:
             self._grid = RegularGrid(nx, ny, transform_pix2angle, ra_at_xy_0, dec_at_xy_0, supersampling_factor,
-                                     flux_evaluate_indexes)
+                                     flux_evaluate_indexes, precision=precision)
         if self._psf_type == 'PIXEL':
             if compute_mode == 'adaptive' and supersampling_convolution is True:
                 from lenstronomy.ImSim.Numerics.adaptive_numerics import AdaptiveConvolution
@@ -64,7 +75,9 @@ class Numerics(PointSourceRendering):
                 self._conv = AdaptiveConvolution(kernel_super, supersampling_factor,
                                                  conv_supersample_pixels=supersampled_indexes,
                                                  supersampling_kernel_size=supersampling_kernel_size,
-                                                 compute_pixels=compute_indexes, nopython=True, cache=True, parallel=False)
+                                                 compute_pixels=compute_indexes, nopython=True, cache=True,
+                                                 parallel=num_threads is not None, precision=precision,
+                                                 num_threads=num_threads)
 
             elif compute_mode == 'regular' and supersampling_convolution is True:
                 kernel_super = psf.kernel_point_source_supersampled(supersampling_factor)
@@ -74,12 +87,14 @@ class Numerics(PointSourceRendering):
                                                                   supersampling_factor)
                 self._conv = SubgridKernelConvolution(kernel_super, supersampling_factor,
                                                       supersampling_kernel_size=supersampling_kernel_size,
-                                                      convolution_type=convolution_type)
+                                                      convolution_type=convolution_type, fft_workers=fft_workers,
+                                                      precision=precision)
             else:
                 kernel = psf.kernel_point_source
                 kernel = self._supersampling_cut_kernel(kernel, convolution_kernel_size,
                                                               supersampling_factor=1)
-                self._conv = PixelKernelConvolution(kernel, convolution_type=convolution_type)
+                self._conv = PixelKernelConvolution(kernel, convolution_type=convolution_type,
+                                                    fft_workers=fft_workers, precision=precision)
 
         elif self._psf_type == 'GAUSSIAN':
             pixel_scale = pixel_grid.pixel_width
@@ -88,7 +103,8 @@ class Numerics(PointSourceRendering):
             sigma_list = [sigma]
             fraction_list = [1]
             self._conv = MultiGaussianConvolution(sigma_list, fraction_list, pixel_scale, supersampling_factor,
-                                                  supersampling_convolution, truncation=truncation)
+                                                  supersampling_convolution, truncation=truncation,
+                                                  precision=precision)
         elif self._psf_type == 'NONE':
             self._conv = None
         else:
@@ -104,13 +120,49 @@ class Numerics(PointSourceRendering):
         :return: convolved image on regular pixel grid, 2d array
         """
         # add supersampled region to lower resolution on
+        flux_array = np.asarray(flux_array, dtype=self._dtype)
         image_low_res, image_high_res_partial = self._grid.flux_array2image_low_high(flux_array)
         if unconvolved is True or self._psf_type == 'NONE':
             image_conv = image_low_res
         else:
             # convolve low res grid and high res grid
             image_conv = self._conv.re_size_convolve(image_low_res, image_high_res_partial)
-        return image_conv * self._pixel_width ** 2
+        return image_conv * self._dtype.type(self._pixel_width ** 2)
+
+    def re_size_convolve_many(self, flux_arrays, unconvolved=False):
+        """
+        re-sizes and convolves a stack of flux arrays in one go (sharing the convolution kernel)
+
+        :param flux_arrays: 2d array (k, n), k flux arrays corresponding to coordinates_evaluate
+        :param unconvolved: bool, if True, does not apply the convolution
+        :return: convolved images on regular pixel grid, 3d array (k, nx, ny)
+        """
+        if len(flux_arrays) == 0:
+            return np.zeros((0, self._nx, self._ny), dtype=self._dtype)
+        flux_arrays = np.asarray(flux_arrays, dtype=self._dtype)
+        image_low_res, image_high_res = [], []
+        for flux_array in flux_arrays:
+            image_low_res_i, image_high_res_i = self._grid.flux_array2image_low_high(flux_array)
+            image_low_res.append(image_low_res_i)
+            image_high_res.append(image_high_res_i)
+        image_low_res = np.array(image_low_res)
+        if image_high_res[0] is None:
+            image_high_res = None
+        else:
+            image_high_res = np.array(image_high_res)
+        if unconvolved is True or self._psf_type == 'NONE':
+            image_conv = image_low_res
+        else:
+            image_conv = self._conv.re_size_convolve_many(image_low_res, image_high_res)
+        return image_conv * self._dtype.type(self._pixel_width ** 2)
+
+    @property
+    def precision(self):
+        """
+
+        :return: floating point precision of the numerics, 'float64' or 'float32'
+        """
+        return self._dtype.name
 
     @property
     def coordinates_evaluate(self):
@@ -13,7 +13,8 @@ class NumericsSubFrame(PointSourceRendering):
     def __init__(self, pixel_grid, psf, supersampling_factor=1, compute_mode='regular', supersampling_convolution=False,
                  supersampling_kernel_size=5, flux_evaluate_indexes=None, supersampled_indexes=None,
                  compute_indexes=None, point_source_supersampling_factor=1, convolution_kernel_size=None,
-                 convolution_type='fft_static', truncation=4):
+                 convolution_type='fft_static', truncation=4, fft_workers=None,
+                 precision='float64', num_threads=None):
         """
 
         :param pixel_grid: PixelGrid() class instance
@@ -36,7 +37,13 @@ class NumericsSubFrame(PointSourceRendering):
         :param point_source_supersampling_factor: super-sampling resolution of the point source placing
         :param convolution_kernel_size: int, odd number, size of convolution kernel. If None, takes size of
         point_source_kernel
-
+        :param convolution_type: string, 'fft', 'grid', 'fft_static' mode of 2d convolution
+        :param fft_workers: int or None, number of threads used by the FFTs in 'fft_static' convolution (requires
+        scipy >= 1.4). None uses a single thread, -1 all available cores.
+        :param precision: 'float64' or 'float32', floating point precision of the coordinates to be evaluated, the
+        surface brightness and the convolution
+        :param num_threads: int or None, number of threads of the multi-threaded (numba) convolution in the adaptive
+        supersampling convolution. None performs it single threaded, -1 uses all available threads.
         """
         # if no super sampling, turn the supersampling convolution off
 
@@ -52,7 +59,9 @@ class NumericsSubFrame(PointSourceRendering):
                                            compute_indexes=self._cut_frame(compute_indexes),
                                            point_source_supersampling_factor=point_source_supersampling_factor,
                                            convolution_kernel_size=convolution_kernel_size,
-                                           convolution_type=convolution_type, truncation=truncation)
+                                           convolution_type=convolution_type, truncation=truncation,
+                                           fft_workers=fft_workers, precision=precision,
+                                           num_threads=num_threads)
         super(NumericsSubFrame, self).__init__(pixel_grid=pixel_grid, supersampling_factor=point_source_supersampling_factor,
                                        psf=psf)
 
@@ -67,6 +76,24 @@ class NumericsSubFrame(PointSourceRendering):
         image_sub_frame = self._numerics_subframe.re_size_convolve(flux_array, unconvolved=unconvolved)
         return self._complete_frame(image_sub_frame)
 
+    def re_size_convolve_many(self, flux_arrays, unconvolved=False):
+        """
+
+        :param flux_arrays: 2d array (k, n), k flux arrays corresponding to coordinates_evaluate
+        :param unconvolved: bool, if True, does not apply the convolution
+        :return: convolved images on regular pixel grid, 3d array (k, nx, ny)
+        """
+        image_sub_frame = self._numerics_subframe.re_size_convolve_many(flux_arrays, unconvolved=unconvolved)
+        return self._complete_frame(image_sub_frame)
+
+    @property
+    def precision(self):
+        """
+
+        :return: floating point precision of the numerics, 'float64' or 'float32'
+        """
+        return self._numerics_subframe.precision
+
     @property
     def coordinates_evaluate(self):
         """
@@ -77,12 +104,12 @@ class NumericsSubFrame(PointSourceRendering):
 
     def _complete_frame(self, image_sub_frame):
         """
-        :param image_sub_frame: 2d numpy array of size of the sub-frame
+        :param image_sub_frame: 2d numpy array of size of the sub-frame (or a stack of them)
         :return: 2d numpy array of size of image with added zeros on their edges
         """
         if self._subframe_calc is True:
-            image = np.zeros((self._nx, self._ny))
-            image[self._x_min_sub:self._x_max_sub + 1, self._y_min_sub:self._y_max_sub + 1] = image_sub_frame
+            image = np.zeros(image_sub_frame.shape[:-2] + (self._nx, self._ny), dtype=image_sub_frame.dtype)
+            image[..., self._x_min_sub:self._x_max_sub + 1, self._y_min_sub:self._y_max_sub + 1] = image_sub_frame
         else:
             image = image_sub_frame
         return image
@@ -27,22 +27,53 @@ class PointSourceRendering(object):
         :param amp: list of amplitudes of point source(s)
         :return: 2d numpy array of size of the image with the point source(s) rendered
         """
+        indexes, values = self.point_source_rendering_sparse(ra_pos, dec_pos, amp)
+        grid1d = np.zeros(self._nx * self._ny)
+        grid1d[indexes] = values
+        return grid1d.reshape(self._nx, self._ny)
+
+    def point_source_rendering_sparse(self, ra_pos, dec_pos, amp):
+        """
+        renders the point source(s) only on their footprint, i.e. the pixels covered by the PSF kernel
+
+        :param ra_pos: list of RA positions of point source(s)
+        :param dec_pos: list of DEC positions of point source(s)
+        :param amp: list of amplitudes of point source(s)
+        :return: 1d array of (unique) indexes of the flattened image (as in util.image2array), 1d array of flux values
+        """
         subgrid = self._supersampling_factor
         x_pos, y_pos = self._pixel_grid.map_coord2pix(ra_pos, dec_pos)
         # translate coordinates to higher resolution grid
         x_pos_subgird = x_pos * subgrid + (subgrid - 1) / 2.
         y_pos_subgrid = y_pos * subgrid + (subgrid - 1) / 2.
         kernel_point_source_subgrid = self._kernel_supersampled
-        # initialize grid with higher resolution
-        subgrid2d = np.zeros((self._nx*subgrid, self._ny*subgrid))
-        # add_layer2image
         if len(x_pos) > len(amp):
             raise ValueError('there are %s images appearing but only %s amplitudes provided!' % (len(x_pos), len(amp)))
+        k_l2 = int((len(kernel_point_source_subgrid) - 1) / 2)
+        # stamps start at multiples of the supersampling factor such that they can be re-sized, and at even
+        # sub-pixels such that the rounding of the positions is the same as on the full grid
+        step = 2 * subgrid
+        index_list, value_list = [], []
         for i in range(len(x_pos)):
-            subgrid2d = image_util.add_layer2image(subgrid2d, x_pos_subgird[i], y_pos_subgrid[i], amp[i] * kernel_point_source_subgrid)
-        # re-size grid to data resolution
-        grid2d = image_util.re_size(subgrid2d, factor=subgrid)
-        return grid2d*subgrid**2
+            x_int = int(round(x_pos_subgird[i]))
+            y_int = int(round(y_pos_subgrid[i]))
+            x_min = (x_int - k_l2) // step * step
+            y_min = (y_int - k_l2) // step * step
+            num = (max(x_int - x_min, y_int - y_min) + k_l2 + 1 + step - 1) // step * step
+            stamp = image_util.add_layer2image(np.zeros((num, num)), x_pos_subgird[i] - x_min,
+                                               y_pos_subgrid[i] - y_min, amp[i] * kernel_point_source_subgrid)
+            # re-size stamp to data resolution
+            stamp = image_util.re_size(stamp, factor=subgrid)
+            row, col = np.meshgrid(np.arange(len(stamp)) + y_min // subgrid, np.arange(len(stamp)) + x_min // subgrid,
+                                   indexing='ij')
+            inside = (row >= 0) & (row < self._nx) & (col >= 0) & (col < self._ny) & (stamp != 0)
+            index_list.append(row[inside] * self._ny + col[inside])
+            value_list.append(stamp[inside])
+        if len(index_list) == 0:
+            return np.zeros(0, dtype=int), np.zeros(0)
+        indexes, inverse = np.unique(np.concatenate(index_list), return_inverse=True)
+        values = np.bincount(inverse, weights=np.concatenate(value_list), minlength=len(indexes))
+        return indexes, values * subgrid**2
 
     @property
     def _kernel_supersampled(self):
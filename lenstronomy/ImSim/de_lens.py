@@ -2,6 +2,7 @@ __author__ = 'sibirrer'
 
 import numpy as np
 import sys
+from scipy import linalg
 
 
 def get_param_WLS(A, C_D_inv, d, inv_bool=True):
@@ -13,31 +14,291 @@ def get_param_WLS(A, C_D_inv, d, inv_bool=True):
     :param inv_bool: boolean, wheter returning also the inverse matrix or just solve the linear system
     :return: 1-d array of parameter values
     """
+    B, M_inv, image, _ = get_param_WLS_cholesky(A, C_D_inv, d, inv_bool=inv_bool)
+    return B, M_inv, image
+
+
+def get_param_WLS_cholesky(A, C_D_inv, d, inv_bool=True):
+    """
+    solves the weighted linear least square problem with a Cholesky factorization of M = A^T C_D^-1 A. The parameters,
+    the inverse matrix and the log determinant of the inverse matrix (for the marginalization) are all derived from
+    the same factorization.
+
+    :param A: response matrix Nd x Ns (Nd = # data points, Ns = # parameters)
+    :param C_D_inv: inverse covariance matrix of the data, Nd x Nd, diagonal form
+    :param d: data array, 1-d Nd
+    :param inv_bool: boolean, wheter returning also the inverse matrix or just solve the linear system
+    :return: 1-d array of parameter values, inverse matrix (or None), 1-d model array,
+     log determinant of the inverse matrix (None if the system is ill-conditioned)
+    """
     M = A.T.dot(np.multiply(C_D_inv, A.T).T)
+    R = A.T.dot(np.multiply(C_D_inv, d))
+    L = cholesky_factor(M)
+    B, M_inv, log_det = _solve_factor(L, R, inv_bool=inv_bool)
+    return B, M_inv, A.dot(B), log_det
+
+
+def cholesky_factor(M):
+    """
+    lower triangular Cholesky factor of a symmetric matrix. The conditioning is estimated from the diagonal of the
+    factor, (max(diag(L)) / min(diag(L)))**2, which is a lower bound of the condition number of M and replaces a full
+    singular value decomposition.
+
+    :param M: symmetric Ns x Ns matrix
+    :return: lower triangular Ns x Ns matrix, or None if M is not positive definite or ill-conditioned
+    """
+    try:
+        L = np.linalg.cholesky(M)
+    except np.linalg.LinAlgError:
+        return None
+    return _check_factor(L)
+
+
+def _solve_factor(L, R, inv_bool=True):
+    """
+
+    :param L: lower Cholesky factor of A^T C_D^-1 A (or None for an ill-conditioned system)
+    :param R: A^T C_D^-1 d, 1-d Ns
+    :param inv_bool: boolean, wheter returning also the inverse matrix or just solve the linear system
+    :return: 1-d array of parameter values, inverse matrix (or None), log determinant of the inverse matrix (or None)
+    """
+    num_param = len(R)
+    if L is None:
+        B = np.zeros(num_param)
+        M_inv = np.zeros((num_param, num_param)) if inv_bool else None
+        return B, M_inv, None
     if inv_bool:
-        if np.linalg.cond(M) < 5/sys.float_info.epsilon:
-            try:
-                M_inv = np.linalg.inv(M)
-            except:
-                M_inv = np.zeros_like(M)
-        else:
-            M_inv = np.zeros_like(M)
-        R = A.T.dot(np.multiply(C_D_inv, d))
+        L_inv = linalg.solve_triangular(L, np.eye(num_param), lower=True)
+        M_inv = L_inv.T.dot(L_inv)
+        M_inv = (M_inv + M_inv.T) / 2
         B = M_inv.dot(R)
     else:
-        if np.linalg.cond(M) < 5/sys.float_info.epsilon:
-            R = A.T.dot(np.multiply(C_D_inv, d))
-            try:
-                B = np.linalg.solve(M, R).T
-            except:
-                B = np.zeros(len(A.T))
-        else:
-            B = np.zeros(len(A.T))
+        B = linalg.cho_solve((L, True), R)
         M_inv = None
-    image = A.dot(B)
+    log_det = -2 * np.sum(np.log(np.diag(L)))
+    return B, M_inv, log_det
+
+
+def normal_equations_sparse(A, A_sparse, C_D_inv, d):
+    """
+    blocks of the normal equations of a response matrix [A, A_sparse] whose trailing columns are only stored on their
+    non-zero footprint. The cost of the sparse blocks scales with the footprint sizes instead of the data size.
+
+    :param A: dense response matrix Nd x Ns
+    :param A_sparse: list of k tuples (indexes, values) of the non-zero entries of the sparse columns on the data array
+    :param C_D_inv: inverse covariance matrix of the data, Nd x Nd, diagonal form
+    :param d: data array, 1-d Nd
+    :return: cross block k x Ns, sparse block k x k and 1-d k array of A_sparse^T C_D^-1 d
+    """
+    num = len(A_sparse)
+    M_cross = np.zeros((num, np.shape(A)[1]))
+    M_sparse = np.zeros((num, num))
+    R_sparse = np.zeros(num)
+    weighted = np.zeros(len(d))
+    for i, (index_i, value_i) in enumerate(A_sparse):
+        weighted_i = C_D_inv[index_i] * value_i
+        M_cross[i] = weighted_i.dot(A[index_i])
+        R_sparse[i] = weighted_i.dot(d[index_i])
+        weighted[index_i] = weighted_i
+        for j in range(i, num):
+            index_j, value_j = A_sparse[j]
+            M_sparse[i, j] = M_sparse[j, i] = weighted[index_j].dot(value_j)
+        weighted[index_i] = 0
+    return M_cross, M_sparse, R_sparse
+
+
+def sparse_dot(A_sparse, B, num_data):
+    """
+
+    :param A_sparse: list of k tuples (indexes, values) of the non-zero entries of the sparse columns on the data array
+    :param B: 1-d array of k coefficients
+    :param num_data: length of the data array
+    :return: 1-d array, sum of the sparse columns weighted by B
+    """
+    image = np.zeros(num_data)
+    for (index, value), b in zip(A_sparse, B):
+        image[index] += value * b
+    return image
+
+
+class CholeskyWLS(object):
+    """
+    weighted linear least square solver that keeps the Cholesky factorization of the leading (fixed) columns of the
+    response matrix between calls. When only the trailing k columns of the response change (e.g. the point source
+    responses of a lens model with fixed extended light components), the fixed block of A^T C_D^-1 A and its factor
+    are re-used and only the rank-k block of the factor is updated. Whether the fixed columns changed is not checked on
+    the arrays but identified by a token provided by the caller (e.g. the parameters they are computed from).
+    """
+    def __init__(self):
+        self._fixed_token = None
+        self._M_fixed = None
+        self._L_fixed = None
+
+    def get_param_WLS(self, A, C_D_inv, d, num_fixed=0, inv_bool=True, fixed_token=None):
+        """
+
+        :param A: response matrix Nd x Ns (Nd = # data points, Ns = # parameters)
+        :param C_D_inv: inverse covariance matrix of the data, Nd x Nd, diagonal form
+        :param d: data array, 1-d Nd
+        :param num_fixed: number of leading columns of A which factorization can be re-used if unchanged
+        :param inv_bool: boolean, wheter returning also the inverse matrix or just solve the linear system
+        :param fixed_token: token identifying the fixed columns of A and C_D_inv. The factorization of the fixed
+         columns is re-used if the token equals the one of the previous call, and re-computed if None.
+        :return: 1-d array of parameter values, inverse matrix (or None), 1-d model array,
+         log determinant of the inverse matrix (None if the system is ill-conditioned)
+        """
+        if num_fixed == 0:
+            return get_param_WLS_cholesky(A, C_D_inv, d, inv_bool=inv_bool)
+        A_fixed, A_update = A[:, :num_fixed], A[:, num_fixed:]
+        M_cross = A_update.T.dot(np.multiply(C_D_inv, A_fixed.T).T)
+        M_update = A_update.T.dot(np.multiply(C_D_inv, A_update.T).T)
+        L = self._factor(A_fixed, C_D_inv, M_cross, M_update, fixed_token)
+        R = A.T.dot(np.multiply(C_D_inv, d))
+        B, M_inv, log_det = _solve_factor(L, R, inv_bool=inv_bool)
+        return B, M_inv, A.dot(B), log_det
+
+    def get_param_WLS_sparse(self, A, A_sparse, C_D_inv, d, inv_bool=True, fixed_token=None):
+        """
+        same as get_param_WLS() with the dense columns A being the fixed ones and the trailing columns only stored on
+        their non-zero footprint (e.g. point source responses).
+
+        :param A: dense response matrix Nd x Ns (Nd = # data points, Ns = # dense parameters)
+        :param A_sparse: list of k tuples (indexes, values) of the non-zero entries of the sparse columns on the data array
+        :param C_D_inv: inverse covariance matrix of the data, Nd x Nd, diagonal form
+        :param d: data array, 1-d Nd
+        :param inv_bool: boolean, wheter returning also the inverse matrix or just solve the linear system
+        :param fixed_token: token identifying A and C_D_inv. The factorization of A is re-used if the token equals the
+         one of the previous call, and re-computed if None.
+        :return: 1-d array of Ns + k parameter values, inverse matrix (or None), 1-d model array,
+         log determinant of the inverse matrix (None if the system is ill-conditioned)
+        """
+        num_fixed = np.shape(A)[1]
+        M_cross, M_update, R_sparse = normal_equations_sparse(A, A_sparse, C_D_inv, d)
+        L = self._factor(A, C_D_inv, M_cross, M_update, fixed_token)
+        R = np.append(A.T.dot(np.multiply(C_D_inv, d)), R_sparse)
+        B, M_inv, log_det = _solve_factor(L, R, inv_bool=inv_bool)
+        image = A.dot(B[:num_fixed]) + sparse_dot(A_sparse, B[num_fixed:], len(d))
+        return B, M_inv, image, log_det
+
+    def _factor(self, A_fixed, C_D_inv, M_cross, M_update, fixed_token=None):
+        """
+        Cholesky factor of the full normal matrix, re-using the factor of the fixed block if unchanged
+
+        :param A_fixed: fixed columns of the response matrix
+        :param C_D_inv: inverse covariance matrix of the data, diagonal form
+        :param M_cross: block of the normal matrix between the updated and the fixed columns
+        :param M_update: block of the normal matrix of the updated columns
+        :param fixed_token: token identifying A_fixed and C_D_inv (or None)
+        :return: lower triangular Cholesky factor or None if the system is ill-conditioned
+        """
+        num_fixed = np.shape(A_fixed)[1]
+        if num_fixed == 0:
+            return cholesky_factor(M_update)
+        if not self._cached(num_fixed, fixed_token):
+            self._M_fixed = A_fixed.T.dot(np.multiply(C_D_inv, A_fixed.T).T)
+            self._L_fixed = cholesky_factor(self._M_fixed)
+            self._fixed_token = fixed_token
+        if self._L_fixed is None or len(M_update) == 0:
+            return self._L_fixed
+        # block update of the factor: L_cross = M_cross L_fixed^-T, L_update L_update^T = M_update - L_cross L_cross^T
+        L_cross = linalg.solve_triangular(self._L_fixed, M_cross.T, lower=True).T
+        L_update = cholesky_factor(M_update - L_cross.dot(L_cross.T))
+        if L_update is None:
+            return None
+        L = np.block([[self._L_fixed, np.zeros((num_fixed, len(L_update)))], [L_cross, L_update]])
+        return _check_factor(L)
+
+    def _cached(self, num_fixed, fixed_token):
+        """
+
+        :param num_fixed: number of fixed columns of the response matrix
+        :param fixed_token: token identifying the fixed columns and the inverse covariance matrix (or None)
+        :return: bool, True if the factorization of the fixed columns can be re-used
+        """
+        if fixed_token is None or self._M_fixed is None or len(self._M_fixed) != num_fixed:
+            return False
+        return fixed_token == self._fixed_token
+
+
+def _check_factor(L):
+    """
+
+    :param L: lower triangular Cholesky factor
+    :return: L or None if the factored matrix is ill-conditioned (estimated from the diagonal of L)
+    """
+    diag = np.diag(L)
+    if len(diag) > 0 and not (np.min(diag) > 0 and (np.max(diag) / np.min(diag)) ** 2 < 5 / sys.float_info.epsilon):
+        return None
+    return L
+
+
+def get_param_WLS_batch(A, C_D_inv, d, inv_bool=True):
+    """
+    solves N independent weighted linear least square problems of identical dimensions at once.
+    The result for each problem is identical to the one of get_param_WLS()
+
+    :param A: stack of response matrices N x Nd x Ns (Nd = # data points, Ns = # parameters)
+    :param C_D_inv: stack of inverse covariance matrices of the data, N x Nd, diagonal form
+    :param d: data array, 1-d Nd (shared by all problems) or N x Nd
+    :param inv_bool: boolean, wheter returning also the inverse matrices or just solve the linear systems
+    :return: N x Ns array of parameter values, N x Ns x Ns inverse matrices (or None), N x Nd model arrays
+    """
+    B, M_inv, image, _ = get_param_WLS_cholesky_batch(A, C_D_inv, d, inv_bool=inv_bool)
     return B, M_inv, image
 
 
+def get_param_WLS_cholesky_batch(A, C_D_inv, d, inv_bool=True):
+    """
+    batched version of get_param_WLS_cholesky(), solving N independent weighted linear least square problems of
+    identical dimensions at once
+
+    :param A: stack of response matrices N x Nd x Ns (Nd = # data points, Ns = # parameters)
+    :param C_D_inv: stack of inverse covariance matrices of the data, N x Nd, diagonal form
+    :param d: data array, 1-d Nd (shared by all problems) or N x Nd
+    :param inv_bool: boolean, wheter returning also the inverse matrices or just solve the linear systems
+    :return: N x Ns array of parameter values, N x Ns x Ns inverse matrices (or None), N x Nd model arrays,
+     list of length N of the log determinants of the inverse matrices (None for the ill-conditioned systems)
+    """
+    A = np.asarray(A)
+    C_D_inv = np.asarray(C_D_inv)
+    num, num_data, num_param = A.shape
+    d = np.broadcast_to(d, (num, num_data))
+    A_T = np.swapaxes(A, 1, 2)
+    M = np.matmul(A_T, C_D_inv[:, :, np.newaxis] * A)
+    R = np.matmul(A_T, (C_D_inv * d)[:, :, np.newaxis])[:, :, 0]
+    L = np.zeros_like(M)
+    stable = np.zeros(num, dtype=bool)
+    try:
+        L[:] = np.linalg.cholesky(M)
+        stable[:] = True
+    except np.linalg.LinAlgError:
+        # at least one matrix in the stack is not positive definite, fall back to treat them one by one
+        for i in range(num):
+            L_i = cholesky_factor(M[i])
+            if L_i is not None:
+                L[i], stable[i] = L_i, True
+    diag = np.diagonal(L, axis1=1, axis2=2)
+    if num_param > 0:
+        stable &= np.min(diag, axis=1) > 0
+        stable[stable] &= (np.max(diag[stable], axis=1) / np.min(diag[stable], axis=1)) ** 2 < 5 / sys.float_info.epsilon
+    B = np.zeros((num, num_param))
+    L_inv = np.zeros_like(M)
+    L_inv[stable] = np.linalg.solve(L[stable], np.broadcast_to(np.eye(num_param), M[stable].shape))
+    if inv_bool:
+        M_inv = np.matmul(np.swapaxes(L_inv, 1, 2), L_inv)
+        M_inv = (M_inv + np.swapaxes(M_inv, 1, 2)) / 2
+        B = np.matmul(M_inv, R[:, :, np.newaxis])[:, :, 0]
+    else:
+        y = np.matmul(L_inv, R[:, :, np.newaxis])
+        B = np.matmul(np.swapaxes(L_inv, 1, 2), y)[:, :, 0]
+        M_inv = None
+    image = np.matmul(A, B[:, :, np.newaxis])[:, :, 0]
+    log_det = [None] * num
+    for i in np.where(stable)[0]:
+        log_det[i] = -2 * np.sum(np.log(diag[i]))
+    return B, M_inv, image, log_det
+
+
 def marginalisation_const(M_inv):
     """
     get marginalisation constant 1/2 log(M_beta) for flat priors
@@ -51,16 +312,24 @@ def marginalisation_const(M_inv):
     return sign * log_det/2
 
 
-def marginalization_new(M_inv, d_prior=None):
+def marginalization_new(M_inv, d_prior=None, log_det=None):
     """
 
     :param M_inv: 2D covariance matrix
     :param d_prior: maximum prior length of linear parameters
+    :param log_det: log determinant of M_inv if already known (e.g. from get_param_WLS_cholesky()), only used for
+     d_prior=None
     :return: log determinant with eigenvalues to be smaller or equal d_prior
     """
     if d_prior is None:
+        if log_det is not None:
+            return log_det / 2
         return marginalisation_const(M_inv)
-    v, w = np.linalg.eig(M_inv)
+    if np.array_equal(M_inv, np.transpose(M_inv)):
+        # covariance matrices are symmetric, which allows for the cheaper symmetric eigenvalue solver
+        v = np.linalg.eigvalsh(M_inv)
+    else:
+        v = np.linalg.eigvals(M_inv)
     sign_v = np.sign(v)
     v_abs = np.abs(v)
 
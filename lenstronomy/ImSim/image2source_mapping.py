@@ -112,6 +112,9 @@ class Image2SourceMapping(object):
         :return: surface brightness of all joint light components at image position (x, y)
         """
         if self._multi_source_plane is False:
+            if self._multi_lens_plane is False:
+                return self._lensModel.lens_model.ray_shooting_surface_brightness(x, y, kwargs_lens, self._lightModel,
+                                                                                  kwargs_source, k=k)
             x_source, y_source = self._lensModel.ray_shooting(x, y, kwargs_lens)
             return self._lightModel.surface_brightness(x_source, y_source, kwargs_source, k=k)
         else:
@@ -28,6 +28,9 @@ class ImageLinearFit(ImageModel):
             likelihood_mask = np.ones_like(data_class.data)
         self.likelihood_mask = np.array(likelihood_mask, dtype=bool)
         self._mask1d = util.image2array(self.likelihood_mask)
+        # position in the data response of each pixel of the flattened image (-1 for masked pixels)
+        self._data_index = -np.ones(len(self._mask1d), dtype=int)
+        self._data_index[self._mask1d] = np.arange(np.sum(self._mask1d))
         #kwargs_numerics['compute_indexes'] = self.likelihood_mask  # here we overwrite the indexes to be computed with the likelihood mask
         super(ImageLinearFit, self).__init__(data_class, psf_class=psf_class, lens_model_class=lens_model_class,
                                              source_model_class=source_model_class,
@@ -36,6 +39,8 @@ class ImageLinearFit(ImageModel):
         if psf_error_map_bool_list is None:
             psf_error_map_bool_list = [True] * len(self.PointSource.point_source_type_list)
         self._psf_error_map_bool_list = psf_error_map_bool_list
+        # keeps the Cholesky factor of the extended light responses for calls where only the point sources change
+        self._linear_solver = de_lens.CholeskyWLS()
 
     def image_linear_solve(self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None, kwargs_ps=None,
                            kwargs_extinction=None, kwargs_special=None, inv_bool=False):
@@ -68,13 +73,53 @@ class ImageLinearFit(ImageModel):
         :param inv_bool: if True, invert the full linear solver Matrix Ax = y for the purpose of the covariance matrix.
         :return: 1d array of surface brightness pixels of the optimal solution of the linear parameters to match the data
         """
-        A = self._linear_response_matrix(kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_extinction, kwargs_special)
+        model, model_error, cov_param, param, _ = self._image_linear_solve_log_det(kwargs_lens, kwargs_source,
+                                                                                   kwargs_lens_light, kwargs_ps,
+                                                                                   kwargs_extinction, kwargs_special,
+                                                                                   inv_bool=inv_bool)
+        return model, model_error, cov_param, param
+
+    def _image_linear_solve_log_det(self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None, kwargs_ps=None,
+                                    kwargs_extinction=None, kwargs_special=None, inv_bool=False):
+        """
+        same as _image_linear_solve() but also returns the log determinant of the covariance matrix of the linear
+        parameters, computed from the same Cholesky factorization as the linear solution.
+
+        :return: model image, model error, covariance matrix (or None), linear parameters,
+         log determinant of the covariance matrix (None if ill-conditioned)
+        """
+        flux_list, ra_pos, dec_pos, amp, n_points = self._linear_response_flux(kwargs_lens, kwargs_source,
+                                                                               kwargs_lens_light, kwargs_ps,
+                                                                               kwargs_extinction, kwargs_special)
+        A_light = np.nan_to_num(self._linear_response_convolve(flux_list))
+        # the point source responses are only stored and processed on their footprint
+        A_ps_sparse = self._linear_response_point_source_sparse(ra_pos, dec_pos, amp, n_points)
         C_D_response, model_error = self._error_response(kwargs_lens, kwargs_ps, kwargs_special=kwargs_special)
         d = self.data_response
-        param, cov_param, wls_model = de_lens.get_param_WLS(A.T, 1 / C_D_response, d, inv_bool=inv_bool)
+        fixed_token = self._linear_solver_token(kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps,
+                                                kwargs_extinction, kwargs_special)
+        param, cov_param, wls_model, log_det = self._linear_solver.get_param_WLS_sparse(A_light.T, A_ps_sparse,
+                                                                                       1 / C_D_response, d,
+                                                                                       inv_bool=inv_bool,
+                                                                                       fixed_token=fixed_token)
         _, _, _, _ = self.update_linear_kwargs(param, kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps)
         model = self.array_masked2image(wls_model)
-        return model, model_error, cov_param, param
+        return model, model_error, cov_param, param, log_det
+
+    def _linear_solver_token(self, kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_extinction,
+                             kwargs_special):
+        """
+        token identifying the extended light responses and the data covariance of the linear inversion, such that their
+        Cholesky factorization is re-used when only the point sources change (see de_lens.CholeskyWLS)
+
+        :return: tuple of the data and PSF instances and of the non-linear parameters the responses and the covariance
+         are computed from
+        """
+        # the PSF error map adds the point sources to the covariance of the data
+        kwargs_ps_token = _kwargs_token(kwargs_ps) if self._psf_error_map is True else None
+        return (self.Data, self.PSF, _kwargs_token(kwargs_lens), _kwargs_token(kwargs_source, linear_keys=['amp']),
+                _kwargs_token(kwargs_lens_light, linear_keys=['amp']), _kwargs_token(kwargs_extinction),
+                _kwargs_token(kwargs_special), kwargs_ps_token)
 
     def linear_response_matrix(self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None, kwargs_ps=None,
                                kwargs_extinction=None, kwargs_special=None):
@@ -150,16 +195,128 @@ class ImageLinearFit(ImageModel):
         :return: log likelihood (natural logarithm)
         """
         # generate image
-        im_sim, model_error, cov_matrix, param = self._image_linear_solve(kwargs_lens, kwargs_source, kwargs_lens_light,
-                                                                          kwargs_ps, kwargs_extinction, kwargs_special,
-                                                                          inv_bool=source_marg)
+        im_sim, model_error, cov_matrix, param, log_det = self._image_linear_solve_log_det(kwargs_lens, kwargs_source,
+                                                                                           kwargs_lens_light, kwargs_ps,
+                                                                                           kwargs_extinction,
+                                                                                           kwargs_special,
+                                                                                           inv_bool=source_marg)
         # compute X^2
         logL = self.Data.log_likelihood(im_sim, self.likelihood_mask, model_error)
         if cov_matrix is not None and source_marg:
-            marg_const = de_lens.marginalization_new(cov_matrix, d_prior=linear_prior)
+            marg_const = de_lens.marginalization_new(cov_matrix, d_prior=linear_prior, log_det=log_det)
             logL += marg_const
         return logL
 
+    def likelihood_data_given_model_batch(self, kwargs_lens_list=None, kwargs_source_list=None,
+                                          kwargs_lens_light_list=None, kwargs_ps_list=None,
+                                          kwargs_extinction_list=None, kwargs_special_list=None, source_marg=False,
+                                          linear_prior=None, point_source_cache_list=None):
+        """
+        computes the likelihood of the data for a batch of N non-linear parameter sets (e.g. all particles of a PSO
+        iteration). The unconvolved responses of all parameter sets are convolved together and the N weighted linear
+        least square problems are solved in stacked form. The result is identical to N calls of
+        likelihood_data_given_model().
+
+        :param kwargs_lens_list: list of length N of kwargs_lens lists (or None)
+        :param kwargs_source_list: list of length N of kwargs_source lists (or None)
+        :param kwargs_lens_light_list: list of length N of kwargs_lens_light lists (or None)
+        :param kwargs_ps_list: list of length N of kwargs_ps lists (or None)
+        :param kwargs_extinction_list: list of length N of kwargs_extinction lists (or None)
+        :param kwargs_special_list: list of length N of kwargs_special dictionaries (or None)
+        :param source_marg: bool, performs a marginalization over the linear parameters
+        :param linear_prior: linear prior width in eigenvalues
+        :param point_source_cache_list: list of length N of point source positions already solved for the parameter
+         sets (see PointSource.lens_model_cache()) or None
+        :return: 1d numpy array of length N of log likelihoods (natural logarithm)
+        """
+        model_list, model_error_list, cov_param_list, _, log_det_list = self._image_linear_solve_batch(
+            kwargs_lens_list, kwargs_source_list, kwargs_lens_light_list, kwargs_ps_list, kwargs_extinction_list,
+            kwargs_special_list, inv_bool=source_marg, point_source_cache_list=point_source_cache_list)
+        logL = np.zeros(len(model_list))
+        for i, im_sim in enumerate(model_list):
+            logL[i] = self.Data.log_likelihood(im_sim, self.likelihood_mask, model_error_list[i])
+            if cov_param_list[i] is not None and source_marg:
+                logL[i] += de_lens.marginalization_new(cov_param_list[i], d_prior=linear_prior,
+                                                       log_det=log_det_list[i])
+        return logL
+
+    def _image_linear_solve_batch(self, kwargs_lens_list=None, kwargs_source_list=None, kwargs_lens_light_list=None,
+                                  kwargs_ps_list=None, kwargs_extinction_list=None, kwargs_special_list=None,
+                                  inv_bool=False, point_source_cache_list=None):
+        """
+        batched version of _image_linear_solve() for N parameter sets. Parameter sets with the same number of linear
+        parameters are solved together with de_lens.get_param_WLS_batch(). The point source positions of each parameter
+        set are solved once (when saving the point source cache) and re-used when updating the linear parameters.
+
+        :param kwargs_lens_list: list of length N of kwargs_lens lists (or None)
+        :param kwargs_source_list: list of length N of kwargs_source lists (or None)
+        :param kwargs_lens_light_list: list of length N of kwargs_lens_light lists (or None)
+        :param kwargs_ps_list: list of length N of kwargs_ps lists (or None)
+        :param kwargs_extinction_list: list of length N of kwargs_extinction lists (or None)
+        :param kwargs_special_list: list of length N of kwargs_special dictionaries (or None)
+        :param inv_bool: if True, invert the full linear solver Matrix Ax = y for the purpose of the covariance matrix.
+        :param point_source_cache_list: list of length N of point source positions already solved for the parameter
+         sets (see PointSource.lens_model_cache()) or None
+        :return: lists of length N of model images, error maps, covariance matrices, linear parameters and log
+         determinants of the covariance matrices (None for ill-conditioned systems)
+        """
+        kwargs_batch = [kwargs_lens_list, kwargs_source_list, kwargs_lens_light_list, kwargs_ps_list,
+                        kwargs_extinction_list, kwargs_special_list]
+        num = max([len(kwargs) for kwargs in kwargs_batch if kwargs is not None] + [0])
+        kwargs_batch = [[None] * num if kwargs is None else kwargs for kwargs in kwargs_batch]
+        kwargs_lens_list, kwargs_source_list, kwargs_lens_light_list, kwargs_ps_list, kwargs_extinction_list, \
+            kwargs_special_list = kwargs_batch
+
+        # the point source cache only refers to a single parameter set and is reset for each of them
+        flux_all, n_flux_list, A_ps_list, C_D_response_list, model_error_list = [], [], [], [], []
+        ps_cache_list = []
+        for i in range(num):
+            if point_source_cache_list is None:
+                self.PointSource.delete_lens_model_cache()
+            else:
+                self.PointSource.set_lens_model_cache(point_source_cache_list[i])
+            flux_list, ra_pos, dec_pos, amp, n_points = self._linear_response_flux(
+                kwargs_lens_list[i], kwargs_source_list[i], kwargs_lens_light_list[i], kwargs_ps_list[i],
+                kwargs_extinction_list[i], kwargs_special_list[i])
+            flux_all += flux_list
+            n_flux_list.append(len(flux_list))
+            A_ps_list.append(self._linear_response_point_source(ra_pos, dec_pos, amp, n_points))
+            C_D_response, model_error = self._error_response(kwargs_lens_list[i], kwargs_ps_list[i],
+                                                             kwargs_special=kwargs_special_list[i])
+            C_D_response_list.append(C_D_response)
+            model_error_list.append(model_error)
+            ps_cache_list.append(self.PointSource.lens_model_cache())
+
+        # all extended responses of all parameter sets are convolved in one go
+        A_light_all = self._linear_response_convolve(flux_all)
+        A_list = []
+        n = 0
+        for i in range(num):
+            A = np.append(A_light_all[n:n + n_flux_list[i]], A_ps_list[i], axis=0)
+            n += n_flux_list[i]
+            A_list.append(np.nan_to_num(A))
+
+        # parameter sets with an identical number of linear parameters are solved together
+        d = self.data_response
+        param_list, cov_param_list, model_list, log_det_list = [None] * num, [None] * num, [None] * num, [None] * num
+        num_param_list = np.array([len(A) for A in A_list], dtype=int)
+        for num_param in np.unique(num_param_list):
+            index = np.where(num_param_list == num_param)[0]
+            A_stack = np.array([A_list[i].T for i in index])
+            C_D_inv_stack = 1. / np.array([C_D_response_list[i] for i in index])
+            param, cov_param, wls_model, log_det = de_lens.get_param_WLS_cholesky_batch(A_stack, C_D_inv_stack, d,
+                                                                                        inv_bool=inv_bool)
+            for j, i in enumerate(index):
+                param_list[i] = param[j]
+                log_det_list[i] = log_det[j]
+                cov_param_list[i] = cov_param[j] if cov_param is not None else None
+                model_list[i] = self.array_masked2image(wls_model[j])
+        for i in range(num):
+            self.PointSource.set_lens_model_cache(ps_cache_list[i])
+            self.update_linear_kwargs(param_list[i], kwargs_lens_list[i], kwargs_source_list[i],
+                                      kwargs_lens_light_list[i], kwargs_ps_list[i])
+        return model_list, model_error_list, cov_param_list, param_list, log_det_list
+
     def num_param_linear(self, kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps):
         """
 
@@ -191,38 +348,90 @@ class ImageLinearFit(ImageModel):
         :param unconvolved:
         :return:
         """
+        flux_list, ra_pos, dec_pos, amp, n_points = self._linear_response_flux(kwargs_lens, kwargs_source,
+                                                                               kwargs_lens_light, kwargs_ps,
+                                                                               kwargs_extinction, kwargs_special)
+        A_light = self._linear_response_convolve(flux_list, unconvolved=unconvolved)
+        A_ps = self._linear_response_point_source(ra_pos, dec_pos, amp, n_points)
+        A = np.append(A_light, A_ps, axis=0)
+        return np.nan_to_num(A)
+
+    def _linear_response_flux(self, kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps,
+                              kwargs_extinction=None, kwargs_special=None):
+        """
+        computes the un-convolved responses of the extended linear basis components on the coordinates_evaluate grid
+        and the point source positions and amplitudes of the point source linear basis components
+
+        :param kwargs_lens:
+        :param kwargs_source:
+        :param kwargs_lens_light:
+        :param kwargs_ps:
+        :return: list of 1d arrays of surface brightness responses (source first, then lens light),
+         point source positions, amplitudes and number of point source components
+        """
         x_grid, y_grid = self.ImageNumerics.coordinates_evaluate
         source_light_response, n_source = self.source_mapping.image_flux_split(x_grid, y_grid, kwargs_lens,
                                                                                kwargs_source)
         extinction = self._extinction.extinction(x_grid, y_grid, kwargs_extinction=kwargs_extinction,
                                                  kwargs_special=kwargs_special)
         lens_light_response, n_lens_light = self.LensLightModel.functions_split(x_grid, y_grid, kwargs_lens_light)
-
         ra_pos, dec_pos, amp, n_points = self.point_source_linear_response_set(kwargs_ps, kwargs_lens, kwargs_special, with_amp=False)
-        num_param = n_points + n_lens_light + n_source
-
-        num_response = self.num_data_evaluate
-        A = np.zeros((num_param, num_response))
-        n = 0
+        flux_list = []
         # response of sersic source profile
         for i in range(0, n_source):
-            image = source_light_response[i]
-            image *= extinction
-            image = self.ImageNumerics.re_size_convolve(image, unconvolved=unconvolved)
-            A[n, :] = self.image2array_masked(image)
-            n += 1
+            flux_list.append(source_light_response[i] * extinction)
         # response of lens light profile
         for i in range(0, n_lens_light):
-            image = lens_light_response[i]
-            image = self.ImageNumerics.re_size_convolve(image, unconvolved=unconvolved)
-            A[n, :] = self.image2array_masked(image)
-            n += 1
-        # response of point sources
+            flux_list.append(lens_light_response[i])
+        return flux_list, ra_pos, dec_pos, amp, n_points
+
+    def _linear_response_convolve(self, flux_list, unconvolved=False):
+        """
+        convolves the un-convolved responses of the linear basis components and applies the likelihood mask
+
+        :param flux_list: list of 1d arrays of surface brightness responses on the coordinates_evaluate grid
+        :param unconvolved: bool, if True, does not apply the PSF convolution
+        :return: 2d array (len(flux_list), num_data_evaluate) of responses
+        """
+        if len(flux_list) == 0:
+            return np.zeros((0, self.num_data_evaluate))
+        images = self.ImageNumerics.re_size_convolve_many(np.array(flux_list), unconvolved=unconvolved)
+        # the linear inversion is always performed in double precision (also with kwargs_numerics precision='float32')
+        A = images.reshape(len(flux_list), -1)[:, self._mask1d].astype(float)
+        return A
+
+    def _linear_response_point_source(self, ra_pos, dec_pos, amp, n_points):
+        """
+
+        :param ra_pos: list of RA positions of the point source components
+        :param dec_pos: list of DEC positions of the point source components
+        :param amp: list of amplitudes of the point source components
+        :param n_points: number of point source components
+        :return: 2d array (n_points, num_data_evaluate) of responses
+        """
+        A = np.zeros((n_points, self.num_data_evaluate))
+        A_sparse = self._linear_response_point_source_sparse(ra_pos, dec_pos, amp, n_points)
+        for i, (index, value) in enumerate(A_sparse):
+            A[i, index] = value
+        return A
+
+    def _linear_response_point_source_sparse(self, ra_pos, dec_pos, amp, n_points):
+        """
+        point source responses on the data response restricted to their footprint
+
+        :param ra_pos: list of RA positions of the point source components
+        :param dec_pos: list of DEC positions of the point source components
+        :param amp: list of amplitudes of the point source components
+        :param n_points: number of point source components
+        :return: list of n_points tuples (indexes, values) of the non-zero entries of the responses on the data response
+        """
+        A_sparse = []
         for i in range(0, n_points):
-            image = self.ImageNumerics.point_source_rendering(ra_pos[i], dec_pos[i], amp[i])
-            A[n, :] = self.image2array_masked(image)
-            n += 1
-        return np.nan_to_num(A)
+            index, value = self.ImageNumerics.point_source_rendering_sparse(ra_pos[i], dec_pos[i], amp[i])
+            index = self._data_index[index]
+            inside = index >= 0
+            A_sparse.append((index[inside], np.nan_to_num(value[inside])))
+        return A_sparse
 
     def update_linear_kwargs(self, param, kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps):
         """
@@ -376,3 +585,20 @@ class ImageLinearFit(ImageModel):
                         dec_pos[i][j] = dec_pos[i][j] + delta_y[k]
                         k += 1
         return ra_pos, dec_pos, amp, n_points
+
+
+def _kwargs_token(kwargs, linear_keys=()):
+    """
+    comparable copy of keyword arguments
+
+    :param kwargs: list of dictionaries, dictionary, numpy array, number or None
+    :param linear_keys: keys of the dictionaries that are excluded (e.g. the linear amplitudes solved for)
+    :return: nested tuple
+    """
+    if isinstance(kwargs, dict):
+        return tuple((key, _kwargs_token(kwargs[key])) for key in sorted(kwargs) if key not in linear_keys)
+    if isinstance(kwargs, (list, tuple)):
+        return tuple(_kwargs_token(value, linear_keys) for value in kwargs)
+    if isinstance(kwargs, np.ndarray):
+        return kwargs.shape, kwargs.dtype.str, kwargs.tobytes()
+    return kwargs
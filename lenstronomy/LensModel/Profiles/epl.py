@@ -0,0 +1,260 @@
+import numpy as np
+import lenstronomy.Util.param_util as param_util
+from lenstronomy.LensModel.Profiles.base_profile import LensProfileBase
+from lenstronomy.LensModel.Profiles.spemd_smooth import SPEMD_SMOOTH
+from lenstronomy.LensModel.Profiles.spp import SPP
+
+
+class EPL(LensProfileBase):
+    """
+    elliptical power-law mass profile (same parameterization as the SPEMD profile) computed with the hypergeometric
+    series of Tessore & Metcalf (2015), https://arxiv.org/abs/1507.01819
+
+    The convergence is given by
+
+    kappa(x, y) = (3 - gamma) / 2 * [theta_E / sqrt(q x^2 + y^2 / q)]^(gamma - 1)
+
+    in the frame aligned with the major axis. The deflection angles, the potential and the Hessian are computed in
+    closed form up to the truncation of the series, which converges geometrically with (1 - q) / (1 + q).
+    """
+    param_names = ['theta_E', 'gamma', 'e1', 'e2', 'center_x', 'center_y']
+    lower_limit_default = {'theta_E': 0, 'gamma': 1.5, 'e1': -0.5, 'e2': -0.5, 'center_x': -100, 'center_y': -100}
+    upper_limit_default = {'theta_E': 100, 'gamma': 2.5, 'e1': 0.5, 'e2': 0.5, 'center_x': 100, 'center_y': 100}
+
+    def __init__(self, series_tolerance=1e-10, num_iter_max=500):
+        """
+
+        :param series_tolerance: relative truncation error of the hypergeometric series
+        :param num_iter_max: maximal number of terms of the series (limits the cost for very elongated profiles)
+        """
+        self.epl_major_axis = EPLMajorAxis(series_tolerance=series_tolerance, num_iter_max=num_iter_max)
+        self.spp = SPP()
+        super(EPL, self).__init__()
+
+    def param_conv(self, theta_E, gamma, e1, e2):
+        """
+        converts the lenstronomy parameters into the parameters of the profile in the major axis frame
+
+        :param theta_E: Einstein radius (angle), same definition as in the SPEMD profile
+        :param gamma: logarithmic slope of the power-law profile. gamma=2 corresponds to isothermal
+        :param e1: eccentricity component
+        :param e2: eccentricity component
+        :return: scale b, slope t = gamma - 1, axis ratio q, orientation angle phi_G
+        """
+        phi_G, q = param_util.ellipticity2phi_q(e1, e2)
+        theta_E, gamma, q, phi_G, _ = SPEMD_SMOOTH._parameter_constraints(theta_E, gamma, q, phi_G, s_scale=0)
+        b = theta_E * np.sqrt(q)
+        t = gamma - 1
+        return b, t, q, phi_G
+
+    def function(self, x, y, theta_E, gamma, e1, e2, center_x=0, center_y=0):
+        """
+
+        :param x: x-coordinate (angle)
+        :param y: y-coordinate (angle)
+        :param theta_E: Einstein radius (angle), pay attention to specific definition!
+        :param gamma: logarithmic slope of the power-law profile. gamma=2 corresponds to isothermal
+        :param e1: eccentricity component
+        :param e2: eccentricity component
+        :param center_x: x-position of lens center
+        :param center_y: y-position of lens center
+        :return: lensing potential
+        """
+        b, t, q, phi_G = self.param_conv(theta_E, gamma, e1, e2)
+        x__, y__ = self._rotate(x - center_x, y - center_y, phi_G)
+        return self.epl_major_axis.function(x__, y__, b, t, q)
+
+    def derivatives(self, x, y, theta_E, gamma, e1, e2, center_x=0, center_y=0):
+        """
+
+        :param x: x-coordinate (angle)
+        :param y: y-coordinate (angle)
+        :param theta_E: Einstein radius (angle), pay attention to specific definition!
+        :param gamma: logarithmic slope of the power-law profile. gamma=2 corresponds to isothermal
+        :param e1: eccentricity component
+        :param e2: eccentricity component
+        :param center_x: x-position of lens center
+        :param center_y: y-position of lens center
+        :return: deflection angles alpha_x, alpha_y
+        """
+        b, t, q, phi_G = self.param_conv(theta_E, gamma, e1, e2)
+        x__, y__ = self._rotate(x - center_x, y - center_y, phi_G)
+        f__x, f__y = self.epl_major_axis.derivatives(x__, y__, b, t, q)
+        return self._rotate(f__x, f__y, -phi_G)
+
+    def hessian(self, x, y, theta_E, gamma, e1, e2, center_x=0, center_y=0):
+        """
+
+        :param x: x-coordinate (angle)
+        :param y: y-coordinate (angle)
+        :param theta_E: Einstein radius (angle), pay attention to specific definition!
+        :param gamma: logarithmic slope of the power-law profile. gamma=2 corresponds to isothermal
+        :param e1: eccentricity component
+        :param e2: eccentricity component
+        :param center_x: x-position of lens center
+        :param center_y: y-position of lens center
+        :return: Hessian components f_xx, f_yy, f_xy
+        """
+        b, t, q, phi_G = self.param_conv(theta_E, gamma, e1, e2)
+        x__, y__ = self._rotate(x - center_x, y - center_y, phi_G)
+        f__xx, f__yy, f__xy = self.epl_major_axis.hessian(x__, y__, b, t, q)
+        # rotate back
+        kappa = 1. / 2 * (f__xx + f__yy)
+        gamma1__ = 1. / 2 * (f__xx - f__yy)
+        gamma2__ = f__xy
+        gamma1 = np.cos(2 * phi_G) * gamma1__ - np.sin(2 * phi_G) * gamma2__
+        gamma2 = +np.sin(2 * phi_G) * gamma1__ + np.cos(2 * phi_G) * gamma2__
+        f_xx = kappa + gamma1
+        f_yy = kappa - gamma1
+        f_xy = gamma2
+        return f_xx, f_yy, f_xy
+
+    @staticmethod
+    def _rotate(x, y, phi_G):
+        """
+
+        :param x: x-coordinate
+        :param y: y-coordinate
+        :param phi_G: rotation angle
+        :return: coordinates rotated by phi_G
+        """
+        cos_phi = np.cos(phi_G)
+        sin_phi = np.sin(phi_G)
+        return cos_phi * x + sin_phi * y, -sin_phi * x + cos_phi * y
+
+    def mass_3d_lens(self, r, theta_E, gamma, e1=None, e2=None):
+        """
+        computes the spherical power-law mass enclosed (with SPP routine)
+
+        :param r: radius within the mass is computed
+        :param theta_E: Einstein radius
+        :param gamma: power-law slope
+        :param e1: eccentricity component (not used)
+        :param e2: eccentricity component (not used)
+        :return: mass enclosed a 3D radius r
+        """
+        return self.spp.mass_3d_lens(r, theta_E, gamma)
+
+    def density_lens(self, r, theta_E, gamma, e1=None, e2=None):
+        """
+        computes the density at 3d radius r given lens model parameterization.
+        The integral in the LOS projection of this quantity results in the convergence quantity.
+
+        :param r: radius within the mass is computed
+        :param theta_E: Einstein radius
+        :param gamma: power-law slope
+        :param e1: eccentricity component (not used)
+        :param e2: eccentricity component (not used)
+        :return: mass enclosed a 3D radius r
+        """
+        return self.spp.density_lens(r, theta_E, gamma)
+
+
+class EPLMajorAxis(LensProfileBase):
+    """
+    elliptical power-law profile aligned with the x-axis in the parameterization of Tessore & Metcalf (2015):
+
+    kappa(x, y) = (2 - t) / 2 * (b / R)^t, R = sqrt(q^2 x^2 + y^2)
+    """
+    param_names = ['b', 't', 'q', 'center_x', 'center_y']
+
+    def __init__(self, series_tolerance=1e-10, num_iter_max=500):
+        """
+
+        :param series_tolerance: relative truncation error of the hypergeometric series
+        :param num_iter_max: maximal number of terms of the series
+        """
+        self._series_tolerance = series_tolerance
+        self._num_iter_max = num_iter_max
+        super(EPLMajorAxis, self).__init__()
+
+    def function(self, x, y, b, t, q):
+        """
+
+        :param x: x-coordinate along the major axis
+        :param y: y-coordinate along the minor axis
+        :param b: scale radius
+        :param t: slope of the convergence (gamma - 1)
+        :param q: axis ratio
+        :return: lensing potential
+        """
+        alpha_x, alpha_y = self.derivatives(x, y, b, t, q)
+        return np.array((x * alpha_x + y * alpha_y) / (2 - t))
+
+    def derivatives(self, x, y, b, t, q):
+        """
+        deflection angles, equation (13) in Tessore & Metcalf (2015)
+
+        :param x: x-coordinate along the major axis
+        :param y: y-coordinate along the minor axis
+        :param b: scale radius
+        :param t: slope of the convergence (gamma - 1)
+        :param q: axis ratio
+        :return: deflection angles alpha_x, alpha_y
+        """
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+        R = np.sqrt((q * x) ** 2 + y ** 2)
+        phi = np.arctan2(y, q * x)
+        alpha = 2 * b ** t / (1 + q) * np.maximum(R, 0.000000001) ** (1 - t) * self._omega(phi, t, q)
+        # the deflection at the center is set to zero by symmetry
+        alpha = np.where(R > 0, alpha, 0)
+        return alpha.real, alpha.imag
+
+    def hessian(self, x, y, b, t, q):
+        """
+        Hessian matrix, equation (14)-(15) in Tessore & Metcalf (2015)
+
+        :param x: x-coordinate along the major axis
+        :param y: y-coordinate along the minor axis
+        :param b: scale radius
+        :param t: slope of the convergence (gamma - 1)
+        :param q: axis ratio
+        :return: f_xx, f_yy, f_xy
+        """
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+        R = np.maximum(np.sqrt((q * x) ** 2 + y ** 2), 0.000000001)
+        r = np.maximum(np.sqrt(x ** 2 + y ** 2), 0.000000001)
+        cos, sin = x / r, y / r
+        cos2, sin2 = cos * cos - sin * sin, 2 * sin * cos
+        alpha_x, alpha_y = self.derivatives(x, y, b, t, q)
+        kappa = (2 - t) / 2. * (b / R) ** t
+        gamma_1 = (1 - t) * (alpha_x * cos - alpha_y * sin) / r - kappa * cos2
+        gamma_2 = (1 - t) * (alpha_y * cos + alpha_x * sin) / r - kappa * sin2
+        f_xx = kappa + gamma_1
+        f_yy = kappa - gamma_1
+        f_xy = gamma_2
+        return f_xx, f_yy, f_xy
+
+    def num_iter(self, q):
+        """
+        number of terms of the series such that the truncation error is below the series_tolerance
+
+        :param q: axis ratio
+        :return: number of terms after the leading term
+        """
+        f = (1. - q) / (1. + q)
+        if f <= 0:
+            return 0
+        num_iter = int(np.ceil(np.log(self._series_tolerance * (1 - f)) / np.log(f)))
+        return min(max(num_iter, 1), self._num_iter_max)
+
+    def _omega(self, phi, t, q):
+        """
+        angular part of the deflection, e^(i phi) 2F1(1, t/2; 2 - t/2; -(1 - q)/(1 + q) e^(2 i phi)), evaluated with
+        the recurrence relation of the terms of the series (equation 29 in Tessore & Metcalf 2015)
+
+        :param phi: elliptical angle
+        :param t: slope of the convergence (gamma - 1)
+        :param q: axis ratio
+        :return: complex array
+        """
+        f = (1. - q) / (1. + q)
+        omega_n = np.exp(1j * phi)
+        omega = omega_n.copy()
+        factor = -f * np.exp(2j * phi)
+        for n in range(1, self.num_iter(q) + 1):
+            omega_n = factor * (2. * n - (2 - t)) / (2. * n + (2 - t)) * omega_n
+            omega += omega_n
+        return omega
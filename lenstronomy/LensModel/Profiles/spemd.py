@@ -2,6 +2,7 @@ __author__ = 'sibirrer'
 
 from lenstronomy.LensModel.Profiles.spp import SPP
 from lenstronomy.LensModel.Profiles.spemd_smooth import SPEMD_SMOOTH
+from lenstronomy.LensModel.Profiles.epl import EPL
 from lenstronomy.LensModel.Profiles.base_profile import LensProfileBase
 
 
@@ -10,6 +11,8 @@ class SPEMD(LensProfileBase):
     class for power law ellipse mass density profile.
     This class effectively calls the class SPEMD_SMOOTH with a fixed and very small central smoothing scale
     to perform the numerical integral using the FASTELL code by Renan Barkana.
+    Alternatively (and by default if fastell4py is not installed), the profile is computed with the native
+    implementation of the hypergeometric series by Tessore & Metcalf (2015) in the EPL class.
 
 
     The Einstein ring parameter converts to the definition used by GRAVLENS as follow:
@@ -19,12 +22,35 @@ class SPEMD(LensProfileBase):
     lower_limit_default = {'theta_E': 0, 'gamma': 1.5, 'e1': -0.5, 'e2': -0.5, 'center_x': -100, 'center_y': -100}
     upper_limit_default = {'theta_E': 100, 'gamma': 2.5, 'e1': 0.5, 'e2': 0.5, 'center_x': 100, 'center_y': 100}
 
-    def __init__(self):
+    def __init__(self, backend=None, series_tolerance=1e-10):
+        """
+
+        :param backend: 'FASTELL' (requires fastell4py), 'EPL' (native series) or None (FASTELL if fastell4py is
+         installed, otherwise EPL)
+        :param series_tolerance: relative truncation error of the hypergeometric series of the EPL backend
+        """
         self._s_scale = 0.0001  # smoothing scale as used to numerically compute a power-law profile
         self.spp = SPP()
         self.spemd_smooth = SPEMD_SMOOTH()
+        if backend is None:
+            backend = 'FASTELL' if self.spemd_smooth._fastell4py_bool else 'EPL'
+        if backend == 'FASTELL':
+            self._profile = None
+        elif backend == 'EPL':
+            self._profile = EPL(series_tolerance=series_tolerance)
+        else:
+            raise ValueError("backend %s not supported! Chose either 'FASTELL' or 'EPL'." % backend)
+        self._backend = backend
         super(SPEMD, self).__init__()
 
+    @property
+    def backend(self):
+        """
+
+        :return: 'FASTELL' or 'EPL', backend used to compute the profile
+        """
+        return self._backend
+
     def function(self, x, y, theta_E, gamma, e1, e2, center_x=0, center_y=0):
         """
 
@@ -38,6 +64,8 @@ class SPEMD(LensProfileBase):
         :param center_y: y-position of lens center
         :return: lensing potential
         """
+        if self._profile is not None:
+            return self._profile.function(x, y, theta_E, gamma, e1, e2, center_x, center_y)
         return self.spemd_smooth.function(x, y, theta_E, gamma, e1, e2, self._s_scale, center_x, center_y)
 
     def derivatives(self, x, y, theta_E, gamma, e1, e2, center_x=0, center_y=0):
@@ -53,6 +81,8 @@ class SPEMD(LensProfileBase):
         :param center_y: y-position of lens center
         :return: deflection angles alpha_x, alpha_y
         """
+        if self._profile is not None:
+            return self._profile.derivatives(x, y, theta_E, gamma, e1, e2, center_x, center_y)
         return self.spemd_smooth.derivatives(x, y, theta_E, gamma, e1, e2, self._s_scale, center_x, center_y)
 
     def hessian(self, x, y, theta_E, gamma, e1, e2, center_x=0, center_y=0):
@@ -68,6 +98,8 @@ class SPEMD(LensProfileBase):
         :param center_y: y-position of lens center
         :return: Hessian components f_xx, f_yy, f_xy
         """
+        if self._profile is not None:
+            return self._profile.hessian(x, y, theta_E, gamma, e1, e2, center_x, center_y)
         return self.spemd_smooth.hessian(x, y, theta_E, gamma, e1, e2, self._s_scale, center_x, center_y)
 
     def mass_3d_lens(self, r, theta_E, gamma, e1=None, e2=None):
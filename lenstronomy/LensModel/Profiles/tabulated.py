@@ -0,0 +1,237 @@
+import numpy as np
+from lenstronomy.LensModel.Profiles.base_profile import LensProfileBase
+
+
+class TabulatedProfile(LensProfileBase):
+    """
+    lookup-table accelerator for spherically symmetric lens profiles.
+
+    The supported profiles are self-similar: with x = R / r_s in units of the scale radius r_s of the profile (e.g.
+    Rs), the lensing potential, the deflection and its radial derivative are the ones of a dimensionless profile with
+    scale radius and normalisation 1, scaled by the normalisation of the profile (e.g. alpha_Rs). The dimensionless
+    profiles are evaluated with the analytic expressions on a logarithmically spaced grid in x and linearly
+    interpolated (in log x), such that the same tables are used for all parameter values. The potential is only
+    self-similar up to a constant, which is fixed with the analytic potential at a single radius. Profiles with a
+    second radius (e.g. r_trunc of TNFW) are tabulated on a logarithmic grid in its ratio to the scale radius as well
+    and linearly interpolated along it. The spacing of the grids is chosen such that the relative interpolation error
+    is of order the tolerance.
+
+    Positions outside the tabulated range (very close to the center) are computed with the analytic expressions, as
+    are evaluations at fewer positions than the number of table entries that would need to be computed for them.
+    """
+    # spherically symmetric profiles that can be tabulated
+    profiles_supported = ['NFW', 'TNFW', 'CNFW', 'coreBURKERT', 'HERNQUIST', 'PJAFFE', 'CORED_DENSITY',
+                          'CORED_DENSITY_2']
+
+    def __init__(self, profile, tolerance=0.0001, dynamic_range=1e6):
+        """
+
+        :param profile: instance of a spherically symmetric lens profile class
+        :param tolerance: relative interpolation error tolerated
+        :param dynamic_range: ratio between the largest and smallest radius of the tables. Smaller radii are evaluated
+         analytically.
+        """
+        self._profile = profile
+        self.param_names = profile.param_names
+        if hasattr(profile, 'lower_limit_default'):
+            self.lower_limit_default = profile.lower_limit_default
+            self.upper_limit_default = profile.upper_limit_default
+        # spacing in log radius of the linear interpolation, its error is ~ step^2 / 8 * |d^2 f / d ln r^2|
+        self._step = np.sqrt(2 * tolerance)
+        self._dynamic_range = dynamic_range
+        # scale radius, normalisation (and the power of the scale radius converting it into a deflection) and the
+        # radius defining the shape of the profile in units of the scale radius
+        param_names = profile.param_names
+        self._scale = 'Rs' if 'Rs' in param_names else 'r_core'
+        if 'alpha_Rs' in param_names:
+            self._norm, self._norm_power = 'alpha_Rs', 0
+        else:
+            self._norm, self._norm_power = 'sigma0', 1
+        shape_names = [name for name in ['r_trunc', 'r_core', 'Ra'] if name in param_names and name != self._scale]
+        self._shape = shape_names[0] if len(shape_names) > 0 else None
+        # for each quantity, tables of the dimensionless profile (log x and values) indexed by the grid point k of the
+        # shape, log(r_shape / r_s) = k * step (k = 0 without shape parameter). The grid in log x is offset by half a
+        # step, such that x = 1 and x = r_shape / r_s (where some analytic expressions are singular) are not evaluated
+        self._tables = {}
+        super(TabulatedProfile, self).__init__()
+
+    def function(self, x, y, **kwargs):
+        """
+        lensing potential
+
+        :param x: x-coordinate (angle)
+        :param y: y-coordinate (angle)
+        :param kwargs: keyword arguments of the profile
+        :return: lensing potential
+        """
+        x_, y_, R, kwargs_profile = self._radius(x, y, kwargs)
+        return self._evaluate('function', R, kwargs_profile)
+
+    def derivatives(self, x, y, **kwargs):
+        """
+        deflection angles
+
+        :param x: x-coordinate (angle)
+        :param y: y-coordinate (angle)
+        :param kwargs: keyword arguments of the profile
+        :return: deflection angles alpha_x, alpha_y
+        """
+        x_, y_, R, kwargs_profile = self._radius(x, y, kwargs)
+        alpha_r = self._evaluate('alpha', R, kwargs_profile)
+        R_ = np.maximum(R, 0.000000001)
+        return alpha_r * x_ / R_, alpha_r * y_ / R_
+
+    def hessian(self, x, y, **kwargs):
+        """
+        Hessian matrix from the radial deflection and its radial derivative
+
+        :param x: x-coordinate (angle)
+        :param y: y-coordinate (angle)
+        :param kwargs: keyword arguments of the profile
+        :return: f_xx, f_yy, f_xy
+        """
+        x_, y_, R, kwargs_profile = self._radius(x, y, kwargs)
+        alpha_r = self._evaluate('alpha', R, kwargs_profile)
+        d_alpha_dr = self._evaluate('d_alpha_dr', R, kwargs_profile)
+        R_ = np.maximum(R, 0.000000001)
+        cos, sin = x_ / R_, y_ / R_
+        alpha_R = alpha_r / R_
+        f_xx = d_alpha_dr * cos ** 2 + alpha_R * sin ** 2
+        f_yy = d_alpha_dr * sin ** 2 + alpha_R * cos ** 2
+        f_xy = (d_alpha_dr - alpha_R) * cos * sin
+        return f_xx, f_yy, f_xy
+
+    def density_lens(self, *args, **kwargs):
+        """
+        see the corresponding definition of the tabulated profile
+        """
+        return self._profile.density_lens(*args, **kwargs)
+
+    def mass_3d_lens(self, *args, **kwargs):
+        """
+        see the corresponding definition of the tabulated profile
+        """
+        return self._profile.mass_3d_lens(*args, **kwargs)
+
+    @staticmethod
+    def _radius(x, y, kwargs):
+        """
+
+        :param x: x-coordinate
+        :param y: y-coordinate
+        :param kwargs: keyword arguments of the profile
+        :return: x and y relative to the center, radius, keyword arguments without the center
+        """
+        kwargs_profile = {key: value for key, value in kwargs.items() if key not in ['center_x', 'center_y']}
+        x_ = np.array(x, dtype=float) - kwargs.get('center_x', 0)
+        y_ = np.array(y, dtype=float) - kwargs.get('center_y', 0)
+        R = np.sqrt(x_ ** 2 + y_ ** 2)
+        return x_, y_, R, kwargs_profile
+
+    def _analytic(self, quantity, R, kwargs_profile):
+        """
+        analytic radial profile of the quantity, evaluated along the x-axis
+
+        :param quantity: 'function', 'alpha' or 'd_alpha_dr'
+        :param R: radii
+        :param kwargs_profile: keyword arguments of the profile (without the center)
+        :return: quantity at radii R
+        """
+        R = np.array(R, dtype=float)
+        zeros = np.zeros_like(R)
+        if quantity == 'function':
+            return self._profile.function(R, zeros, **kwargs_profile)
+        elif quantity == 'alpha':
+            return self._profile.derivatives(R, zeros, **kwargs_profile)[0]
+        else:
+            return self._profile.hessian(R, zeros, **kwargs_profile)[0]
+
+    def _reference_kwargs(self, k):
+        """
+
+        :param k: index of the grid point of the shape parameter
+        :return: keyword arguments of the dimensionless profile (scale radius and normalisation 1)
+        """
+        kwargs = {self._scale: 1., self._norm: 1.}
+        if self._shape is not None:
+            kwargs[self._shape] = np.exp(k * self._step)
+        return kwargs
+
+    def _table_range(self, k, quantity, log_x_min, log_x_max):
+        """
+        range of the table of the shape grid point k required to cover log x within [log_x_min, log_x_max]
+
+        :param k: index of the grid point of the shape parameter
+        :param quantity: 'function', 'alpha' or 'd_alpha_dr'
+        :param log_x_min: minimum of log x to be covered
+        :param log_x_max: maximum of log x to be covered
+        :return: None if the table covers the range, otherwise the indexes (i_min, i_max) of the first and last grid
+         points log x = (i + 1/2) * step of the new table
+        """
+        table = self._tables.get(quantity, {}).get(k)
+        if table is not None and table[0][0] <= log_x_min and table[0][-1] >= log_x_max:
+            return None
+        # margin such that tables are not rebuilt for small changes in the coordinates
+        i_min = int(np.floor((log_x_min - 1) / self._step - 0.5))
+        i_max = int(np.ceil((log_x_max + 1) / self._step - 0.5))
+        if table is not None:
+            i_min = min(i_min, int(np.round(table[0][0] / self._step - 0.5)))
+            i_max = max(i_max, int(np.round(table[0][-1] / self._step - 0.5)))
+        return i_min, i_max
+
+    def _evaluate(self, quantity, R, kwargs_profile):
+        """
+        interpolated radial profile of the quantity
+
+        :param quantity: 'function', 'alpha' or 'd_alpha_dr'
+        :param R: radii
+        :param kwargs_profile: keyword arguments of the profile (without the center)
+        :return: quantity at radii R
+        """
+        R = np.array(R, dtype=float)
+        r_scale = kwargs_profile[self._scale]
+        if R.size == 0 or np.max(R) <= 0 or r_scale <= 0:
+            return self._analytic(quantity, R, kwargs_profile)
+        with np.errstate(divide='ignore'):
+            log_x = np.log(R / r_scale)
+        log_x_max = np.max(log_x)
+        log_x_min = max(np.min(log_x), log_x_max - np.log(self._dynamic_range))
+        if self._shape is None:
+            k_list, weights = [0], [1.]
+        else:
+            t = np.log(kwargs_profile[self._shape] / r_scale) / self._step
+            k = int(np.floor(t))
+            k_list, weights = [k, k + 1], [k + 1 - t, t - k]
+        table_ranges = [self._table_range(k, quantity, log_x_min, log_x_max) for k in k_list]
+        num_entries = sum([i_max - i_min + 1 for (i_min, i_max) in filter(None, table_ranges)])
+        if num_entries > R.size:
+            # computing the missing tables is more expensive than the analytic evaluation
+            return self._analytic(quantity, R, kwargs_profile)
+        tables = self._tables.setdefault(quantity, {})
+        for k, table_range in zip(k_list, table_ranges):
+            if table_range is not None:
+                log_x_table = (np.arange(table_range[0], table_range[1] + 1) + 0.5) * self._step
+                values = self._analytic(quantity, np.exp(log_x_table), self._reference_kwargs(k))
+                tables[k] = (log_x_table, values)
+        # first radius covered by all the tables used
+        log_x_start = max([tables[k][0][0] for k in k_list])
+        result, result_start = 0, 0
+        for k, weight in zip(k_list, weights):
+            log_x_table, values = tables[k]
+            result = result + weight * np.interp(log_x, log_x_table, values)
+            result_start = result_start + weight * np.interp(log_x_start, log_x_table, values)
+        norm = kwargs_profile[self._norm] * r_scale ** self._norm_power
+        if quantity == 'function':
+            # the additive constant of the potential is fixed with the analytic potential at the first radius
+            f_start = self._analytic(quantity, r_scale * np.exp(log_x_start), kwargs_profile)
+            result = norm * r_scale * (result - result_start) + f_start
+        elif quantity == 'alpha':
+            result = norm * result
+        else:
+            result = norm / r_scale * result
+        outside = log_x < log_x_start
+        if np.any(outside):
+            if result.ndim == 0:
+                return self._analytic(quantity, R, kwargs_profile)
+            result[outside] = self._analytic(quantity, R[outside], kwargs_profile)
+        return result
@@ -1,7 +1,7 @@
 import numpy as np
 import lenstronomy.Util.util as util
 import lenstronomy.Util.image_util as image_util
-import datetime as dt
+from lenstronomy.Util.profiling_util import Profiler
 from scipy.optimize import minimize
 
 
@@ -9,7 +9,7 @@ class LensEquationSolver(object):
     """
     class to solve for image positions given lens model and source position
     """
-    def __init__(self, lensModel):
+    def __init__(self, lensModel, profiling=False):
         """
 
         :param lensModel: instance of a class according to lenstronomy.LensModel.lens_model
@@ -17,8 +17,12 @@ class LensEquationSolver(object):
         def ray_shooting()
         def hessian()
         def magnification()
+        :param profiling: bool, if True, the timings of the stages of image_position_from_source() and the number of
+         candidate and accepted image positions are recorded in self.profiler (see
+         lenstronomy.Util.profiling_util.Profiler). Can also be switched with self.profiler.enabled.
         """
         self.lensModel = lensModel
+        self.profiler = Profiler(enabled=profiling)
 
     def image_position_stochastic(self, source_x, source_y, kwargs_lens, search_window=10,
                                   precision_limit=10**(-10), arrival_time_sort=True, x_center=0,
@@ -74,7 +78,8 @@ class LensEquationSolver(object):
     def image_position_from_source(self, sourcePos_x, sourcePos_y, kwargs_lens, min_distance=0.1, search_window=10,
                                    precision_limit=10**(-10), num_iter_max=100, arrival_time_sort=True,
                                    initial_guess_cut=True, verbose=False, x_center=0, y_center=0, num_random=0,
-                                   non_linear=False, magnification_limit=None):
+                                   non_linear=False, magnification_limit=None, vectorized=False, adaptive_grid=False,
+                                   coarse_distance=None):
         """
         finds image position source position and lens model
 
@@ -91,69 +96,258 @@ class LensEquationSolver(object):
         :param x_center: float, center of the window to search for point sources
         :param y_center: float, center of the window to search for point sources
         :param non_linear: bool, if True applies a non-linear solver not dependent on Hessian computation
+        :param magnification_limit: None or float, if set will only return image positions that have an
+         abs(magnification) larger than this number
+        :param vectorized: bool, if True, the Newton iterations of all candidate positions are performed at once with
+         array calls of the lens model (ignored with non_linear=True)
+        :param adaptive_grid: bool, if True, the initial guesses are found with a coarse grid of triangles which is only
+         refined where the triangles mapped to the source plane contain the source position (see
+         candidates_adaptive_grid()) instead of ray-shooting a regular grid with resolution min_distance
+        :param coarse_distance: size of the coarse grid cells with adaptive_grid=True. If None, 10 * min_distance but
+         at most search_window / 50 (see candidates_adaptive_grid())
         :returns: (exact) angular position of (multiple) images ra_pos, dec_pos in units of angle
         :raises: AttributeError, KeyError
         """
-        ips_start = dt.datetime.now()
-        # this is a comment to see how github commits work
+        profiler = self.profiler
+        time_start = profiler.start()
         kwargs_lens = self.lensModel.set_static(kwargs_lens)
-        # compute number of pixels to cover the search window with the required min_distance
-        numPix = int(round(search_window / min_distance) + 0.5)
-        x_grid, y_grid = util.make_grid(numPix, min_distance)
-        x_grid += x_center
-        y_grid += y_center
-        # ray-shoot to find the relative distance to the required source position for each grid point
-        x_mapped, y_mapped = self.lensModel.ray_shooting(x_grid, y_grid, kwargs_lens)
-        absmapped = util.displaceAbs(x_mapped, y_mapped, sourcePos_x, sourcePos_y)
-        # select minima in the grid points and select grid points that do not deviate more than the
-        # width of the grid point to a solution of the lens equation
-        x_mins, y_mins, delta_map = util.neighborSelect(absmapped, x_grid, y_grid)
-        if verbose is True:
-            print("There are %s regions identified that could contain a solution of the lens equation" % len(x_mins))
-        #mag = np.abs(mag)
-        #print(x_mins, y_mins, 'before requirement of min_distance')
-        if len(x_mins) < 1:
-            return x_mins, y_mins
-        if initial_guess_cut is True:
-            mag = np.abs(self.lensModel.magnification(x_mins, y_mins, kwargs_lens))
-            mag[mag < 1] = 1
-            x_mins = x_mins[delta_map <= min_distance*mag*5]
-            y_mins = y_mins[delta_map <= min_distance*mag*5]
+        if adaptive_grid is True:
+            with profiler.stage('grid_search'):
+                x_mins, y_mins = self.candidates_adaptive_grid(sourcePos_x, sourcePos_y, kwargs_lens,
+                                                               min_distance=min_distance, search_window=search_window,
+                                                               x_center=x_center, y_center=y_center,
+                                                               coarse_distance=coarse_distance)
+            if verbose is True:
+                print("There are %s regions identified that could contain a solution of the lens equation"
+                      % len(x_mins))
+        else:
+            with profiler.stage('grid_search'):
+                # compute number of pixels to cover the search window with the required min_distance
+                numPix = int(round(search_window / min_distance) + 0.5)
+                x_grid, y_grid = util.make_grid(numPix, min_distance)
+                x_grid += x_center
+                y_grid += y_center
+                # ray-shoot to find the relative distance to the required source position for each grid point
+                x_mapped, y_mapped = self.lensModel.ray_shooting(x_grid, y_grid, kwargs_lens)
+                absmapped = util.displaceAbs(x_mapped, y_mapped, sourcePos_x, sourcePos_y)
+                # select minima in the grid points and select grid points that do not deviate more than the
+                # width of the grid point to a solution of the lens equation
+                x_mins, y_mins, delta_map = util.neighborSelect(absmapped, x_grid, y_grid)
             if verbose is True:
-                print("The number of regions that meet the plausibility criteria are %s" % len(x_mins))
+                print("There are %s regions identified that could contain a solution of the lens equation" % len(x_mins))
+            #mag = np.abs(mag)
+            #print(x_mins, y_mins, 'before requirement of min_distance')
+            if len(x_mins) < 1:
+                profiler.stop('total', time_start)
+                return x_mins, y_mins
+            if initial_guess_cut is True:
+                mag = np.abs(self.lensModel.magnification(x_mins, y_mins, kwargs_lens))
+                mag[mag < 1] = 1
+                x_mins = x_mins[delta_map <= min_distance*mag*5]
+                y_mins = y_mins[delta_map <= min_distance*mag*5]
+                if verbose is True:
+                    print("The number of regions that meet the plausibility criteria are %s" % len(x_mins))
         x_mins = np.append(x_mins, np.random.uniform(low=-search_window/2+x_center, high=search_window/2+x_center,
                                                      size=num_random))
         y_mins = np.append(y_mins, np.random.uniform(low=-search_window / 2 + y_center, high=search_window / 2 + y_center,
                                              size=num_random))
+        profiler.count('candidates', len(x_mins))
         # iterative solving of the lens equation for the selected grid points
-        itertime_start = dt.datetime.now()
-        x_mins, y_mins, solver_precision = self._findIterative(x_mins, y_mins, sourcePos_x, sourcePos_y, kwargs_lens,
-                                                               precision_limit, num_iter_max, verbose=verbose,
-                                                               min_distance=min_distance, non_linear=non_linear)
-        itertime_end = dt.datetime.now()
-        delta_time = itertime_end-itertime_start
-        delta_time = delta_time.seconds + round((delta_time.microseconds / (10**6)), 6)
-        delta_time = str(delta_time)
-        print("Find_iterative " + delta_time)
+        with profiler.stage('iterative_solve'):
+            if vectorized is True and non_linear is False:
+                x_mins, y_mins, solver_precision = self._findIterative_vectorized(x_mins, y_mins, sourcePos_x,
+                                                                                  sourcePos_y, kwargs_lens,
+                                                                                  precision_limit, num_iter_max,
+                                                                                  min_distance=min_distance)
+            else:
+                x_mins, y_mins, solver_precision = self._findIterative(x_mins, y_mins, sourcePos_x, sourcePos_y,
+                                                                       kwargs_lens, precision_limit, num_iter_max,
+                                                                       verbose=verbose, min_distance=min_distance,
+                                                                       non_linear=non_linear)
         # only select iterative results that match the precision limit
         x_mins = x_mins[solver_precision <= precision_limit]
         y_mins = y_mins[solver_precision <= precision_limit]
+        profiler.count('converged', len(x_mins))
         # find redundant solutions within the min_distance criterion
-        x_mins, y_mins = image_util.findOverlap(x_mins, y_mins, min_distance)
+        with profiler.stage('overlap_removal'):
+            x_mins, y_mins = image_util.findOverlap(x_mins, y_mins, min_distance)
         if arrival_time_sort is True:
-            x_mins, y_mins = self.sort_arrival_times(x_mins, y_mins, kwargs_lens)
+            with profiler.stage('arrival_time_sort'):
+                x_mins, y_mins = self.sort_arrival_times(x_mins, y_mins, kwargs_lens)
         if magnification_limit is not None:
-            mag = np.abs(self.lensModel.magnification(x_mins, y_mins, kwargs_lens))
-            x_mins = x_mins[mag >= magnification_limit]
-            y_mins = y_mins[mag >= magnification_limit]
+            with profiler.stage('magnification_limit'):
+                mag = np.abs(self.lensModel.magnification(x_mins, y_mins, kwargs_lens))
+                x_mins = x_mins[mag >= magnification_limit]
+                y_mins = y_mins[mag >= magnification_limit]
+        self.lensModel.set_dynamic()
+        profiler.count('images', len(x_mins))
+        profiler.stop('total', time_start)
+        return x_mins, y_mins
+
+    def image_position_from_initial_guess(self, sourcePos_x, sourcePos_y, kwargs_lens, x_init, y_init,
+                                          min_distance=0.1, precision_limit=10**(-10), num_iter_max=100,
+                                          arrival_time_sort=True, magnification_limit=None):
+        """
+        solves the lens equation with Newton iterations starting from given guesses of the image positions, e.g. the
+        solutions of a slightly different lens model. No search for additional images is performed.
+
+        :param sourcePos_x: source position in units of angle
+        :param sourcePos_y: source position in units of angle
+        :param kwargs_lens: lens model parameters as keyword arguments
+        :param x_init: initial guesses of the image positions
+        :param y_init: initial guesses of the image positions
+        :param min_distance: minimum separation of two distinct images
+        :param precision_limit: required precision in the source plane
+        :param num_iter_max: maximum number of iterations of the solver
+        :param arrival_time_sort: bool, if True, sorts image position in arrival time (first arrival photon first listed)
+        :param magnification_limit: None or float, if set, images with abs(magnification) below this number are
+         discarded
+        :return: image positions, or None, None if not all initial guesses converge to distinct images that pass the
+         magnification limit
+        """
+        kwargs_lens = self.lensModel.set_static(kwargs_lens)
+        x_init, y_init = np.array(x_init, dtype=float), np.array(y_init, dtype=float)
+        x_mins, y_mins, solver_precision = self._findIterative_vectorized(x_init, y_init, sourcePos_x, sourcePos_y,
+                                                                          kwargs_lens, precision_limit, num_iter_max,
+                                                                          min_distance=min_distance)
+        success = bool(np.all(solver_precision <= precision_limit))
+        if success:
+            x_mins, y_mins = image_util.findOverlap(x_mins, y_mins, min_distance)
+            if magnification_limit is not None:
+                mag = np.abs(self.lensModel.magnification(x_mins, y_mins, kwargs_lens))
+                x_mins, y_mins = x_mins[mag >= magnification_limit], y_mins[mag >= magnification_limit]
+            success = len(x_mins) == len(x_init)
+        if success and arrival_time_sort is True:
+            x_mins, y_mins = self.sort_arrival_times(x_mins, y_mins, kwargs_lens)
         self.lensModel.set_dynamic()
-        ips_end = dt.datetime.now()
-        delta_time = ips_end-ips_start
-        delta_time = delta_time.seconds + round((delta_time.microseconds / (10**6)), 6)
-        delta_time = str(delta_time)
-        print("Find_total " + delta_time)
+        if not success:
+            return None, None
         return x_mins, y_mins
 
+    def candidates_adaptive_grid(self, sourcePos_x, sourcePos_y, kwargs_lens, min_distance=0.1, search_window=10,
+                                 x_center=0, y_center=0, coarse_distance=None, final_margin=None):
+        """
+        coarse-to-fine search of initial guesses of image positions. The search window is covered with a coarse grid
+        of triangles whose vertices are ray-shot to the source plane. Triangles whose mapping in the source plane
+        contains the source position (with a margin accounting for the non-linearity of the mapping) are divided into
+        four triangles, until their size is below min_distance. The centers of the remaining triangles are returned.
+
+        :param sourcePos_x: source position
+        :param sourcePos_y: source position
+        :param kwargs_lens: lens model keyword argument list
+        :param min_distance: size of the triangles at the end of the refinement
+        :param search_window: size of the search window
+        :param x_center: center of the search window
+        :param y_center: center of the search window
+        :param coarse_distance: size of the cells of the coarse grid. If None, 10 * min_distance but at most
+         search_window / 50. Features of the lens model (e.g. sub-halos) much smaller than the coarse cells may be missed.
+        :param final_margin: if not None, margin on the barycentric coordinates applied to the triangles at the end of
+         the refinement (e.g. 0 to only keep triangles whose mapping contains the source position)
+        :return: x_mins, y_mins of the initial guesses
+        """
+        if coarse_distance is None:
+            coarse_distance = max(min(10 * min_distance, search_window / 50.), min_distance)
+        num_cells = max(int(np.ceil(search_window / coarse_distance)), 1)
+        cell_size = float(search_window) / num_cells
+        nodes = np.linspace(-search_window / 2., search_window / 2., num_cells + 1)
+        x_nodes, y_nodes = np.meshgrid(nodes + x_center, nodes + y_center)
+        x_mapped, y_mapped = self.lensModel.ray_shooting(x_nodes.flatten(), y_nodes.flatten(), kwargs_lens)
+        x_mapped, y_mapped = x_mapped.reshape(x_nodes.shape), y_mapped.reshape(x_nodes.shape)
+
+        def _corners(a):
+            # values at the corners (lower left, lower right, upper right, upper left) of all cells
+            return a[:-1, :-1].flatten(), a[:-1, 1:].flatten(), a[1:, 1:].flatten(), a[1:, :-1].flatten()
+
+        # each cell is divided in two triangles, vertices are stored with shape (num_triangles, 3)
+        triangles = []
+        for a in [x_nodes, y_nodes, x_mapped, y_mapped]:
+            c0, c1, c2, c3 = _corners(a)
+            triangles.append(np.concatenate([np.array([c0, c1, c2]).T, np.array([c0, c2, c3]).T]))
+        x_tri, y_tri, x_tri_mapped, y_tri_mapped = triangles
+        while True:
+            select = self._triangle_contains(x_tri_mapped, y_tri_mapped, sourcePos_x, sourcePos_y)
+            x_tri, y_tri = x_tri[select], y_tri[select]
+            x_tri_mapped, y_tri_mapped = x_tri_mapped[select], y_tri_mapped[select]
+            if cell_size <= min_distance or len(x_tri) == 0:
+                break
+            # mid points of the edges (0-1, 1-2, 2-0)
+            x_mid = (x_tri + np.roll(x_tri, -1, axis=1)) / 2.
+            y_mid = (y_tri + np.roll(y_tri, -1, axis=1)) / 2.
+            x_mid_mapped, y_mid_mapped = self.lensModel.ray_shooting(x_mid.flatten(), y_mid.flatten(), kwargs_lens)
+            x_mid_mapped, y_mid_mapped = x_mid_mapped.reshape(x_mid.shape), y_mid_mapped.reshape(x_mid.shape)
+            refined = []
+            for a, m in [(x_tri, x_mid), (y_tri, y_mid), (x_tri_mapped, x_mid_mapped), (y_tri_mapped, y_mid_mapped)]:
+                refined.append(np.concatenate([np.array([a[:, 0], m[:, 0], m[:, 2]]).T,
+                                               np.array([m[:, 0], a[:, 1], m[:, 1]]).T,
+                                               np.array([m[:, 2], m[:, 1], a[:, 2]]).T, m]))
+            x_tri, y_tri, x_tri_mapped, y_tri_mapped = refined
+            cell_size /= 2.
+        if final_margin is not None:
+            select = self._triangle_contains(x_tri_mapped, y_tri_mapped, sourcePos_x, sourcePos_y, margin=final_margin)
+            x_tri, y_tri = x_tri[select], y_tri[select]
+        x_mins, y_mins = np.mean(x_tri, axis=1), np.mean(y_tri, axis=1)
+        x_mins, y_mins = image_util.findOverlap(x_mins, y_mins, min_distance)
+        return np.array(x_mins), np.array(y_mins)
+
+    def image_number(self, sourcePos_x, sourcePos_y, kwargs_lens, min_distance=0.1, search_window=10, x_center=0,
+                     y_center=0, precision_limit=10**(-10), num_iter_max=100, magnification_limit=None):
+        """
+        number of images of a source position, as a cheap check of a solution obtained otherwise (e.g. with
+        image_position_from_initial_guess()). Only the triangles of the adaptive grid whose mapping in the source plane
+        contains the source position at the end of the refinement are used as initial guesses of the Newton iterations,
+        and the converged solutions are selected as in image_position_from_source().
+
+        :param sourcePos_x: source position
+        :param sourcePos_y: source position
+        :param kwargs_lens: lens model keyword argument list
+        :param min_distance: see image_position_from_source()
+        :param search_window: see image_position_from_source()
+        :param x_center: see image_position_from_source()
+        :param y_center: see image_position_from_source()
+        :param precision_limit: see image_position_from_source()
+        :param num_iter_max: see image_position_from_source()
+        :param magnification_limit: see image_position_from_source()
+        :return: number of images
+        """
+        kwargs_lens = self.lensModel.set_static(kwargs_lens)
+        x_mins, y_mins = self.candidates_adaptive_grid(sourcePos_x, sourcePos_y, kwargs_lens, min_distance=min_distance,
+                                                       search_window=search_window, x_center=x_center,
+                                                       y_center=y_center, final_margin=0)
+        if len(x_mins) > 0:
+            x_mins, y_mins, solver_precision = self._findIterative_vectorized(x_mins, y_mins, sourcePos_x,
+                                                                              sourcePos_y, kwargs_lens,
+                                                                              precision_limit, num_iter_max,
+                                                                              min_distance=min_distance)
+            x_mins = x_mins[solver_precision <= precision_limit]
+            y_mins = y_mins[solver_precision <= precision_limit]
+            x_mins, y_mins = image_util.findOverlap(x_mins, y_mins, min_distance)
+            if magnification_limit is not None and len(x_mins) > 0:
+                mag = np.abs(self.lensModel.magnification(x_mins, y_mins, kwargs_lens))
+                x_mins = x_mins[mag >= magnification_limit]
+        self.lensModel.set_dynamic()
+        return len(x_mins)
+
+    @staticmethod
+    def _triangle_contains(x_tri, y_tri, x, y, margin=2.):
+        """
+        tests whether a point lies within triangles, extended by a margin
+
+        :param x_tri: x-coordinates of the vertices, shape (num_triangles, 3)
+        :param y_tri: y-coordinates of the vertices, shape (num_triangles, 3)
+        :param x: x-coordinate of the point
+        :param y: y-coordinate of the point
+        :param margin: tolerance on the barycentric coordinates of the point
+        :return: bool array of length num_triangles
+        """
+        x0, x1, x2 = x_tri[:, 0], x_tri[:, 1], x_tri[:, 2]
+        y0, y1, y2 = y_tri[:, 0], y_tri[:, 1], y_tri[:, 2]
+        area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            l0 = ((x1 - x) * (y2 - y) - (x2 - x) * (y1 - y)) / area
+            l1 = ((x2 - x) * (y0 - y) - (x0 - x) * (y2 - y)) / area
+            l2 = 1 - l0 - l1
+            return (l0 >= -margin) & (l1 >= -margin) & (l2 >= -margin)
+
     def _findIterative(self, x_min, y_min, sourcePos_x, sourcePos_y, kwargs_lens, precision_limit=10 ** (-10),
                        num_iter_max=100, verbose=False, min_distance=0.01, non_linear=False):
         num_candidates = len(x_min)
@@ -171,6 +365,61 @@ class LensEquationSolver(object):
             solver_precision[i] = delta
         return x_mins, y_mins, solver_precision
 
+    def _findIterative_vectorized(self, x_min, y_min, sourcePos_x, sourcePos_y, kwargs_lens,
+                                  precision_limit=10 ** (-10), num_iter_max=100, min_distance=0.01):
+        """
+        Newton iterations of the lens equation for all candidate positions at once (see _solve_single_proposal() for
+        the iteration of a single candidate). Each step evaluates the lens model with one array call for all candidates
+        that have not yet converged. Steps that do not decrease the distance in the source plane are randomly
+        shortened and repeated for the concerned candidates only.
+
+        :param x_min: candidate image positions
+        :param y_min: candidate image positions
+        :param sourcePos_x: source position
+        :param sourcePos_y: source position
+        :param kwargs_lens: lens model keyword argument list
+        :param precision_limit: required precision in the source plane
+        :param num_iter_max: maximum number of iterations per candidate
+        :param min_distance: maximum step size in the image plane
+        :return: image positions and their precision in the source plane
+        """
+        x_guess = np.array(x_min, dtype=float)
+        y_guess = np.array(y_min, dtype=float)
+        if len(x_guess) == 0:
+            return x_guess, y_guess, np.zeros(0)
+        x_mapped, y_mapped = self.lensModel.ray_shooting(x_guess, y_guess, kwargs_lens)
+        delta = np.sqrt((x_mapped - sourcePos_x) ** 2 + (y_mapped - sourcePos_y) ** 2)
+        num_iter = np.zeros(len(x_guess), dtype=int)
+        active = np.where((delta > precision_limit) & (num_iter < num_iter_max))[0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            while len(active) > 0:
+                f_xx, f_xy, f_yx, f_yy = self.lensModel.hessian(x_guess[active], y_guess[active], kwargs_lens)
+                det = (1 - f_xx) * (1 - f_yy) - f_xy * f_yx
+                delta_x, delta_y = x_mapped[active] - sourcePos_x, y_mapped[active] - sourcePos_y
+                step_x = ((1 - f_yy) * delta_x + f_yx * delta_y) / det
+                step_y = (f_xy * delta_x + (1 - f_xx) * delta_y) / det
+                dist = np.sqrt(step_x ** 2 + step_y ** 2)
+                scale = np.where(dist > min_distance, min_distance / dist, 1)
+                step_x, step_y = step_x * scale, step_y * scale
+                pending = active
+                while len(pending) > 0:
+                    x_new, y_new = x_guess[pending] - step_x, y_guess[pending] - step_y
+                    x_mapped_new, y_mapped_new = self.lensModel.ray_shooting(x_new, y_new, kwargs_lens)
+                    delta_new = np.sqrt((x_mapped_new - sourcePos_x) ** 2 + (y_mapped_new - sourcePos_y) ** 2)
+                    num_iter[pending] += 1
+                    accept = ~(delta_new > delta[pending])
+                    index = pending[accept]
+                    x_guess[index], y_guess[index] = x_new[accept], y_new[accept]
+                    x_mapped[index], y_mapped[index] = x_mapped_new[accept], y_mapped_new[accept]
+                    delta[index] = delta_new[accept]
+                    # shortened steps are repeated as long as the maximum number of iterations is not exceeded
+                    retry = ~accept & (num_iter[pending] <= num_iter_max)
+                    pending = pending[retry]
+                    step_x = step_x[retry] * np.random.normal(loc=0, scale=0.5, size=len(pending))
+                    step_y = step_y[retry] * np.random.normal(loc=0, scale=0.5, size=len(pending))
+                active = np.where((delta > precision_limit) & (num_iter < num_iter_max))[0]
+        return x_guess, y_guess, delta
+
     def _solve_single_proposal(self, x_guess, y_guess, source_x, source_y, kwargs_lens, precision_limit, num_iter_max,
                                max_step, non_linear=False):
         l = 0
@@ -221,7 +470,7 @@ class LensEquationSolver(object):
             return x_new, y_new, delta_new, iter_num
 
     def findBrightImage(self, sourcePos_x, sourcePos_y, kwargs_lens, numImages=4, min_distance=0.01, search_window=5,
-                        precision_limit=10**(-10), num_iter_max=10, arrival_time_sort=True):
+                        precision_limit=10**(-10), num_iter_max=10, arrival_time_sort=True, vectorized=False):
         """
 
         :param sourcePos_x:
@@ -234,12 +483,13 @@ class LensEquationSolver(object):
         :param ray_shooting_function: a special function for performing ray shooting; defaults to self.lensModel.ray_shooting
         :param hessian_function: same as ray_shooting_function, but for computing the hessian matrix
         :param magnification_function: same as ray_shooting_function, but for computing magnifications
+        :param vectorized: bool, if True, uses the vectorized Newton iterations (see image_position_from_source())
         :return:
         """
 
         x_mins, y_mins = self.image_position_from_source(sourcePos_x, sourcePos_y, kwargs_lens, min_distance,
                                                          search_window, precision_limit, num_iter_max,
-                                                         arrival_time_sort=arrival_time_sort)
+                                                         arrival_time_sort=arrival_time_sort, vectorized=vectorized)
         mag_list = []
         for i in range(len(x_mins)):
             mag = self.lensModel.magnification(x_mins[i], y_mins[i], kwargs_lens)
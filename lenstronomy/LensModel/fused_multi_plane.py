@@ -0,0 +1,89 @@
+import numpy as np
+from lenstronomy.Util import numba_util
+from lenstronomy.LensModel.fused_single_plane import FusedSinglePlane, _alpha_point_range
+
+
+class FusedMultiPlane(object):
+    """
+    compiled execution path of the multi-plane ray-tracing recursion for the lens models supported by
+    FusedSinglePlane. Each ray is propagated through all lens planes in a single compiled loop, without the
+    per-plane and per-profile Python overhead and temporary arrays of MultiPlaneBase.ray_shooting_partial().
+
+    The lens planes and the geometry (transverse distances and reduced to physical deflection factors) are provided
+    by MultiPlaneBase.
+    """
+    def __init__(self, lens_model_list, sorted_redshift_index):
+        """
+
+        :param lens_model_list: list of strings with lens model names
+        :param sorted_redshift_index: indexes of the lens models in increasing redshift order
+        """
+        self._sorted_redshift_index = list(sorted_redshift_index)
+        self._fused_single_plane = FusedSinglePlane([lens_model_list[k] for k in self._sorted_redshift_index])
+
+    def ray_shooting_partial(self, x, y, alpha_x, alpha_y, kwargs_lens, plane_start, T_ij_list, T_z_list, factor_list,
+                             T_ij_end):
+        """
+        ray-tracing through a sequence of lens planes
+
+        :param x: co-moving position [Mpc]
+        :param y: co-moving position [Mpc]
+        :param alpha_x: ray angle at the start
+        :param alpha_y: ray angle at the start
+        :param kwargs_lens: lens model keyword argument list
+        :param plane_start: indexes (in the sorted redshift order) of the first lens model of each plane to be
+         evaluated, followed by the index after the last lens model of the last plane
+        :param T_ij_list: transverse distances of the steps before each plane
+        :param T_z_list: transverse distances from the observer to each plane
+        :param factor_list: reduced to physical deflection factors of each plane
+        :param T_ij_end: transverse distance from the last plane to the end of the ray-tracing
+        :return: co-moving position and angles at the end of the ray-tracing
+        """
+        x = np.array(x, dtype=float)
+        shape = x.shape
+        x = x.flatten()
+        y = np.array(y, dtype=float).flatten()
+        alpha_x = np.array(alpha_x, dtype=float) * np.ones(shape)
+        alpha_y = np.array(alpha_y, dtype=float) * np.ones(shape)
+        alpha_x, alpha_y = alpha_x.flatten(), alpha_y.flatten()
+        kwargs_sorted = [kwargs_lens[k] for k in self._sorted_redshift_index]
+        lens_params = self._fused_single_plane._lens_params(kwargs_sorted)
+        _ray_shooting_partial(x, y, alpha_x, alpha_y, self._fused_single_plane._lens_types, lens_params,
+                              np.array(plane_start, dtype=np.int64), np.array(T_ij_list, dtype=float),
+                              np.array(T_z_list, dtype=float), np.array(factor_list, dtype=float), float(T_ij_end))
+        return x.reshape(shape), y.reshape(shape), alpha_x.reshape(shape), alpha_y.reshape(shape)
+
+
+@numba_util.jit()
+def _ray_shooting_partial(x, y, alpha_x, alpha_y, lens_types, lens_params, plane_start, T_ij_list, T_z_list,
+                          factor_list, T_ij_end):
+    """
+    multi-plane recursion, updates x, y, alpha_x and alpha_y in place
+
+    :param x: co-moving x-positions
+    :param y: co-moving y-positions
+    :param alpha_x: ray angles in x-direction
+    :param alpha_y: ray angles in y-direction
+    :param lens_types: profile identifiers in sorted redshift order
+    :param lens_params: parameter table of the profiles in sorted redshift order
+    :param plane_start: index of the first profile of each plane followed by the index after the last profile
+    :param T_ij_list: transverse distances of the steps before each plane
+    :param T_z_list: transverse distances from the observer to each plane
+    :param factor_list: reduced to physical deflection factors of each plane
+    :param T_ij_end: transverse distance from the last plane to the end of the ray-tracing
+    :return: None
+    """
+    num_planes = len(T_ij_list)
+    for i in range(len(x)):
+        x_i, y_i, alpha_x_i, alpha_y_i = x[i], y[i], alpha_x[i], alpha_y[i]
+        for p in range(num_planes):
+            x_i += alpha_x_i * T_ij_list[p]
+            y_i += alpha_y_i * T_ij_list[p]
+            f_x, f_y = _alpha_point_range(x_i / T_z_list[p], y_i / T_z_list[p], lens_types, lens_params,
+                                          plane_start[p], plane_start[p + 1])
+            alpha_x_i -= f_x * factor_list[p]
+            alpha_y_i -= f_y * factor_list[p]
+        x[i] = x_i + alpha_x_i * T_ij_end
+        y[i] = y_i + alpha_y_i * T_ij_end
+        alpha_x[i] = alpha_x_i
+        alpha_y[i] = alpha_y_i
@@ -0,0 +1,374 @@
+import numpy as np
+from lenstronomy.Util import numba_util
+import lenstronomy.Util.param_util as param_util
+from lenstronomy.LensModel.Profiles.nfw import NFW
+from lenstronomy.LensModel.Profiles.epl import EPL
+
+# integer identifiers of the profiles supported by the compiled kernels
+# (SPEMD is the same elliptical power-law profile as EPL and evaluated with the EPL kernel)
+_LENS_TYPES = {'SIE': 0, 'NIE': 0, 'SHEAR': 1, 'NFW': 2, 'EPL': 3, 'SPEMD': 3}
+_LIGHT_TYPES = {'SERSIC_ELLIPSE': 0, 'SHAPELETS': 1}
+_NUM_PARAMS = 10
+
+
+class FusedSinglePlane(object):
+    """
+    compiled execution path of a single lens plane for the most commonly used profiles. The deflections of all lens
+    profiles are accumulated coordinate by coordinate in a single compiled loop (instead of one vectorized call and a
+    set of temporary arrays per profile) and, if requested, the source surface brightness is evaluated in the same pass
+    at the ray-shot position.
+
+    supported lens models: 'SIE', 'NIE', 'SHEAR', 'NFW', 'EPL', 'SPEMD'
+    supported light models: 'SERSIC_ELLIPSE', 'SHAPELETS'
+
+    The results agree with the individual profile classes to numerical precision (the shapelets are evaluated with the
+    stable recursion of the Hermite functions).
+    """
+    lens_models_supported = list(_LENS_TYPES.keys())
+    light_models_supported = list(_LIGHT_TYPES.keys())
+
+    def __init__(self, lens_model_list):
+        """
+
+        :param lens_model_list: list of strings with lens model names
+        """
+        for lens_type in lens_model_list:
+            if lens_type not in _LENS_TYPES:
+                raise ValueError('lens model %s not supported in the fused kernel! Supported are %s.'
+                                 % (lens_type, self.lens_models_supported))
+        self._lens_model_list = lens_model_list
+        self._lens_types = np.array([_LENS_TYPES[lens_type] for lens_type in lens_model_list], dtype=np.int64)
+        self._epl = EPL()
+
+    @classmethod
+    def light_model_supported(cls, light_model_list):
+        """
+
+        :param light_model_list: list of strings with light model names
+        :return: bool, True if all light models can be evaluated in the fused kernel
+        """
+        for light_type in light_model_list:
+            if light_type not in _LIGHT_TYPES:
+                return False
+        return True
+
+    def alpha(self, x, y, kwargs):
+        """
+        deflection angles
+
+        :param x: x-position (preferentially arcsec)
+        :param y: y-position (preferentially arcsec)
+        :param kwargs: list of keyword arguments of lens model parameters matching the lens model classes
+        :return: deflection angles in units of arcsec
+        """
+        x, y, shape = self._flatten(x, y)
+        f_x, f_y = _alpha(x, y, self._lens_types, self._lens_params(kwargs))
+        return f_x.reshape(shape), f_y.reshape(shape)
+
+    def ray_shooting(self, x, y, kwargs):
+        """
+        maps image to source position (inverse deflection)
+
+        :param x: x-position (preferentially arcsec)
+        :param y: y-position (preferentially arcsec)
+        :param kwargs: list of keyword arguments of lens model parameters matching the lens model classes
+        :return: source plane positions corresponding to (x, y) in the image plane
+        """
+        x, y, shape = self._flatten(x, y)
+        f_x, f_y = _alpha(x, y, self._lens_types, self._lens_params(kwargs))
+        return (x - f_x).reshape(shape), (y - f_y).reshape(shape)
+
+    def ray_shooting_surface_brightness(self, x, y, kwargs_lens, light_model, kwargs_light):
+        """
+        surface brightness of the source at the ray-shot positions of (x, y), evaluated in one pass over the
+        coordinates
+
+        :param x: x-position (preferentially arcsec)
+        :param y: y-position (preferentially arcsec)
+        :param kwargs_lens: list of keyword arguments of lens model parameters matching the lens model classes
+        :param light_model: LightModel() class instance with only supported light models
+         (see light_model_supported())
+        :param kwargs_light: list of keyword arguments of the light model
+        :return: surface brightness at the source plane positions of (x, y)
+        """
+        x, y, shape = self._flatten(x, y)
+        light_types, light_params, light_amps, n_max = self._light_params(light_model, kwargs_light)
+        flux = _ray_shooting_surface_brightness(x, y, self._lens_types, self._lens_params(kwargs_lens), light_types,
+                                                light_params, light_amps, n_max)
+        return flux.reshape(shape)
+
+    @staticmethod
+    def _flatten(x, y):
+        """
+
+        :param x: x-coordinates
+        :param y: y-coordinates
+        :return: 1d float arrays of x and y, original shape
+        """
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+        shape = x.shape
+        return x.ravel(), y.ravel(), shape
+
+    def _lens_params(self, kwargs):
+        """
+        converts the lens keyword arguments into the parameter table of the compiled kernel
+
+        :param kwargs: list of keyword arguments of lens model parameters matching the lens model classes
+        :return: 2d float array (num profiles, _NUM_PARAMS)
+        """
+        params = np.zeros((len(self._lens_model_list), _NUM_PARAMS))
+        for i, lens_type in enumerate(self._lens_model_list):
+            kw = kwargs[i]
+            if lens_type in ['SIE', 'NIE']:
+                s_scale = kw['s_scale'] if lens_type == 'NIE' else 0.0000000001
+                phi_G, q = param_util.ellipticity2phi_q(kw['e1'], kw['e2'])
+                theta_E = kw['theta_E'] / (np.sqrt((1. + q ** 2) / (2. * q))) / (1 + (1 - q) / 2.)
+                if q >= 1:
+                    q = 0.99999999
+                params[i, :7] = [kw.get('center_x', 0), kw.get('center_y', 0), np.cos(phi_G), np.sin(phi_G),
+                                 s_scale, q, theta_E]
+            elif lens_type == 'SHEAR':
+                params[i, :4] = [kw.get('ra_0', 0), kw.get('dec_0', 0), kw['gamma1'], kw['gamma2']]
+            elif lens_type == 'NFW':
+                Rs = kw['Rs']
+                rho0 = NFW._alpha2rho0(alpha_Rs=kw['alpha_Rs'], Rs=Rs)
+                params[i, :4] = [kw.get('center_x', 0), kw.get('center_y', 0), max(Rs, 0.0000001), rho0]
+            elif lens_type in ['EPL', 'SPEMD']:
+                b, t, q, phi_G = self._epl.param_conv(kw['theta_E'], kw['gamma'], kw['e1'], kw['e2'])
+                num_iter = self._epl.epl_major_axis.num_iter(q)
+                params[i, :8] = [kw.get('center_x', 0), kw.get('center_y', 0), np.cos(phi_G), np.sin(phi_G), b, t,
+                                 q, num_iter]
+        return params
+
+    @staticmethod
+    def _light_params(light_model, kwargs):
+        """
+        converts the light keyword arguments into the parameter table of the compiled kernel
+
+        :param light_model: LightModel() class instance
+        :param kwargs: list of keyword arguments of the light model
+        :return: light type identifiers, parameter table, concatenated shapelet amplitudes, maximal shapelet order
+        """
+        light_model_list = light_model.profile_type_list
+        kwargs = light_model._transform_kwargs(kwargs)
+        light_types = np.array([_LIGHT_TYPES[light_type] for light_type in light_model_list], dtype=np.int64)
+        params = np.zeros((len(light_model_list), _NUM_PARAMS))
+        amps = []
+        num_amps = 0
+        n_max_total = 0
+        for i, light_type in enumerate(light_model_list):
+            kw = kwargs[i]
+            if light_type == 'SERSIC_ELLIPSE':
+                phi_G, q = param_util.ellipticity2phi_q(kw['e1'], kw['e2'])
+                n_sersic = kw['n_sersic']
+                bn = light_model.func_list[i].b_n(n_sersic)
+                params[i] = [kw.get('center_x', 0), kw.get('center_y', 0), np.cos(phi_G), np.sin(phi_G), q,
+                             kw['amp'], max(0, kw['R_sersic']), n_sersic, bn, light_model.func_list[i]._smoothing]
+            elif light_type == 'SHAPELETS':
+                n_max = int(kw['n_max'])
+                num_param = int((n_max + 1) * (n_max + 2) / 2)
+                params[i, :5] = [kw.get('center_x', 0), kw.get('center_y', 0), kw['beta'], n_max, num_amps]
+                amps.append(np.array(kw['amp'], dtype=float)[:num_param])
+                num_amps += num_param
+                n_max_total = max(n_max_total, n_max)
+        if len(amps) > 0:
+            amps = np.concatenate(amps)
+        else:
+            amps = np.zeros(0)
+        return light_types, params, amps, n_max_total
+
+
+@numba_util.jit()
+def _alpha_point(x, y, lens_types, lens_params):
+    """
+    sum of the deflections of all lens profiles at a single position
+
+    :param x: x-coordinate
+    :param y: y-coordinate
+    :param lens_types: profile identifiers
+    :param lens_params: parameter table of the profiles
+    :return: f_x, f_y
+    """
+    return _alpha_point_range(x, y, lens_types, lens_params, 0, len(lens_types))
+
+
+@numba_util.jit()
+def _alpha_point_range(x, y, lens_types, lens_params, start, stop):
+    """
+    sum of the deflections of the lens profiles start, ..., stop - 1 at a single position
+
+    :param x: x-coordinate
+    :param y: y-coordinate
+    :param lens_types: profile identifiers
+    :param lens_params: parameter table of the profiles
+    :param start: index of the first profile
+    :param stop: index after the last profile
+    :return: f_x, f_y
+    """
+    f_x = 0.
+    f_y = 0.
+    for j in range(start, stop):
+        if lens_types[j] == 0:
+            # NIE (Keeton & Kochanek 1998), in the frame aligned with the major axis
+            x_ = x - lens_params[j, 0]
+            y_ = y - lens_params[j, 1]
+            cos_phi, sin_phi, s = lens_params[j, 2], lens_params[j, 3], lens_params[j, 4]
+            q, theta_E = lens_params[j, 5], lens_params[j, 6]
+            x__ = x_ * cos_phi + y_ * sin_phi
+            y__ = -x_ * sin_phi + y_ * cos_phi
+            psi = np.sqrt(q ** 2 * (s ** 2 + x__ ** 2) + y__ ** 2)
+            sqrt_q = np.sqrt(1. - q ** 2)
+            f__x = theta_E / sqrt_q * np.arctan(sqrt_q * x__ / (psi + s))
+            f__y = theta_E / sqrt_q * np.arctanh(sqrt_q * y__ / (psi + q ** 2 * s))
+            f_x += f__x * cos_phi - f__y * sin_phi
+            f_y += f__x * sin_phi + f__y * cos_phi
+        elif lens_types[j] == 1:
+            # external shear
+            x_ = x - lens_params[j, 0]
+            y_ = y - lens_params[j, 1]
+            f_x += lens_params[j, 2] * x_ + lens_params[j, 3] * y_
+            f_y += lens_params[j, 3] * x_ - lens_params[j, 2] * y_
+        elif lens_types[j] == 2:
+            # NFW
+            x_ = x - lens_params[j, 0]
+            y_ = y - lens_params[j, 1]
+            Rs, rho0 = lens_params[j, 2], lens_params[j, 3]
+            R = max(np.sqrt(x_ ** 2 + y_ ** 2), 0.00000001)
+            X = max(R / Rs, 0.000001)
+            if X < 1:
+                g = np.log(X / 2.) + 1 / np.sqrt(1 - X ** 2) * np.arccosh(1. / X)
+            elif X == 1:
+                g = 1 + np.log(1. / 2.)
+            else:
+                g = np.log(X / 2) + 1 / np.sqrt(X ** 2 - 1) * np.arccos(1. / X)
+            a = 4 * rho0 * Rs * g / X ** 2
+            f_x += a * x_
+            f_y += a * y_
+        elif lens_types[j] == 3:
+            # EPL, hypergeometric series of Tessore & Metcalf (2015) in the frame aligned with the major axis
+            x_ = x - lens_params[j, 0]
+            y_ = y - lens_params[j, 1]
+            cos_phi, sin_phi, b = lens_params[j, 2], lens_params[j, 3], lens_params[j, 4]
+            t, q, num_iter = lens_params[j, 5], lens_params[j, 6], int(lens_params[j, 7])
+            x__ = x_ * cos_phi + y_ * sin_phi
+            y__ = -x_ * sin_phi + y_ * cos_phi
+            R = np.sqrt((q * x__) ** 2 + y__ ** 2)
+            if R > 0:
+                phi = np.arctan2(y__, q * x__)
+                omega_n = np.exp(1j * phi)
+                omega = omega_n
+                factor = -(1. - q) / (1. + q) * np.exp(2j * phi)
+                for n in range(1, num_iter + 1):
+                    omega_n = factor * (2. * n - (2 - t)) / (2. * n + (2 - t)) * omega_n
+                    omega += omega_n
+                alpha = 2 * b ** t / (1 + q) * max(R, 0.000000001) ** (1 - t) * omega
+                f_x += alpha.real * cos_phi - alpha.imag * sin_phi
+                f_y += alpha.real * sin_phi + alpha.imag * cos_phi
+    return f_x, f_y
+
+
+@numba_util.jit()
+def _alpha(x, y, lens_types, lens_params):
+    """
+
+    :param x: 1d array of x-coordinates
+    :param y: 1d array of y-coordinates
+    :param lens_types: profile identifiers
+    :param lens_params: parameter table of the profiles
+    :return: deflection angles f_x, f_y
+    """
+    num = len(x)
+    f_x = np.zeros(num)
+    f_y = np.zeros(num)
+    for i in range(num):
+        f_x[i], f_y[i] = _alpha_point(x[i], y[i], lens_types, lens_params)
+    return f_x, f_y
+
+
+@numba_util.jit()
+def _hermite_functions(x, n_max, phi):
+    """
+    1d shapelet basis functions (Hermite functions, formula (1) in Refregier et al. 2001) of order 0 to n_max,
+    computed with the stable three-term recursion
+
+    :param x: dimensionless position
+    :param n_max: maximal order
+    :param phi: array of length >= n_max + 1 that is filled
+    :return: None
+    """
+    phi[0] = np.pi ** (-0.25) * np.exp(-x ** 2 / 2.)
+    if n_max > 0:
+        phi[1] = np.sqrt(2.) * x * phi[0]
+    for n in range(1, n_max):
+        phi[n + 1] = np.sqrt(2. / (n + 1)) * x * phi[n] - np.sqrt(n / (n + 1.)) * phi[n - 1]
+
+
+@numba_util.jit()
+def _surface_brightness_point(x, y, light_types, light_params, light_amps, phi_x, phi_y):
+    """
+    sum of the surface brightness of all light profiles at a single position
+
+    :param x: x-coordinate
+    :param y: y-coordinate
+    :param light_types: profile identifiers
+    :param light_params: parameter table of the profiles
+    :param light_amps: concatenated shapelet amplitudes
+    :param phi_x: work array for the shapelet basis in x
+    :param phi_y: work array for the shapelet basis in y
+    :return: surface brightness
+    """
+    flux = 0.
+    for j in range(len(light_types)):
+        if light_types[j] == 0:
+            # elliptical Sersic
+            x_ = x - light_params[j, 0]
+            y_ = y - light_params[j, 1]
+            cos_phi, sin_phi, q = light_params[j, 2], light_params[j, 3], light_params[j, 4]
+            amp, R_sersic, n_sersic = light_params[j, 5], light_params[j, 6], light_params[j, 7]
+            bn, smoothing = light_params[j, 8], light_params[j, 9]
+            xt1 = cos_phi * x_ + sin_phi * y_
+            xt2 = -sin_phi * x_ + cos_phi * y_
+            R = max(np.sqrt(xt1 * xt1 + xt2 * xt2 / (q * q)), smoothing)
+            R_frac = R / R_sersic
+            if R_frac <= 100:
+                value = amp * np.exp(-bn * (R_frac ** (1. / n_sersic) - 1.))
+                if np.isfinite(value):
+                    flux += value
+        elif light_types[j] == 1:
+            # shapelet set
+            beta = light_params[j, 2]
+            n_max = int(light_params[j, 3])
+            index = int(light_params[j, 4])
+            _hermite_functions((x - light_params[j, 0]) / beta, n_max, phi_x)
+            _hermite_functions((y - light_params[j, 1]) / beta, n_max, phi_y)
+            for n in range(n_max + 1):
+                for n2 in range(n + 1):
+                    flux += light_amps[index] * phi_x[n - n2] * phi_y[n2]
+                    index += 1
+    return flux
+
+
+@numba_util.jit()
+def _ray_shooting_surface_brightness(x, y, lens_types, lens_params, light_types, light_params, light_amps, n_max):
+    """
+
+    :param x: 1d array of x-coordinates
+    :param y: 1d array of y-coordinates
+    :param lens_types: lens profile identifiers
+    :param lens_params: parameter table of the lens profiles
+    :param light_types: light profile identifiers
+    :param light_params: parameter table of the light profiles
+    :param light_amps: concatenated shapelet amplitudes
+    :param n_max: maximal shapelet order of all light profiles
+    :return: surface brightness at the source plane positions
+    """
+    num = len(x)
+    flux = np.zeros(num)
+    phi_x = np.zeros(n_max + 1)
+    phi_y = np.zeros(n_max + 1)
+    for i in range(num):
+        f_x, f_y = _alpha_point(x[i], y[i], lens_types, lens_params)
+        flux[i] = _surface_brightness_point(x[i] - f_x, y[i] - f_y, light_types, light_params, light_amps, phi_x,
+                                            phi_y)
+    return flux
@@ -13,7 +13,9 @@ class LensModel(object):
     """
 
     def __init__(self, lens_model_list, z_lens=None, z_source=None, lens_redshift_list=None, cosmo=None,
-                 multi_plane=False, numerical_alpha_class=None, observed_convention_index=None, z_source_convention=None):
+                 multi_plane=False, numerical_alpha_class=None, observed_convention_index=None, z_source_convention=None,
+                 fused_kernel=False, tabulated_index=None, tabulation_tolerance=0.0001, tree_index=None,
+                 kwargs_tree=None, cosmo_interp=False):
         """
 
         :param lens_model_list: list of strings with lens model names
@@ -31,6 +33,16 @@ class LensModel(object):
         physical positions
         :param z_source_convention: float, redshift of a source to define the reduced deflection angles of the lens
         models. If None, 'z_source' is used.
+        :param fused_kernel: bool, if True, uses the compiled kernels of FusedSinglePlane to compute the deflection
+        angles (for the lens models supported, see FusedSinglePlane and FusedMultiPlane)
+        :param tabulated_index: list of indexes of the lens models that are evaluated with interpolated lookup tables
+        of their radial profiles (see Profiles.tabulated.TabulatedProfile for the supported lens models)
+        :param tabulation_tolerance: relative interpolation error tolerated in the lookup tables
+        :param tree_index: list of indexes of spherically symmetric lens models (e.g. sub-halos) whose deflection
+        angles are aggregated with a Barnes-Hut tree (per lens plane in multi-plane mode, see TreeDeflection)
+        :param kwargs_tree: keyword arguments of TreeDeflection (e.g. opening_angle, multipole_order)
+        :param cosmo_interp: bool, if True, the cosmological distances are computed from an interpolation of the
+        comoving distance (see Cosmo.cosmo_interp.CosmoInterp)
         """
         self.lens_model_list = lens_model_list
         self.z_lens = z_lens
@@ -51,12 +63,18 @@ class LensModel(object):
             self.lens_model = MultiPlane(z_source, lens_model_list, lens_redshift_list, cosmo=cosmo,
                                          numerical_alpha_class=numerical_alpha_class,
                                          observed_convention_index=observed_convention_index,
-                                         z_source_convention=z_source_convention)
+                                         z_source_convention=z_source_convention,
+                                         tabulated_index=tabulated_index, tabulation_tolerance=tabulation_tolerance,
+                                         tree_index=tree_index, kwargs_tree=kwargs_tree, fused_kernel=fused_kernel,
+                                         cosmo_interp=cosmo_interp)
         else:
             self.lens_model = SinglePlane(lens_model_list, numerical_alpha_class=numerical_alpha_class,
-                                          lens_redshift_list=lens_redshift_list, z_source_convention=z_source_convention)
+                                          lens_redshift_list=lens_redshift_list, z_source_convention=z_source_convention,
+                                          fused_kernel=fused_kernel, tabulated_index=tabulated_index,
+                                          tabulation_tolerance=tabulation_tolerance, tree_index=tree_index,
+                                          kwargs_tree=kwargs_tree)
         if z_lens is not None and z_source is not None:
-            self._lensCosmo = LensCosmo(z_lens, z_source, cosmo=cosmo)
+            self._lensCosmo = LensCosmo(z_lens, z_source, cosmo=cosmo, interp=cosmo_interp)
 
     def ray_shooting(self, x, y, kwargs, k=None):
         """
@@ -12,7 +12,9 @@ class MultiPlane(object):
     """
 
     def __init__(self, z_source, lens_model_list, lens_redshift_list, cosmo=None, numerical_alpha_class=None,
-                 observed_convention_index=None, ignore_observed_positions=False, z_source_convention=None):
+                 observed_convention_index=None, ignore_observed_positions=False, z_source_convention=None,
+                 tabulated_index=None, tabulation_tolerance=0.0001, tree_index=None, kwargs_tree=None,
+                 fused_kernel=False, cosmo_interp=False):
         """
 
         :param z_source: source redshift for default computation of reduced lensing quantities
@@ -28,6 +30,16 @@ class MultiPlane(object):
         position of deflectors
         :param z_source_convention: float, redshift of a source to define the reduced deflection angles of the lens
         models. If None, 'z_source' is used.
+        :param tabulated_index: list of indexes of the lens models that are evaluated with interpolated lookup tables
+        (see Profiles.tabulated.TabulatedProfile for the supported lens models)
+        :param tabulation_tolerance: relative interpolation error tolerated in the lookup tables
+        :param tree_index: list of indexes of spherically symmetric lens models (e.g. sub-halos) whose deflection
+        angles are aggregated with a Barnes-Hut tree per lens plane (see TreeDeflection for the supported lens models)
+        :param kwargs_tree: keyword arguments of TreeDeflection (e.g. opening_angle, multipole_order)
+        :param fused_kernel: bool, if True, the rays are propagated through all lens planes in a compiled loop (see
+        FusedMultiPlane, only for the lens models supported by FusedSinglePlane)
+        :param cosmo_interp: bool, if True, the cosmological distances are computed from an interpolation of the
+        comoving distance (see Cosmo.cosmo_interp.CosmoInterp)
         """
 
         if z_source_convention is None:
@@ -35,7 +47,11 @@ class MultiPlane(object):
         self._multi_plane_base = MultiPlaneBase(lens_model_list=lens_model_list,
                                                 lens_redshift_list=lens_redshift_list, cosmo=cosmo,
                                                 numerical_alpha_class=numerical_alpha_class,
-                                                z_source_convention=z_source_convention)
+                                                z_source_convention=z_source_convention,
+                                                tabulated_index=tabulated_index,
+                                                tabulation_tolerance=tabulation_tolerance,
+                                                tree_index=tree_index, kwargs_tree=kwargs_tree,
+                                                fused_kernel=fused_kernel, cosmo_interp=cosmo_interp)
 
         self._set_source_distances(z_source)
         self._observed_convention_index = observed_convention_index
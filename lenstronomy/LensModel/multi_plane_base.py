@@ -13,7 +13,9 @@ class MultiPlaneBase(ProfileListBase):
     sourde redshift of the class instance.
     """
 
-    def __init__(self, lens_model_list, lens_redshift_list, z_source_convention, cosmo=None, numerical_alpha_class=None):
+    def __init__(self, lens_model_list, lens_redshift_list, z_source_convention, cosmo=None, numerical_alpha_class=None,
+                 tabulated_index=None, tabulation_tolerance=0.0001, tree_index=None, kwargs_tree=None,
+                 fused_kernel=False, cosmo_interp=False):
         """
 
         :param lens_model_list: list of lens model strings
@@ -23,9 +25,21 @@ class MultiPlaneBase(ProfileListBase):
         :param cosmo: instance of astropy.cosmology
         :param numerical_alpha_class: an instance of a custom class for use in NumericalAlpha() lens model
         (see documentation in Profiles/numerical_alpha)
+        :param tabulated_index: list of indexes of the lens models that are evaluated with interpolated lookup tables
+        (see Profiles.tabulated.TabulatedProfile for the supported lens models)
+        :param tabulation_tolerance: relative interpolation error tolerated in the lookup tables
+        :param tree_index: list of indexes of spherically symmetric lens models (e.g. sub-halos) whose deflection
+        angles are aggregated with a Barnes-Hut tree per lens plane (see TreeDeflection for the supported lens models)
+        :param kwargs_tree: keyword arguments of TreeDeflection (e.g. opening_angle, multipole_order)
+        :param fused_kernel: bool, if True, ray_shooting_partial() propagates the rays through all lens planes in a
+        compiled loop (see FusedMultiPlane, only for the lens models supported by FusedSinglePlane)
+        :param cosmo_interp: bool, if True, the cosmological distances are computed from an interpolation of the
+        comoving distance (see Cosmo.cosmo_interp.CosmoInterp)
 
         """
-        self._cosmo_bkg = Background(cosmo)
+        self._cosmo_bkg = Background(cosmo, interp=cosmo_interp)
+        self._T_xy_cache = {}
+        self._D_dt_cache = {}
         self._z_source_convention = z_source_convention
         if len(lens_redshift_list) > 0:
             z_lens_max = np.max(lens_redshift_list)
@@ -38,7 +52,8 @@ class MultiPlaneBase(ProfileListBase):
 
         self._lens_redshift_list = lens_redshift_list
         super(MultiPlaneBase, self).__init__(lens_model_list, numerical_alpha_class=numerical_alpha_class,
-                                       lens_redshift_list=lens_redshift_list, z_source_convention=z_source_convention)
+                                       lens_redshift_list=lens_redshift_list, z_source_convention=z_source_convention,
+                                       tabulated_index=tabulated_index, tabulation_tolerance=tabulation_tolerance)
 
         if len(lens_model_list) < 1:
             self._sorted_redshift_index = []
@@ -54,13 +69,22 @@ class MultiPlaneBase(ProfileListBase):
             if z_before == z_lens:
                 delta_T = 0
             else:
-                T_z = self._cosmo_bkg.T_xy(0, z_lens)
-                delta_T = self._cosmo_bkg.T_xy(z_before, z_lens)
+                T_z = self._T_xy(0, z_lens)
+                delta_T = self._T_xy(z_before, z_lens)
             self._T_ij_list.append(delta_T)
             self._T_z_list.append(T_z)
             factor = self._cosmo_bkg.D_xy(0, z_source_convention) / self._cosmo_bkg.D_xy(z_lens, z_source_convention)
             self._reduced2physical_factor.append(factor)
             z_before = z_lens
+        self._set_planes()
+        self._set_trees(lens_model_list, tree_index, kwargs_tree)
+        if fused_kernel is True:
+            if tree_index is not None:
+                raise ValueError('fused_kernel and tree_index can not be used at the same time.')
+            from lenstronomy.LensModel.fused_multi_plane import FusedMultiPlane
+            self._fused = FusedMultiPlane(lens_model_list, self._sorted_redshift_index)
+        else:
+            self._fused = None
 
     def ray_shooting_partial(self, x, y, alpha_x, alpha_y, z_start, z_stop, kwargs_lens,
                              include_z_start=False, T_ij_start=None, T_ij_end=None):
@@ -84,40 +108,41 @@ class MultiPlaneBase(ProfileListBase):
          If not set, will compute the distance each time this function gets executed.
         :return: co-moving position and angles at redshift z_stop
         """
-        x = np.array(x, dtype=float)
-        y = np.array(y, dtype=float)
-        alpha_x = np.array(alpha_x)
-        alpha_y = np.array(alpha_y)
-        z_lens_last = z_start
-        first_deflector = True
-
-        for i, idex in enumerate(self._sorted_redshift_index):
-            z_lens = self._lens_redshift_list[idex]
-
-            if self._start_condition(include_z_start, z_lens, z_start) and z_lens <= z_stop:
-                if first_deflector is True:
-                    if T_ij_start is None:
-                        if z_start == 0:
-                            delta_T = self._T_ij_list[0]
-                        else:
-                            delta_T = self._cosmo_bkg.T_xy(z_start, z_lens)
-                    else:
-                        delta_T = T_ij_start
-                    first_deflector = False
+        planes = [p for p, z_lens in enumerate(self._plane_redshift_list)
+                  if self._start_condition(include_z_start, z_lens, z_start) and z_lens <= z_stop]
+        if len(planes) > 0:
+            z_lens_first = self._plane_redshift_list[planes[0]]
+            z_lens_last = self._plane_redshift_list[planes[-1]]
+            if T_ij_start is None:
+                if z_start == 0:
+                    T_ij_start = self._plane_T_ij_list[0]
                 else:
-                    delta_T = self._T_ij_list[i]
-                x, y = self._ray_step_add(x, y, alpha_x, alpha_y, delta_T)
-                alpha_x, alpha_y = self._add_deflection(x, y, alpha_x, alpha_y, kwargs_lens, i)
-
-                z_lens_last = z_lens
+                    T_ij_start = self._T_xy(z_start, z_lens_first)
+        else:
+            z_lens_last = z_start
         if T_ij_end is None:
             if z_lens_last == z_stop:
-                delta_T = 0
+                T_ij_end = 0
             else:
-                delta_T = self._cosmo_bkg.T_xy(z_lens_last, z_stop)
-        else:
-            delta_T = T_ij_end
-        x, y = self._ray_step_add(x, y, alpha_x, alpha_y, delta_T)
+                T_ij_end = self._T_xy(z_lens_last, z_stop)
+        T_ij_list = [T_ij_start] + [self._plane_T_ij_list[p] for p in planes[1:]]
+
+        if self._fused is not None:
+            # the selected planes are contiguous in the sorted redshift order
+            plane_start = [self._plane_start_list[p] for p in planes] + [self._plane_start_list[p + 1] for p in planes[-1:]]
+            T_z_list = [self._T_z_list[self._plane_start_list[p]] for p in planes]
+            factor_list = [self._reduced2physical_factor[self._plane_start_list[p]] for p in planes]
+            return self._fused.ray_shooting_partial(x, y, alpha_x, alpha_y, kwargs_lens, plane_start,
+                                                    T_ij_list[:len(planes)], T_z_list, factor_list, T_ij_end)
+
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+        alpha_x = np.array(alpha_x)
+        alpha_y = np.array(alpha_y)
+        for p, delta_T in zip(planes, T_ij_list):
+            x, y = self._ray_step_add(x, y, alpha_x, alpha_y, delta_T)
+            alpha_x, alpha_y = self._add_deflection_plane(x, y, alpha_x, alpha_y, kwargs_lens, p)
+        x, y = self._ray_step_add(x, y, alpha_x, alpha_y, T_ij_end)
         return x, y, alpha_x, alpha_y
 
     def transverse_distance_start_stop(self, z_start, z_stop, include_z_start=False):
@@ -136,10 +161,10 @@ class MultiPlaneBase(ProfileListBase):
             z_lens = self._lens_redshift_list[idex]
             if self._start_condition(include_z_start, z_lens, z_start) and z_lens <= z_stop:
                 if first_deflector is True:
-                    T_ij_start = self._cosmo_bkg.T_xy(z_start, z_lens)
+                    T_ij_start = self._T_xy(z_start, z_lens)
                     first_deflector = False
                 z_lens_last = z_lens
-        T_ij_end = self._cosmo_bkg.T_xy(z_lens_last, z_stop)
+        T_ij_end = self._T_xy(z_lens_last, z_stop)
         return T_ij_start, T_ij_end
 
     def ray_shooting_partial_steps(self, x, y, alpha_x, alpha_y, z_start, z_stop, kwargs_lens,
@@ -169,7 +194,7 @@ class MultiPlaneBase(ProfileListBase):
         pos_x.append(x)
         pos_y.append(y)
         redshifts.append(z_start)
-        Tz_list.append(self._cosmo_bkg.T_xy(0, z_start))
+        Tz_list.append(self._T_xy(0, z_start))
 
         current_z = z_lens_last
 
@@ -187,7 +212,7 @@ class MultiPlaneBase(ProfileListBase):
                     new_plane = False
 
                 if first_deflector is True:
-                    delta_T = self._cosmo_bkg.T_xy(z_start, z_lens)
+                    delta_T = self._T_xy(z_start, z_lens)
 
                     first_deflector = False
                 else:
@@ -203,14 +228,14 @@ class MultiPlaneBase(ProfileListBase):
                     redshifts.append(z_lens)
                     Tz_list.append(self._T_z_list[i])
 
-        delta_T = self._cosmo_bkg.T_xy(z_lens_last, z_stop)
+        delta_T = self._T_xy(z_lens_last, z_stop)
 
         x, y = self._ray_step_add(x, y, alpha_x, alpha_y, delta_T)
 
         pos_x.append(x)
         pos_y.append(y)
         redshifts.append(z_stop)
-        T_z_source = self._cosmo_bkg.T_xy(0, z_stop)
+        T_z_source = self._T_xy(0, z_stop)
         Tz_list.append(T_z_source)
 
         return pos_x, pos_y, redshifts, Tz_list
@@ -257,11 +282,11 @@ class MultiPlaneBase(ProfileListBase):
                 dt_grav += dt_grav_new
                 z_lens_last = z_lens
         if T_ij_end is None:
-            T_ij_end = self._cosmo_bkg.T_xy(z_lens_last, z_stop)
+            T_ij_end = self._T_xy(z_lens_last, z_stop)
         T_ij = T_ij_end
         x_new, y_new = self._ray_step(x, y, alpha_x, alpha_y, T_ij)
         if T_z_stop is None:
-            T_z_stop = self._cosmo_bkg.T_xy(0, z_stop)
+            T_z_stop = self._T_xy(0, z_stop)
         T_j = T_z_stop
         T_i = self._T_z_list[i]
         beta_i_x, beta_i_y = x / T_i, y / T_i
@@ -339,7 +364,9 @@ class MultiPlaneBase(ProfileListBase):
         :param z_source: redshift of source for the definition of the lensing quantities
         :return: gravitational time-delay in units of days
         """
-        D_dt = self._cosmo_bkg.D_dt(z_lens, z_source)
+        if (z_lens, z_source) not in self._D_dt_cache:
+            self._D_dt_cache[(z_lens, z_source)] = self._cosmo_bkg.D_dt(z_lens, z_source)
+        D_dt = self._D_dt_cache[(z_lens, z_source)]
         delay_days = const.delay_arcsec2days(potential, D_dt)
         return delay_days
 
@@ -402,13 +429,105 @@ class MultiPlaneBase(ProfileListBase):
         :param idex_lens: redshift of the deflector plane
         :return: updated physical deflection after deflector plane (in a backwards ray-tracing perspective)
         """
-        theta_x, theta_y = self._co_moving2angle(x, y, index)
         k = self._sorted_redshift_index[index]
-        alpha_x_red, alpha_y_red = self.func_list[k].derivatives(theta_x, theta_y, **kwargs_lens[k])
+        if k in self._tree_members:
+            # already accounted for in the aggregated deflection of the lens plane
+            return alpha_x, alpha_y
+        theta_x, theta_y = self._co_moving2angle(x, y, index)
+        if k in self._trees:
+            tree, index_plane = self._trees[k]
+            alpha_x_red, alpha_y_red = tree.derivatives(theta_x, theta_y, [kwargs_lens[i] for i in index_plane])
+        else:
+            alpha_x_red, alpha_y_red = self.func_list[k].derivatives(theta_x, theta_y, **kwargs_lens[k])
         alpha_x_phys = self._reduced2physical_deflection(alpha_x_red, index)
         alpha_y_phys = self._reduced2physical_deflection(alpha_y_red, index)
         return alpha_x - alpha_x_phys, alpha_y - alpha_y_phys
 
+    def _T_xy(self, z_observer, z_source):
+        """
+        transverse comoving distance, cached for repeated calls with the same redshifts
+
+        :param z_observer: observer redshift
+        :param z_source: source redshift
+        :return: transverse comoving distance in units of Mpc
+        """
+        if (z_observer, z_source) not in self._T_xy_cache:
+            self._T_xy_cache[(z_observer, z_source)] = self._cosmo_bkg.T_xy(z_observer, z_source)
+        return self._T_xy_cache[(z_observer, z_source)]
+
+    def _set_planes(self):
+        """
+        groups the lens models at the same redshift into lens planes. The planes are described by their redshift, the
+        transverse distance to the previous plane and the index of their first lens model in the sorted redshift list.
+
+        :return: None
+        """
+        self._plane_redshift_list = []
+        self._plane_T_ij_list = []
+        self._plane_start_list = []
+        for i, idex in enumerate(self._sorted_redshift_index):
+            z_lens = self._lens_redshift_list[idex]
+            if len(self._plane_redshift_list) == 0 or z_lens != self._plane_redshift_list[-1]:
+                self._plane_redshift_list.append(z_lens)
+                self._plane_T_ij_list.append(self._T_ij_list[i])
+                self._plane_start_list.append(i)
+        self._plane_start_list.append(len(self._sorted_redshift_index))
+
+    def _add_deflection_plane(self, x, y, alpha_x, alpha_y, kwargs_lens, plane_index):
+        """
+        adds the physical deflection angles of all lens models of a lens plane to the deflection field
+
+        :param x: co-moving distance at the deflector plane
+        :param y: co-moving distance at the deflector plane
+        :param alpha_x: physical angle (radian) before the deflector plane
+        :param alpha_y: physical angle (radian) before the deflector plane
+        :param kwargs_lens: lens model parameter kwargs
+        :param plane_index: index of the lens plane
+        :return: updated physical deflection after deflector plane (in a backwards ray-tracing perspective)
+        """
+        start, stop = self._plane_start_list[plane_index], self._plane_start_list[plane_index + 1]
+        theta_x, theta_y = self._co_moving2angle(x, y, start)
+        alpha_x_red, alpha_y_red = 0, 0
+        for index in range(start, stop):
+            k = self._sorted_redshift_index[index]
+            if k in self._tree_members:
+                continue
+            if k in self._trees:
+                tree, index_plane = self._trees[k]
+                f_x, f_y = tree.derivatives(theta_x, theta_y, [kwargs_lens[i] for i in index_plane])
+            else:
+                f_x, f_y = self.func_list[k].derivatives(theta_x, theta_y, **kwargs_lens[k])
+            alpha_x_red = alpha_x_red + f_x
+            alpha_y_red = alpha_y_red + f_y
+        alpha_x_phys = self._reduced2physical_deflection(alpha_x_red, start)
+        alpha_y_phys = self._reduced2physical_deflection(alpha_y_red, start)
+        return alpha_x - alpha_x_phys, alpha_y - alpha_y_phys
+
+    def _set_trees(self, lens_model_list, tree_index, kwargs_tree):
+        """
+        groups the lens models to be aggregated per lens plane. The deflection of a group is computed when the first
+        lens model of the group (in the sorted redshift order) is reached and skipped for the other members.
+
+        :param lens_model_list: list of lens model strings
+        :param tree_index: list of indexes of the lens models to be aggregated
+        :param kwargs_tree: keyword arguments of TreeDeflection
+        :return: None
+        """
+        self._trees = {}
+        self._tree_members = set()
+        if tree_index is None:
+            return
+        from lenstronomy.LensModel.tree_deflection import TreeDeflection
+        if kwargs_tree is None:
+            kwargs_tree = {}
+        for z_lens in np.unique([self._lens_redshift_list[i] for i in tree_index]):
+            index_plane = [k for k in self._sorted_redshift_index
+                           if k in tree_index and self._lens_redshift_list[k] == z_lens]
+            tree = TreeDeflection([lens_model_list[k] for k in index_plane], [self.func_list[k] for k in index_plane],
+                                  **kwargs_tree)
+            self._trees[index_plane[0]] = (tree, index_plane)
+            self._tree_members.update(index_plane[1:])
+
     @staticmethod
     def _start_condition(inclusive, z_lens, z_start):
 
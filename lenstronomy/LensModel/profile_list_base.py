@@ -6,17 +6,23 @@ class ProfileListBase(object):
     class that manages the list of lens model class instances. This class is applicable for single plane and multi
     plane lensing
     """
-    def __init__(self, lens_model_list, numerical_alpha_class=None, lens_redshift_list=None, z_source_convention=None):
+    def __init__(self, lens_model_list, numerical_alpha_class=None, lens_redshift_list=None, z_source_convention=None,
+                 tabulated_index=None, tabulation_tolerance=0.0001):
         """
 
         :param lens_model_list: list of strings with lens model names
         :param numerical_alpha_class: an instance of a custom class for use in NumericalAlpha() lens model
         deflection angles as a lens model. See the documentation in Profiles.numerical_deflections
+        :param tabulated_index: list of indexes of the lens models that are evaluated with interpolated lookup tables
+        (see Profiles.tabulated.TabulatedProfile for the supported lens models)
+        :param tabulation_tolerance: relative interpolation error tolerated in the lookup tables
         """
 
         self.func_list = self._load_model_instances(lens_model_list, custom_class=numerical_alpha_class,
                                                     lens_redshift_list=lens_redshift_list,
                                                     z_source_convention=z_source_convention)
+        if tabulated_index is not None:
+            self._tabulate(lens_model_list, tabulated_index, tabulation_tolerance)
         self._num_func = len(self.func_list)
         self._model_list = lens_model_list
 
@@ -42,6 +48,23 @@ class ProfileListBase(object):
             func_list.append(lensmodel_class)
         return func_list
 
+    def _tabulate(self, lens_model_list, tabulated_index, tolerance):
+        """
+        replaces the lens model instances of the indexes by lookup-table accelerated instances
+
+        :param lens_model_list: list of strings with lens model names
+        :param tabulated_index: list of indexes of the lens models to be tabulated
+        :param tolerance: relative interpolation error tolerated in the lookup tables
+        :return: None
+        """
+        from lenstronomy.LensModel.Profiles.tabulated import TabulatedProfile
+        for i in tabulated_index:
+            if lens_model_list[i] not in TabulatedProfile.profiles_supported:
+                raise ValueError('lens model %s can not be tabulated. Supported are %s.'
+                                 % (lens_model_list[i], TabulatedProfile.profiles_supported))
+            # each tabulated profile requires its own instance as the tables are specific to the parameters
+            self.func_list[i] = TabulatedProfile(self.func_list[i], tolerance=tolerance)
+
     @staticmethod
     def _import_class(lens_type, custom_class, z_lens=None, z_source=None):
         """
@@ -107,6 +130,9 @@ class ProfileListBase(object):
         elif lens_type == 'SPEMD':
             from lenstronomy.LensModel.Profiles.spemd import SPEMD
             return SPEMD()
+        elif lens_type == 'EPL':
+            from lenstronomy.LensModel.Profiles.epl import EPL
+            return EPL()
         elif lens_type == 'SPEMD_SMOOTH':
             from lenstronomy.LensModel.Profiles.spemd_smooth import SPEMD_SMOOTH
             return SPEMD_SMOOTH()
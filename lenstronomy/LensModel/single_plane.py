@@ -2,12 +2,51 @@ __author__ = 'sibirrer'
 
 import numpy as np
 from lenstronomy.LensModel.profile_list_base import ProfileListBase
+from lenstronomy.Util.util import float_array
 
 
 class SinglePlane(ProfileListBase):
     """
     class to handle an arbitrary list of lens models in a single lensing plane
     """
+    def __init__(self, lens_model_list, numerical_alpha_class=None, lens_redshift_list=None, z_source_convention=None,
+                 fused_kernel=False, tabulated_index=None, tabulation_tolerance=0.0001, tree_index=None,
+                 kwargs_tree=None):
+        """
+
+        :param lens_model_list: list of strings with lens model names
+        :param numerical_alpha_class: an instance of a custom class for use in NumericalAlpha() lens model
+        deflection angles as a lens model. See the documentation in Profiles.numerical_deflections
+        :param fused_kernel: bool, if True, the deflection angles of all lens models (and the surface brightness in
+        ray_shooting_surface_brightness()) are computed with the compiled kernels of FusedSinglePlane. Only supports
+        the lens models listed in FusedSinglePlane.lens_models_supported.
+        :param tabulated_index: list of indexes of the lens models that are evaluated with interpolated lookup tables
+        (see Profiles.tabulated.TabulatedProfile for the supported lens models)
+        :param tabulation_tolerance: relative interpolation error tolerated in the lookup tables
+        :param tree_index: list of indexes of spherically symmetric lens models (e.g. sub-halos) whose deflection
+        angles are aggregated with a Barnes-Hut tree (see TreeDeflection for the supported lens models)
+        :param kwargs_tree: keyword arguments of TreeDeflection (e.g. opening_angle, multipole_order)
+        """
+        super(SinglePlane, self).__init__(lens_model_list, numerical_alpha_class=numerical_alpha_class,
+                                          lens_redshift_list=lens_redshift_list,
+                                          z_source_convention=z_source_convention, tabulated_index=tabulated_index,
+                                          tabulation_tolerance=tabulation_tolerance)
+        if fused_kernel is True:
+            from lenstronomy.LensModel.fused_single_plane import FusedSinglePlane
+            self._fused = FusedSinglePlane(lens_model_list)
+        else:
+            self._fused = None
+        if tree_index is not None and len(tree_index) > 0:
+            if fused_kernel is True:
+                raise ValueError('fused_kernel and tree_index can not be used at the same time.')
+            from lenstronomy.LensModel.tree_deflection import TreeDeflection
+            if kwargs_tree is None:
+                kwargs_tree = {}
+            self._tree_index = list(tree_index)
+            self._tree = TreeDeflection([lens_model_list[i] for i in self._tree_index],
+                                        [self.func_list[i] for i in self._tree_index], **kwargs_tree)
+        else:
+            self._tree = None
 
     def ray_shooting(self, x, y, kwargs, k=None):
         """
@@ -23,6 +62,25 @@ class SinglePlane(ProfileListBase):
         dx, dy = self.alpha(x, y, kwargs, k=k)
         return x - dx, y - dy
 
+    def ray_shooting_surface_brightness(self, x, y, kwargs_lens, light_model, kwargs_light, k=None):
+        """
+        surface brightness of a light model at the source plane positions of (x, y). With the fused kernel and
+        supported light models, the ray-shooting and the evaluation of the light profiles are performed in one
+        compiled pass over the coordinates.
+
+        :param x: x-position (preferentially arcsec)
+        :param y: y-position (preferentially arcsec)
+        :param kwargs_lens: list of keyword arguments of lens model parameters matching the lens model classes
+        :param light_model: LightModel() class instance
+        :param kwargs_light: list of keyword arguments of the light model
+        :param k: only evaluate the k-th light model
+        :return: surface brightness at the source plane positions of (x, y)
+        """
+        if self._fused is not None and k is None and self._fused.light_model_supported(light_model.profile_type_list):
+            return self._fused.ray_shooting_surface_brightness(x, y, kwargs_lens, light_model, kwargs_light)
+        x_source, y_source = self.ray_shooting(x, y, kwargs_lens)
+        return light_model.surface_brightness(x_source, y_source, kwargs_light, k=k)
+
     def fermat_potential(self, x_image, y_image, kwargs_lens, x_source=None, y_source=None, k=None):
         """
         fermat potential (negative sign means earlier arrival time)
@@ -75,12 +133,20 @@ class SinglePlane(ProfileListBase):
         :param k: only evaluate the k-th lens model
         :return: deflection angles in units of arcsec
         """
-        x = np.array(x, dtype=float)
-        y = np.array(y, dtype=float)
+        if self._fused is not None and k is None:
+            return self._fused.alpha(x, y, kwargs)
+        # single precision coordinates (e.g. from numerics with precision='float32') are ray-shot in single precision
+        x = float_array(x)
+        y = float_array(y)
         if isinstance(k, int):
             return self.func_list[k].derivatives(x, y, **kwargs[k])
         bool_list = self._bool_list(k)
-        f_x, f_y = np.zeros_like(x), np.zeros_like(x)
+        if self._tree is not None and k is None:
+            f_x, f_y = self._tree.derivatives(x, y, [kwargs[i] for i in self._tree_index])
+            for i in self._tree_index:
+                bool_list[i] = False
+        else:
+            f_x, f_y = np.zeros_like(x), np.zeros_like(x)
         for i, func in enumerate(self.func_list):
             if bool_list[i] is True:
                 f_x_i, f_y_i = func.derivatives(x, y, **kwargs[i])
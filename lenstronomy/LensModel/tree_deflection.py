@@ -0,0 +1,220 @@
+__author__ = 'sibirrer'
+
+import numpy as np
+from lenstronomy.Util import numba_util
+
+
+class TreeDeflection(object):
+    """
+    aggregated deflection angles of a large number of spherically symmetric deflectors in the same lens plane
+    (e.g. sub-halos) with a Barnes-Hut tree.
+
+    The deflectors are sorted in a quadtree according to their centers. For each node of the tree, the multipole
+    moments of the complex deflection
+
+    conj(alpha)(z) = sum_i M_i(|z - z_i|) / (z - z_i) = sum_k a_k / (z - z_c)^(k+1), a_k = sum_i M_i (z_i - z_c)^k
+
+    are pre-computed, where M_i(r) = r * alpha_i(r) is the (projected) mass enclosed in radius r in units of the
+    deflection. The radial dependence of the enclosed masses is tabulated on a logarithmic grid such that also extended
+    profiles (e.g. NFW) are accurately described in the far field. The enclosed masses are evaluated at the distance to
+    the center of the node, and the difference to the distances of the individual deflectors is accounted for up to
+    second order in (z_i - z_c) with additional moments of the radial derivatives of the enclosed masses. A node is used as a whole for all positions further
+    away than its radius divided by the opening angle. Otherwise, its children are opened and the deflection of the
+    deflectors in the leaves of the tree is computed directly.
+
+    The tree is re-computed when the keyword arguments of the deflectors change.
+    """
+    profiles_supported = ['POINT_MASS', 'SIS', 'NFW', 'TNFW', 'CNFW', 'coreBURKERT', 'HERNQUIST', 'PJAFFE',
+                          'CORED_DENSITY', 'CORED_DENSITY_2']
+
+    def __init__(self, lens_model_list, func_list, opening_angle=0.5, multipole_order=6, leaf_size=4,
+                 tolerance=0.001, dynamic_range=100000):
+        """
+
+        :param lens_model_list: list of strings with lens model names of the deflectors to be aggregated
+        :param func_list: list of lens model class instances corresponding to lens_model_list
+        :param opening_angle: ratio of the size of a node and the distance above which the node is aggregated
+        :param multipole_order: highest order of the multipole expansion of the nodes
+        :param leaf_size: maximum number of deflectors in a leaf of the tree
+        :param tolerance: relative interpolation error of the tabulated enclosed masses
+        :param dynamic_range: ratio between the largest and smallest radius of the tabulated enclosed masses.
+         Positions closer to a node are computed by opening the node.
+        """
+        for lens_type in lens_model_list:
+            if lens_type not in self.profiles_supported:
+                raise ValueError('lens model %s not supported in the tree aggregation. Supported are %s.'
+                                 % (lens_type, self.profiles_supported))
+        if not 0 < opening_angle < 1:
+            raise ValueError('opening_angle needs to be in between 0 and 1, got %s.' % opening_angle)
+        self._func_list = func_list
+        self._opening_angle = opening_angle
+        self._multipole_order = int(multipole_order)
+        self._leaf_size = max(int(leaf_size), 1)
+        self._step = np.sqrt(2 * tolerance)
+        self._dynamic_range = dynamic_range
+        self._kwargs_cache = None
+        self._r_max = 0
+
+    def derivatives(self, x, y, kwargs_list):
+        """
+        sum of the deflection angles of all deflectors
+
+        :param x: x-coordinate (angle)
+        :param y: y-coordinate (angle)
+        :param kwargs_list: list of keyword arguments of the deflectors
+        :return: deflection angles alpha_x, alpha_y
+        """
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+        shape = x.shape
+        x, y = x.flatten(), y.flatten()
+        f_x, f_y = np.zeros_like(x), np.zeros_like(x)
+        if len(self._func_list) == 0 or len(x) == 0:
+            return f_x.reshape(shape), f_y.reshape(shape)
+        self._update(x, y, kwargs_list)
+        z = x + 1j * y
+        alpha_conj = np.zeros(len(x), dtype=complex)
+        stack = [(0, np.arange(len(x)))]
+        while len(stack) > 0:
+            n, index = stack.pop()
+            d = np.abs(z[index] - self._center[n])
+            aggregate = (d * self._opening_angle > self._radius[n]) & (d > self._r_min)
+            if np.any(aggregate):
+                _multipole(z, index[aggregate], self._center[n], self._moments[n], self._multipole_order,
+                           self._log_r_min, self._step, alpha_conj)
+            index = index[~aggregate]
+            if len(index) == 0:
+                continue
+            if len(self._children[n]) == 0:
+                for i in self._members[n]:
+                    f_x_i, f_y_i = self._func_list[i].derivatives(x[index], y[index], **kwargs_list[i])
+                    f_x[index] += f_x_i
+                    f_y[index] += f_y_i
+            else:
+                for child in self._children[n]:
+                    stack.append((child, index))
+        f_x += alpha_conj.real
+        f_y -= alpha_conj.imag
+        return f_x.reshape(shape), f_y.reshape(shape)
+
+    def _update(self, x, y, kwargs_list):
+        """
+        re-computes the tree if the keyword arguments have changed or the tabulated radial range does not cover the
+        positions
+
+        :param x: x-coordinates
+        :param y: y-coordinates
+        :param kwargs_list: list of keyword arguments of the deflectors
+        :return: None
+        """
+        center_x = np.array([kwargs.get('center_x', 0) for kwargs in kwargs_list], dtype=float)
+        center_y = np.array([kwargs.get('center_y', 0) for kwargs in kwargs_list], dtype=float)
+        x_min, x_max = min(np.min(x), np.min(center_x)), max(np.max(x), np.max(center_x))
+        y_min, y_max = min(np.min(y), np.min(center_y)), max(np.max(y), np.max(center_y))
+        r_max = np.sqrt((x_max - x_min) ** 2 + (y_max - y_min) ** 2)
+        kwargs_cache = [sorted(kwargs.items()) for kwargs in kwargs_list]
+        if kwargs_cache == self._kwargs_cache and r_max <= self._r_max:
+            return
+        self._kwargs_cache = kwargs_cache
+        # margin such that the tree is not re-computed for small changes in the coordinates
+        self._r_max = max(2 * r_max, 0.000001)
+        self._r_min = self._r_max / self._dynamic_range
+        self._log_r_min = np.log(self._r_min)
+        self._num_grid = int(np.ceil(np.log(self._dynamic_range) / self._step)) + 2
+        r_grid = np.exp(self._log_r_min + self._step * np.arange(self._num_grid))
+        mass = np.zeros((len(kwargs_list), self._num_grid))
+        for i, kwargs in enumerate(kwargs_list):
+            kwargs_profile = {key: value for key, value in kwargs.items() if key not in ['center_x', 'center_y']}
+            mass[i] = r_grid * self._func_list[i].derivatives(r_grid, np.zeros_like(r_grid), **kwargs_profile)[0]
+        mass_derivative = np.gradient(mass, self._step, axis=1) / r_grid
+        mass_derivative2 = np.gradient(mass_derivative, self._step, axis=1) / r_grid
+        self._build_tree(center_x + 1j * center_y, mass, mass_derivative, mass_derivative2)
+
+    def _build_tree(self, z, mass, mass_derivative, mass_derivative2):
+        """
+        builds the quadtree and the multipole moments of its nodes
+
+        :param z: complex positions of the deflectors
+        :param mass: tabulated enclosed masses of the deflectors
+        :param mass_derivative: tabulated first radial derivatives of the enclosed masses
+        :param mass_derivative2: tabulated second radial derivatives of the enclosed masses
+        :return: None
+        """
+        self._center, self._radius, self._moments, self._members, self._children = [], [], [], [], []
+        stack = [(np.arange(len(z)), -1)]
+        while len(stack) > 0:
+            members, parent = stack.pop()
+            n = len(self._center)
+            if parent >= 0:
+                self._children[parent].append(n)
+            z_n = z[members]
+            center = np.mean(z_n)
+            dz = z_n - center
+            radius = np.max(np.abs(dz))
+            # multipole moments a_k followed by the moments of the radial derivatives entering the corrections
+            p = self._multipole_order
+            moments = np.zeros((p + 6, self._num_grid), dtype=complex)
+            dz_k = np.ones_like(dz)
+            for k in range(p + 1):
+                moments[k] = np.dot(dz_k, mass[members])
+                dz_k = dz_k * dz
+            moments[p + 1] = np.dot(dz, mass_derivative[members])
+            moments[p + 2] = np.dot(dz ** 2, mass_derivative[members])
+            moments[p + 3] = np.dot(np.abs(dz) ** 2, mass_derivative[members])
+            moments[p + 4] = np.dot(dz ** 2, mass_derivative2[members])
+            moments[p + 5] = np.dot(np.abs(dz) ** 2, mass_derivative2[members])
+            self._center.append(center)
+            self._radius.append(radius)
+            self._moments.append(moments)
+            self._members.append(members)
+            self._children.append([])
+            if len(members) <= self._leaf_size or radius <= self._r_min:
+                continue
+            # split the bounding box in four quadrants
+            mid = (np.min(z_n.real) + np.max(z_n.real)) / 2. + 1j * (np.min(z_n.imag) + np.max(z_n.imag)) / 2.
+            right, top = z_n.real > mid.real, z_n.imag > mid.imag
+            for quadrant in [right & top, right & ~top, ~right & top, ~right & ~top]:
+                if np.any(quadrant):
+                    stack.append((members[quadrant], n))
+
+
+@numba_util.jit()
+def _multipole(z, index, center, moments, multipole_order, log_r_min, step, alpha_conj):
+    """
+    adds the multipole expansion of a node to the complex conjugate deflection
+
+    :param z: complex positions
+    :param index: indexes of the positions to be evaluated
+    :param center: complex center of the node
+    :param moments: tabulated moments of the node (see TreeDeflection._build_tree)
+    :param multipole_order: highest order of the multipole expansion
+    :param log_r_min: logarithm of the smallest radius of the tables
+    :param step: spacing of the tables in logarithmic radius
+    :param alpha_conj: complex conjugate deflection, updated in place
+    :return: None
+    """
+    p = multipole_order
+    num_grid = moments.shape[1]
+    for i in index:
+        dz = z[i] - center
+        d = abs(dz)
+        t = (np.log(d) - log_r_min) / step
+        j = min(int(t), num_grid - 2)
+        w = t - j
+        u = 1. / dz
+        result = 0j
+        for k in range(p, -1, -1):
+            result = u * (moments[k, j] * (1 - w) + moments[k, j + 1] * w + result)
+        b1 = moments[p + 1, j] * (1 - w) + moments[p + 1, j + 1] * w
+        b2 = moments[p + 2, j] * (1 - w) + moments[p + 2, j + 1] * w
+        c = moments[p + 3, j] * (1 - w) + moments[p + 3, j + 1] * w
+        d2 = moments[p + 4, j] * (1 - w) + moments[p + 4, j + 1] * w
+        e = moments[p + 5, j] * (1 - w) + moments[p + 5, j + 1] * w
+        # corrections of the enclosed masses for the offsets of the deflectors from the center of the node, derived
+        # from a second order expansion of M_i(|z - z_i|) around M_i(|z - z_c|)
+        dz_conj = dz.conjugate()
+        result -= (b1.conjugate() + dz_conj * u * b1) / (2 * d)
+        result -= u ** 2 * (dz * c + dz_conj * b2) / (2 * d)
+        result += u * (c / (4 * d) - (dz ** 2 * b2.conjugate() + dz_conj ** 2 * b2) / (8 * d ** 3))
+        result += u / (8 * d ** 2) * (dz ** 2 * d2.conjugate() + 2 * d ** 2 * e + dz_conj ** 2 * d2)
+        alpha_conj[i] += result
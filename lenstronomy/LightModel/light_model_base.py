@@ -3,7 +3,7 @@ __author__ = 'sibirrer'
 #this file contains a class which describes the surface brightness of the light models
 
 import numpy as np
-from lenstronomy.Util.util import convert_bool_list
+from lenstronomy.Util.util import convert_bool_list, float_array
 
 
 class LightModelBase(object):
@@ -95,13 +95,14 @@ class LightModelBase(object):
         :type x: set or single 1d numpy array
         """
         kwargs_list_standard = self._transform_kwargs(kwargs_list)
-        x = np.array(x, dtype=float)
-        y = np.array(y, dtype=float)
+        # the flux keeps the precision of the coordinates (float32 or float64)
+        x = float_array(x)
+        y = float_array(y)
         flux = np.zeros_like(x)
         bool_list = self._bool_list(k=k)
         for i, func in enumerate(self.func_list):
             if bool_list[i] is True:
-                out = np.array(func.function(x, y, **kwargs_list_standard[i]), dtype=float)
+                out = np.array(func.function(x, y, **kwargs_list_standard[i]), dtype=flux.dtype)
                 flux += out
         return flux
 
@@ -8,7 +8,7 @@ class PointSource(object):
     def __init__(self, point_source_type_list, lensModel=None, fixed_magnification_list=None,
                  additional_images_list=None, magnification_limit=None,
                  save_cache=False, min_distance=0.05, search_window=5, precision_limit=10**(-10), num_iter_max=100,
-                 x_center=0, y_center=0):
+                 x_center=0, y_center=0, warm_start=False):
         """
 
         :param point_source_type_list: list of point source types
@@ -30,6 +30,9 @@ class PointSource(object):
         :param num_iter_max: see LensEquationSolver() instance
         :param x_center: center of search window
         :param y_center: center of search window
+        :param warm_start: bool, if True, the lens equation solver is started from the image positions found in the
+        previous evaluation and only falls back to the full search when not all of them are recovered (e.g. in a
+        sampling process where the lens model changes only slightly from one evaluation to the next)
 
         for the parameters: min_distance=0.01, search_window=5, precision_limit=10**(-10), num_iter_max=100
         have a look at the lensEquationSolver class
@@ -50,11 +53,13 @@ class PointSource(object):
             elif model == 'LENSED_POSITION':
                 from lenstronomy.PointSource.point_source_types import LensedPositions
                 self._point_source_list.append(PointSourceCached(LensedPositions(lensModel, fixed_magnification=fixed_magnification_list[i],
-                                                               additional_image=additional_images_list[i]), save_cache=save_cache))
+                                                               additional_image=additional_images_list[i],
+                                                               warm_start=warm_start), save_cache=save_cache))
             elif model == 'SOURCE_POSITION':
                 from lenstronomy.PointSource.point_source_types import SourcePositions
                 self._point_source_list.append(PointSourceCached(SourcePositions(lensModel,
-                                                                 fixed_magnification=fixed_magnification_list[i]),
+                                                                 fixed_magnification=fixed_magnification_list[i],
+                                                                 warm_start=warm_start),
                                                                  save_cache=save_cache))
             else:
                 raise ValueError("Point-source model %s not available" % model)
@@ -95,6 +100,26 @@ class PointSource(object):
         for model in self._point_source_list:
             model.delete_lens_model_cache()
 
+    def lens_model_cache(self):
+        """
+        image and source positions saved for a specific lens model (see set_save_cache())
+
+        :return: list of dictionaries, one for each point source model
+        """
+        return [model.lens_model_cache() for model in self._point_source_list]
+
+    def set_lens_model_cache(self, cache):
+        """
+        sets the image and source positions saved for a specific lens model, e.g. as returned by lens_model_cache() of
+        this or of an identical PointSource instance, such that they are not solved for again. The positions are only
+        used when saving the cache (see set_save_cache()).
+
+        :param cache: return of lens_model_cache()
+        :return: None
+        """
+        for model, cache_model in zip(self._point_source_list, cache):
+            model.set_lens_model_cache(cache_model)
+
     def set_save_cache(self, bool):
         """
         set the save cache boolean to new value
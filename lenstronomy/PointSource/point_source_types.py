@@ -46,11 +46,22 @@ class LensedPositions(object):
     parameters: ra_image, dec_image, point_amp
 
     """
-    def __init__(self, lensModel, fixed_magnification=False, additional_image=False):
+    def __init__(self, lensModel, fixed_magnification=False, additional_image=False, warm_start=False):
+        """
+
+        :param lensModel: instance of the LensModel() class
+        :param fixed_magnification: bool, if True, magnification ratio of point sources is fixed to the one given by
+         the lens model
+        :param additional_image: bool, if True, search for additional images of the same source is conducted
+        :param warm_start: bool, if True, the lens equation solver starts from the image positions of the previous call
+         (see _solve_lens_equation())
+        """
         self._lensModel = lensModel
         self._solver = LensEquationSolver(lensModel)
         self._fixed_magnification = fixed_magnification
         self._additional_image = additional_image
+        self._warm_start = warm_start
+        self._warm_start_cache = {}
         if fixed_magnification is True and additional_image is True:
             Warning('The combination of fixed_magnification=True and additional_image=True is not optimal for the current computation.'
                     'If you see this warning, please approach the developers.')
@@ -66,12 +77,11 @@ class LensedPositions(object):
         """
         if self._additional_image is True:
             ra_source, dec_source = self.source_position(kwargs_ps, kwargs_lens)
-            ra_image, dec_image = self._solver.image_position_from_source(ra_source, dec_source, kwargs_lens,
-                                                                          min_distance=min_distance,
-                                                                          search_window=search_window,
-                                                                          precision_limit=precision_limit,
-                                                                          num_iter_max=num_iter_max, x_center=x_center,
-                                                                          y_center=y_center, magnification_limit=magnification_limit)
+            ra_image, dec_image = _solve_lens_equation(self._solver, self._warm_start, self._warm_start_cache,
+                                                       ra_source, dec_source, kwargs_lens, min_distance=min_distance,
+                                                       search_window=search_window, precision_limit=precision_limit,
+                                                       num_iter_max=num_iter_max, x_center=x_center,
+                                                       y_center=y_center, magnification_limit=magnification_limit)
         else:
             ra_image = kwargs_ps['ra_image']
             dec_image = kwargs_ps['dec_image']
@@ -114,6 +124,7 @@ class LensedPositions(object):
     def update_lens_model(self, lens_model_class):
         self._lensModel = lens_model_class
         self._solver = LensEquationSolver(lens_model_class)
+        self._warm_start_cache = {}
 
 
 class SourcePositions(object):
@@ -122,10 +133,20 @@ class SourcePositions(object):
     parameters: ra_image, dec_image, point_amp
 
     """
-    def __init__(self, lensModel, fixed_magnification=True):
+    def __init__(self, lensModel, fixed_magnification=True, warm_start=False):
+        """
+
+        :param lensModel: instance of the LensModel() class
+        :param fixed_magnification: bool, if True, magnification ratio of point sources is fixed to the one given by
+         the lens model
+        :param warm_start: bool, if True, the lens equation solver starts from the image positions of the previous call
+         (see _solve_lens_equation())
+        """
         self._lensModel = lensModel
         self._solver = LensEquationSolver(lensModel)
         self._fixed_magnification = fixed_magnification
+        self._warm_start = warm_start
+        self._warm_start_cache = {}
 
     def image_position(self, kwargs_ps, kwargs_lens, min_distance=0.01, search_window=5, precision_limit=10**(-10),
                        num_iter_max=100, x_center=0, y_center=0, magnification_limit=None):
@@ -137,12 +158,11 @@ class SourcePositions(object):
         :return:
         """
         ra_source, dec_source = self.source_position(kwargs_ps, kwargs_lens)
-        ra_image, dec_image = self._solver.image_position_from_source(ra_source, dec_source, kwargs_lens,
-                                                                      min_distance=min_distance,
-                                                                      search_window=search_window,
-                                                                      precision_limit=precision_limit,
-                                                                      num_iter_max=num_iter_max, x_center=x_center,
-                                                                      y_center=y_center, magnification_limit=magnification_limit)
+        ra_image, dec_image = _solve_lens_equation(self._solver, self._warm_start, self._warm_start_cache, ra_source,
+                                                   dec_source, kwargs_lens, min_distance=min_distance,
+                                                   search_window=search_window, precision_limit=precision_limit,
+                                                   num_iter_max=num_iter_max, x_center=x_center, y_center=y_center,
+                                                   magnification_limit=magnification_limit)
         return ra_image, dec_image
 
     def source_position(self, kwargs_ps, kwargs_lens=None):
@@ -182,6 +202,7 @@ class SourcePositions(object):
     def update_lens_model(self, lens_model_class):
         self._lensModel = lens_model_class
         self._solver = LensEquationSolver(lens_model_class)
+        self._warm_start_cache = {}
 
 
 class PointSourceCached(object):
@@ -202,6 +223,24 @@ class PointSourceCached(object):
         if hasattr(self, '_y_source'):
             del self._y_source
 
+    def lens_model_cache(self):
+        """
+
+        :return: dictionary of the saved image and source positions
+        """
+        return {key: getattr(self, key) for key in ['_x_image', '_y_image', '_x_source', '_y_source']
+                if hasattr(self, key)}
+
+    def set_lens_model_cache(self, cache):
+        """
+
+        :param cache: return of lens_model_cache()
+        :return: None
+        """
+        self.delete_lens_model_cache()
+        for key, value in cache.items():
+            setattr(self, key, value)
+
     def set_save_cache(self, bool):
         self._save_cache = bool
 
@@ -219,16 +258,23 @@ class PointSourceCached(object):
         """
 
         if not self._save_cache or not hasattr(self, '_x_image') or not hasattr(self, '_y_image'):
-            self._x_image, self._y_image = self._model.image_position(kwargs_ps, kwargs_lens, min_distance=min_distance,
-                                                                      search_window=search_window,
-                                                                      precision_limit=precision_limit,
-                                                                      num_iter_max=num_iter_max, x_center=x_center,
-                                                                      y_center=y_center, magnification_limit=magnification_limit)
+            x_image, y_image = self._model.image_position(kwargs_ps, kwargs_lens, min_distance=min_distance,
+                                                          search_window=search_window,
+                                                          precision_limit=precision_limit,
+                                                          num_iter_max=num_iter_max, x_center=x_center,
+                                                          y_center=y_center, magnification_limit=magnification_limit)
+            if not self._save_cache:
+                # without saving the cache, no solution is kept for later evaluations with different kwargs
+                return x_image, y_image
+            self._x_image, self._y_image = x_image, y_image
         return self._x_image, self._y_image
 
     def source_position(self, kwargs_ps, kwargs_lens=None):
         if not self._save_cache or not hasattr(self, '_x_source') or not hasattr(self, '_y_source'):
-            self._x_source, self._y_source = self._model.source_position(kwargs_ps, kwargs_lens)
+            x_source, y_source = self._model.source_position(kwargs_ps, kwargs_lens)
+            if not self._save_cache:
+                return x_source, y_source
+            self._x_source, self._y_source = x_source, y_source
         return self._x_source, self._y_source
 
     def image_amplitude(self, kwargs_ps, kwargs_lens=None, min_distance=0.01, search_window=5, precision_limit=10**(-10),
@@ -244,6 +290,57 @@ class PointSourceCached(object):
         return self._model.source_amplitude(kwargs_ps, kwargs_lens)
 
 
+def _solve_lens_equation(solver, warm_start, warm_start_cache, ra_source, dec_source, kwargs_lens, min_distance,
+                         search_window, precision_limit, num_iter_max, x_center, y_center, magnification_limit):
+    """
+    solves the lens equation. With warm_start=True, the Newton iterations of the solver are started from the image
+    positions found in the previous call, as in a sampling process the lens model changes only slightly from one call
+    to the next. The full search of the image positions is performed when not all previous images are recovered
+    with the required precision, when the number of images estimated with LensEquationSolver.image_number() differs
+    from the number of recovered images (e.g. when new images appear) or when no previous solution is available.
+
+    :param solver: LensEquationSolver instance
+    :param warm_start: bool, if True, starts from the previous solution
+    :param warm_start_cache: dictionary holding the previous solution, updated in place
+    :param ra_source: source position
+    :param dec_source: source position
+    :param kwargs_lens: lens model keyword argument list
+    :param min_distance: see LensEquationSolver.image_position_from_source()
+    :param search_window: see LensEquationSolver.image_position_from_source()
+    :param precision_limit: see LensEquationSolver.image_position_from_source()
+    :param num_iter_max: see LensEquationSolver.image_position_from_source()
+    :param x_center: see LensEquationSolver.image_position_from_source()
+    :param y_center: see LensEquationSolver.image_position_from_source()
+    :param magnification_limit: see LensEquationSolver.image_position_from_source()
+    :return: image positions
+    """
+    if warm_start is True and 'x_image' in warm_start_cache:
+        ra_image, dec_image = solver.image_position_from_initial_guess(ra_source, dec_source, kwargs_lens,
+                                                                       warm_start_cache['x_image'],
+                                                                       warm_start_cache['y_image'],
+                                                                       min_distance=min_distance,
+                                                                       precision_limit=precision_limit,
+                                                                       num_iter_max=num_iter_max,
+                                                                       magnification_limit=magnification_limit)
+        if ra_image is not None and len(ra_image) == solver.image_number(ra_source, dec_source, kwargs_lens,
+                                                                         min_distance=min_distance,
+                                                                         search_window=search_window,
+                                                                         x_center=x_center, y_center=y_center,
+                                                                         precision_limit=precision_limit,
+                                                                         num_iter_max=num_iter_max,
+                                                                         magnification_limit=magnification_limit):
+            warm_start_cache['x_image'], warm_start_cache['y_image'] = ra_image, dec_image
+            return ra_image, dec_image
+    ra_image, dec_image = solver.image_position_from_source(ra_source, dec_source, kwargs_lens,
+                                                            min_distance=min_distance, search_window=search_window,
+                                                            precision_limit=precision_limit,
+                                                            num_iter_max=num_iter_max, x_center=x_center,
+                                                            y_center=y_center, magnification_limit=magnification_limit)
+    if warm_start is True and len(ra_image) > 0:
+        warm_start_cache['x_image'], warm_start_cache['y_image'] = ra_image, dec_image
+    return ra_image, dec_image
+
+
 def _expand_to_array(array, num):
     """
 
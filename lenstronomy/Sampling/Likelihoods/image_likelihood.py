@@ -55,6 +55,33 @@ class ImageLikelihood(object):
             return -10 ** 15
         return logL
 
+    def logL_batch(self, kwargs_list, point_source_cache_list=None):
+        """
+        imaging likelihood of a batch of samples. The linear inversions of the samples are solved together (see
+        ImageLinearFit.likelihood_data_given_model_batch()).
+
+        :param kwargs_list: list of keyword arguments of the samples, as returned by Param.args2kwargs()
+        :param point_source_cache_list: list of point source positions already solved for the samples (see
+         PointSource.lens_model_cache()) or None
+        :return: log likelihoods, numpy array of shape (n_samples,)
+        """
+        kwargs_batch = {}
+        for key in ['kwargs_lens', 'kwargs_source', 'kwargs_lens_light', 'kwargs_ps', 'kwargs_extinction',
+                    'kwargs_special']:
+            kwargs_batch[key + '_list'] = [kwargs.get(key) for kwargs in kwargs_list]
+        logL = np.zeros(len(kwargs_list))
+        logL += self.imSim.likelihood_data_given_model_batch(source_marg=self._source_marg,
+                                                             linear_prior=self._linear_prior,
+                                                             point_source_cache_list=point_source_cache_list,
+                                                             **kwargs_batch)
+        if self._force_minimum_source_surface_brightness is True:
+            for k, kwargs in enumerate(kwargs_list):
+                if len(kwargs['kwargs_source']) > 0:
+                    if self._check_minimum_source_flux(kwargs['kwargs_lens'], kwargs['kwargs_source']) is True:
+                        logL[k] -= 10 ** 10
+        logL[np.isnan(logL)] = -10 ** 15
+        return logL
+
     def _check_minimum_source_flux(self, kwargs_lens, kwargs_source):
         if self._model_type in ['single-band']:
             flux = self.imSim.source_surface_brightness(kwargs_source, kwargs_lens=kwargs_lens, unconvolved=True)
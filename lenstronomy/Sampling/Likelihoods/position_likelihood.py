@@ -58,13 +58,53 @@ class PositionLikelihood(object):
         :param verbose: bool
         :return: log likelihood of the optional likelihoods being computed
         """
+        logL = self.logL_astrometric(kwargs_ps, kwargs_special, verbose=verbose)
+        logL += self.logL_image_positions(kwargs_lens, kwargs_ps, verbose=verbose)
+        return logL
+
+    def logL_astrometric(self, kwargs_ps, kwargs_special, verbose=False):
+        """
+
+        :param kwargs_ps: point source model parameter keyword argument list
+        :param kwargs_special: special keyword arguments
+        :param verbose: bool
+        :return: astrometric log likelihood if astrometric_likelihood=True, otherwise 0
+        """
+        if self._astrometric_likelihood is not True:
+            return 0
+        logL_astrometry = self.astrometric_likelihood(kwargs_ps, kwargs_special, self._image_position_sigma)
+        if verbose is True:
+            print('Astrometric likelihood = %s' % logL_astrometry)
+        return logL_astrometry
+
+    def logL_astrometric_batch(self, kwargs_ps, kwargs_special):
+        """
+        astrometric log likelihood of a batch of samples evaluated at once
 
+        :param kwargs_ps: point source model parameter keyword argument list with the samples along the last axis of the
+         parameters (see Param.args2kwargs_batch())
+        :param kwargs_special: special keyword arguments with the samples along the last axis
+        :return: astrometric log likelihood of the samples if astrometric_likelihood=True, otherwise 0
+        """
+        if self._astrometric_likelihood is not True:
+            return 0
+        if not len(kwargs_ps) > 0 or 'ra_image' not in kwargs_ps[0] or 'delta_x_image' not in kwargs_special:
+            return 0
+        delta_x, delta_y = np.asarray(kwargs_special['delta_x_image']), np.asarray(kwargs_special['delta_y_image'])
+        dist = (delta_x ** 2 + delta_y ** 2) / self._image_position_sigma ** 2 / 2
+        return -np.sum(dist.reshape(-1, dist.shape[-1]), axis=0)
+
+    def logL_image_positions(self, kwargs_lens, kwargs_ps, verbose=False):
+        """
+        likelihood terms evaluating the image positions predicted by the lens model (all terms but the astrometric
+        likelihood)
+
+        :param kwargs_lens: lens model parameter keyword argument list
+        :param kwargs_ps: point source model parameter keyword argument list
+        :param verbose: bool
+        :return: log likelihood
+        """
         logL = 0
-        if self._astrometric_likelihood is True:
-            logL_astrometry = self.astrometric_likelihood(kwargs_ps, kwargs_special, self._image_position_sigma)
-            logL += logL_astrometry
-            if verbose is True:
-                print('Astrometric likelihood = %s' % logL_astrometry)
         if self._check_matched_source_position is True:
             logL_source_scatter = self.source_position_likelihood(kwargs_lens, kwargs_ps, self._source_position_sigma, hard_bound_rms=self._bound_source_position_scatter, verbose=verbose)
             #logL_source_scatter = self.source_position_scatter(kwargs_lens, kwargs_ps, self._bound_source_position_scatter, self._source_position_sigma, verbose=verbose)
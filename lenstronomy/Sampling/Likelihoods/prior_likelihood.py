@@ -79,101 +79,157 @@ class PriorLikelihood(object):
         :param kwargs_lens: lens model parameter list
         :return: log likelihood of lens center
         """
+        return self._logL(kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special, kwargs_extinction)
+
+    def logL_batch(self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None, kwargs_ps=None,
+                   kwargs_special=None, kwargs_extinction=None):
+        """
+        log likelihood of the priors evaluated on a batch of samples at once
+
+        :param kwargs_lens: lens model parameter list with the samples along the last axis of the parameters
+         (see Param.args2kwargs_batch())
+        :return: log likelihood of the samples, numpy array or 0 if no priors are set
+        """
+        return self._logL(kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special, kwargs_extinction,
+                          batch=True)
+
+    def _logL(self, kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special, kwargs_extinction,
+              batch=False):
+        """
+
+        :param batch: bool, if True, the parameters are columnar with the samples along the last axis
+        :return: log likelihood of the priors
+        """
         logL = 0
-        logL += self._prior_kwargs_list(kwargs_lens, self._prior_lens)
-        logL += self._prior_kwargs_list(kwargs_source, self._prior_source)
-        logL += self._prior_kwargs_list(kwargs_lens_light, self._prior_lens_light)
-        logL += self._prior_kwargs_list(kwargs_ps, self._prior_ps)
-        logL += self._prior_kwargs(kwargs_special, self._prior_special)
-        logL += self._prior_kwargs_list(kwargs_extinction, self._prior_extinction)
+        logL += self._prior_kwargs_list(kwargs_lens, self._prior_lens, batch=batch)
+        logL += self._prior_kwargs_list(kwargs_source, self._prior_source, batch=batch)
+        logL += self._prior_kwargs_list(kwargs_lens_light, self._prior_lens_light, batch=batch)
+        logL += self._prior_kwargs_list(kwargs_ps, self._prior_ps, batch=batch)
+        logL += self._prior_kwargs(kwargs_special, self._prior_special, batch=batch)
+        logL += self._prior_kwargs_list(kwargs_extinction, self._prior_extinction, batch=batch)
 
         logL += self._prior_lognormal_kwargs_list(kwargs_lens,
-                                                  self._prior_lens_lognormal)
-        logL += self._prior_lognormal_kwargs_list(kwargs_source, self._prior_source_lognormal)
+                                                  self._prior_lens_lognormal, batch=batch)
+        logL += self._prior_lognormal_kwargs_list(kwargs_source, self._prior_source_lognormal, batch=batch)
         logL += self._prior_lognormal_kwargs_list(kwargs_lens_light,
-                                        self._prior_lens_light_lognormal)
-        logL += self._prior_lognormal_kwargs_list(kwargs_ps, self._prior_ps_lognormal)
-        logL += self._prior_lognormal_kwargs(kwargs_special, self._prior_special_lognormal)
+                                        self._prior_lens_light_lognormal, batch=batch)
+        logL += self._prior_lognormal_kwargs_list(kwargs_ps, self._prior_ps_lognormal, batch=batch)
+        logL += self._prior_lognormal_kwargs(kwargs_special, self._prior_special_lognormal, batch=batch)
         logL += self._prior_lognormal_kwargs_list(kwargs_extinction,
-                                        self._prior_extinction_lognormal)
+                                        self._prior_extinction_lognormal, batch=batch)
 
-        logL += self._prior_kde_list(kwargs_lens, self._prior_lens_kde, self._kde_lens_list)
-        logL += self._prior_kde_list(kwargs_source, self._prior_source_kde, self._kde_source_list)
-        logL += self._prior_kde_list(kwargs_lens_light, self._prior_lens_light_kde, self._kde_lens_light_list)
-        logL += self._prior_kde_list(kwargs_ps, self._prior_ps_kde, self._kde_ps_list)
+        logL += self._prior_kde_list(kwargs_lens, self._prior_lens_kde, self._kde_lens_list, batch=batch)
+        logL += self._prior_kde_list(kwargs_source, self._prior_source_kde, self._kde_source_list, batch=batch)
+        logL += self._prior_kde_list(kwargs_lens_light, self._prior_lens_light_kde, self._kde_lens_light_list, batch=batch)
+        logL += self._prior_kde_list(kwargs_ps, self._prior_ps_kde, self._kde_ps_list, batch=batch)
         return logL
 
-    def _prior_kde_list(self, kwargs_list, prior_list, kde_list):
+    def _prior_kde_list(self, kwargs_list, prior_list, kde_list, batch=False):
         """
 
         :param kwargs_list:
         :param prior_list:
+        :param batch: bool, if True, the parameters are columnar with the samples along the last axis
         :return:
         """
         logL = 0
         for i in range(len(prior_list)):
             index, param_name, values = prior_list[i]
             model_value = kwargs_list[index][param_name]
-            likelihood = kde_list[i].likelihood(model_value)[0]
+            if batch is True:
+                likelihood = kde_list[i].likelihood(np.asarray(model_value))
+            else:
+                likelihood = kde_list[i].likelihood(model_value)[0]
             logL += np.log(likelihood)
         return logL
 
-    def _prior_kwargs_list(self, kwargs_list, prior_list):
+    def _prior_kwargs_list(self, kwargs_list, prior_list, batch=False):
         """
 
         :param kwargs_list: keyword argument list
         :param prior_list: prior list
+        :param batch: bool, if True, the parameters are columnar with the samples along the last axis
         :return: logL
         """
         logL = 0
         for i in range(len(prior_list)):
             index, param_name, value, sigma = prior_list[i]
             model_value = kwargs_list[index][param_name]
-            dist = (model_value - value) ** 2 / sigma ** 2 / 2
-            logL -= np.sum(dist)
+            dist = (model_value - _expand_batch(value, batch)) ** 2 / _expand_batch(sigma, batch) ** 2 / 2
+            logL -= _sum_batch(dist, batch)
         return logL
 
-    def _prior_kwargs(self, kwargs, prior_list):
+    def _prior_kwargs(self, kwargs, prior_list, batch=False):
         """
         prior computation for a keyword argument (not list thereof)
 
         :param kwargs: keyword argument
+        :param batch: bool, if True, the parameters are columnar with the samples along the last axis
         :return: logL
         """
         logL = 0
         for i in range(len(prior_list)):
             param_name, value, sigma = prior_list[i]
             model_value = kwargs[param_name]
-            dist = (model_value - value) ** 2 / sigma ** 2 / 2
-            logL -= np.sum(dist)
+            dist = (model_value - _expand_batch(value, batch)) ** 2 / _expand_batch(sigma, batch) ** 2 / 2
+            logL -= _sum_batch(dist, batch)
         return logL
 
-    def _prior_lognormal_kwargs_list(self, kwargs_list, prior_list):
+    def _prior_lognormal_kwargs_list(self, kwargs_list, prior_list, batch=False):
         """
 
         :param kwargs_list: keyword argument list
         :param prior_list: prior list
+        :param batch: bool, if True, the parameters are columnar with the samples along the last axis
         :return: logL
         """
         logL = 0
         for i in range(len(prior_list)):
             index, param_name, value, sigma = prior_list[i]
             model_value = kwargs_list[index][param_name]
-            dist = (np.log(model_value) - value) ** 2 / sigma ** 2 / 2 + model_value
-            logL -= np.sum(dist)
+            dist = (np.log(model_value) - _expand_batch(value, batch)) ** 2 / _expand_batch(sigma, batch) ** 2 / 2 \
+                + model_value
+            logL -= _sum_batch(dist, batch)
         return logL
 
-    def _prior_lognormal_kwargs(self, kwargs, prior_list):
+    def _prior_lognormal_kwargs(self, kwargs, prior_list, batch=False):
         """
         prior computation for a keyword argument (not list thereof)
 
         :param kwargs: keyword argument
+        :param batch: bool, if True, the parameters are columnar with the samples along the last axis
         :return: logL
         """
         logL = 0
         for i in range(len(prior_list)):
             param_name, value, sigma = prior_list[i]
             model_value = kwargs[param_name]
-            dist = (np.log(model_value) - value) ** 2 / sigma ** 2 / 2 + model_value
-            logL -= np.sum(dist)
+            dist = (np.log(model_value) - _expand_batch(value, batch)) ** 2 / _expand_batch(sigma, batch) ** 2 / 2 \
+                + model_value
+            logL -= _sum_batch(dist, batch)
         return logL
+
+
+def _expand_batch(value, batch):
+    """
+
+    :param value: prior value of a parameter (float or array)
+    :param batch: bool, if True, an axis is added such that the value broadcasts against columnar parameters
+    :return: value
+    """
+    if batch is True:
+        return np.expand_dims(np.asarray(value), -1)
+    return value
+
+
+def _sum_batch(dist, batch):
+    """
+
+    :param dist: prior penalty of a parameter
+    :param batch: bool, if True, the penalty is summed over all but the last (sample) axis
+    :return: sum of dist
+    """
+    if batch is True:
+        dist = np.atleast_1d(dist)
+        return np.sum(dist.reshape(-1, dist.shape[-1]), axis=0)
+    return np.sum(dist)
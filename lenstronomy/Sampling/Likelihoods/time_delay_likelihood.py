@@ -33,13 +33,59 @@ class TimeDelayLikelihood(object):
         :param kwargs_cosmo: cosmology and other kwargs
         :return: log likelihood of the model given the time delay data
         """
+        fermat_pot = self.fermat_potential(kwargs_lens, kwargs_ps)
+        return self.logL_fermat(fermat_pot, kwargs_cosmo['D_dt'])
+
+    def fermat_potential(self, kwargs_lens, kwargs_ps):
+        """
+
+        :param kwargs_lens: lens model kwargs list
+        :param kwargs_ps: point source kwargs list
+        :return: Fermat potential [arcsec^2] at the image positions of the first point source
+        """
         x_pos, y_pos = self._pointSource.image_position(kwargs_ps=kwargs_ps, kwargs_lens=kwargs_lens)
         x_pos, y_pos = x_pos[0], y_pos[0]
-        delay_arcsec = self._lensModel.fermat_potential(x_pos, y_pos, kwargs_lens)
-        D_dt_model = kwargs_cosmo['D_dt']
-        delay_days = const.delay_arcsec2days(delay_arcsec, D_dt_model)
-        logL = self._logL_delays(delay_days, self._delays_measured, self._delays_errors)
-        return logL
+        return self._lensModel.fermat_potential(x_pos, y_pos, kwargs_lens)
+
+    def logL_fermat(self, fermat_pot, D_dt):
+        """
+
+        :param fermat_pot: Fermat potential [arcsec^2] at the image positions (see fermat_potential())
+        :param D_dt: time-delay distance [Mpc]
+        :return: log likelihood of the model given the time delay data
+        """
+        delay_days = const.delay_arcsec2days(fermat_pot, D_dt)
+        return self._logL_delays(delay_days, self._delays_measured, self._delays_errors)
+
+    def logL_batch(self, fermat_pot_list, D_dt):
+        """
+        log likelihood of a batch of samples, evaluated at once with logL_D_dt() if all the samples have an image
+        for each measured delay
+
+        :param fermat_pot_list: list of the Fermat potentials at the image positions of the samples
+        :param D_dt: time-delay distances [Mpc] of the samples, numpy array of shape (n,)
+        :return: log likelihood, numpy array of shape (n,)
+        """
+        D_dt = np.broadcast_to(D_dt, (len(fermat_pot_list),))
+        if all(len(fermat_pot) == self.num_data + 1 for fermat_pot in fermat_pot_list):
+            return self.logL_D_dt(D_dt, fermat_pot_list)
+        return np.array([self.logL_fermat(fermat_pot, D_dt[k]) for k, fermat_pot in enumerate(fermat_pot_list)])
+
+    def logL_D_dt(self, D_dt, fermat_pot):
+        """
+        vectorized log likelihood of time-delay distances given the Fermat potentials at the image positions, e.g. to
+        re-weight a lens model posterior with a large number of cosmologies
+
+        :param D_dt: time-delay distances [Mpc], float or numpy array of shape (n,)
+        :param fermat_pot: Fermat potentials of the images [arcsec^2] in the order of the measured delays, array of
+         shape (num_images,) or (n, num_images)
+        :return: log likelihood, float or numpy array of shape (n,)
+        """
+        D_dt = np.array(D_dt, dtype=float)
+        fermat_pot = np.array(fermat_pot, dtype=float)
+        delta_fermat = fermat_pot[..., 1:] - fermat_pot[..., :1]
+        delta_t_model = const.delay_arcsec2days(delta_fermat, D_dt[..., np.newaxis])
+        return np.sum(-(delta_t_model - self._delays_measured) ** 2 / (2 * self._delays_errors ** 2), axis=-1)
 
     def _logL_delays(self, delays_model, delays_measured, delays_errors):
         """
@@ -5,6 +5,7 @@ import shutil
 import numpy as np
 
 from lenstronomy.Sampling.Samplers.base_nested_sampler import NestedSampler
+from lenstronomy.Sampling.pool import LikelihoodPool
 import lenstronomy.Util.sampling_util as utils
 
 import dynesty
@@ -21,7 +22,7 @@ class DynestySampler(NestedSampler):
 
     def __init__(self, likelihood_module, prior_type='uniform', 
                  prior_means=None, prior_sigmas=None, width_scale=1, sigma_scale=1,
-                 bound='multi', sample='auto', use_mpi=False, use_pool={}):
+                 bound='multi', sample='auto', use_mpi=False, use_pool={}, thread_count=1):
         """
         :param likelihood_module: likelihood_module like in likelihood.py (should be callable)
         :param prior_type: 'uniform' of 'gaussian', for converting the unit hypercube to param cube
@@ -33,10 +34,13 @@ class DynestySampler(NestedSampler):
         :param sample: specific to Dynesty, see https://dynesty.readthedocs.io
         :param use_mpi: Use MPI computing if `True`
         :param use_pool: specific to Dynesty, see https://dynesty.readthedocs.io
+        :param thread_count: number of processes evaluating the likelihood with a LikelihoodPool (if use_mpi=False).
+         The pool is closed at the end of run().
         """
         super(DynestySampler, self).__init__(likelihood_module, prior_type, 
                                              prior_means, prior_sigmas,
                                              width_scale, sigma_scale)
+        self._pool = None
 
         # create the Dynesty sampler
         if use_mpi:
@@ -54,6 +58,16 @@ class DynestySampler(NestedSampler):
                                                          sample=sample,
                                                          pool=pool,
                                                          use_pool=use_pool)
+        elif thread_count > 1:
+            self._pool = LikelihoodPool(self._ll, processes=thread_count)
+            # only a reference to the likelihood module of the workers is sent with the tasks
+            self._ll = self._pool.logL
+            self._sampler = dynesty.DynamicNestedSampler(self.log_likelihood,
+                                                         self.prior, self.n_dims,
+                                                         bound=bound,
+                                                         sample=sample,
+                                                         pool=self._pool,
+                                                         use_pool=use_pool)
         else:
             self._sampler = dynesty.DynamicNestedSampler(self.log_likelihood,
                                                          self.prior,
@@ -62,6 +76,14 @@ class DynestySampler(NestedSampler):
                                                          sample=sample)
         self._has_warned = False
 
+    def __getstate__(self):
+        # prior() and log_likelihood() are sent to the pool with this instance, the Dynesty sampler and the pool
+        # are not needed in the workers
+        state = self.__dict__.copy()
+        if self._pool is not None:
+            state['_sampler'] = None
+            state['_pool'] = None
+        return state
 
     def prior(self, u):
         """
@@ -107,7 +129,11 @@ class DynestySampler(NestedSampler):
         print("prior type :", self.prior_type)
         print("parameter names :", self.param_names)
     
-        self._sampler.run_nested(**kwargs_run)
+        try:
+            self._sampler.run_nested(**kwargs_run)
+        finally:
+            if self._pool is not None:
+                self._pool.close()
 
         results = self._sampler.results
         samples_w = results.samples  # weighted samples
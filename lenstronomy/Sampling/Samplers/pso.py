@@ -0,0 +1,288 @@
+__author__ = 'sibirrer'
+
+import os
+import numpy as np
+
+
+class ParticleSwarmOptimizer(object):
+    """
+    Particle Swarm Optimizer (PSO) with the swarm stored as numpy arrays.
+
+    The fitness of the particles is evaluated with a pluggable map:
+
+    - serial: the built-in map (default)
+    - process pool or MPI: any object with a map(func, sequence) method, e.g. multiprocessing.Pool or MpiMap
+    - batched: with vectorized=True, func is called once per iteration with the positions of all particles as a
+      (n_particles, n_param) array and returns the fitness of all particles
+
+    The state of the swarm can be saved to and restored from a checkpoint file (save_state(), load_state()), and the
+    optimization stops early when the global best does not improve over a number of iterations.
+
+    The velocity update, the default weights and the convergence criterion follow the PSO implementation of
+    cosmoHammer (Akeret et al. 2013).
+    """
+    def __init__(self, func, low, high, particle_count=25, pool=None, vectorized=False):
+        """
+
+        :param func: function returning the fitness (e.g. log likelihood) of a position in parameter space
+        :param low: array of the lower bound of the parameter space to initialize the particles
+        :param high: array of the upper bound of the parameter space to initialize the particles
+        :param particle_count: number of particles
+        :param pool: None or object with a map(func, sequence) method to evaluate the fitness of the particles
+        :param vectorized: bool, if True, func takes the positions of all particles at once
+        """
+        self._func = func
+        self._pool = pool
+        self._vectorized = vectorized
+        self.low = np.array(low, dtype=float)
+        self.high = np.array(high, dtype=float)
+        self.particle_count = int(particle_count)
+        self.param_count = len(self.low)
+        self.position = np.random.uniform(self.low, self.high, size=(self.particle_count, self.param_count))
+        self.velocity = np.zeros_like(self.position)
+        self.fitness = np.zeros(self.particle_count)
+        self.pbest_position = np.array(self.position)
+        self.pbest_fitness = -np.inf * np.ones(self.particle_count)
+        self.gbest_position = np.zeros(self.param_count)
+        self.gbest_velocity = np.zeros(self.param_count)
+        self.gbest_fitness = -np.inf
+        self._gbest_fitness_list = []
+        self.iteration = 0
+        self._evaluated = False
+
+    def is_master(self):
+        """
+
+        :return: bool, False for the MPI processes that only evaluate the fitness
+        """
+        if hasattr(self._pool, 'is_master'):
+            return self._pool.is_master()
+        return True
+
+    def set_global_best(self, position, velocity, fitness):
+        """
+        sets the global best, e.g. from an initial guess
+
+        :param position: position in parameter space
+        :param velocity: velocity
+        :param fitness: fitness of the position
+        :return: None
+        """
+        self.gbest_position = np.array(position, dtype=float)
+        self.gbest_velocity = np.array(velocity, dtype=float)
+        self.gbest_fitness = fitness
+
+    def sample(self, max_iter=1000, c1=1.193, c2=1.193, p=0.7, m=10**-3, n=10**-2, stagnation_iter=None,
+               stagnation_tolerance=0., checkpoint_path=None, checkpoint_interval=10):
+        """
+        launches the PSO. Yields the swarm (position, velocity and fitness arrays) after every iteration.
+        The iterations are counted across resumes from a checkpoint.
+
+        :param max_iter: maximum number of iterations
+        :param c1: cognitive weight
+        :param c2: social weight
+        :param p: stop criterion, fraction of particles to use
+        :param m: stop criterion, difference between mean fitness and global best
+        :param n: stop criterion, difference between norm of the particle vector and norm of the global best
+        :param stagnation_iter: None or int, stops when the global best fitness did not improve by more than
+         stagnation_tolerance over this number of iterations
+        :param stagnation_tolerance: improvement of the global best fitness required with stagnation_iter
+        :param checkpoint_path: None or path of a file to which the state of the swarm is saved
+        :param checkpoint_interval: number of iterations between two checkpoints
+        """
+        if not self._evaluated:
+            self._get_fitness()
+            self._evaluated = True
+        while True:
+            self._update_best()
+            if self.iteration >= max_iter:
+                break
+            if self._converged(p=p, m=m, n=n):
+                if self.is_master():
+                    print("converged after %s iterations!" % self.iteration)
+                break
+            if self._stagnated(stagnation_iter, stagnation_tolerance):
+                if self.is_master():
+                    print("global best did not improve over %s iterations, stopping after %s iterations!"
+                          % (stagnation_iter, self.iteration))
+                break
+            w = 0.5 + np.random.uniform(0, 1, size=self.position.shape) / 2
+            part_vel = w * self.velocity
+            cog_vel = c1 * np.random.uniform(0, 1, size=self.position.shape) * (self.pbest_position - self.position)
+            soc_vel = c2 * np.random.uniform(0, 1, size=self.position.shape) * (self.gbest_position - self.position)
+            self.velocity = part_vel + cog_vel + soc_vel
+            self.position = self.position + self.velocity
+            self._get_fitness()
+            self.iteration += 1
+            if checkpoint_path is not None and self.iteration % checkpoint_interval == 0:
+                self.save_state(checkpoint_path)
+            yield self.position, self.velocity, self.fitness
+        if checkpoint_path is not None:
+            self.save_state(checkpoint_path)
+
+    def optimize(self, max_iter=1000, **kwargs):
+        """
+        runs the complete optimization
+
+        :param max_iter: maximum number of iterations
+        :param kwargs: keyword arguments of sample()
+        :return: global best position and fitness
+        """
+        for _ in self.sample(max_iter, **kwargs):
+            pass
+        return self.gbest_position, self.gbest_fitness
+
+    def _get_fitness(self):
+        """
+        evaluates the fitness of all particles. Not finite values are replaced by -inf.
+
+        :return: None
+        """
+        if hasattr(self._pool, 'bcast'):
+            # all MPI processes continue with the swarm of the master process
+            self.position, self.velocity = self._pool.bcast((self.position, self.velocity))
+        if self._vectorized is True:
+            fitness = self._func(self.position)
+        elif self._pool is not None:
+            fitness = self._pool.map(self._func, self.position)
+        else:
+            fitness = list(map(self._func, self.position))
+        fitness = np.array(fitness, dtype=float)
+        fitness[~np.isfinite(fitness)] = -np.inf
+        self.fitness = fitness
+
+    def _update_best(self):
+        """
+        updates the personal best positions of the particles and the global best
+
+        :return: None
+        """
+        improved = self.fitness > self.pbest_fitness
+        self.pbest_position[improved] = self.position[improved]
+        self.pbest_fitness[improved] = self.fitness[improved]
+        i = np.argmax(self.fitness)
+        if self.fitness[i] > self.gbest_fitness:
+            self.gbest_position = np.array(self.position[i])
+            self.gbest_velocity = np.array(self.velocity[i])
+            self.gbest_fitness = self.fitness[i]
+        # one entry per iteration, also when the update is repeated after resuming from a checkpoint
+        del self._gbest_fitness_list[self.iteration:]
+        self._gbest_fitness_list.append(self.gbest_fitness)
+
+    def _converged(self, p, m, n):
+        """
+        convergence criterion: the mean personal best fitness of the best particles is close to the global best, and
+        the best particles are close to the global best position
+
+        :param p: fraction of particles to use
+        :param m: difference between mean fitness and global best
+        :param n: difference between norm of the particle vector and norm of the global best
+        :return: bool
+        """
+        num_best = int(np.floor(self.particle_count * p))
+        if num_best < 2:
+            return False
+        best_sort = np.sort(self.pbest_fitness)[::-1]
+        mean_fit = np.mean(best_sort[1:num_best])
+        if not abs(self.gbest_fitness - mean_fit) < m:
+            return False
+        best_of_best = np.argsort(-self.fitness, kind='stable')[:num_best]
+        max_norm = np.max(np.linalg.norm(self.gbest_position - self.position[best_of_best], axis=1))
+        return max_norm < n
+
+    def _stagnated(self, stagnation_iter, stagnation_tolerance):
+        """
+
+        :param stagnation_iter: None or number of iterations
+        :param stagnation_tolerance: required improvement of the global best fitness
+        :return: bool, True if the global best fitness did not improve over stagnation_iter iterations
+        """
+        if stagnation_iter is None or len(self._gbest_fitness_list) <= stagnation_iter:
+            return False
+        return self._gbest_fitness_list[-1] - self._gbest_fitness_list[-1 - stagnation_iter] <= stagnation_tolerance
+
+    def save_state(self, path):
+        """
+        saves the state of the swarm, including the state of the numpy random number generator, to a .npz file.
+        Only the master process writes the file.
+
+        :param path: file path
+        :return: None
+        """
+        if not self.is_master():
+            return
+        random_state = np.random.get_state()
+        # write to a temporary file first such that an interruption does not corrupt the previous checkpoint
+        path_tmp = path + '.tmp.npz'
+        np.savez(path_tmp, position=self.position, velocity=self.velocity, fitness=self.fitness,
+                 pbest_position=self.pbest_position, pbest_fitness=self.pbest_fitness,
+                 gbest_position=self.gbest_position, gbest_velocity=self.gbest_velocity,
+                 gbest_fitness=self.gbest_fitness, gbest_fitness_list=np.array(self._gbest_fitness_list),
+                 iteration=self.iteration, random_keys=random_state[1], random_pos=random_state[2],
+                 random_has_gauss=random_state[3], random_cached_gaussian=random_state[4])
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(path_tmp, path)
+
+    def load_state(self, path):
+        """
+        restores the state of the swarm saved with save_state()
+
+        :param path: file path
+        :return: None
+        """
+        state = np.load(path)
+        if state['position'].shape != self.position.shape:
+            raise ValueError('the checkpoint contains a swarm of shape %s, expected %s.'
+                             % (state['position'].shape, self.position.shape))
+        self.position, self.velocity = state['position'], state['velocity']
+        self.fitness = state['fitness']
+        self.pbest_position, self.pbest_fitness = state['pbest_position'], state['pbest_fitness']
+        self.gbest_position, self.gbest_velocity = state['gbest_position'], state['gbest_velocity']
+        self.gbest_fitness = float(state['gbest_fitness'])
+        self._gbest_fitness_list = list(state['gbest_fitness_list'])
+        self.iteration = int(state['iteration'])
+        np.random.set_state(('MT19937', state['random_keys'], int(state['random_pos']),
+                             int(state['random_has_gauss']), float(state['random_cached_gaussian'])))
+        self._evaluated = True
+
+
+class MpiMap(object):
+    """
+    map function distributing the evaluations over all MPI processes. In contrast to a master-worker pool, all
+    processes run the optimizer with the same state, evaluate their share of the sequence and gather the results.
+    """
+    def __init__(self):
+        from mpi4py import MPI
+        self._comm = MPI.COMM_WORLD
+        self._rank = self._comm.Get_rank()
+        self._size = self._comm.Get_size()
+
+    def is_master(self):
+        """
+
+        :return: bool, True for the process of rank 0
+        """
+        return self._rank == 0
+
+    def bcast(self, value):
+        """
+
+        :param value: any picklable object
+        :return: value of the process of rank 0
+        """
+        return self._comm.bcast(value, root=0)
+
+    def map(self, func, sequence):
+        """
+
+        :param func: function
+        :param sequence: sequence of arguments
+        :return: list of func(x) for all x in sequence
+        """
+        sequence = self.bcast(sequence)
+        num = len(sequence)
+        start = int(round(num * self._rank / float(self._size)))
+        end = int(round(num * (self._rank + 1) / float(self._size)))
+        results = self._comm.allgather([func(x) for x in sequence[start:end]])
+        return [result for block in results for result in block]
@@ -150,7 +150,83 @@ class LikelihoodModule(object):
                 return -np.inf
         return self.log_likelihood(kwargs_return, verbose=verbose)
 
+    def logL_batch(self, args_2d):
+        """
+        log likelihood of a batch of parameter vectors (e.g. all the walkers of an ensemble sampler).
+        The parameter mapping, the bounds, the priors, the astrometric and the time-delay likelihood are evaluated on
+        the batch at once and the linear inversions of the imaging likelihood are solved together. The other terms
+        requiring the lens, light and point source models are evaluated sample by sample.
+
+        :param args_2d: array of shape (n_samples, num_param)
+        :return: log likelihoods, numpy array of shape (n_samples,), -inf for the samples outside the bounds
+        """
+        args_2d = np.array(args_2d, dtype=float, ndmin=2)
+        logL = -np.inf * np.ones(len(args_2d))
+        if self._check_bounds is True:
+            inside = self.check_bounds_batch(args_2d, self._lower_limit, self._upper_limit)
+        else:
+            inside = np.ones(len(args_2d), dtype=bool)
+        if not np.any(inside):
+            return logL
+        args_inside = args_2d[inside]
+        kwargs_list = [self.param.args2kwargs(args) for args in args_inside]
+        kwargs_batch = self.param.args2kwargs_batch(args_inside, kwargs_list=kwargs_list)
+        logL_inside = np.zeros(len(args_inside))
+        point_source_cache_list = [None] * len(kwargs_list)
+        if self._image_likelihood is True:
+            # the image positions of each sample are solved once and re-used by the imaging likelihood and the terms
+            # evaluated sample by sample
+            for k, kwargs_return in enumerate(kwargs_list):
+                self._reset_point_source_cache(bool=True)
+                self.PointSource.image_position(kwargs_return['kwargs_ps'], kwargs_return['kwargs_lens'])
+                point_source_cache_list[k] = self.PointSource.lens_model_cache()
+            self._reset_point_source_cache(bool=True)
+            logL_inside += self.image_likelihood.logL_batch(kwargs_list,
+                                                            point_source_cache_list=point_source_cache_list)
+            self._reset_point_source_cache(bool=False)
+        fermat_pot_list = []
+        for k, kwargs_return in enumerate(kwargs_list):
+            logL_sample, fermat_pot = self._log_likelihood_sample(kwargs_return, image_likelihood=False,
+                                                                  point_source_cache=point_source_cache_list[k])
+            logL_inside[k] += logL_sample
+            fermat_pot_list.append(fermat_pot)
+        if self._time_delay_likelihood is True:
+            logL_inside += self.time_delay_likelihood.logL_batch(fermat_pot_list,
+                                                                 kwargs_batch['kwargs_special']['D_dt'])
+        logL_inside += self._position_likelihood.logL_astrometric_batch(kwargs_batch['kwargs_ps'],
+                                                                        kwargs_batch['kwargs_special'])
+        logL_inside += self._prior_likelihood.logL_batch(**kwargs_batch)
+        logL[inside] = logL_inside
+        return logL
+
     def log_likelihood(self, kwargs_return, verbose=False):
+        logL, fermat_pot = self._log_likelihood_sample(kwargs_return, verbose=verbose)
+        if self._time_delay_likelihood is True:
+            logL_time_delay = self.time_delay_likelihood.logL_fermat(fermat_pot, kwargs_return['kwargs_special']['D_dt'])
+            logL += logL_time_delay
+            if verbose is True:
+                print('time-delay logL = %s' % logL_time_delay)
+        logL += self._position_likelihood.logL_astrometric(kwargs_return['kwargs_ps'], kwargs_return['kwargs_special'],
+                                                           verbose=verbose)
+        logL_prior = self._prior_likelihood.logL(**kwargs_return)
+        logL += logL_prior
+        if verbose is True:
+            print('Prior likelihood = %s' % logL_prior)
+        return logL#, None
+
+    def _log_likelihood_sample(self, kwargs_return, verbose=False, image_likelihood=True, point_source_cache=None):
+        """
+        likelihood terms of a single sample that require the lens, light and point source models (all terms but the
+        priors, the astrometric likelihood and the likelihood of the time delays given the Fermat potential)
+
+        :param kwargs_return: keyword arguments of Param.args2kwargs()
+        :param verbose: bool
+        :param image_likelihood: bool, if False, the imaging likelihood is not evaluated (e.g. when evaluated for a
+         batch of samples with ImageLikelihood.logL_batch())
+        :param point_source_cache: point source positions already solved for the sample (see
+         PointSource.lens_model_cache()) or None
+        :return: log likelihood, Fermat potential at the image positions (None without time-delay likelihood)
+        """
         kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special = kwargs_return['kwargs_lens'], \
                                                                                    kwargs_return['kwargs_source'], \
                                                                                    kwargs_return['kwargs_lens_light'], \
@@ -158,18 +234,18 @@ class LikelihoodModule(object):
                                                                                    kwargs_return['kwargs_special']
         #generate image and computes likelihood
         self._reset_point_source_cache(bool=True)
+        if point_source_cache is not None:
+            self.PointSource.set_lens_model_cache(point_source_cache)
         logL = 0
 
-        if self._image_likelihood is True:
+        if self._image_likelihood is True and image_likelihood is True:
             logL_image = self.image_likelihood.logL(**kwargs_return)
             logL += logL_image
             if verbose is True:
                 print('image logL = %s' % logL_image)
+        fermat_pot = None
         if self._time_delay_likelihood is True:
-            logL_time_delay = self.time_delay_likelihood.logL(kwargs_lens, kwargs_ps, kwargs_special)
-            logL += logL_time_delay
-            if verbose is True:
-                print('time-delay logL = %s' % logL_time_delay)
+            fermat_pot = self.time_delay_likelihood.fermat_potential(kwargs_lens, kwargs_ps)
         if self._check_positive_flux is True:
             bool = self.param.check_positive_flux(kwargs_source, kwargs_lens_light, kwargs_ps)
             if bool is False:
@@ -185,18 +261,14 @@ class LikelihoodModule(object):
             logL += logL_flux_ratios
             if verbose is True:
                 print('flux ratio logL = %s' % logL_flux_ratios)
-        logL += self._position_likelihood.logL(kwargs_lens, kwargs_ps, kwargs_special, verbose=verbose)
-        logL_prior = self._prior_likelihood.logL(**kwargs_return)
-        logL += logL_prior
-        if verbose is True:
-            print('Prior likelihood = %s' % logL_prior)
+        logL += self._position_likelihood.logL_image_positions(kwargs_lens, kwargs_ps, verbose=verbose)
         if self._custom_logL_addition is not None:
             logL_cond = self._custom_logL_addition(**kwargs_return)
             logL += logL_cond
             if verbose is True:
                 print('custom added logL = %s' % logL_cond)
         self._reset_point_source_cache(bool=False)
-        return logL#, None
+        return logL, fermat_pot
 
     @staticmethod
     def check_bounds(args, lowerLimit, upperLimit, verbose=False):
@@ -214,6 +286,19 @@ class LikelihoodModule(object):
                 return penalty, bound_hit
         return penalty, bound_hit
 
+    @staticmethod
+    def check_bounds_batch(args_2d, lowerLimit, upperLimit):
+        """
+        checks which parameter vectors of a batch are within the bounds
+
+        :param args_2d: array of shape (n_samples, num_param)
+        :param lowerLimit: lower bounds of the parameters
+        :param upperLimit: upper bounds of the parameters
+        :return: bool array of shape (n_samples,), True for the samples within the bounds
+        """
+        args_2d = np.asarray(args_2d)
+        return ~np.any((args_2d < np.asarray(lowerLimit)) | (args_2d > np.asarray(upperLimit)), axis=1)
+
     @property
     def num_data(self):
         """
@@ -177,7 +177,7 @@ class Param(object):
             if i_source in self._image_plane_source_list:
                 raise ValueError("linking a source light model with a lens model AND simultaneously parameterizing the"
                                  " source position in the image plane is not valid!")
-
+        self._index_map = self._compile_index_map()
 
     @property
     def num_point_source_images(self):
@@ -189,13 +189,8 @@ class Param(object):
         :param args: tuple of parameter values (float, strings, ...)
         :return: keyword arguments sorted in lenstronomy conventions
         """
-        i = 0
-        kwargs_lens, i = self.lensParams.getParams(args, i)
-        kwargs_source, i = self.souceParams.getParams(args, i)
-        kwargs_lens_light, i = self.lensLightParams.getParams(args, i)
-        kwargs_ps, i = self.pointSourceParams.getParams(args, i)
-        kwargs_special, i = self.specialParams.getParams(args, i)
-        kwargs_extinction, i = self.extinctionParams.getParams(args, i)
+        kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special, kwargs_extinction = \
+            self._get_params(args)
         # update lens_light joint parameters
         kwargs_lens_light = self._update_lens_light_joint_with_point_source(kwargs_lens_light, kwargs_ps)
         kwargs_lens_light = self._update_joint_param(kwargs_lens_light, kwargs_lens_light, self._joint_lens_light_with_lens_light)
@@ -206,7 +201,8 @@ class Param(object):
         kwargs_extinction = self._update_joint_param(kwargs_lens_light, kwargs_extinction, self._joint_extinction_with_lens_light)
         # update lens model joint parameters (including scaling)
         kwargs_lens = self._update_joint_param(kwargs_lens, kwargs_lens, self._joint_lens_with_lens)
-        kwargs_lens = self.update_lens_scaling(kwargs_special, kwargs_lens)
+        if self._mass_scaling is True:
+            kwargs_lens = self.update_lens_scaling(kwargs_special, kwargs_lens)
         # update point source constraint solver
         if self._solver is True:
             x_pos, y_pos = kwargs_ps[0]['ra_image'], kwargs_ps[0]['dec_image']
@@ -218,13 +214,195 @@ class Param(object):
         kwargs_source = self._update_joint_param(kwargs_source, kwargs_source, self._joint_source_with_source)
         # optional revert lens_scaling for bijective
 
-        if bijective is True:
+        if bijective is True and self._mass_scaling is True:
             kwargs_lens = self.update_lens_scaling(kwargs_special, kwargs_lens, inverse=True)
         kwargs_return = {'kwargs_lens': kwargs_lens, 'kwargs_source': kwargs_source,
                          'kwargs_lens_light': kwargs_lens_light, 'kwargs_ps': kwargs_ps,
                          'kwargs_special': kwargs_special, 'kwargs_extinction': kwargs_extinction}
         return kwargs_return
 
+    def _get_params(self, args):
+        """
+        maps the arguments to the keyword arguments of the models (before the joint parameters and the solver are
+        applied) with the compiled index map, or with the parameter classes of the models if the setting can not be
+        compiled
+
+        :param args: tuple of parameter values
+        :return: kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special, kwargs_extinction
+        """
+        if self._index_map is None:
+            return self._get_params_models(args)
+        kwargs_all = []
+        for template_list, assignment_list in self._index_map:
+            kwargs_list = []
+            for template, assignments in zip(template_list, assignment_list):
+                kwargs = dict(template)
+                for name, index, to_array in assignments:
+                    if to_array is True:
+                        kwargs[name] = np.array(args[index])
+                    else:
+                        kwargs[name] = args[index]
+                kwargs_list.append(kwargs)
+            kwargs_all.append(kwargs_list)
+        kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special, kwargs_extinction = kwargs_all
+        return kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special[0], kwargs_extinction
+
+    def _get_params_models(self, args):
+        """
+
+        :param args: tuple of parameter values
+        :return: kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special, kwargs_extinction as
+         returned by the getParams() methods of the parameter classes of the models
+        """
+        i = 0
+        kwargs_lens, i = self.lensParams.getParams(args, i)
+        kwargs_source, i = self.souceParams.getParams(args, i)
+        kwargs_lens_light, i = self.lensLightParams.getParams(args, i)
+        kwargs_ps, i = self.pointSourceParams.getParams(args, i)
+        kwargs_special, i = self.specialParams.getParams(args, i)
+        kwargs_extinction, i = self.extinctionParams.getParams(args, i)
+        return kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps, kwargs_special, kwargs_extinction
+
+    def _compile_index_map(self):
+        """
+        compiles the mapping of the arguments to the keyword arguments of the models into an index map, such that
+        args2kwargs() does not need to go through the parameter classes of the models for every call.
+        For every model, the index map contains a template with the fixed parameters and a list of
+        (param_name, index or slice of the arguments, bool whether the slice is converted to a numpy array).
+
+        The map is derived by mapping two different probe arguments with the parameter classes: fixed parameters are
+        the same objects in both mappings, sampled parameters are the probe values at their index.
+
+        :return: index map, or None if the mapping can not be expressed as an index map (e.g. the lens model
+         coefficients of the 'SHAPELETS' solver)
+        """
+        try:
+            num_param, _ = self.num_param()
+            kwargs_probe = self._get_params_models([i + 0.5 for i in range(num_param)])
+            kwargs_probe_2 = self._get_params_models([i + 0.25 for i in range(num_param)])
+        except (ValueError, IndexError, TypeError):
+            # invalid settings raise when the arguments are mapped
+            return None
+        index_map = []
+        for k, kwargs_list in enumerate(kwargs_probe):
+            kwargs_list_2 = kwargs_probe_2[k]
+            if isinstance(kwargs_list, dict):
+                kwargs_list, kwargs_list_2 = [kwargs_list], [kwargs_list_2]
+            template_list, assignment_list = [], []
+            for kwargs, kwargs_2 in zip(kwargs_list, kwargs_list_2):
+                template, assignments = {}, []
+                for name in kwargs:
+                    value, value_2 = kwargs[name], kwargs_2[name]
+                    if value is value_2:
+                        template[name] = value
+                        continue
+                    index = self._probe_index(value, value_2)
+                    if index is None:
+                        return None
+                    template[name] = None
+                    assignments.append((name, index, isinstance(value, np.ndarray)))
+                template_list.append(template)
+                assignment_list.append(assignments)
+            index_map.append((template_list, assignment_list))
+        return index_map
+
+    @staticmethod
+    def _probe_index(value, value_2):
+        """
+
+        :param value: mapped parameter of the probe arguments i + 0.5
+        :param value_2: mapped parameter of the probe arguments i + 0.25
+        :return: index or slice of the arguments of the parameter, None if the parameter is not a plain argument or
+         slice of the arguments
+        """
+        if isinstance(value, float):
+            index = int(value)
+            if value == index + 0.5 and value_2 == index + 0.25:
+                return index
+            return None
+        if isinstance(value, (list, np.ndarray)) and np.ndim(value) == 1:
+            if len(value) == 0:
+                return slice(0, 0)
+            start = int(value[0])
+            index_array = np.arange(start, start + len(value))
+            if np.array_equal(value, index_array + 0.5) and np.array_equal(value_2, index_array + 0.25):
+                return slice(start, start + len(value))
+        return None
+
+    def args2kwargs_batch(self, args_2d, bijective=False, kwargs_list=None):
+        """
+        columnar version of args2kwargs() for a batch of parameter vectors (e.g. the walkers of an ensemble sampler).
+        All parameters of the returned keyword arguments are arrays with the samples along the last axis, e.g.
+        kwargs_lens[0]['theta_E'] has shape (n_samples,) and kwargs_ps[0]['ra_image'] has shape (num_images, n_samples).
+        Fixed parameters are broadcast (read-only) to the same convention.
+        The mapping is vectorized over the samples unless the lens equation solver or joint parameters requiring
+        ray-shooting are used, in which case the samples are mapped one by one.
+
+        :param args_2d: array of shape (n_samples, num_param)
+        :param bijective: bool, see args2kwargs()
+        :param kwargs_list: None or list of the args2kwargs() returns of the samples if already available, such that
+         the samples are not mapped a second time
+        :return: keyword arguments sorted in lenstronomy conventions with columnar parameters
+        """
+        args_2d = np.array(args_2d, dtype=float, ndmin=2)
+        num = len(args_2d)
+        if kwargs_list is None:
+            kwargs_ref = self.args2kwargs(args_2d[0], bijective=bijective)
+        else:
+            kwargs_ref = kwargs_list[0]
+        if self._batch_vectorized is True:
+            # the models only index the arguments, such that the columns of the batch are passed through
+            kwargs_batch = self.args2kwargs(args_2d.T, bijective=bijective)
+            return self._broadcast_batch(kwargs_batch, kwargs_ref, num)
+        if kwargs_list is None:
+            kwargs_list = [kwargs_ref] + [self.args2kwargs(args, bijective=bijective) for args in args_2d[1:]]
+        return self._stack_batch(kwargs_list)
+
+    @property
+    def _batch_vectorized(self):
+        """
+
+        :return: bool, True if args2kwargs() can be evaluated on the columns of a batch of parameter vectors
+        """
+        if self._solver is True or any(self._image_plane_source_list):
+            return False
+        if len(self._joint_source_with_point_source) > 0 or len(self._joint_lens_light_with_point_source) > 0:
+            return False
+        return True
+
+    @staticmethod
+    def _broadcast_batch(kwargs_batch, kwargs_ref, num):
+        """
+
+        :param kwargs_batch: return of args2kwargs() evaluated on the columns of a batch of parameter vectors
+        :param kwargs_ref: return of args2kwargs() of a single parameter vector
+        :param num: number of samples in the batch
+        :return: kwargs_batch with the parameters that do not vary (fixed parameters) broadcast to the batch
+        """
+        if isinstance(kwargs_ref, dict):
+            return {key: Param._broadcast_batch(kwargs_batch[key], kwargs_ref[key], num) for key in kwargs_ref}
+        if isinstance(kwargs_ref, list) and all(isinstance(kwargs, dict) for kwargs in kwargs_ref):
+            return [Param._broadcast_batch(kwargs_batch[k], kwargs_ref[k], num) for k in range(len(kwargs_ref))]
+        value = np.asarray(kwargs_batch)
+        shape = np.shape(kwargs_ref) + (num,)
+        if value.shape == shape:
+            return value
+        return np.broadcast_to(np.expand_dims(np.asarray(kwargs_ref), -1), shape)
+
+    @staticmethod
+    def _stack_batch(kwargs_list):
+        """
+
+        :param kwargs_list: list of args2kwargs() returns of the samples of a batch
+        :return: columnar keyword arguments with the samples along the last axis
+        """
+        kwargs_ref = kwargs_list[0]
+        if isinstance(kwargs_ref, dict):
+            return {key: Param._stack_batch([kwargs[key] for kwargs in kwargs_list]) for key in kwargs_ref}
+        if isinstance(kwargs_ref, list) and all(isinstance(kwargs, dict) for kwargs in kwargs_ref):
+            return [Param._stack_batch([kwargs[k] for kwargs in kwargs_list]) for k in range(len(kwargs_ref))]
+        return np.stack([np.asarray(value) for value in kwargs_list], axis=-1)
+
     def kwargs2args(self, kwargs_lens=None, kwargs_source=None, kwargs_lens_light=None, kwargs_ps=None,
                     kwargs_special=None, kwargs_extinction=None):
         """
@@ -314,7 +492,8 @@ class Param(object):
         return kwargs_source_copy
 
     def _update_source_joint_with_point_source(self, kwargs_lens_list, kwargs_source_list, kwargs_ps, kwargs_special, image_plane=False):
-        kwargs_source_list = self.image2source_plane(kwargs_source_list, kwargs_lens_list, image_plane=image_plane)
+        if any(self._image_plane_source_list):
+            kwargs_source_list = self.image2source_plane(kwargs_source_list, kwargs_lens_list, image_plane=image_plane)
 
         for setting in self._joint_source_with_point_source:
             i_point_source, k_source, param_list = setting
@@ -0,0 +1,239 @@
+__author__ = 'sibirrer'
+
+import io
+import uuid
+import pickle
+import multiprocessing
+import numpy as np
+
+try:
+    # dill (or cloudpickle) also pickles local functions and closures, e.g. a custom_logL_addition defined in a function
+    import dill as _pickle_base
+    _Unpickler = _pickle_base.Unpickler
+except ImportError:
+    try:
+        import cloudpickle as _pickle_base
+    except ImportError:
+        _pickle_base = pickle
+    _Unpickler = pickle.Unpickler
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # python < 3.8, the arrays are copied once into every worker
+    shared_memory = None
+
+# likelihood modules of the pools, indexed by the token of the pool, together with the shared memory blocks they use
+_likelihood_dict = {}
+
+
+class LikelihoodPool(object):
+    """
+    persistent pool of processes evaluating a likelihood module (e.g. LikelihoodModule).
+
+    The likelihood module is sent once to every worker when the pool is created. The numpy arrays in it (e.g. data,
+    noise maps and PSF kernels) are placed in shared memory (multiprocessing.shared_memory, python >= 3.8) such that
+    they are not copied into the workers. For every evaluation, only the name of the method and its arguments (e.g. a
+    parameter vector) are sent to the workers.
+
+    The pool can be passed to the samplers (PSO, emcee, dynesty) together with the functions returned by function()
+    or logL, e.g.::
+
+        with LikelihoodPool(likelihood_module, processes=4) as pool:
+            log_likelihoods = pool.map(pool.logL, args_list)
+    """
+    def __init__(self, likelihood_module, processes=None, min_shared_size=8192):
+        """
+
+        :param likelihood_module: likelihood module instance (needs to be picklable, local functions such as a
+         custom_logL_addition defined in a function require dill or cloudpickle)
+        :param processes: number of processes, if None, the number of CPUs
+        :param min_shared_size: minimum size in bytes of the numpy arrays placed in shared memory
+        """
+        self._token = uuid.uuid4().hex
+        self._shared_memory_list = []
+        state = _dumps(likelihood_module, min_shared_size, self._shared_memory_list)
+        # the functions of the pool can also be evaluated in the parent process
+        _likelihood_dict[self._token] = (likelihood_module, [])
+        self._pool = _get_context().Pool(processes, initializer=_init_worker, initargs=(self._token, state))
+        self.size = self._pool._processes
+
+    @property
+    def num_shared_arrays(self):
+        """
+
+        :return: number of numpy arrays placed in shared memory
+        """
+        return len(self._shared_memory_list)
+
+    def function(self, name='logL'):
+        """
+        method of the likelihood module to be evaluated with map()
+
+        :param name: name of the method of the likelihood module
+        :return: picklable callable, evaluating the method with the likelihood module of the process
+        """
+        return PoolFunction(self._token, name)
+
+    @property
+    def logL(self):
+        """
+
+        :return: picklable callable evaluating the logL() method of the likelihood module
+        """
+        return self.function('logL')
+
+    def map(self, func, iterable):
+        """
+        evaluates func for all elements of iterable in the workers
+
+        :param func: picklable function, e.g. from function()
+        :param iterable: sequence of arguments
+        :return: list of results
+        """
+        return self._pool.map(func, iterable)
+
+    def close(self):
+        """
+        terminates the workers and releases the shared memory
+
+        :return: None
+        """
+        self._pool.close()
+        self._pool.join()
+        for shm in self._shared_memory_list:
+            shm.close()
+            shm.unlink()
+        self._shared_memory_list = []
+        _likelihood_dict.pop(self._token, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+
+class PoolFunction(object):
+    """
+    picklable reference to a method of the likelihood module of a LikelihoodPool
+    """
+    def __init__(self, token, name):
+        """
+
+        :param token: token of the LikelihoodPool
+        :param name: name of the method
+        """
+        self._token = token
+        self._name = name
+
+    def __call__(self, *args, **kwargs):
+        likelihood_module = _likelihood_dict[self._token][0]
+        return getattr(likelihood_module, self._name)(*args, **kwargs)
+
+
+class _SharedArrayPickler(_pickle_base.Pickler):
+    """
+    pickler storing numpy arrays in shared memory blocks instead of the pickle stream (based on the pickler of dill or
+    cloudpickle if installed)
+    """
+    def __init__(self, file, min_shared_size, shared_memory_list):
+        _pickle_base.Pickler.__init__(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._min_shared_size = min_shared_size
+        self._shared_memory_list = shared_memory_list
+        self._memo_shared = {}
+
+    def persistent_id(self, obj):
+        if shared_memory is None or type(obj) is not np.ndarray or obj.dtype.hasobject:
+            return None
+        if obj.nbytes < self._min_shared_size:
+            return None
+        key = id(obj)
+        if key not in self._memo_shared:
+            shm = shared_memory.SharedMemory(create=True, size=obj.nbytes)
+            np.ndarray(obj.shape, dtype=obj.dtype, buffer=shm.buf)[...] = obj
+            self._shared_memory_list.append(shm)
+            # the array is kept in the memo such that its id is not re-used while pickling
+            self._memo_shared[key] = ((shm.name, obj.shape, obj.dtype.str), obj)
+        return self._memo_shared[key][0]
+
+
+class _SharedArrayUnpickler(_Unpickler):
+    """
+    unpickler attaching the numpy arrays stored in shared memory blocks by _SharedArrayPickler (read-only)
+    """
+    def __init__(self, file, shared_memory_list):
+        _Unpickler.__init__(self, file)
+        self._shared_memory_list = shared_memory_list
+        self._memo_shared = {}
+
+    def persistent_load(self, pid):
+        name, shape, dtype = pid
+        # several references to the same array are restored as the same array
+        if name not in self._memo_shared:
+            shm = shared_memory.SharedMemory(name=name)
+            self._shared_memory_list.append(shm)
+            array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            array.flags.writeable = False
+            self._memo_shared[name] = array
+        return self._memo_shared[name]
+
+
+def _get_context():
+    """
+    start method of the worker processes. The workers are not forked from the (possibly multi-threaded) process
+    using the pool, since a fork after numba's parallel (e.g. TBB) threading layer has been launched can deadlock.
+    The likelihood module is sent to the workers pickled, such that it does not rely on fork.
+
+    :return: multiprocessing context ('forkserver' if available, otherwise 'spawn')
+    """
+    if not hasattr(multiprocessing, 'get_context'):
+        # python 2
+        return multiprocessing
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _dumps(obj, min_shared_size, shared_memory_list):
+    """
+
+    :param obj: object to be pickled
+    :param min_shared_size: minimum size in bytes of the numpy arrays placed in shared memory
+    :param shared_memory_list: list to which the created shared memory blocks are appended
+    :return: pickled object
+    """
+    file = io.BytesIO()
+    try:
+        _SharedArrayPickler(file, min_shared_size, shared_memory_list).dump(obj)
+    except BaseException:
+        # the shared memory blocks created before the failure are released
+        for shm in shared_memory_list:
+            shm.close()
+            shm.unlink()
+        del shared_memory_list[:]
+        raise
+    return file.getvalue()
+
+
+def _loads(state):
+    """
+
+    :param state: return of _dumps()
+    :return: object, list of the attached shared memory blocks
+    """
+    shared_memory_list = []
+    obj = _SharedArrayUnpickler(io.BytesIO(state), shared_memory_list).load()
+    return obj, shared_memory_list
+
+
+def _init_worker(token, state):
+    """
+    initializes the likelihood module in a worker process
+
+    :param token: token of the LikelihoodPool
+    :param state: pickled likelihood module
+    :return: None
+    """
+    _likelihood_dict[token] = _loads(state)
@@ -1,16 +1,15 @@
 __author__ = 'sibirrer'
 
+import os
 import time
 import sys
 
 import numpy as np
-from cosmoHammer import MpiParticleSwarmOptimizer
-from cosmoHammer import ParticleSwarmOptimizer
-from cosmoHammer.util import MpiUtil
+from lenstronomy.Sampling.Samplers.pso import ParticleSwarmOptimizer, MpiMap
+from lenstronomy.Sampling.pool import LikelihoodPool
 from lenstronomy.Util import sampling_util
 import emcee
 from schwimmbad import MPIPool
-from multiprocess import Pool
 
 
 class Sampler(object):
@@ -30,54 +29,86 @@ class Sampler(object):
         self.lower_limit, self.upper_limit = self.chain.param_limits
 
     def pso(self, n_particles, n_iterations, lower_start=None, upper_start=None, threadCount=1, init_pos=None,
-            mpi=False, print_key='PSO'):
+            mpi=False, print_key='PSO', pool=None, checkpoint_path=None, checkpoint_interval=10, stagnation_iter=None,
+            stagnation_tolerance=0., vectorize=False):
         """
         returns the best fit for the lense model on catalogue basis with particle swarm optimizer
+
+        :param n_particles: number of particles
+        :param n_iterations: maximum number of iterations
+        :param lower_start: lower bound of the parameters to initialize the particles
+        :param upper_start: upper bound of the parameters to initialize the particles
+        :param threadCount: number of processes to evaluate the likelihood of the particles (with a LikelihoodPool)
+        :param init_pos: initial global best position
+        :param mpi: bool, if True, the likelihood evaluations are distributed over the MPI processes
+        :param print_key: string, name of the process printed
+        :param pool: None or object with a map(func, sequence) method to evaluate the likelihood of the particles
+         (overwrites threadCount and mpi), e.g. a LikelihoodPool of the likelihood module
+        :param checkpoint_path: None or path of a file to save the state of the swarm. If the file exists, the PSO
+         resumes from it.
+        :param checkpoint_interval: number of iterations between two checkpoints
+        :param stagnation_iter: None or int, stops the PSO when the best likelihood did not improve by more than
+         stagnation_tolerance over this number of iterations
+        :param stagnation_tolerance: improvement in logL required with stagnation_iter
+        :param vectorize: bool, if True, the likelihoods of all particles of an iteration are evaluated in one call of
+         LikelihoodModule.logL_batch() (not compatible with pool, mpi and threadCount > 1)
+        :return: best fit parameters, [chi^2, positions and velocities of the global best of each iteration, []]
         """
+        if vectorize is True and (pool is not None or mpi is True or threadCount > 1):
+            raise ValueError('vectorize=True evaluates the particles in a single process and can not be combined with '
+                             'pool, mpi or threadCount > 1.')
         if lower_start is None or upper_start is None:
             lower_start, upper_start = np.array(self.lower_limit), np.array(self.upper_limit)
             print("PSO initialises its particles with default values")
         else:
             lower_start = np.maximum(lower_start, self.lower_limit)
             upper_start = np.minimum(upper_start, self.upper_limit)
-        if mpi is True:
-            pso = MpiParticleSwarmOptimizer(self.chain.likelihood_derivative, lower_start, upper_start, n_particles, threads=1)
-            if pso.isMaster():
+        close_pool = False
+        if pool is None:
+            if mpi is True:
+                pool = MpiMap()
+            elif threadCount > 1:
+                pool = LikelihoodPool(self.chain, processes=threadCount)
+                close_pool = True
+        try:
+            if isinstance(pool, LikelihoodPool):
+                log_likelihood = pool.logL
+            elif vectorize is True:
+                log_likelihood = self.chain.logL_batch
+            else:
+                log_likelihood = self.chain.logL
+            pso = ParticleSwarmOptimizer(log_likelihood, lower_start, upper_start, n_particles, pool=pool,
+                                         vectorized=vectorize)
+            if mpi is True and pso.is_master():
                 print('MPI option chosen')
-        else:
-            pso = ParticleSwarmOptimizer(self.chain.likelihood_derivative, lower_start, upper_start, n_particles, threads=threadCount)
-        if init_pos is None:
-            init_pos = (upper_start - lower_start) / 2 + lower_start
-        if not init_pos is None:
-            pso.gbest.position = init_pos
-            pso.gbest.velocity = [0]*len(init_pos)
-            pso.gbest.fitness = self.chain.likelihood(init_pos)
-        X2_list = []
-        vel_list = []
-        pos_list = []
-        time_start = time.time()
-        if pso.isMaster():
-            print('Computing the %s ...' % print_key)
-        num_iter = 0
-        for swarm in pso.sample(n_iterations):
-            X2_list.append(pso.gbest.fitness*2)
-            vel_list.append(pso.gbest.velocity)
-            pos_list.append(pso.gbest.position)
-            num_iter += 1
-            if pso.isMaster():
-                if num_iter % 10 == 0:
-                    print(num_iter)
-        if not mpi:
-            result = pso.gbest.position
-        else:
-            result = MpiUtil.mpiBCast(pso.gbest.position)
+            if init_pos is None:
+                init_pos = (upper_start - lower_start) / 2 + lower_start
+            pso.set_global_best(init_pos, [0] * len(init_pos), self.chain.likelihood(init_pos))
+            if checkpoint_path is not None and os.path.exists(checkpoint_path):
+                pso.load_state(checkpoint_path)
+                if pso.is_master():
+                    print('PSO resumed from %s after %s iterations' % (checkpoint_path, pso.iteration))
+            X2_list = []
+            vel_list = []
+            pos_list = []
+            time_start = time.time()
+            if pso.is_master():
+                print('Computing the %s ...' % print_key)
+            for swarm in pso.sample(n_iterations, checkpoint_path=checkpoint_path,
+                                    checkpoint_interval=checkpoint_interval, stagnation_iter=stagnation_iter,
+                                    stagnation_tolerance=stagnation_tolerance):
+                X2_list.append(pso.gbest_fitness * 2)
+                vel_list.append(pso.gbest_velocity)
+                pos_list.append(pso.gbest_position)
+        finally:
+            if close_pool is True:
+                pool.close()
+        result = pso.gbest_position
 
-        if mpi is True and not pso.isMaster():
-            pass
-        else:
+        if pso.is_master():
             kwargs_return = self.chain.param.args2kwargs(result)
-            print(pso.gbest.fitness * 2 / (max(self.chain.effectiv_num_data_points(**kwargs_return), 1)), 'reduced X^2 of best position')
-            print(pso.gbest.fitness, 'logL')
+            print(pso.gbest_fitness * 2 / (max(self.chain.effectiv_num_data_points(**kwargs_return), 1)), 'reduced X^2 of best position')
+            print(pso.gbest_fitness, 'logL')
             print(self.chain.effectiv_num_data_points(**kwargs_return), 'effective number of data points')
             print(kwargs_return.get('kwargs_lens', None), 'lens result')
             print(kwargs_return.get('kwargs_source', None), 'source result')
@@ -89,7 +120,32 @@ class Sampler(object):
             print('===================')
         return result, [X2_list, pos_list, vel_list, []]
 
-    def mcmc_emcee(self, n_walkers, n_run, n_burn, mean_start, sigma_start, mpi=False, progress=False, threadCount=1):
+    def mcmc_emcee(self, n_walkers, n_run, n_burn, mean_start, sigma_start, mpi=False, progress=False, threadCount=1,
+                   backend_filename=None, start_from_backend=False, vectorize=False):
+        """
+        MCMC with the affine-invariant ensemble sampler emcee
+
+        :param n_walkers: number of walkers
+        :param n_run: number of iterations after the burn-in
+        :param n_burn: number of burn-in iterations
+        :param mean_start: mean of the initial walker positions
+        :param sigma_start: spread of the initial walker positions
+        :param mpi: bool, if True, the walkers are evaluated with an MPI pool
+        :param progress: bool, if True, shows a progress bar
+        :param threadCount: number of processes to evaluate the walkers (with a LikelihoodPool)
+        :param backend_filename: None or name of an HDF5 file to which every iteration (including the burn-in) is
+         written with emcee.backends.HDFBackend, instead of keeping the chain in memory
+        :param start_from_backend: bool, if True and backend_filename contains iterations of a previous (interrupted)
+         run, the chain continues from the last stored walker positions until n_burn + n_run iterations are stored.
+         A ValueError is raised if the stored chain has a different number of walkers or parameters. If False or
+         no iterations are stored, the backend is reset.
+        :param vectorize: bool, if True, the log likelihoods of all walkers of an iteration are evaluated in one call of
+         LikelihoodModule.logL_batch() (not compatible with mpi and threadCount > 1)
+        :return: samples after the burn-in, log likelihoods of the samples
+        """
+        if vectorize is True and (mpi is True or threadCount > 1):
+            raise ValueError('vectorize=True evaluates the walkers in a single process and can not be combined with '
+                             'mpi or threadCount > 1.')
         numParam, _ = self.chain.param.num_param()
         p0 = sampling_util.sample_ball(mean_start, sigma_start, n_walkers)
         time_start = time.time()
@@ -99,16 +155,43 @@ class Sampler(object):
                 pool.wait()
                 sys.exit(0)
             is_master_pool = pool.is_master()
-            sampler = emcee.EnsembleSampler(n_walkers, numParam, self.chain.logL, pool=pool)
+            log_likelihood = self.chain.logL
         else:
             is_master_pool = True
-            if threadCount > 1 :
-                pool = Pool(processes=threadCount)
-            else :
+            if threadCount > 1:
+                pool = LikelihoodPool(self.chain, processes=threadCount)
+                log_likelihood = pool.logL
+            elif vectorize is True:
+                pool = None
+                log_likelihood = self.chain.logL_batch
+            else:
                 pool = None
-            sampler = emcee.EnsembleSampler(n_walkers, numParam, self.chain.likelihood, pool=pool)
+                log_likelihood = self.chain.likelihood
+        try:
+            n_steps = n_burn + n_run
+            if backend_filename is not None:
+                backend = emcee.backends.HDFBackend(backend_filename, name='lenstronomy_mcmc_emcee')
+                if start_from_backend is True and backend.initialized and backend.iteration > 0:
+                    if tuple(backend.shape) != (n_walkers, numParam):
+                        raise ValueError('The chain stored in %s has %s walkers and %s parameters, but %s walkers and '
+                                         '%s parameters are requested.' % (backend_filename, backend.shape[0],
+                                                                           backend.shape[1], n_walkers, numParam))
+                    # continue from the last walker positions stored
+                    p0 = None
+                    n_steps = max(n_burn + n_run - backend.iteration, 0)
+                    print('MCMC continues from %s iterations stored in %s' % (backend.iteration, backend_filename))
+                else:
+                    backend.reset(n_walkers, numParam)
+            else:
+                backend = None
+            sampler = emcee.EnsembleSampler(n_walkers, numParam, log_likelihood, pool=pool, backend=backend,
+                                            vectorize=vectorize)
 
-        sampler.run_mcmc(p0, n_burn + n_run, progress=progress)
+            if n_steps > 0:
+                sampler.run_mcmc(p0, n_steps, progress=progress)
+        finally:
+            if mpi is False and pool is not None:
+                pool.close()
         flat_samples = sampler.get_chain(discard=n_burn, thin=1, flat=True)
         dist = sampler.get_log_prob(flat=True, discard=n_burn, thin=1)
         if is_master_pool:
@@ -0,0 +1,141 @@
+"""
+persistent on-disk cache of precomputed arrays (e.g. supersampled PSF kernels or the frame kernels of the numba
+convolution). The entries are content-addressed by a hash of all the inputs of the computation and are memory-mapped
+when read, such that fresh (MPI) worker processes and restarts share the setup of previous runs.
+
+The cache is disabled by default. It is enabled by setting the environment variable LENSTRONOMY_CACHE_DIR to a
+directory or by calling set_cache_dir().
+"""
+
+import os
+import hashlib
+import shutil
+import tempfile
+import numpy as np
+
+_cache_dir = None
+
+
+def set_cache_dir(path):
+    """
+    sets the directory of the on-disk cache (overwrites the environment variable LENSTRONOMY_CACHE_DIR)
+
+    :param path: directory path or None to disable the cache
+    :return: None
+    """
+    global _cache_dir
+    _cache_dir = path
+
+
+def cache_dir():
+    """
+
+    :return: directory of the on-disk cache or None if the cache is disabled
+    """
+    if _cache_dir is not None:
+        return _cache_dir
+    return os.environ.get('LENSTRONOMY_CACHE_DIR', None)
+
+
+def hash_key(*args):
+    """
+    content hash of the inputs of a computation
+
+    :param args: numpy arrays, numbers, strings or None
+    :return: hex string
+    """
+    sha = hashlib.sha1()
+    for arg in args:
+        if isinstance(arg, np.ndarray):
+            arg = np.ascontiguousarray(arg)
+            sha.update(('%s%s' % (arg.dtype.str, arg.shape)).encode())
+            sha.update(arg.view(np.uint8))
+        else:
+            sha.update(repr(arg).encode())
+        # separator such that different splits of the arguments do not collide
+        sha.update(b'|')
+    return sha.hexdigest()
+
+
+def load(key, names):
+    """
+
+    :param key: hash key of the entry
+    :param names: list of names of the arrays stored in the entry
+    :return: list of (read-only, memory-mapped) arrays or None if the entry is not in the cache
+    """
+    directory = cache_dir()
+    if directory is None:
+        return None
+    path = os.path.join(directory, key)
+    try:
+        return [np.asarray(np.load(os.path.join(path, name + '.npy'), mmap_mode='r')) for name in names]
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def save(key, names, arrays):
+    """
+    stores arrays in the cache. The entry is written to a temporary directory first and then moved in place, such that
+    concurrent processes never read incomplete entries.
+
+    :param key: hash key of the entry
+    :param names: list of names of the arrays
+    :param arrays: list of numpy arrays
+    :return: None
+    """
+    directory = cache_dir()
+    if directory is None:
+        return
+    path = os.path.join(directory, key)
+    if os.path.isdir(path):
+        return
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        path_tmp = tempfile.mkdtemp(dir=directory, prefix='.tmp_')
+        for name, array in zip(names, arrays):
+            np.save(os.path.join(path_tmp, name + '.npy'), np.asarray(array))
+        try:
+            os.rename(path_tmp, path)
+        except OSError:
+            # another process stored the same entry in the meantime
+            shutil.rmtree(path_tmp, ignore_errors=True)
+    except (IOError, OSError):
+        # the cache is an optimization only, an unwritable location is ignored
+        pass
+
+
+def cached(key, names, function, *args, **kwargs):
+    """
+    returns the arrays computed by function(*args, **kwargs) from the cache if available, otherwise computes and stores
+    them
+
+    :param key: hash key of the entry (see hash_key())
+    :param names: list of names of the arrays returned by the function
+    :param function: function returning a tuple of numpy arrays (or a single array if len(names) == 1)
+    :return: same as function
+    """
+    arrays = load(key, names)
+    if arrays is None:
+        arrays = function(*args, **kwargs)
+        if len(names) == 1:
+            arrays = [arrays]
+        save(key, names, arrays)
+    if len(names) == 1:
+        return arrays[0]
+    return tuple(arrays)
+
+
+def clear():
+    """
+    removes all entries of the cache (other content of the cache directory is not touched)
+
+    :return: None
+    """
+    directory = cache_dir()
+    if directory is None or not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if len(name) == 40 and all(c in '0123456789abcdef' for c in name):
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
@@ -15,7 +15,9 @@ def create_class_instances(lens_model_list=[], z_lens=None, z_source=None, lens_
                            index_lens_model_list=None, index_source_light_model_list=None,
                            index_lens_light_model_list=None, index_point_source_model_list=None,
                            optical_depth_model_list=[], index_optical_depth_model_list=None,
-                           band_index=0, tau0_index_list=None, all_models=False, point_source_magnification_limit=None):
+                           band_index=0, tau0_index_list=None, all_models=False, point_source_magnification_limit=None,
+                           fused_kernel=False, tabulated_index=None, tabulation_tolerance=0.0001, tree_index=None,
+                           kwargs_tree=None, cosmo_interp=False, point_source_warm_start=False):
     """
 
     :param lens_model_list: list of strings indicating the type of lens models
@@ -45,12 +47,23 @@ def create_class_instances(lens_model_list=[], z_lens=None, z_source=None, lens_
     :param tau0_index_list: list of integers of the specific extinction scaling parameter tau0 for each band
     :param all_models: bool, if True, will make class instances of all models ignoring potential keywords that are excluding specific models as indicated.
     :param point_source_magnification_limit: float >0 or None, if set and additional images are computed, then it will cut the point sources computed to the limiting (absolute) magnification
+    :param fused_kernel: bool, if True, the single plane lens model uses the compiled kernels of FusedSinglePlane
+    :param tabulated_index: list of indexes of the lens models evaluated with interpolated lookup tables
+    :param tabulation_tolerance: relative interpolation error tolerated in the lookup tables
+    :param tree_index: list of indexes of the lens models whose deflection angles are aggregated with a Barnes-Hut tree
+    :param kwargs_tree: keyword arguments of TreeDeflection
+    :param cosmo_interp: bool, if True, the cosmological distances of the lens model are computed from an interpolation
+     of the comoving distance
+    :param point_source_warm_start: bool, if True, the lens equation solver of the point sources starts from the
+     image positions of the previous evaluation
     :return:
     """
     if index_lens_model_list is None or all_models is True:
         lens_model_list_i = lens_model_list
         lens_redshift_list_i = lens_redshift_list
         observed_convention_index_i = observed_convention_index
+        tabulated_index_i = tabulated_index
+        tree_index_i = tree_index
     else:
         lens_model_list_i = [lens_model_list[k] for k in index_lens_model_list[band_index]]
         if lens_redshift_list is not None:
@@ -66,10 +79,22 @@ def create_class_instances(lens_model_list=[], z_lens=None, z_source=None, lens_
                 counter += 1
         else:
             observed_convention_index_i = observed_convention_index
+        if tabulated_index is not None:
+            tabulated_index_i = [counter for counter, k in enumerate(index_lens_model_list[band_index])
+                                 if k in tabulated_index]
+        else:
+            tabulated_index_i = tabulated_index
+        if tree_index is not None:
+            tree_index_i = [counter for counter, k in enumerate(index_lens_model_list[band_index]) if k in tree_index]
+        else:
+            tree_index_i = tree_index
     lens_model_class = LensModel(lens_model_list=lens_model_list_i, z_lens=z_lens, z_source=z_source,
                                  lens_redshift_list=lens_redshift_list_i,
                                  multi_plane=multi_plane, cosmo=cosmo,
-                                 observed_convention_index=observed_convention_index_i)
+                                 observed_convention_index=observed_convention_index_i,
+                                 fused_kernel=fused_kernel, tabulated_index=tabulated_index_i,
+                                 tabulation_tolerance=tabulation_tolerance, tree_index=tree_index_i,
+                                 kwargs_tree=kwargs_tree, cosmo_interp=cosmo_interp)
 
     if index_source_light_model_list is None or all_models is True:
         source_light_model_list_i = source_light_model_list
@@ -109,7 +134,8 @@ def create_class_instances(lens_model_list=[], z_lens=None, z_source=None, lens_
                                      fixed_magnification_list=fixed_magnification_list_i,
                                      additional_images_list=additional_images_list_i, min_distance=min_distance,
                                      search_window=search_window, precision_limit=precision_limit,
-                                     num_iter_max=num_iter_max, magnification_limit=point_source_magnification_limit)
+                                     num_iter_max=num_iter_max, magnification_limit=point_source_magnification_limit,
+                                     warm_start=point_source_warm_start)
     if tau0_index_list is None:
         tau0_index = 0
     else:
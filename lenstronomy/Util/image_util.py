@@ -179,16 +179,17 @@ def coordInImage(x_coord, y_coord, numPix, deltapix):
 def re_size(image, factor=1):
     """
     re-sizes image with nx x ny to nx/factor x ny/factor
-    :param image: 2d image with shape (nx,ny)
+    :param image: 2d image with shape (nx,ny) or stack of 2d images with shape (k, nx, ny)
     :param factor: integer >=1
     :return:
     """
     if factor < 1:
         raise ValueError('scaling factor in re-sizing %s < 1' %factor)
     f = int(factor)
-    nx, ny = np.shape(image)
+    shape = np.shape(image)
+    nx, ny = shape[-2:]
     if int(nx/f) == nx/f and int(ny/f) == ny/f:
-        small = image.reshape([int(nx/f), f, int(ny/f), f]).mean(3).mean(1)
+        small = image.reshape(list(shape[:-2]) + [int(nx/f), f, int(ny/f), f]).mean(-1).mean(-2)
         return small
     else:
         raise ValueError("scaling with factor %s is not possible with grid size %s, %s" %(f, nx, ny))
@@ -19,3 +19,28 @@ def jit(nopython=nopython, cache=cache, parallel=parallel):
         return numba.jit(func, nopython=nopython, cache=cache, parallel=parallel)
 
     return wrapper
+
+
+def set_num_threads(num_threads):
+    """
+    sets the number of threads used by the parallel compiled functions at runtime (requires numba >= 0.49, with older
+    versions all threads of the numba thread pool are used).
+
+    :param num_threads: int, number of threads; -1 or None uses all threads of the numba thread pool
+    :return: None
+    """
+    if not hasattr(numba, 'set_num_threads'):
+        return
+    if num_threads is None or num_threads == -1:
+        num_threads = numba.config.NUMBA_NUM_THREADS
+    numba.set_num_threads(int(max(1, min(num_threads, numba.config.NUMBA_NUM_THREADS))))
+
+
+def get_num_threads():
+    """
+
+    :return: number of threads currently used by the parallel compiled functions
+    """
+    if hasattr(numba, 'get_num_threads'):
+        return numba.get_num_threads()
+    return numba.config.NUMBA_NUM_THREADS
@@ -0,0 +1,159 @@
+"""
+opt-in instrumentation of the stages of a computation (e.g. the lens equation solver). Timings and counters are
+accumulated in memory and can be queried afterwards instead of being printed at every call. When disabled, the
+instrumentation reduces to a few attribute look-ups.
+"""
+
+from timeit import default_timer
+
+
+class _NullStage(object):
+    """
+    context manager doing nothing, used when the profiler is disabled
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_null_stage = _NullStage()
+
+
+class _Stage(object):
+    """
+    context manager recording the wall-clock time of a stage
+    """
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = default_timer()
+        return self
+
+    def __exit__(self, *args):
+        self._profiler.record(self._name, default_timer() - self._start)
+        return False
+
+
+class Profiler(object):
+    """
+    accumulates the number of calls and the wall-clock time spent in named stages, as well as additional counters.
+    Callbacks registered with add_callback() are called with the name and duration of every recorded stage.
+
+    Example::
+
+        profiler = Profiler(enabled=True)
+        with profiler.stage('grid_search'):
+            ...
+        profiler.timings()  # {'grid_search': {'calls': 1, 'time': ..., 'mean': ...}}
+    """
+    def __init__(self, enabled=False):
+        """
+
+        :param enabled: bool, if False, nothing is recorded
+        """
+        self.enabled = enabled
+        self._callbacks = []
+        self.reset()
+
+    def reset(self):
+        """
+        deletes all recorded timings and counters
+
+        :return: None
+        """
+        self._calls = {}
+        self._time = {}
+        self._counters = {}
+
+    def stage(self, name):
+        """
+        context manager recording the time spent in a stage
+
+        :param name: name of the stage
+        :return: context manager
+        """
+        if not self.enabled:
+            return _null_stage
+        return _Stage(self, name)
+
+    def start(self):
+        """
+        start time of a stage, to be used with stop() when the stage can not be expressed as a with-statement
+
+        :return: start time or None if the profiler is disabled
+        """
+        if not self.enabled:
+            return None
+        return default_timer()
+
+    def stop(self, name, start):
+        """
+        records the time since start()
+
+        :param name: name of the stage
+        :param start: return of start()
+        :return: None
+        """
+        if start is not None:
+            self.record(name, default_timer() - start)
+
+    def record(self, name, duration):
+        """
+        adds a duration to a stage
+
+        :param name: name of the stage
+        :param duration: duration in seconds
+        :return: None
+        """
+        self._calls[name] = self._calls.get(name, 0) + 1
+        self._time[name] = self._time.get(name, 0.) + duration
+        for callback in self._callbacks:
+            callback(name, duration)
+
+    def count(self, name, num=1):
+        """
+        increments a counter
+
+        :param name: name of the counter
+        :param num: increment
+        :return: None
+        """
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + num
+
+    def add_callback(self, callback):
+        """
+        registers a function called as callback(name, duration) for every recorded stage
+
+        :param callback: callable
+        :return: None
+        """
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """
+        removes a registered callback
+
+        :param callback: callable registered with add_callback()
+        :return: None
+        """
+        self._callbacks.remove(callback)
+
+    def timings(self):
+        """
+
+        :return: dictionary with the number of calls, total time and mean time (in seconds) of each stage
+        """
+        return {name: {'calls': self._calls[name], 'time': self._time[name],
+                       'mean': self._time[name] / self._calls[name]} for name in self._calls}
+
+    def counters(self):
+        """
+
+        :return: dictionary of the counters
+        """
+        return dict(self._counters)
@@ -541,3 +541,15 @@ def convert_bool_list(n, k=None):
     else:
         raise ValueError('input list k as %s not compatible' % k)
     return bool_list
+
+
+def float_array(x):
+    """
+    copy of x as a floating point numpy array. Single precision input stays in single precision, any other input is
+    converted to double precision.
+
+    :param x: array-like or float
+    :return: numpy array of dtype float32 or float64
+    """
+    x = np.asarray(x)
+    return np.array(x, dtype=np.float32 if x.dtype == np.float32 else float)
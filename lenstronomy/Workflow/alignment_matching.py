@@ -2,9 +2,8 @@ __author__ = 'sibirrer'
 
 import time
 import copy
-from cosmoHammer import MpiParticleSwarmOptimizer
-from cosmoHammer import ParticleSwarmOptimizer
-from cosmoHammer.util import MpiUtil
+from lenstronomy.Sampling.pool import LikelihoodPool
+from lenstronomy.Sampling.Samplers.pso import ParticleSwarmOptimizer, MpiMap
 from lenstronomy.ImSim.MultiBand.single_band_multi_model import SingleBandMultiModel
 
 
@@ -26,37 +25,33 @@ class AlignmentFitting(object):
         num_param = self.chain.num_param
         lowerLimit = [lowerLimit] * num_param
         upperLimit = [upperLimit] * num_param
+        pool = None
+        log_likelihood = self.chain.logL
         if mpi is True:
-            pso = MpiParticleSwarmOptimizer(self.chain, lowerLimit, upperLimit, n_particles, threads=1)
-        else:
-            pso = ParticleSwarmOptimizer(self.chain, lowerLimit, upperLimit, n_particles, threads=threadCount)
-        if not init_pos is None:
-            pso.gbest.position = init_pos
-            pso.gbest.velocity = [0]*len(init_pos)
-            pso.gbest.fitness, _ = self.chain.likelihood(init_pos)
-        X2_list = []
-        vel_list = []
-        pos_list = []
-        time_start = time.time()
-        if pso.isMaster():
-            print('Computing the %s ...' % print_key)
-        num_iter = 0
-        for swarm in pso.sample(n_iterations):
-            X2_list.append(pso.gbest.fitness*2)
-            vel_list.append(pso.gbest.velocity)
-            pos_list.append(pso.gbest.position)
-            num_iter += 1
-            if pso.isMaster():
-                if num_iter % 10 == 0:
-                    print(num_iter)
-        if not mpi:
-            result = pso.gbest.position
-        else:
-            result = MpiUtil.mpiBCast(pso.gbest.position)
+            pool = MpiMap()
+        elif threadCount > 1:
+            pool = LikelihoodPool(self.chain, processes=threadCount)
+            log_likelihood = pool.logL
+        try:
+            pso = ParticleSwarmOptimizer(log_likelihood, lowerLimit, upperLimit, n_particles, pool=pool)
+            if not init_pos is None:
+                pso.set_global_best(init_pos, [0]*len(init_pos), self.chain.logL(init_pos))
+            X2_list = []
+            vel_list = []
+            pos_list = []
+            time_start = time.time()
+            if pso.is_master():
+                print('Computing the %s ...' % print_key)
+            for swarm in pso.sample(n_iterations):
+                X2_list.append(pso.gbest_fitness*2)
+                vel_list.append(pso.gbest_velocity)
+                pos_list.append(pso.gbest_position)
+        finally:
+            if mpi is False and threadCount > 1:
+                pool.close()
+        result = pso.gbest_position
         kwargs_data = self.chain.update_data(result)
-        if mpi is True and not pso.isMaster():
-            pass
-        else:
+        if pso.is_master():
             time_end = time.time()
             print("Shifts found: ", result)
             print(time_end - time_start, 'time used for ', print_key)
@@ -97,6 +92,14 @@ class AlignmentLikelihood(object):
     def likelihood(self, a):
         return self._likelihood(a)
 
+    def logL(self, a):
+        """
+
+        :param a: list of parameters
+        :return: log likelihood
+        """
+        return self._likelihood(a)[0]
+
     def computeLikelihood(self, ctx):
         logL, _ = self._likelihood(ctx.args2kwargs())
         return logL
@@ -51,6 +51,10 @@ class FittingSequence(object):
 
         :param fitting_list: list of [['string', {kwargs}], ..] with 'string being the specific fitting option and kwargs being the arguments passed to this option
         :return: fitting results
+
+        An interrupted sequence can be resumed by running it again with checkpoint files: 'PSO' steps with
+        'checkpoint_path' continue from the stored swarm (completed steps are not repeated) and 'MCMC' steps with
+        'backend_filename' and 'start_from_backend': True continue from the last stored walker positions.
         """
         chain_list = []
         for i, fitting in enumerate(fitting_list):
@@ -160,7 +164,7 @@ class FittingSequence(object):
         return likelihoodModule
 
     def mcmc(self, n_burn, n_run, walkerRatio, sigma_scale=1, threadCount=1, init_samples=None, re_use_samples=True,
-             sampler_type='EMCEE', progress=True):
+             sampler_type='EMCEE', progress=True, backend_filename=None, start_from_backend=False, vectorize=False):
         """
         MCMC routine
 
@@ -173,6 +177,11 @@ class FittingSequence(object):
         :param re_use_samples: bool, if True, re-uses the samples described in init_samples.nOtherwise starts from scratch.
         :param sampler_type: string, which MCMC sampler to be used. Options are: 'COSMOHAMMER, and 'EMCEE'
         :param progress: boolean, if True shows progress bar in EMCEE
+        :param backend_filename: None or name of an HDF5 file to which the EMCEE chain is written at every iteration
+        :param start_from_backend: bool, if True, an interrupted EMCEE run stored in backend_filename is continued
+         from the last stored walker positions (see Sampler.mcmc_emcee())
+        :param vectorize: bool, if True, the walkers of an EMCEE iteration are evaluated with a single call of
+         LikelihoodModule.logL_batch()
         :return: list of output arguments, e.g. MCMC samples, parameter names, logL distances of all samples specified by the specific sampler used
         """
 
@@ -200,14 +209,17 @@ class FittingSequence(object):
         if sampler_type is 'EMCEE':
             n_walkers = num_param * walkerRatio
             samples, dist = mcmc_class.mcmc_emcee(n_walkers, n_run, n_burn, mean_start, sigma_start, mpi=self._mpi,
-                                                  threadCount=threadCount, progress=progress)
+                                                  threadCount=threadCount, progress=progress,
+                                                  backend_filename=backend_filename,
+                                                  start_from_backend=start_from_backend, vectorize=vectorize)
             output = [sampler_type, samples, param_list, dist]
         else:
             raise ValueError('sampler_type %s not supported!' % sampler_type)
         self._mcmc_init_samples = samples  # overwrites previous samples to continue from there in the next MCMC run
         return output
 
-    def pso(self, n_particles, n_iterations, sigma_scale=1, print_key='PSO', threadCount=1):
+    def pso(self, n_particles, n_iterations, sigma_scale=1, print_key='PSO', threadCount=1, checkpoint_path=None,
+            stagnation_iter=None, stagnation_tolerance=0., vectorize=False):
         """
         Particle Swarm Optimization
 
@@ -216,6 +228,13 @@ class FittingSequence(object):
         :param sigma_scale: scaling of the initial parameter spread relative to the width in the initial settings
         :param print_key: string, printed text when executing this routine
         :param threadCount: number of CPU threads. If MPI option is set, threadCount=1
+        :param checkpoint_path: None or path of a file to save the state of the swarm. If the file exists, the PSO
+         resumes from it.
+        :param stagnation_iter: None or int, stops the PSO when the best likelihood did not improve by more than
+         stagnation_tolerance over this number of iterations
+        :param stagnation_tolerance: improvement in logL required with stagnation_iter
+        :param vectorize: bool, if True, the particles of an iteration are evaluated with a single call of
+         LikelihoodModule.logL_batch()
         :return: result of the best fit, the chain of the best fit parameter after each iteration, list of parameters in same order
         """
 
@@ -231,7 +250,9 @@ class FittingSequence(object):
         # run PSO
         sampler = Sampler(likelihoodModule=self.likelihoodModule)
         result, chain = sampler.pso(n_particles, n_iterations, lowerLimit, upperLimit, init_pos=init_pos,
-                                       threadCount=threadCount, mpi=self._mpi, print_key=print_key)
+                                    threadCount=threadCount, mpi=self._mpi, print_key=print_key,
+                                    checkpoint_path=checkpoint_path, stagnation_iter=stagnation_iter,
+                                    stagnation_tolerance=stagnation_tolerance, vectorize=vectorize)
         kwargs_result = param_class.args2kwargs(result, bijective=True)
         return kwargs_result, chain, param_list
 
@@ -242,7 +263,7 @@ class FittingSequence(object):
                         polychord_settings={},
                         dypolychord_seed_increment=200,
                         output_dir="nested_sampling_chains",
-                        dynesty_bound='multi', dynesty_sample='auto'):
+                        dynesty_bound='multi', dynesty_sample='auto', threadCount=1):
         """
         Run (Dynamic) Nested Sampling algorithms, depending on the type of algorithm.
 
@@ -258,6 +279,8 @@ class FittingSequence(object):
         :param dypolychord_seed_increment: seed increment for dypolychord with MPI. Check dypolychord documentation for details.
         :param dynesty_bound: see https://dynesty.readthedocs.io for details
         :param dynesty_sample: see https://dynesty.readthedocs.io for details
+        :param threadCount: number of processes evaluating the likelihood with DYNESTY. If MPI option is set,
+         threadCount=1
         :return: list of output arguments : samples, mean inferred values, log-likelihood, log-evidence, error on log-evidence for each sample
         """
         mean_start, sigma_start = self._prepare_sampling(prior_type)
@@ -303,7 +326,8 @@ class FittingSequence(object):
                                      sigma_scale=sigma_scale,
                                      bound=dynesty_bound, 
                                      sample=dynesty_sample,
-                                     use_mpi=self._mpi)
+                                     use_mpi=self._mpi,
+                                     thread_count=threadCount)
             samples, means, logZ, logZ_err, logL, results_object = sampler.run(kwargs_run)
 
         else:
@@ -3,6 +3,7 @@ __author__ = 'sibirrer'
 import numpy.testing as npt
 import pytest
 import numpy as np
+import unittest
 
 from lenstronomy.Analysis.td_cosmography import TDCosmography
 from lenstronomy.LensModel.lens_model import LensModel
@@ -104,6 +105,34 @@ class TestTDCosmography(object):
         npt.assert_almost_equal(D_dt_infered, D_dt, decimal=6)
         npt.assert_almost_equal(D_d_infered, D_d, decimal=6)
 
+        # vectorized likelihood of the distances
+        D_dt_array, D_d_array = self.td_cosmo.distances_from_cosmology(H_0=np.array([60, 70, 80]),
+                                                                       Om0=np.array([0.3, 0.3, 0.3]))
+        npt.assert_almost_equal(D_dt_array[1] / D_dt, 1, decimal=6)
+        npt.assert_almost_equal(D_d_array[1] / D_d, 1, decimal=6)
+        logL = self.td_cosmo.logL_distances(D_dt_array, D_d_array, d_fermat_model=[d_fermat], dt_measured=[dt],
+                                            dt_sigma=[1.], J=J, sigma_v_measured=sigma_v_kappa, sigma_v_sigma=10,
+                                            kappa_ext=kappa_s)
+        assert logL.shape == (3,)
+        npt.assert_almost_equal(logL[1], 0, decimal=6)
+        assert logL[0] < logL[1] and logL[2] < logL[1]
+        d_fermat_samples = np.array([[d_fermat], [d_fermat * 1.1], [d_fermat * 0.9]])
+        logL_samples = self.td_cosmo.logL_distances(D_dt, D_d, d_fermat_model=d_fermat_samples, dt_measured=[dt],
+                                                    dt_sigma=[1.], kappa_ext=kappa_s)
+        npt.assert_almost_equal(logL_samples[0], 0, decimal=6)
+        npt.assert_almost_equal(logL_samples[1], -(dt * 0.1) ** 2 / 2, decimal=6)
+        D_dt_k, D_d_k = self.td_cosmo.distances_from_cosmology(H_0=70, Om0=0.3, Ode0=0.7)
+        npt.assert_almost_equal(D_dt_k / D_dt, 1, decimal=6)
+
+
+class TestRaise(unittest.TestCase):
+
+    def test_raise(self):
+        kwargs_model = {'lens_model_list': ['SIE'], 'point_source_model_list': ['LENSED_POSITION']}
+        td_cosmo = TDCosmography(0.5, 2, kwargs_model)
+        with self.assertRaises(ValueError):
+            td_cosmo.logL_distances(3000, 1000, d_fermat_model=[0.5], dt_measured=[10], dt_sigma=[1], J=0.1)
+
 
 if __name__ == '__main__':
     pytest.main()
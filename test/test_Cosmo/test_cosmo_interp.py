@@ -0,0 +1,57 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+from astropy.cosmology import FlatLambdaCDM, LambdaCDM, wCDM
+
+from lenstronomy.Cosmo.cosmo_interp import CosmoInterp
+from lenstronomy.Cosmo.background import Background
+from lenstronomy.Cosmo.lens_cosmo import LensCosmo
+
+
+class TestCosmoInterp(object):
+
+    def setup(self):
+        self.cosmo_list = [FlatLambdaCDM(H0=70, Om0=0.3, Ob0=0.05), LambdaCDM(H0=70, Om0=0.3, Ode0=0.6),
+                           LambdaCDM(H0=65, Om0=0.3, Ode0=0.8), wCDM(H0=70, Om0=0.3, Ode0=0.7, w0=-0.9, Tcmb0=2.7)]
+
+    def test_angular_diameter_distance_z1z2(self):
+        z1 = np.array([0, 0, 0.3, 0.5, 1.2])
+        z2 = np.array([0.1, 1., 2., 0.5, 4.])
+        for cosmo in self.cosmo_list:
+            cosmo_interp = CosmoInterp(cosmo)
+            d_xy = cosmo_interp.angular_diameter_distance_z1z2(z1, z2)
+            d_xy_astropy = cosmo.angular_diameter_distance_z1z2(z1, z2).value
+            npt.assert_almost_equal(d_xy[d_xy_astropy > 0] / d_xy_astropy[d_xy_astropy > 0], 1, decimal=6)
+            assert d_xy[3] == 0
+            d_xy = cosmo_interp.angular_diameter_distance_z1z2(0.5, 2.)
+            npt.assert_almost_equal(d_xy / cosmo.angular_diameter_distance_z1z2(0.5, 2.).value, 1, decimal=6)
+            assert np.shape(d_xy) == ()
+
+    def test_comoving_distance(self):
+        cosmo = self.cosmo_list[0]
+        cosmo_interp = CosmoInterp(cosmo, z_stop=1, num_interp=50)
+        npt.assert_almost_equal(cosmo_interp.comoving_distance(0.8) / cosmo.comoving_distance(0.8).value, 1,
+                                decimal=6)
+        # the interpolation is extended beyond z_stop
+        npt.assert_almost_equal(cosmo_interp.comoving_distance(3.) / cosmo.comoving_distance(3.).value, 1, decimal=6)
+        assert cosmo_interp._z_stop == 6
+        npt.assert_almost_equal(cosmo_interp.comoving_distance(0), 0, decimal=10)
+
+    def test_background(self):
+        cosmo = self.cosmo_list[1]
+        bkg = Background(cosmo)
+        bkg_interp = Background(cosmo, interp=True, z_stop=3, num_interp=200)
+        npt.assert_almost_equal(bkg_interp.D_xy(0.5, 2) / bkg.D_xy(0.5, 2), 1, decimal=6)
+        npt.assert_almost_equal(bkg_interp.T_xy(0.5, 2) / bkg.T_xy(0.5, 2), 1, decimal=6)
+        npt.assert_almost_equal(bkg_interp.D_dt(0.5, 2) / bkg.D_dt(0.5, 2), 1, decimal=6)
+        z_lens, z_source = np.array([0.3, 0.5, 0.7]), np.array([1., 2., 3.])
+        npt.assert_almost_equal(bkg_interp.D_dt(z_lens, z_source) / bkg.D_dt(z_lens, z_source), 1, decimal=6)
+
+        lens_cosmo = LensCosmo(0.5, 2, cosmo=cosmo)
+        lens_cosmo_interp = LensCosmo(0.5, 2, cosmo=cosmo, interp=True)
+        npt.assert_almost_equal(lens_cosmo_interp.D_dt / lens_cosmo.D_dt, 1, decimal=6)
+        npt.assert_almost_equal(lens_cosmo_interp.epsilon_crit / lens_cosmo.epsilon_crit, 1, decimal=6)
+
+
+if __name__ == '__main__':
+    pytest.main()
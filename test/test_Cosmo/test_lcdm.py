@@ -1,5 +1,6 @@
 __author__ = 'sibirrer'
 
+import numpy as np
 import numpy.testing as npt
 import pytest
 
@@ -36,6 +37,19 @@ class TestFlatLCDM(object):
         D_dt_k = self.cosmo_k.D_dt(H_0=70, Om0=0.3, Ode0=0.7)
         npt.assert_almost_equal(D_dt, D_dt_k, decimal=8)
 
+    def test_distances(self):
+        H_0, Om0, Ode0 = np.array([60, 70, 80]), np.array([0.2, 0.3, 0.4]), np.array([0.9, 0.7, 0.5])
+        for cosmo in [self.cosmo, self.cosmo_k]:
+            D_d, D_s, D_ds, D_dt = cosmo.distances(H_0, Om0, Ode0=Ode0)
+            assert D_dt.shape == (3,)
+            for i in range(3):
+                npt.assert_almost_equal(D_d[i] / cosmo.D_d(H_0[i], Om0[i], Ode0[i]), 1, decimal=8)
+                npt.assert_almost_equal(D_s[i] / cosmo.D_s(H_0[i], Om0[i], Ode0[i]), 1, decimal=8)
+                npt.assert_almost_equal(D_ds[i] / cosmo.D_ds(H_0[i], Om0[i], Ode0[i]), 1, decimal=8)
+                npt.assert_almost_equal(D_dt[i] / cosmo.D_dt(H_0[i], Om0[i], Ode0[i]), 1, decimal=8)
+        D_d, D_s, D_ds, D_dt = self.cosmo.distances(H_0=70, Om0=0.3)
+        npt.assert_almost_equal(D_dt, 3329.665360925441, decimal=5)
+
 
 if __name__ == '__main__':
     pytest.main()
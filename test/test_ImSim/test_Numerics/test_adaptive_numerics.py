@@ -57,6 +57,18 @@ class TestAdaptiveConvolution(object):
         npt.assert_almost_equal(np.sum(model_subgrid_conv), np.sum(model_adaptive_conv), decimal=2)
         npt.assert_almost_equal(model_subgrid_conv, model_adaptive_conv, decimal=2)
 
+    def test_convolve2d_parallel(self):
+        conv_supersample_pixels = np.zeros_like(self.model)
+        conv_supersample_pixels = np.array(conv_supersample_pixels, dtype=bool)
+        conv_supersample_pixels[self.model > np.max(self.model) / 20] = True
+        adaptive_conv = AdaptiveConvolution(self.kernel_sub, self.supersampling_factor, conv_supersample_pixels,
+                                            supersampling_kernel_size=5, compute_pixels=None)
+        adaptive_conv_parallel = AdaptiveConvolution(self.kernel_sub, self.supersampling_factor,
+                                                     conv_supersample_pixels, supersampling_kernel_size=5,
+                                                     compute_pixels=None, parallel=True, num_threads=2)
+        npt.assert_almost_equal(adaptive_conv_parallel.convolve2d(self.model_sub),
+                                adaptive_conv.convolve2d(self.model_sub), decimal=10)
+
 
 if __name__ == '__main__':
     pytest.main()
@@ -3,9 +3,14 @@ __author__ = 'sibirrer'
 import numpy as np
 import numpy.testing as npt
 from lenstronomy.ImSim.Numerics.convolution import MultiGaussianConvolution, PixelKernelConvolution, \
-    SubgridKernelConvolution, MGEConvolution
+    SubgridKernelConvolution, MGEConvolution, FFTConvolution
 from lenstronomy.LightModel.light_model import LightModel
 import lenstronomy.Util.util as util
+from scipy import signal
+import pickle
+import threading
+import weakref
+import gc
 import pytest
 
 
@@ -26,6 +31,98 @@ class TestPixelKernelConvolution(object):
         image_convolved = pixel_conv.convolution2d(self.model)
         npt.assert_almost_equal(np.sum(image_convolved), np.sum(self.model), decimal=2)
 
+    def test_convolution2d_many(self):
+        kernel = np.ones((3, 3)) / 9.
+        images = np.array([self.model, self.model ** 2])
+        for convolution_type in ['fft', 'fft_static', 'grid']:
+            pixel_conv = PixelKernelConvolution(kernel=kernel, convolution_type=convolution_type)
+            images_conv = pixel_conv.re_size_convolve_many(images)
+            for i in range(len(images)):
+                npt.assert_almost_equal(images_conv[i], pixel_conv.convolution2d(images[i]), decimal=10)
+
+    def test_static_fft_shapes(self):
+        kernel = np.ones((3, 3)) / 9.
+        pixel_conv = PixelKernelConvolution(kernel=kernel, convolution_type='fft_static')
+        pixel_conv_scipy = PixelKernelConvolution(kernel=kernel, convolution_type='fft')
+        image_large = np.ones((15, 15))
+        npt.assert_almost_equal(pixel_conv.convolution2d(self.model), pixel_conv_scipy.convolution2d(self.model),
+                                decimal=10)
+        npt.assert_almost_equal(pixel_conv.convolution2d(image_large), pixel_conv_scipy.convolution2d(image_large),
+                                decimal=10)
+
+
+class TestFFTConvolution(object):
+
+    def setup(self):
+        np.random.seed(42)
+        self.kernel = np.random.uniform(size=(7, 7))
+        self.kernel /= np.sum(self.kernel)
+
+    def test_convolve(self):
+        fft_conv = FFTConvolution(self.kernel)
+        for shape in [(20, 20), (31, 17), (20, 20)]:
+            image = np.random.normal(size=shape)
+            for mode in ['same', 'full', 'valid']:
+                image_conv = fft_conv.convolve(image, mode=mode)
+                image_conv_scipy = signal.fftconvolve(image, self.kernel, mode=mode)
+                npt.assert_almost_equal(image_conv, image_conv_scipy, decimal=10)
+        assert len(fft_conv._spectrum_list) == 2
+        with pytest.raises(ValueError):
+            fft_conv.convolve(image, mode='wrong')
+
+    def test_convolve_many(self):
+        fft_conv = FFTConvolution(self.kernel)
+        images = np.random.normal(size=(3, 20, 15))
+        for mode in ['same', 'full', 'valid']:
+            images_conv = fft_conv.convolve_many(images, mode=mode)
+            for i in range(3):
+                npt.assert_almost_equal(images_conv[i], fft_conv.convolve(images[i], mode=mode), decimal=10)
+
+    def test_precision(self):
+        fft_conv = FFTConvolution(self.kernel)
+        fft_conv_32 = FFTConvolution(self.kernel, precision='float32')
+        image = np.random.normal(size=(20, 20))
+        image_conv_32 = fft_conv_32.convolve(image.astype(np.float32))
+        assert image_conv_32.dtype == np.float32
+        npt.assert_almost_equal(image_conv_32, fft_conv.convolve(image), decimal=5)
+        images_conv_32 = fft_conv_32.convolve_many(np.array([image, image], dtype=np.float32))
+        assert images_conv_32.dtype == np.float32
+        npt.assert_almost_equal(images_conv_32[1], image_conv_32, decimal=5)
+
+    def test_shared_spectrum(self):
+        fft_conv = FFTConvolution(self.kernel)
+        fft_conv_2 = FFTConvolution(self.kernel.copy(), workers=2)
+        image = np.random.normal(size=(20, 20))
+        _, _, sp2 = fft_conv._spectrum(image.shape)
+        _, _, sp2_2 = fft_conv_2._spectrum(image.shape)
+        assert sp2 is sp2_2
+        npt.assert_almost_equal(fft_conv_2.convolve(image), fft_conv.convolve(image), decimal=10)
+
+    def test_pickle(self):
+        fft_conv = FFTConvolution(self.kernel)
+        image = np.random.normal(size=(20, 20))
+        image_conv = fft_conv.convolve(image)
+        fft_conv_pickled = pickle.loads(pickle.dumps(fft_conv))
+        assert not hasattr(fft_conv_pickled._local, 'buffer_list')
+        npt.assert_almost_equal(fft_conv_pickled.convolve(image), image_conv, decimal=10)
+
+    def test_thread_buffer(self):
+        fft_conv = FFTConvolution(self.kernel)
+        image = np.random.normal(size=(20, 20))
+        image_conv = fft_conv.convolve(image)
+        buffer_ref = []
+
+        def _convolve():
+            npt.assert_almost_equal(fft_conv.convolve(image), image_conv, decimal=10)
+            buffer_ref.append(weakref.ref(fft_conv._local.buffer_list[image.shape]))
+        thread = threading.Thread(target=_convolve)
+        thread.start()
+        thread.join()
+        gc.collect()
+        # the buffer of the finished thread is released, the one of the main thread is kept
+        assert buffer_ref[0]() is None
+        assert len(fft_conv._local.buffer_list) == 1
+
 
 class TestSubgridKernelConvolution(object):
 
@@ -89,6 +186,17 @@ class TestSubgridKernelConvolution(object):
         npt.assert_almost_equal(np.sum(model_subgrid_conv), np.sum(model_subgrid_conv_split), decimal=5)
         npt.assert_almost_equal(model_subgrid_conv, model_subgrid_conv_split, decimal=3)
 
+    def test_re_size_convolve_many(self):
+        images_sub = np.array([self.model_sub, self.model_sub ** 2])
+        images = np.array([self.model, self.model ** 2])
+        for supersampling_kernel_size in [None, 3]:
+            subgrid_conv = SubgridKernelConvolution(self.kernel_sub, self.supersampling_factor,
+                                                    supersampling_kernel_size=supersampling_kernel_size)
+            images_conv = subgrid_conv.re_size_convolve_many(images, images_sub)
+            for i in range(len(images)):
+                npt.assert_almost_equal(images_conv[i], subgrid_conv.re_size_convolve(images[i], images_sub[i]),
+                                        decimal=10)
+
 
 class TestMultiGaussianConvolution(object):
 
@@ -107,6 +215,10 @@ class TestMultiGaussianConvolution(object):
         image_convolved = mge_conv.convolution2d(self.model)
         npt.assert_almost_equal(np.sum(image_convolved), np.sum(self.model), decimal=2)
 
+        images_convolved = mge_conv.convolution2d_many(np.array([self.model, self.model ** 2]))
+        npt.assert_almost_equal(images_convolved[0], image_convolved, decimal=10)
+        npt.assert_almost_equal(images_convolved[1], mge_conv.convolution2d(self.model ** 2), decimal=10)
+
 
 class TestMGEConvolution(object):
 
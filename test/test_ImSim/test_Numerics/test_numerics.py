@@ -177,6 +177,63 @@ class TestNumerics(object):
         delta = (self.image_true - image_conv) / self.image_true
         npt.assert_almost_equal(delta[self._conv_pixels_partial], 0, decimal=1)
 
+    def test_re_size_convolve_many(self):
+        from lenstronomy.Data.psf import PSF
+        kwargs_light_2 = [{'amp': 10, 'R_sersic': 0.2, 'n_sersic': 1, 'e1': 0.1, 'e2': 0, 'center_x': 0.1,
+                           'center_y': 0}]
+        psf_gaussian = PSF(psf_type='GAUSSIAN', fwhm=0.1)
+        psf_none = PSF(psf_type='NONE')
+        for psf_class in [self.psf_class, psf_gaussian, psf_none]:
+            for kwargs_numerics in [self.kwargs_numerics_true, self.kwargs_numerics_high_res_narrow,
+                                    self.kwargs_numerics_low_conv_high_grid, self.kwargs_numerics_low_conv_high_adaptive,
+                                    self.kwargs_numerics_high_adaptive, self.kwargs_numerics_low_res,
+                                    self.kwargs_numerics_partial]:
+                image_model = ImageModel(self.pixel_grid, psf_class, lens_light_model_class=self.lightModel,
+                                         kwargs_numerics=kwargs_numerics)
+                numerics = image_model.ImageNumerics
+                x, y = numerics.coordinates_evaluate
+                flux_1 = self.lightModel.surface_brightness(x, y, self.kwargs_light)
+                flux_2 = self.lightModel.surface_brightness(x, y, kwargs_light_2)
+                for unconvolved in [False, True]:
+                    images = numerics.re_size_convolve_many(np.array([flux_1, flux_2]), unconvolved=unconvolved)
+                    assert images.shape == (2, 61, 61)
+                    npt.assert_almost_equal(images[0], numerics.re_size_convolve(flux_1, unconvolved=unconvolved),
+                                            decimal=8)
+                    npt.assert_almost_equal(images[1], numerics.re_size_convolve(flux_2, unconvolved=unconvolved),
+                                            decimal=8)
+                images = numerics.re_size_convolve_many(np.zeros((0, len(x))))
+                assert images.shape == (0, 61, 61)
+
+    def test_precision(self):
+        from lenstronomy.Data.psf import PSF
+        psf_gaussian = PSF(psf_type='GAUSSIAN', fwhm=0.1)
+        for psf_class in [self.psf_class, psf_gaussian]:
+            for kwargs_numerics in [self.kwargs_numerics_true, self.kwargs_numerics_high_res_narrow,
+                                    self.kwargs_numerics_low_conv_high_grid, self.kwargs_numerics_low_conv_high_adaptive,
+                                    self.kwargs_numerics_low_res, self.kwargs_numerics_partial]:
+                image_model = ImageModel(self.pixel_grid, psf_class, lens_light_model_class=self.lightModel,
+                                         kwargs_numerics=kwargs_numerics)
+                image = image_model.image(kwargs_lens_light=self.kwargs_light)
+                kwargs_numerics_32 = dict(kwargs_numerics, precision='float32')
+                image_model_32 = ImageModel(self.pixel_grid, psf_class, lens_light_model_class=self.lightModel,
+                                            kwargs_numerics=kwargs_numerics_32)
+                assert image_model_32.ImageNumerics.precision == 'float32'
+                x, y = image_model_32.ImageNumerics.coordinates_evaluate
+                assert x.dtype == np.float32
+                image_32 = image_model_32.image(kwargs_lens_light=self.kwargs_light)
+                npt.assert_allclose(image_32, image, rtol=1e-4, atol=1e-5 * np.max(image))
+
+    def test_num_threads(self):
+        image_model = ImageModel(self.pixel_grid, self.psf_class, lens_light_model_class=self.lightModel,
+                                 kwargs_numerics=self.kwargs_numerics_high_adaptive)
+        image = image_model.image(kwargs_lens_light=self.kwargs_light)
+        kwargs_numerics = dict(self.kwargs_numerics_high_adaptive, num_threads=2)
+        image_model_threads = ImageModel(self.pixel_grid, self.psf_class, lens_light_model_class=self.lightModel,
+                                         kwargs_numerics=kwargs_numerics)
+        image_threads = image_model_threads.image(kwargs_lens_light=self.kwargs_light)
+        npt.assert_almost_equal(image_threads, image, decimal=10)
+
+
 class TestRaise(unittest.TestCase):
 
 
@@ -188,6 +245,8 @@ class TestRaise(unittest.TestCase):
         from lenstronomy.ImSim.Numerics.numerics import Numerics
         with self.assertRaises(TypeError):
             Numerics(pixel_grid=None, psf=psf_class, supersampling_factor=1.)
+        with self.assertRaises(ValueError):
+            Numerics(pixel_grid=None, psf=psf_class, precision='float16')
 
 
 if __name__ == '__main__':
@@ -39,6 +39,36 @@ class TestPixelConvolution(object):
         image_convolved = pixel_conv.convolution2d(self.model)
         npt.assert_almost_equal(model_conv_numba, image_convolved, decimal=10)
 
+    def test_frame_kernels(self):
+        np.random.seed(42)
+        conv_pixels = np.random.uniform(size=(self.num_pix, self.num_pix)) > 0.3
+        compute_pixels = np.random.uniform(size=(self.num_pix, self.num_pix)) > 0.5
+        numba_conv = NumbaConvolution(kernel=self.kernel, conv_pixels=conv_pixels, compute_pixels=compute_pixels)
+        numba_conv_parallel = NumbaConvolution(kernel=self.kernel, conv_pixels=conv_pixels,
+                                               compute_pixels=compute_pixels, parallel=True)
+        npt.assert_equal(numba_conv_parallel._image_frame_indexes, numba_conv._image_frame_indexes)
+        npt.assert_equal(numba_conv_parallel._image_frame_psfs, numba_conv._image_frame_psfs)
+        npt.assert_equal(numba_conv_parallel._image_frame_lengths, numba_conv._image_frame_lengths)
+
+        # explicit convolution of the selected pixels
+        image = np.random.normal(size=(self.num_pix, self.num_pix))
+        pixel_conv = PixelKernelConvolution(kernel=self.kernel, convolution_type='grid')
+        image_convolved = pixel_conv.convolution2d(image * conv_pixels) * compute_pixels
+        npt.assert_almost_equal(numba_conv.convolve2d(image), image_convolved, decimal=10)
+
+    def test_convolve_parallel(self):
+        np.random.seed(41)
+        conv_pixels = np.random.uniform(size=(self.num_pix, self.num_pix)) > 0.3
+        compute_pixels = np.random.uniform(size=(self.num_pix, self.num_pix)) > 0.5
+        image = np.random.normal(size=(self.num_pix, self.num_pix))
+        numba_conv = NumbaConvolution(kernel=self.kernel, conv_pixels=conv_pixels, compute_pixels=compute_pixels)
+        image_convolved = numba_conv.convolve2d(image)
+        for num_threads in [None, -1, 1, 2]:
+            numba_conv_parallel = NumbaConvolution(kernel=self.kernel, conv_pixels=conv_pixels,
+                                                   compute_pixels=compute_pixels, parallel=True,
+                                                   num_threads=num_threads)
+            npt.assert_almost_equal(numba_conv_parallel.convolve2d(image), image_convolved, decimal=10)
+
 
 class TestSubgirdNumbaConvolution(object):
     def setup(self):
@@ -42,6 +42,29 @@ class TestPointSourceRendering(object):
         model = self._ps_rendering.point_source_rendering(ra_pos, dec_pos, amp)
         npt.assert_almost_equal(np.sum(model), 2, decimal=8)
 
+    def test_point_source_rendering_sparse(self):
+        amp = [1, 2]
+        ra_pos, dec_pos = [0, 1.3], [1, 8.5]
+        indexes, values = self._ps_rendering.point_source_rendering_sparse(ra_pos, dec_pos, amp)
+        model = self._ps_rendering.point_source_rendering(ra_pos, dec_pos, amp)
+        assert len(indexes) == len(np.unique(indexes))
+        npt.assert_almost_equal(values, model.flatten()[indexes], decimal=10)
+        npt.assert_almost_equal(np.sum(values), np.sum(model), decimal=10)
+        npt.assert_almost_equal(np.sum(values), 3, decimal=8)
+
+        # supersampled point sources at the edge of the image
+        kernel = np.ones((9, 9)) / 81.
+        psf_class = PSF(kernel_point_source=kernel, psf_type='PIXEL', point_source_supersampling_factor=1)
+        pixel_grid = PixelGrid(nx=10, ny=10, transform_pix2angle=np.array([[1, 0], [0, 1]]), ra_at_xy_0=0,
+                               dec_at_xy_0=0)
+        ps_rendering = PointSourceRendering(pixel_grid, supersampling_factor=3, psf=psf_class)
+        ra_pos, dec_pos = [0.2, 9.5, 20], [-0.5, 4.3, 20]
+        indexes, values = ps_rendering.point_source_rendering_sparse(ra_pos, dec_pos, [1, 1, 1])
+        model = ps_rendering.point_source_rendering(ra_pos, dec_pos, [1, 1, 1])
+        npt.assert_almost_equal(values, model.flatten()[indexes], decimal=10)
+        assert np.sum(model > 0) == len(indexes)
+        assert np.sum(values) < 2
+
 
 class TestRaise(unittest.TestCase):
 
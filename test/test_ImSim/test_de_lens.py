@@ -51,6 +51,118 @@ class TestDeLens(object):
         npt.assert_almost_equal(result[1], 0, decimal=8)
         npt.assert_almost_equal(image[0], 0, decimal=8)
 
+    def test_get_param_WLS_batch(self):
+        A = np.array([[1, 2, 3], [3, 2, 1]]).T
+        A_stack = np.array([A, A * 2., np.array([[1, 2, 1], [1, 2, 1]]).T])
+        C_D_inv = np.array([[1, 1, 1], [1, 2, 1], [1, 1, 1]])
+        d = np.array([1, 2, 3])
+        for inv_bool in [True, False]:
+            result, cov_error, image = self.deLens.get_param_WLS_batch(A_stack, C_D_inv, d, inv_bool=inv_bool)
+            for i in range(len(A_stack)):
+                result_i, cov_error_i, image_i = self.deLens.get_param_WLS(A_stack[i], C_D_inv[i], d, inv_bool=inv_bool)
+                npt.assert_almost_equal(result[i], result_i, decimal=10)
+                npt.assert_almost_equal(image[i], image_i, decimal=10)
+                if inv_bool is True:
+                    npt.assert_almost_equal(cov_error[i], cov_error_i, decimal=10)
+                else:
+                    assert cov_error is None
+        # the degenerate problem is set to zero
+        npt.assert_almost_equal(result[2], 0, decimal=8)
+
+        result, cov_error, image, log_det = self.deLens.get_param_WLS_cholesky_batch(A_stack, C_D_inv, d)
+        for i in range(2):
+            log_det_i = self.deLens.get_param_WLS_cholesky(A_stack[i], C_D_inv[i], d)[3]
+            npt.assert_almost_equal(log_det[i], log_det_i, decimal=10)
+        assert log_det[2] is None
+
+    def test_get_param_WLS_cholesky(self):
+        np.random.seed(41)
+        A = np.random.normal(size=(50, 4))
+        C_D_inv = np.random.uniform(1, 2, size=50)
+        d = np.random.normal(size=50)
+        result, cov_error, image, log_det = self.deLens.get_param_WLS_cholesky(A, C_D_inv, d, inv_bool=True)
+        M = A.T.dot(np.multiply(C_D_inv, A.T).T)
+        npt.assert_almost_equal(cov_error, np.linalg.inv(M), decimal=10)
+        npt.assert_almost_equal(result, np.linalg.solve(M, A.T.dot(C_D_inv * d)), decimal=10)
+        npt.assert_almost_equal(image, A.dot(result), decimal=10)
+        npt.assert_almost_equal(log_det, self.deLens.marginalisation_const(cov_error) * 2, decimal=8)
+        npt.assert_almost_equal(self.deLens.marginalization_new(cov_error, log_det=log_det),
+                                self.deLens.marginalization_new(cov_error), decimal=8)
+
+        # degenerate system
+        A[:, 1] = A[:, 0]
+        result, cov_error, image, log_det = self.deLens.get_param_WLS_cholesky(A, C_D_inv, d, inv_bool=True)
+        npt.assert_almost_equal(result, 0, decimal=10)
+        assert log_det is None
+        assert self.deLens.cholesky_factor(np.array([[1, 0], [0, -1]])) is None
+
+    def test_cholesky_wls(self):
+        np.random.seed(41)
+        A = np.random.normal(size=(50, 5))
+        C_D_inv = np.random.uniform(1, 2, size=50)
+        d = np.random.normal(size=50)
+        solver = self.deLens.CholeskyWLS()
+        for i in range(3):
+            # only the last two columns change
+            A[:, 3:] = np.random.normal(size=(50, 2))
+            for num_fixed, fixed_token in [(0, None), (3, 'first three'), (5, i)]:
+                for inv_bool in [True, False]:
+                    result, cov_error, image, log_det = solver.get_param_WLS(A, C_D_inv, d, num_fixed=num_fixed,
+                                                                             inv_bool=inv_bool,
+                                                                             fixed_token=fixed_token)
+                    result_full, cov_error_full, image_full, log_det_full = self.deLens.get_param_WLS_cholesky(
+                        A, C_D_inv, d, inv_bool=inv_bool)
+                    npt.assert_almost_equal(result, result_full, decimal=10)
+                    npt.assert_almost_equal(image, image_full, decimal=10)
+                    npt.assert_almost_equal(log_det, log_det_full, decimal=10)
+                    if inv_bool is True:
+                        npt.assert_almost_equal(cov_error, cov_error_full, decimal=10)
+        # the factorization of the fixed columns is re-used for the same token only
+        L_fixed = solver._L_fixed
+        solver.get_param_WLS(A, C_D_inv, d, num_fixed=5, fixed_token=2)
+        assert solver._L_fixed is L_fixed
+        solver.get_param_WLS(A, C_D_inv, d, num_fixed=5)
+        assert solver._L_fixed is not L_fixed
+        L_fixed = solver._L_fixed
+        solver.get_param_WLS(A, C_D_inv, d, num_fixed=5, fixed_token=None)
+        assert solver._L_fixed is not L_fixed
+        # degenerate update
+        A[:, 4] = A[:, 0]
+        result, cov_error, image, log_det = solver.get_param_WLS(A, C_D_inv, d, num_fixed=3, fixed_token='first three')
+        npt.assert_almost_equal(result, 0, decimal=10)
+        assert log_det is None
+
+    def test_get_param_WLS_sparse(self):
+        np.random.seed(41)
+        A = np.random.normal(size=(50, 5))
+        A[:, 3:] = 0
+        A[5:10, 3] = np.random.normal(size=5)
+        A[8:15, 4] = np.random.normal(size=7)
+        A_sparse = [(np.arange(5, 10), A[5:10, 3]), (np.arange(8, 15), A[8:15, 4])]
+        C_D_inv = np.random.uniform(1, 2, size=50)
+        d = np.random.normal(size=50)
+        M = A.T.dot(np.multiply(C_D_inv, A.T).T)
+        M_cross, M_sparse, R_sparse = self.deLens.normal_equations_sparse(A[:, :3], A_sparse, C_D_inv, d)
+        npt.assert_almost_equal(M_cross, M[3:, :3], decimal=10)
+        npt.assert_almost_equal(M_sparse, M[3:, 3:], decimal=10)
+        npt.assert_almost_equal(R_sparse, A[:, 3:].T.dot(C_D_inv * d), decimal=10)
+        npt.assert_almost_equal(self.deLens.sparse_dot(A_sparse, [1, 2], 50), A[:, 3] + 2 * A[:, 4], decimal=10)
+
+        solver = self.deLens.CholeskyWLS()
+        for num_fixed in [3, 0]:
+            A_fixed = A[:, 3 - num_fixed:3]
+            A_full = A[:, 3 - num_fixed:]
+            for inv_bool in [True, False]:
+                result, cov_error, image, log_det = solver.get_param_WLS_sparse(A_fixed, A_sparse, C_D_inv, d,
+                                                                                inv_bool=inv_bool)
+                result_full, cov_error_full, image_full, log_det_full = self.deLens.get_param_WLS_cholesky(
+                    A_full, C_D_inv, d, inv_bool=inv_bool)
+                npt.assert_almost_equal(result, result_full, decimal=10)
+                npt.assert_almost_equal(image, image_full, decimal=10)
+                npt.assert_almost_equal(log_det, log_det_full, decimal=10)
+                if inv_bool is True:
+                    npt.assert_almost_equal(cov_error, cov_error_full, decimal=10)
+
     def test_marginalisation_const(self):
         A = np.array([[1,2,3],[3,2,1]]).T
         C_D_inv = np.array([1,1,1])
@@ -3,6 +3,7 @@ __author__ = 'sibirrer'
 import numpy.testing as npt
 import numpy as np
 import pytest
+import copy
 
 import lenstronomy.Util.param_util as param_util
 from lenstronomy.LensModel.lens_model import LensModel
@@ -10,6 +11,7 @@ from lenstronomy.LightModel.light_model import LightModel
 from lenstronomy.PointSource.point_source import PointSource
 from lenstronomy.ImSim.image_model import ImageModel
 from lenstronomy.ImSim.image_linear_solve import ImageLinearFit
+import lenstronomy.ImSim.de_lens as de_lens
 import lenstronomy.Util.simulation_util as sim_util
 from lenstronomy.LensModel.Solver.lens_equation_solver import LensEquationSolver
 from lenstronomy.Data.imaging_data import ImageData
@@ -119,6 +121,104 @@ class TestImageModel(object):
         npt.assert_almost_equal(logL - logLmarg, 0, decimal=-3)
         assert logLmarg < logL
 
+    def test_likelihood_data_given_model_batch(self):
+        kwargs_lens_list, kwargs_source_list, kwargs_lens_light_list, kwargs_ps_list = [], [], [], []
+        for theta_E in [0.9, 1., 1.1]:
+            kwargs_lens = copy.deepcopy(self.kwargs_lens)
+            kwargs_lens[0]['theta_E'] = theta_E
+            kwargs_lens_list.append(kwargs_lens)
+            kwargs_source_list.append(copy.deepcopy(self.kwargs_source))
+            kwargs_lens_light_list.append(copy.deepcopy(self.kwargs_lens_light))
+            kwargs_ps_list.append(copy.deepcopy(self.kwargs_ps))
+        for source_marg in [False, True]:
+            logL_batch = self.imageModel.likelihood_data_given_model_batch(kwargs_lens_list, kwargs_source_list,
+                                                                           kwargs_lens_light_list, kwargs_ps_list,
+                                                                           source_marg=source_marg)
+            assert len(logL_batch) == 3
+            for i in range(3):
+                logL = self.imageModel.likelihood_data_given_model(kwargs_lens_list[i], kwargs_source_list[i],
+                                                                   kwargs_lens_light_list[i], kwargs_ps_list[i],
+                                                                   source_marg=source_marg)
+                npt.assert_almost_equal(logL_batch[i], logL, decimal=6)
+        assert logL_batch[1] > logL_batch[0]
+
+    def test_image_linear_solve_sparse(self):
+        # the solution with sparse point source responses matches the one with the dense response matrix
+        for inv_bool in [True, False]:
+            model, error_map, cov_param, param = self.imageModel.image_linear_solve(self.kwargs_lens, self.kwargs_source,
+                                                                                    self.kwargs_lens_light,
+                                                                                    self.kwargs_ps, inv_bool=inv_bool)
+            A = self.imageModel.linear_response_matrix(self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light,
+                                                       self.kwargs_ps)
+            C_D_response, _ = self.imageModel.error_response(self.kwargs_lens, self.kwargs_ps, kwargs_special=None)
+            param_dense, cov_param_dense, _ = de_lens.get_param_WLS(A.T, 1 / C_D_response,
+                                                                    self.imageModel.data_response, inv_bool=inv_bool)
+            npt.assert_allclose(param, param_dense, rtol=1e-6)
+            if inv_bool is True:
+                npt.assert_allclose(cov_param, cov_param_dense, rtol=1e-6)
+
+    def test_linear_solver_reuse(self):
+        # the factorization of the extended light responses is re-used when only the point sources change
+        psf_class = PSF(psf_type='PIXEL', kernel_point_source=self.imageModel.PSF.kernel_point_source)
+        kwargs_numerics = {'supersampling_factor': 2, 'supersampling_convolution': False}
+        imageModel = ImageLinearFit(self.imageModel.Data, psf_class, self.imageModel.LensModel,
+                                    self.imageModel.SourceModel, self.imageModel.LensLightModel,
+                                    self.imageModel.PointSource, kwargs_numerics=kwargs_numerics)
+        imageModel.image_linear_solve(self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light, self.kwargs_ps)
+        L_fixed = imageModel._linear_solver._L_fixed
+        kwargs_ps = [{'ra_source': 0.02, 'dec_source': 0.01, 'source_amp': 1.}]
+        kwargs_source = copy.deepcopy(self.kwargs_source)
+        kwargs_source[0]['amp'] = 10.
+        model, error_map, cov_param, param = imageModel.image_linear_solve(self.kwargs_lens, kwargs_source,
+                                                                           self.kwargs_lens_light, kwargs_ps,
+                                                                           inv_bool=True)
+        assert imageModel._linear_solver._L_fixed is L_fixed
+        imageModel_new = ImageLinearFit(self.imageModel.Data, psf_class, self.imageModel.LensModel,
+                                        self.imageModel.SourceModel, self.imageModel.LensLightModel,
+                                        self.imageModel.PointSource, kwargs_numerics=kwargs_numerics)
+        model_new, error_map_new, cov_param_new, param_new = imageModel_new.image_linear_solve(
+            self.kwargs_lens, kwargs_source, self.kwargs_lens_light, kwargs_ps, inv_bool=True)
+        npt.assert_almost_equal(param, param_new, decimal=8)
+        npt.assert_almost_equal(cov_param, cov_param_new, decimal=8)
+        npt.assert_almost_equal(model, model_new, decimal=8)
+
+        # changes of the non-linear parameters of the extended light invalidate the factorization
+        kwargs_lens = copy.deepcopy(self.kwargs_lens)
+        kwargs_lens[0]['theta_E'] = 1.1
+        imageModel.image_linear_solve(kwargs_lens, kwargs_source, self.kwargs_lens_light, kwargs_ps)
+        assert imageModel._linear_solver._L_fixed is not L_fixed
+
+        # with a PSF error map the point sources enter the covariance of the data
+        self.imageModel.image_linear_solve(self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light, self.kwargs_ps)
+        L_fixed = self.imageModel._linear_solver._L_fixed
+        self.imageModel.image_linear_solve(self.kwargs_lens, self.kwargs_source, self.kwargs_lens_light, kwargs_ps)
+        assert self.imageModel._linear_solver._L_fixed is not L_fixed
+
+    def test_likelihood_precision(self):
+        kwargs_numerics = {'supersampling_factor': 2, 'precision': 'float32'}
+        imageModel_32 = ImageLinearFit(self.imageModel.Data, self.imageModel.PSF, self.imageModel.LensModel,
+                                       self.imageModel.SourceModel, self.imageModel.LensLightModel,
+                                       self.imageModel.PointSource, kwargs_numerics=kwargs_numerics)
+        kwargs_numerics = {'supersampling_factor': 2, 'precision': 'float64'}
+        imageModel_64 = ImageLinearFit(self.imageModel.Data, self.imageModel.PSF, self.imageModel.LensModel,
+                                       self.imageModel.SourceModel, self.imageModel.LensLightModel,
+                                       self.imageModel.PointSource, kwargs_numerics=kwargs_numerics)
+        logL_32 = imageModel_32.likelihood_data_given_model(self.kwargs_lens, self.kwargs_source,
+                                                            self.kwargs_lens_light, self.kwargs_ps)
+        logL_64 = imageModel_64.likelihood_data_given_model(self.kwargs_lens, self.kwargs_source,
+                                                            self.kwargs_lens_light, self.kwargs_ps)
+        # the single precision likelihood is sufficiently close to the double precision one for sampling purposes
+        assert np.abs(logL_32 - logL_64) < 0.01
+
+        # ray-shooting and profile evaluation are performed in single precision
+        x, y = imageModel_32.ImageNumerics.coordinates_evaluate
+        x_source, y_source = imageModel_32.LensModel.ray_shooting(x, y, self.kwargs_lens)
+        assert x_source.dtype == np.float32 and y_source.dtype == np.float32
+        flux = imageModel_32.SourceModel.surface_brightness(x_source, y_source, self.kwargs_source)
+        assert flux.dtype == np.float32
+        flux = imageModel_32.LensLightModel.surface_brightness(x, y, self.kwargs_lens_light)
+        assert flux.dtype == np.float32
+
     def test_reduced_residuals(self):
         model = sim_util.simulate_simple(self.imageModel, self.kwargs_lens, self.kwargs_source,
                                          self.kwargs_lens_light, self.kwargs_ps, no_noise=True)
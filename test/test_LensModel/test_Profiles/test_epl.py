@@ -0,0 +1,107 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import unittest
+import lenstronomy.Util.param_util as param_util
+from lenstronomy.LensModel.Profiles.epl import EPL, EPLMajorAxis
+from lenstronomy.LensModel.Profiles.spep import SPEP
+from lenstronomy.LensModel.Profiles.spemd import SPEMD
+
+
+class TestEPL(object):
+    """
+    tests the elliptical power-law profile
+    """
+    def setup(self):
+        self.epl = EPL()
+        self.spep = SPEP()
+        self.x = np.linspace(-2, 2, 11) + 0.013
+        self.y = np.linspace(-1.5, 2.2, 11)
+
+    def test_spep(self):
+        # for a spherical profile, the elliptical potential (SPEP) and elliptical mass (EPL) are identical
+        for gamma in [1.6, 2., 2.3]:
+            e1, e2 = 0., 0.
+            kwargs = {'theta_E': 1.2, 'gamma': gamma, 'e1': e1, 'e2': e2, 'center_x': 0.1, 'center_y': -0.1}
+            npt.assert_almost_equal(self.epl.function(self.x, self.y, **kwargs),
+                                    self.spep.function(self.x, self.y, **kwargs), decimal=10)
+            npt.assert_almost_equal(self.epl.derivatives(self.x, self.y, **kwargs),
+                                    self.spep.derivatives(self.x, self.y, **kwargs), decimal=10)
+            npt.assert_almost_equal(self.epl.hessian(self.x, self.y, **kwargs),
+                                    self.spep.hessian(self.x, self.y, **kwargs), decimal=10)
+
+        # close to spherical, they agree to first order
+        e1, e2 = param_util.phi_q2_ellipticity(0.3, 0.99)
+        kwargs = {'theta_E': 1.2, 'gamma': 1.8, 'e1': e1, 'e2': e2}
+        npt.assert_almost_equal(self.epl.derivatives(self.x, self.y, **kwargs),
+                                self.spep.derivatives(self.x, self.y, **kwargs), decimal=2)
+
+    def test_convergence(self):
+        theta_E, gamma = 1.2, 2.2
+        phi_G, q = 0.3, 0.6
+        e1, e2 = param_util.phi_q2_ellipticity(phi_G, q)
+        f_xx, f_yy, f_xy = self.epl.hessian(self.x, self.y, theta_E, gamma, e1, e2)
+        x1 = np.cos(phi_G) * self.x + np.sin(phi_G) * self.y
+        x2 = -np.sin(phi_G) * self.x + np.cos(phi_G) * self.y
+        kappa = (3 - gamma) / 2. * (theta_E / np.sqrt(q * x1 ** 2 + x2 ** 2 / q)) ** (gamma - 1)
+        npt.assert_almost_equal((f_xx + f_yy) / 2., kappa, decimal=10)
+
+    def test_finite_differences(self):
+        e1, e2 = param_util.phi_q2_ellipticity(0.3, 0.5)
+        kwargs = {'theta_E': 1.2, 'gamma': 1.7, 'e1': e1, 'e2': e2, 'center_x': 0.1, 'center_y': 0.2}
+        diff = 0.000001
+        f_x, f_y = self.epl.derivatives(self.x, self.y, **kwargs)
+        f_x_num = (self.epl.function(self.x + diff, self.y, **kwargs) - self.epl.function(self.x - diff, self.y, **kwargs)) / (2 * diff)
+        f_y_num = (self.epl.function(self.x, self.y + diff, **kwargs) - self.epl.function(self.x, self.y - diff, **kwargs)) / (2 * diff)
+        npt.assert_almost_equal(f_x_num, f_x, decimal=7)
+        npt.assert_almost_equal(f_y_num, f_y, decimal=7)
+
+        f_xx, f_yy, f_xy = self.epl.hessian(self.x, self.y, **kwargs)
+        f_x_dx, f_y_dx = self.epl.derivatives(self.x + diff, self.y, **kwargs)
+        f_x_dy, f_y_dy = self.epl.derivatives(self.x, self.y + diff, **kwargs)
+        npt.assert_almost_equal((f_x_dx - f_x) / diff, f_xx, decimal=5)
+        npt.assert_almost_equal((f_y_dy - f_y) / diff, f_yy, decimal=5)
+        npt.assert_almost_equal((f_y_dx - f_y) / diff, f_xy, decimal=5)
+
+    def test_series_tolerance(self):
+        e1, e2 = param_util.phi_q2_ellipticity(0.3, 0.3)
+        kwargs = {'theta_E': 1.2, 'gamma': 2.1, 'e1': e1, 'e2': e2}
+        epl_coarse = EPL(series_tolerance=0.001)
+        assert epl_coarse.epl_major_axis.num_iter(0.3) < self.epl.epl_major_axis.num_iter(0.3)
+        npt.assert_almost_equal(epl_coarse.derivatives(self.x, self.y, **kwargs),
+                                self.epl.derivatives(self.x, self.y, **kwargs), decimal=2)
+        epl_major_axis = EPLMajorAxis()
+        assert epl_major_axis.num_iter(1) == 0
+        assert EPLMajorAxis(num_iter_max=10).num_iter(0.1) == 10
+
+    def test_center(self):
+        kwargs = {'theta_E': 1.2, 'gamma': 1.9, 'e1': 0.1, 'e2': 0.}
+        f_x, f_y = self.epl.derivatives(0., 0., **kwargs)
+        assert f_x == 0
+        assert f_y == 0
+        f_x, f_y = self.epl.derivatives(self.x, self.y, theta_E=0, gamma=1.9, e1=0.1, e2=0)
+        npt.assert_almost_equal(f_x, 0, decimal=10)
+
+    def test_spemd_backend(self):
+        spemd = SPEMD(backend='EPL')
+        assert spemd.backend == 'EPL'
+        e1, e2 = param_util.phi_q2_ellipticity(1., 0.9)
+        kwargs = {'theta_E': 1., 'gamma': 1.9, 'e1': e1, 'e2': e2}
+        npt.assert_almost_equal(spemd.derivatives(self.x, self.y, **kwargs),
+                                self.epl.derivatives(self.x, self.y, **kwargs), decimal=10)
+        # values of the FASTELL computation (with a core of 0.0001)
+        f_xx, f_yy, f_xy = spemd.hessian(1., 2., **kwargs)
+        npt.assert_almost_equal(f_xx, 0.41789957732890953, decimal=3)
+        npt.assert_almost_equal(f_yy, 0.14047593655054141, decimal=3)
+        npt.assert_almost_equal(f_xy, -0.18560737698052343, decimal=3)
+
+
+class TestRaise(unittest.TestCase):
+
+    def test_raise(self):
+        with self.assertRaises(ValueError):
+            SPEMD(backend='WRONG')
+
+
+if __name__ == '__main__':
+    pytest.main()
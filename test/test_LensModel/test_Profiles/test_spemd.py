@@ -10,7 +10,7 @@ try:
     import fastell4py
     fastell4py_bool = True
 except:
-    print("Warning: fastell4py not available, tests will be trivially fulfilled without giving the right answer!")
+    print("Warning: fastell4py not available, tests are performed with the native EPL backend!")
     fastell4py_bool = False
 
 
@@ -37,7 +37,7 @@ class TestSPEMD(object):
         if fastell4py_bool:
             assert values == 2.1567297115381039
         else:
-            assert values == 0
+            npt.assert_almost_equal(values, 2.1567297115381039, decimal=3)
         a += values
         x = np.array(1.)
         y = np.array(2.)
@@ -48,7 +48,7 @@ class TestSPEMD(object):
         if fastell4py_bool:
             assert values == 2.1567297115381039
         else:
-            assert values == 0
+            npt.assert_almost_equal(values, 2.1567297115381039, decimal=3)
         assert type(x) == type(values)
 
         x = np.array([2, 3, 4])
@@ -59,9 +59,9 @@ class TestSPEMD(object):
             npt.assert_almost_equal(values[1], 3.209319798597186, decimal=7)
             npt.assert_almost_equal(values[2], 4.3105937398856398, decimal=7)
         else:
-            npt.assert_almost_equal(values[0], 0, decimal=7)
-            npt.assert_almost_equal(values[1], 0, decimal=7)
-            npt.assert_almost_equal(values[2], 0, decimal=7)
+            npt.assert_almost_equal(values[0], 2.1798076611034141, decimal=3)
+            npt.assert_almost_equal(values[1], 3.209319798597186, decimal=3)
+            npt.assert_almost_equal(values[2], 4.3105937398856398, decimal=3)
 
     def test_derivatives(self):
         x = np.array([1])
@@ -76,8 +76,8 @@ class TestSPEMD(object):
             npt.assert_almost_equal(f_x[0], 0.46663367437984204, decimal=7)
             npt.assert_almost_equal(f_y[0], 0.95307422686028065, decimal=7)
         else:
-            npt.assert_almost_equal(f_x[0], 0, decimal=7)
-            npt.assert_almost_equal(f_y[0], 0, decimal=7)
+            npt.assert_almost_equal(f_x[0], 0.46663367437984204, decimal=3)
+            npt.assert_almost_equal(f_y[0], 0.95307422686028065, decimal=3)
 
         x = np.array([1., 3, 4])
         y = np.array([2., 1, 1])
@@ -89,10 +89,10 @@ class TestSPEMD(object):
             npt.assert_almost_equal(values[0][1], 1.0722152681324291, decimal=7)
             npt.assert_almost_equal(values[1][1], 0.31400298272329669, decimal=7)
         else:
-            npt.assert_almost_equal(values[0][0], 0, decimal=7)
-            npt.assert_almost_equal(values[1][0], 0, decimal=7)
-            npt.assert_almost_equal(values[0][1], 0, decimal=7)
-            npt.assert_almost_equal(values[1][1], 0, decimal=7)
+            npt.assert_almost_equal(values[0][0], 0.46663367437984204, decimal=3)
+            npt.assert_almost_equal(values[1][0], 0.95307422686028065, decimal=3)
+            npt.assert_almost_equal(values[0][1], 1.0722152681324291, decimal=3)
+            npt.assert_almost_equal(values[1][1], 0.31400298272329669, decimal=3)
         a += values[0]
         x = 1.
         y = 2.
@@ -106,8 +106,8 @@ class TestSPEMD(object):
             npt.assert_almost_equal(f_x, 0.46663367437984204, decimal=7)
             npt.assert_almost_equal(f_y, 0.95307422686028065, decimal=7)
         else:
-            npt.assert_almost_equal(f_x, 0, decimal=7)
-            npt.assert_almost_equal(f_y, 0, decimal=7)
+            npt.assert_almost_equal(f_x, 0.46663367437984204, decimal=3)
+            npt.assert_almost_equal(f_y, 0.95307422686028065, decimal=3)
         x = 0.
         y = 0.
         f_x, f_y = self.SPEMD.derivatives(x, y, phi_E, gamma, e1, e2)
@@ -128,9 +128,9 @@ class TestSPEMD(object):
             npt.assert_almost_equal(f_yy, 0.14047593655054141, decimal=7)
             npt.assert_almost_equal(f_xy, -0.18560737698052343, decimal=7)
         else:
-            npt.assert_almost_equal(f_xx, 0, decimal=7)
-            npt.assert_almost_equal(f_yy, 0, decimal=7)
-            npt.assert_almost_equal(f_xy, 0, decimal=7)
+            npt.assert_almost_equal(f_xx, 0.41789957732890953, decimal=3)
+            npt.assert_almost_equal(f_yy, 0.14047593655054141, decimal=3)
+            npt.assert_almost_equal(f_xy, -0.18560737698052343, decimal=3)
 
         x = 1.
         y = 2.
@@ -146,9 +146,9 @@ class TestSPEMD(object):
             npt.assert_almost_equal(f_yy, 0.14047593655054141, decimal=7)
             npt.assert_almost_equal(f_xy, -0.18560737698052343, decimal=7)
         else:
-            npt.assert_almost_equal(f_xx, 0, decimal=7)
-            npt.assert_almost_equal(f_yy, 0, decimal=7)
-            npt.assert_almost_equal(f_xy, 0, decimal=7)
+            npt.assert_almost_equal(f_xx, 0.41789957732890953, decimal=3)
+            npt.assert_almost_equal(f_yy, 0.14047593655054141, decimal=3)
+            npt.assert_almost_equal(f_xy, -0.18560737698052343, decimal=3)
         a += f_xx
         x = np.array([1,3,4])
         y = np.array([2,1,1])
@@ -162,7 +162,12 @@ class TestSPEMD(object):
             npt.assert_almost_equal(values[1][1], 0.32494089371516482, decimal=7)
             npt.assert_almost_equal(values[2][1], -0.097845438684594374, decimal=7)
         else:
-            npt.assert_almost_equal(values[0][0], 0, decimal=7)
+            npt.assert_almost_equal(values[0][0], 0.41789957732890953, decimal=3)
+            npt.assert_almost_equal(values[1][0], 0.14047593655054141, decimal=3)
+            npt.assert_almost_equal(values[2][0], -0.18560737698052343, decimal=3)
+            npt.assert_almost_equal(values[0][1], 0.068359818958208918, decimal=3)
+            npt.assert_almost_equal(values[1][1], 0.32494089371516482, decimal=3)
+            npt.assert_almost_equal(values[2][1], -0.097845438684594374, decimal=3)
 
     def test_spep_spemd(self):
         x = np.array([1])
@@ -177,7 +182,7 @@ class TestSPEMD(object):
         if fastell4py_bool:
             npt.assert_almost_equal(f_x[0], f_x_spep[0], decimal=2)
         else:
-            pass
+            npt.assert_almost_equal(f_x[0], f_x_spep[0], decimal=2)
 
         theta_E = 2.
         gamma = 2.
@@ -189,7 +194,7 @@ class TestSPEMD(object):
         if fastell4py_bool:
             npt.assert_almost_equal(f_x[0], f_x_spep[0], decimal=2)
         else:
-            pass
+            npt.assert_almost_equal(f_x[0], f_x_spep[0], decimal=2)
 
         theta_E = 2.
         gamma = 1.7
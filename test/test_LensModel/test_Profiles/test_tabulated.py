@@ -0,0 +1,177 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import unittest
+from lenstronomy.LensModel.Profiles.tabulated import TabulatedProfile
+from lenstronomy.LensModel.Profiles.nfw import NFW
+from lenstronomy.LensModel.Profiles.tnfw import TNFW
+from lenstronomy.LensModel.Profiles.cnfw import CNFW
+from lenstronomy.LensModel.Profiles.coreBurkert import CoreBurkert
+from lenstronomy.LensModel.Profiles.hernquist import Hernquist
+from lenstronomy.LensModel.Profiles.p_jaffe import PJaffe
+from lenstronomy.LensModel.Profiles.cored_density import CoredDensity
+from lenstronomy.LensModel.Profiles.cored_density_2 import CoredDensity2
+from lenstronomy.LensModel.lens_model import LensModel
+from lenstronomy.LensModel.single_plane import SinglePlane
+import lenstronomy.Util.util as util
+
+
+class TestTabulatedProfile(object):
+    """
+    tests the lookup-table accelerated profiles against the analytic expressions
+    """
+    def setup(self):
+        self.x, self.y = util.make_grid(numPix=41, deltapix=0.1)
+        self.x += 0.013
+        self.profiles = [(NFW(), {'Rs': 1., 'alpha_Rs': 0.5, 'center_x': 0.1, 'center_y': -0.2}),
+                         (TNFW(), {'Rs': 1., 'alpha_Rs': 0.5, 'r_trunc': 3., 'center_x': 0.1}),
+                         (CNFW(), {'Rs': 1., 'alpha_Rs': 0.5, 'r_core': 0.25}),
+                         (CoreBurkert(), {'Rs': 1., 'alpha_Rs': 0.5, 'r_core': 0.5, 'center_y': 0.3}),
+                         (Hernquist(), {'Rs': 0.7, 'sigma0': 0.3, 'center_x': -0.1}),
+                         (PJaffe(), {'Rs': 2.5, 'Ra': 0.2, 'sigma0': 0.4}),
+                         (CoredDensity(), {'r_core': 0.6, 'sigma0': 0.2}),
+                         (CoredDensity2(), {'r_core': 0.6, 'sigma0': 0.2, 'center_y': 0.1})]
+
+    def test_accuracy(self):
+        for profile, kwargs in self.profiles:
+            tabulated = TabulatedProfile(profile, tolerance=0.0001)
+            f = profile.function(self.x, self.y, **kwargs)
+            f_tab = tabulated.function(self.x, self.y, **kwargs)
+            npt.assert_almost_equal(f_tab / np.max(np.abs(f)), f / np.max(np.abs(f)), decimal=4)
+            f_x, f_y = profile.derivatives(self.x, self.y, **kwargs)
+            f_x_tab, f_y_tab = tabulated.derivatives(self.x, self.y, **kwargs)
+            norm = np.max(np.abs(f_x))
+            npt.assert_almost_equal(f_x_tab / norm, f_x / norm, decimal=4)
+            npt.assert_almost_equal(f_y_tab / norm, f_y / norm, decimal=4)
+            f_xx, f_yy, f_xy = profile.hessian(self.x, self.y, **kwargs)
+            f_xx_tab, f_yy_tab, f_xy_tab = tabulated.hessian(self.x, self.y, **kwargs)
+            norm = np.max(np.abs(f_xx))
+            npt.assert_almost_equal(f_xx_tab / norm, f_xx / norm, decimal=4)
+            npt.assert_almost_equal(f_yy_tab / norm, f_yy / norm, decimal=4)
+            npt.assert_almost_equal(f_xy_tab / norm, f_xy / norm, decimal=4)
+
+    def test_tolerance(self):
+        profile, kwargs = self.profiles[0]
+        f_x, f_y = profile.derivatives(self.x, self.y, **kwargs)
+        error_list = []
+        for tolerance in [0.01, 0.0001, 0.000001]:
+            tabulated = TabulatedProfile(profile, tolerance=tolerance)
+            f_x_tab, f_y_tab = tabulated.derivatives(self.x, self.y, **kwargs)
+            error = np.max(np.abs(f_x_tab - f_x)) / np.max(np.abs(f_x))
+            assert error < tolerance
+            error_list.append(error)
+        assert error_list[2] < error_list[1] < error_list[0]
+
+    def test_tables(self):
+        profile, kwargs = self.profiles[0]
+        tabulated = TabulatedProfile(profile)
+        tabulated.derivatives(self.x, self.y, **kwargs)
+        log_x = tabulated._tables['alpha'][0][0]
+        # the dimensionless table is re-used for positions within the tabulated range and for all parameters
+        kwargs_new = dict(kwargs, center_x=0.2, Rs=0.5, alpha_Rs=2.)
+        x = 0.2 + (self.x - kwargs['center_x']) / 2.
+        y = kwargs['center_y'] + (self.y - kwargs['center_y']) / 2.
+        f_x_tab, f_y_tab = tabulated.derivatives(x, y, **kwargs_new)
+        assert tabulated._tables['alpha'][0][0] is log_x
+        f_x, f_y = profile.derivatives(x, y, **kwargs_new)
+        npt.assert_almost_equal(f_x_tab / np.max(np.abs(f_x)), f_x / np.max(np.abs(f_x)), decimal=4)
+        # and extended when the range is exceeded
+        tabulated.derivatives(self.x * 10, self.y * 10, **kwargs)
+        log_x_new = tabulated._tables['alpha'][0][0]
+        assert log_x_new[0] <= log_x[0] and log_x_new[-1] > log_x[-1]
+        assert len(tabulated._tables['alpha']) == 1
+
+        # profiles with a shape parameter are tabulated at the two neighbouring grid points of the shape
+        profile, kwargs = self.profiles[1]
+        tabulated = TabulatedProfile(profile)
+        tabulated.derivatives(self.x, self.y, **kwargs)
+        assert len(tabulated._tables['alpha']) == 2
+        tabulated.derivatives(self.x, self.y, **dict(kwargs, Rs=2., r_trunc=6.))
+        assert len(tabulated._tables['alpha']) == 2
+        tabulated.derivatives(self.x, self.y, **dict(kwargs, r_trunc=6.))
+        assert len(tabulated._tables['alpha']) == 4
+
+    def test_small_arrays(self):
+        profile, kwargs = self.profiles[0]
+        tabulated = TabulatedProfile(profile)
+        # no table is computed for fewer positions than table entries
+        x, y = self.x[:10], self.y[:10]
+        f_x_tab, f_y_tab = tabulated.derivatives(x, y, **kwargs)
+        assert 'alpha' not in tabulated._tables
+        f_x, f_y = profile.derivatives(x, y, **kwargs)
+        npt.assert_almost_equal(f_x_tab, f_x, decimal=10)
+        # but an existing table is used
+        tabulated.derivatives(self.x, self.y, **kwargs)
+        f_x_tab, f_y_tab = tabulated.derivatives(x, y, **kwargs)
+        npt.assert_almost_equal(f_x_tab / np.max(np.abs(f_x)), f_x / np.max(np.abs(f_x)), decimal=4)
+        assert np.max(np.abs(f_x_tab - f_x)) > 0
+
+    def test_center(self):
+        profile, kwargs = self.profiles[0]
+        tabulated = TabulatedProfile(profile)
+        # positions at and close to the center are computed analytically
+        x = np.array([0.1, 0.10000001, 1.1])
+        y = np.array([-0.2, -0.2, -0.2])
+        f_x_tab, f_y_tab = tabulated.derivatives(x, y, **kwargs)
+        f_x, f_y = profile.derivatives(x, y, **kwargs)
+        npt.assert_almost_equal(f_x_tab[:2], f_x[:2], decimal=8)
+        npt.assert_almost_equal(f_y_tab[:2], f_y[:2], decimal=8)
+        npt.assert_almost_equal(f_x_tab[2], f_x[2], decimal=4)
+        f_x_tab, f_y_tab = tabulated.derivatives(0.1, -0.2, **kwargs)
+        f_x, f_y = profile.derivatives(0.1, -0.2, **kwargs)
+        npt.assert_almost_equal(f_x_tab, f_x, decimal=8)
+        f_x_tab, f_y_tab = tabulated.derivatives(1., 1., **kwargs)
+        f_x, f_y = profile.derivatives(1., 1., **kwargs)
+        npt.assert_almost_equal(f_x_tab, f_x, decimal=4)
+        assert np.shape(f_x_tab) == ()
+
+    def test_mass(self):
+        profile, kwargs = self.profiles[0]
+        tabulated = TabulatedProfile(profile)
+        npt.assert_almost_equal(tabulated.density_lens(1., Rs=1., alpha_Rs=0.5), profile.density_lens(1., Rs=1., alpha_Rs=0.5))
+        npt.assert_almost_equal(tabulated.mass_3d_lens(1., Rs=1., alpha_Rs=0.5), profile.mass_3d_lens(1., Rs=1., alpha_Rs=0.5))
+
+    def test_lens_model(self):
+        lens_model_list = ['SIE', 'NFW', 'TNFW', 'NFW']
+        kwargs_lens = [{'theta_E': 1., 'e1': 0.1, 'e2': 0, 'center_x': 0, 'center_y': 0},
+                       {'Rs': 2., 'alpha_Rs': 0.3, 'center_x': 0, 'center_y': 0},
+                       {'Rs': 0.1, 'alpha_Rs': 0.01, 'r_trunc': 0.5, 'center_x': 0.5, 'center_y': 0.5},
+                       {'Rs': 0.1, 'alpha_Rs': 0.01, 'center_x': -0.5, 'center_y': 0.5}]
+        # enough positions to compute the tables
+        x, y = util.make_grid(numPix=101, deltapix=0.04)
+        x += 0.013
+        lens_model = LensModel(lens_model_list)
+        lens_model_tab = LensModel(lens_model_list, tabulated_index=[1, 2, 3], tabulation_tolerance=0.00001)
+        assert isinstance(lens_model_tab.lens_model.func_list[1], TabulatedProfile)
+        assert not isinstance(lens_model_tab.lens_model.func_list[0], TabulatedProfile)
+        # each tabulated profile has its own tables
+        assert lens_model_tab.lens_model.func_list[1] is not lens_model_tab.lens_model.func_list[3]
+        beta_x, beta_y = lens_model.ray_shooting(x, y, kwargs_lens)
+        beta_x_tab, beta_y_tab = lens_model_tab.ray_shooting(x, y, kwargs_lens)
+        npt.assert_almost_equal(beta_x_tab, beta_x, decimal=5)
+        npt.assert_almost_equal(beta_y_tab, beta_y, decimal=5)
+        assert 'alpha' in lens_model_tab.lens_model.func_list[2]._tables
+        kappa = lens_model.kappa(x, y, kwargs_lens)
+        kappa_tab = lens_model_tab.kappa(x, y, kwargs_lens)
+        npt.assert_almost_equal(kappa_tab, kappa, decimal=4)
+
+        lens_model = LensModel(lens_model_list, z_source=2, lens_redshift_list=[0.5, 0.5, 0.3, 0.7], multi_plane=True)
+        lens_model_tab = LensModel(lens_model_list, z_source=2, lens_redshift_list=[0.5, 0.5, 0.3, 0.7],
+                                   multi_plane=True, tabulated_index=[1, 2, 3], tabulation_tolerance=0.00001)
+        beta_x, beta_y = lens_model.ray_shooting(x, y, kwargs_lens)
+        beta_x_tab, beta_y_tab = lens_model_tab.ray_shooting(x, y, kwargs_lens)
+        npt.assert_almost_equal(beta_x_tab, beta_x, decimal=5)
+        npt.assert_almost_equal(beta_y_tab, beta_y, decimal=5)
+
+
+class TestRaise(unittest.TestCase):
+
+    def test_raise(self):
+        with self.assertRaises(ValueError):
+            SinglePlane(['SIE', 'NFW'], tabulated_index=[0])
+        with self.assertRaises(ValueError):
+            LensModel(['CHAMELEON'], tabulated_index=[0])
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -1,5 +1,6 @@
 __author__ = 'sibirrer'
 
+import numpy as np
 import numpy.testing as npt
 import pytest
 from lenstronomy.LensModel.Solver.lens_equation_solver import LensEquationSolver
@@ -124,6 +125,162 @@ class TestLensEquationSolver(object):
         npt.assert_almost_equal(x_pos, x_pos_stoch, decimal=5)
         npt.assert_almost_equal(x_pos, x_pos_non_linear, decimal=5)
 
+    def test_vectorized(self):
+        lens_model_list = ['SPEP', 'SIS', 'SHEAR']
+        kwargs_lens = [{'theta_E': 1, 'gamma': 2, 'e1': 0.2, 'e2': -0.03, 'center_x': 0, 'center_y': 0},
+                       {'theta_E': 0.1, 'center_x': 0.5, 'center_y': 0}, {'gamma1': 0.01, 'gamma2': 0}]
+        for lensModel in [LensModel(lens_model_list),
+                          LensModel(lens_model_list, z_source=1.5, lens_redshift_list=[0.5, 0.3, 0.5],
+                                    multi_plane=True)]:
+            lensEquationSolver = LensEquationSolver(lensModel)
+            sourcePos_x, sourcePos_y = 0.1, -0.1
+            x_pos, y_pos = lensEquationSolver.image_position_from_source(sourcePos_x, sourcePos_y, kwargs_lens,
+                                                                         min_distance=0.05, search_window=10,
+                                                                         precision_limit=10 ** (-10), num_iter_max=10)
+            x_pos_vec, y_pos_vec = lensEquationSolver.image_position_from_source(sourcePos_x, sourcePos_y,
+                                                                                 kwargs_lens, min_distance=0.05,
+                                                                                 search_window=10,
+                                                                                 precision_limit=10 ** (-10),
+                                                                                 num_iter_max=10, vectorized=True)
+            assert len(x_pos_vec) == len(x_pos)
+            npt.assert_almost_equal(x_pos_vec, x_pos, decimal=8)
+            npt.assert_almost_equal(y_pos_vec, y_pos, decimal=8)
+            source_x, source_y = lensModel.ray_shooting(x_pos_vec, y_pos_vec, kwargs_lens)
+            npt.assert_almost_equal(source_x, sourcePos_x, decimal=10)
+            npt.assert_almost_equal(source_y, sourcePos_y, decimal=10)
+
+        # candidates far from the solutions need several steps and candidates may not converge
+        lensModel = LensModel(lens_model_list)
+        lensEquationSolver = LensEquationSolver(lensModel)
+        x_min, y_min = np.array([1.5, 0.1, -3., 0.]), np.array([0.3, -1.2, 0., 0.])
+        x_guess, y_guess, precision = lensEquationSolver._findIterative_vectorized(x_min, y_min, 0.1, -0.1,
+                                                                                  kwargs_lens, min_distance=0.1,
+                                                                                  num_iter_max=100)
+        assert len(precision) == 4
+        converged = precision <= 10 ** (-10)
+        assert np.sum(converged) >= 2
+        source_x, source_y = lensModel.ray_shooting(x_guess[converged], y_guess[converged], kwargs_lens)
+        npt.assert_almost_equal(source_x, 0.1, decimal=10)
+        x_guess, y_guess, precision = lensEquationSolver._findIterative_vectorized([], [], 0.1, -0.1, kwargs_lens)
+        assert len(x_guess) == 0
+
+        x_pos, y_pos = lensEquationSolver.findBrightImage(0.1, -0.1, kwargs_lens, numImages=2, min_distance=0.05,
+                                                          search_window=5, vectorized=True)
+        assert len(x_pos) == 2
+
+    def test_adaptive_grid(self):
+        lens_model_list = ['SPEP', 'SIS', 'SHEAR']
+        kwargs_lens = [{'theta_E': 1, 'gamma': 2, 'e1': 0.2, 'e2': -0.03, 'center_x': 0, 'center_y': 0},
+                       {'theta_E': 0.1, 'center_x': 0.5, 'center_y': 0}, {'gamma1': 0.01, 'gamma2': 0}]
+        lensModel = LensModel(lens_model_list)
+        lensEquationSolver = LensEquationSolver(lensModel)
+        sourcePos_x, sourcePos_y = 0.1, -0.1
+        x_pos, y_pos = lensEquationSolver.image_position_from_source(sourcePos_x, sourcePos_y, kwargs_lens,
+                                                                     min_distance=0.01, search_window=5,
+                                                                     precision_limit=10 ** (-10), num_iter_max=10)
+        for vectorized in [False, True]:
+            x_pos_adapt, y_pos_adapt = lensEquationSolver.image_position_from_source(sourcePos_x, sourcePos_y,
+                                                                                     kwargs_lens, min_distance=0.01,
+                                                                                     search_window=5,
+                                                                                     precision_limit=10 ** (-10),
+                                                                                     num_iter_max=10,
+                                                                                     adaptive_grid=True,
+                                                                                     vectorized=vectorized)
+            assert len(x_pos_adapt) == len(x_pos)
+            npt.assert_almost_equal(x_pos_adapt, x_pos, decimal=8)
+            npt.assert_almost_equal(y_pos_adapt, y_pos, decimal=8)
+
+        # the candidates are close to the solutions
+        x_mins, y_mins = lensEquationSolver.candidates_adaptive_grid(sourcePos_x, sourcePos_y, kwargs_lens,
+                                                                     min_distance=0.01, search_window=5)
+        for x, y in zip(x_pos, y_pos):
+            assert np.min(np.sqrt((x_mins - x) ** 2 + (y_mins - y) ** 2)) < 0.05
+
+        # no solution in the search window
+        x_pos, y_pos = lensEquationSolver.image_position_from_source(sourcePos_x, sourcePos_y, kwargs_lens,
+                                                                     min_distance=0.01, search_window=0.2,
+                                                                     x_center=3, y_center=3, adaptive_grid=True)
+        assert len(x_pos) == 0
+
+    def test_image_position_from_initial_guess(self):
+        lens_model_list = ['SPEP', 'SHEAR']
+        kwargs_lens = [{'theta_E': 1, 'gamma': 2, 'e1': 0.2, 'e2': -0.03, 'center_x': 0, 'center_y': 0},
+                       {'gamma1': 0.01, 'gamma2': 0}]
+        lensModel = LensModel(lens_model_list)
+        lensEquationSolver = LensEquationSolver(lensModel)
+        sourcePos_x, sourcePos_y = 0.05, -0.03
+        x_pos, y_pos = lensEquationSolver.image_position_from_source(sourcePos_x, sourcePos_y, kwargs_lens,
+                                                                     min_distance=0.05, search_window=5)
+        # solutions of a slightly perturbed lens model are used as starting points
+        kwargs_lens_new = [dict(kwargs_lens[0], theta_E=1.01), kwargs_lens[1]]
+        x_new, y_new = lensEquationSolver.image_position_from_source(sourcePos_x, sourcePos_y, kwargs_lens_new,
+                                                                     min_distance=0.05, search_window=5)
+        x_warm, y_warm = lensEquationSolver.image_position_from_initial_guess(sourcePos_x, sourcePos_y,
+                                                                              kwargs_lens_new, x_pos, y_pos,
+                                                                              min_distance=0.05)
+        assert len(x_warm) == len(x_new)
+        npt.assert_almost_equal(x_warm, x_new, decimal=8)
+        npt.assert_almost_equal(y_warm, y_new, decimal=8)
+
+        # two starting points converging to the same image
+        x_warm, y_warm = lensEquationSolver.image_position_from_initial_guess(sourcePos_x, sourcePos_y,
+                                                                              kwargs_lens_new,
+                                                                              [x_pos[0], x_pos[0] + 0.001],
+                                                                              [y_pos[0], y_pos[0]],
+                                                                              min_distance=0.05)
+        assert x_warm is None and y_warm is None
+
+        # images below the magnification limit are rejected
+        x_warm, y_warm = lensEquationSolver.image_position_from_initial_guess(sourcePos_x, sourcePos_y,
+                                                                              kwargs_lens_new, x_pos, y_pos,
+                                                                              min_distance=0.05,
+                                                                              magnification_limit=10 ** 5)
+        assert x_warm is None
+
+    def test_image_number(self):
+        lensModel = LensModel(['SIE', 'SHEAR'])
+        kwargs_lens = [{'theta_E': 1., 'e1': 0.3, 'e2': 0., 'center_x': 0, 'center_y': 0},
+                       {'gamma1': 0.05, 'gamma2': 0.}]
+        lensEquationSolver = LensEquationSolver(lensModel)
+        for sourcePos_x, num_images in [(0.8, 2), (0.01, 4)]:
+            x_pos, y_pos = lensEquationSolver.image_position_from_source(sourcePos_x, 0.02, kwargs_lens,
+                                                                         min_distance=0.01, search_window=5)
+            assert len(x_pos) == num_images
+            num = lensEquationSolver.image_number(sourcePos_x, 0.02, kwargs_lens, min_distance=0.01, search_window=5)
+            assert num == num_images
+        num = lensEquationSolver.image_number(0.01, 0.02, kwargs_lens, min_distance=0.01, search_window=5,
+                                              magnification_limit=10 ** 5)
+        assert num == 0
+
+    def test_profiling(self, capsys):
+        lensModel = LensModel(['SIS'])
+        kwargs_lens = [{'theta_E': 1, 'center_x': 0, 'center_y': 0}]
+        lensEquationSolver = LensEquationSolver(lensModel)
+        lensEquationSolver.image_position_from_source(0.1, 0, kwargs_lens, min_distance=0.05, search_window=5)
+        # nothing is printed or recorded by default
+        assert capsys.readouterr().out == ''
+        assert lensEquationSolver.profiler.timings() == {}
+
+        lensEquationSolver = LensEquationSolver(lensModel, profiling=True)
+        for i in range(2):
+            x_pos, y_pos = lensEquationSolver.image_position_from_source(0.1, 0, kwargs_lens, min_distance=0.05,
+                                                                         search_window=5, magnification_limit=0.1)
+        timings = lensEquationSolver.profiler.timings()
+        for stage in ['grid_search', 'iterative_solve', 'overlap_removal', 'arrival_time_sort',
+                      'magnification_limit', 'total']:
+            assert timings[stage]['calls'] == 2
+        assert timings['total']['time'] >= timings['iterative_solve']['time']
+        counters = lensEquationSolver.profiler.counters()
+        assert counters['images'] == 2 * len(x_pos) == 4
+        assert counters['candidates'] >= counters['converged'] >= counters['images']
+
+    def test_triangle_contains(self):
+        x_tri, y_tri = np.array([[0., 1., 0.], [0., 1., 0.]]), np.array([[0., 0., 1.], [0., 0., 0.]])
+        inside = LensEquationSolver._triangle_contains(x_tri, y_tri, 0.2, 0.2, margin=0)
+        assert inside[0] and not inside[1]
+        assert not LensEquationSolver._triangle_contains(x_tri, y_tri, 1, 1, margin=0)[0]
+        assert LensEquationSolver._triangle_contains(x_tri, y_tri, 1, 1, margin=1)[0]
+
 
 if __name__ == '__main__':
     pytest.main()
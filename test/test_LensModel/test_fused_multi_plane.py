@@ -0,0 +1,112 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import unittest
+from lenstronomy.LensModel.lens_model import LensModel
+from lenstronomy.LensModel.multi_plane_base import MultiPlaneBase
+import lenstronomy.Util.util as util
+
+
+class TestFusedMultiPlane(object):
+
+    def setup(self):
+        np.random.seed(41)
+        self.x, self.y = util.make_grid(numPix=20, deltapix=0.1)
+        self.lens_model_list = ['SIE', 'SHEAR']
+        self.kwargs_lens = [{'theta_E': 1., 'e1': 0.1, 'e2': -0.05, 'center_x': 0, 'center_y': 0},
+                            {'gamma1': 0.02, 'gamma2': -0.01}]
+        self.lens_redshift_list = [0.5, 0.5]
+        # 20 planes with several sub-halos sharing their redshift
+        for z in np.linspace(0.1, 1.5, 20):
+            for i in range(3):
+                self.lens_model_list.append('NFW')
+                self.lens_redshift_list.append(z)
+                self.kwargs_lens.append({'Rs': 0.1, 'alpha_Rs': 0.01, 'center_x': np.random.uniform(-1, 1),
+                                         'center_y': np.random.uniform(-1, 1)})
+        self.lens_model_list.append('EPL')
+        self.lens_redshift_list.append(0.8)
+        self.kwargs_lens.append({'theta_E': 0.1, 'gamma': 2.1, 'e1': 0.05, 'e2': 0., 'center_x': 0.3, 'center_y': 0.})
+        self.lens_model = LensModel(self.lens_model_list, z_source=2, lens_redshift_list=self.lens_redshift_list,
+                                    multi_plane=True)
+        self.lens_model_fused = LensModel(self.lens_model_list, z_source=2, lens_redshift_list=self.lens_redshift_list,
+                                          multi_plane=True, fused_kernel=True)
+
+    def _reference(self, multi_plane_base, x, y, alpha_x, alpha_y, z_start, z_stop, kwargs_lens,
+                   include_z_start=False):
+        """
+        lens model by lens model recursion through the planes
+        """
+        z_lens_last = z_start
+        first_deflector = True
+        for i, idex in enumerate(multi_plane_base._sorted_redshift_index):
+            z_lens = multi_plane_base._lens_redshift_list[idex]
+            if multi_plane_base._start_condition(include_z_start, z_lens, z_start) and z_lens <= z_stop:
+                if first_deflector is True:
+                    delta_T = multi_plane_base._cosmo_bkg.T_xy(z_start, z_lens)
+                    first_deflector = False
+                else:
+                    delta_T = multi_plane_base._T_ij_list[i]
+                x, y = multi_plane_base._ray_step_add(x, y, alpha_x, alpha_y, delta_T)
+                alpha_x, alpha_y = multi_plane_base._add_deflection(x, y, alpha_x, alpha_y, kwargs_lens, i)
+                z_lens_last = z_lens
+        delta_T = multi_plane_base._cosmo_bkg.T_xy(z_lens_last, z_stop)
+        x, y = multi_plane_base._ray_step_add(x, y, alpha_x, alpha_y, delta_T)
+        return x, y, alpha_x, alpha_y
+
+    def test_planes(self):
+        multi_plane_base = self.lens_model.lens_model._multi_plane_base
+        assert len(multi_plane_base._plane_redshift_list) == 22
+        assert multi_plane_base._plane_start_list[-1] == len(self.lens_model_list)
+
+    def test_ray_shooting_partial(self):
+        multi_plane_base = self.lens_model.lens_model._multi_plane_base
+        multi_plane_base_fused = self.lens_model_fused.lens_model._multi_plane_base
+        for z_start, z_stop, include_z_start in [(0, 2, False), (0.5, 1.2, True), (0.5, 1.2, False), (1.6, 2, False)]:
+            alpha_x, alpha_y = self.x * 0.000001, self.y * 0.000001
+            x_ref, y_ref, alpha_x_ref, alpha_y_ref = self._reference(multi_plane_base, self.x * 0, self.y * 0, alpha_x,
+                                                                     alpha_y, z_start, z_stop, self.kwargs_lens,
+                                                                     include_z_start=include_z_start)
+            for base in [multi_plane_base, multi_plane_base_fused]:
+                x, y, alpha_x_out, alpha_y_out = base.ray_shooting_partial(self.x * 0, self.y * 0, alpha_x, alpha_y,
+                                                                           z_start, z_stop, self.kwargs_lens,
+                                                                           include_z_start=include_z_start)
+                npt.assert_almost_equal(x, x_ref, decimal=8)
+                npt.assert_almost_equal(y, y_ref, decimal=8)
+                npt.assert_almost_equal(alpha_x_out / alpha_x_ref, 1, decimal=8)
+                npt.assert_almost_equal(alpha_y_out / alpha_y_ref, 1, decimal=8)
+
+    def test_ray_shooting(self):
+        beta_x, beta_y = self.lens_model.ray_shooting(self.x, self.y, self.kwargs_lens)
+        beta_x_fused, beta_y_fused = self.lens_model_fused.ray_shooting(self.x, self.y, self.kwargs_lens)
+        npt.assert_almost_equal(beta_x_fused, beta_x, decimal=10)
+        npt.assert_almost_equal(beta_y_fused, beta_y, decimal=10)
+        beta_x_fused, beta_y_fused = self.lens_model_fused.ray_shooting(1., 0.5, self.kwargs_lens)
+        beta_x, beta_y = self.lens_model.ray_shooting(1., 0.5, self.kwargs_lens)
+        npt.assert_almost_equal(beta_x_fused, beta_x, decimal=10)
+        assert np.shape(beta_x_fused) == ()
+        f_xx, f_xy, f_yx, f_yy = self.lens_model.hessian(self.x, self.y, self.kwargs_lens)
+        f_xx_fused, f_xy_fused, f_yx_fused, f_yy_fused = self.lens_model_fused.hessian(self.x, self.y,
+                                                                                       self.kwargs_lens)
+        npt.assert_almost_equal(f_xx_fused, f_xx, decimal=6)
+        npt.assert_almost_equal(f_xy_fused, f_xy, decimal=6)
+
+    def test_distance_cache(self):
+        multi_plane_base = MultiPlaneBase(['SIS', 'SIS'], [0.5, 0.5], z_source_convention=2)
+        T_xy = multi_plane_base._T_xy(0.5, 1.)
+        npt.assert_almost_equal(T_xy, multi_plane_base._cosmo_bkg.T_xy(0.5, 1.), decimal=10)
+        assert (0.5, 1.) in multi_plane_base._T_xy_cache
+        dt = multi_plane_base._lensing_potential2time_delay(1., 0.5, 2.)
+        assert (0.5, 2.) in multi_plane_base._D_dt_cache
+        npt.assert_almost_equal(multi_plane_base._lensing_potential2time_delay(1., 0.5, 2.), dt, decimal=10)
+
+
+class TestRaise(unittest.TestCase):
+
+    def test_raise(self):
+        with self.assertRaises(ValueError):
+            LensModel(['SIE', 'NFW'], z_source=2, lens_redshift_list=[0.5, 0.5], multi_plane=True, fused_kernel=True,
+                      tree_index=[1])
+
+
+if __name__ == '__main__':
+    pytest.main()
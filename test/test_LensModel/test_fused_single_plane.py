@@ -0,0 +1,129 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import unittest
+from lenstronomy.LensModel.single_plane import SinglePlane
+from lenstronomy.LensModel.lens_model import LensModel
+from lenstronomy.LensModel.fused_single_plane import FusedSinglePlane
+from lenstronomy.LightModel.light_model import LightModel
+import lenstronomy.Util.util as util
+
+
+class TestFusedSinglePlane(object):
+
+    def setup(self):
+        self.lens_model_list = ['SIE', 'NIE', 'SHEAR', 'NFW', 'EPL']
+        self.kwargs_lens = [{'theta_E': 1., 'e1': 0.1, 'e2': -0.05, 'center_x': 0.02, 'center_y': -0.01},
+                            {'theta_E': 0.2, 'e1': -0.1, 'e2': 0.2, 's_scale': 0.05, 'center_x': 0.5,
+                             'center_y': 0.3},
+                            {'gamma1': 0.03, 'gamma2': -0.02, 'ra_0': 0.1, 'dec_0': 0},
+                            {'Rs': 2., 'alpha_Rs': 0.3, 'center_x': -0.3, 'center_y': 0.1},
+                            {'theta_E': 0.3, 'gamma': 2.2, 'e1': 0.2, 'e2': 0.1, 'center_x': 0.2, 'center_y': -0.4}]
+        self.single_plane = SinglePlane(self.lens_model_list)
+        self.single_plane_fused = SinglePlane(self.lens_model_list, fused_kernel=True)
+        self.x, self.y = util.make_grid(numPix=31, deltapix=0.1)
+
+        n_max = 4
+        num_param = int((n_max + 1) * (n_max + 2) / 2)
+        np.random.seed(42)
+        self.light_model = LightModel(['SERSIC_ELLIPSE', 'SHAPELETS'])
+        self.kwargs_light = [{'amp': 10., 'R_sersic': 0.3, 'n_sersic': 3., 'e1': 0.1, 'e2': 0.05, 'center_x': 0.05,
+                              'center_y': 0},
+                             {'amp': np.random.normal(size=num_param), 'n_max': n_max, 'beta': 0.2, 'center_x': 0,
+                              'center_y': 0.05}]
+
+    def test_alpha(self):
+        f_x, f_y = self.single_plane.alpha(self.x, self.y, self.kwargs_lens)
+        f_x_fused, f_y_fused = self.single_plane_fused.alpha(self.x, self.y, self.kwargs_lens)
+        npt.assert_almost_equal(f_x_fused, f_x, decimal=10)
+        npt.assert_almost_equal(f_y_fused, f_y, decimal=10)
+
+        # individual profiles are evaluated with the standard path
+        f_x, f_y = self.single_plane.alpha(self.x, self.y, self.kwargs_lens, k=3)
+        f_x_fused, f_y_fused = self.single_plane_fused.alpha(self.x, self.y, self.kwargs_lens, k=3)
+        npt.assert_almost_equal(f_x_fused, f_x, decimal=10)
+
+        # shape of the input is preserved
+        f_x, f_y = self.single_plane_fused.alpha(1., 0.5, self.kwargs_lens)
+        f_x_true, f_y_true = self.single_plane.alpha(1., 0.5, self.kwargs_lens)
+        assert np.shape(f_x) == ()
+        npt.assert_almost_equal(f_x, f_x_true, decimal=10)
+        npt.assert_almost_equal(f_y, f_y_true, decimal=10)
+
+        x_image, y_image = util.array2image(self.x), util.array2image(self.y)
+        f_x, f_y = self.single_plane_fused.alpha(x_image, y_image, self.kwargs_lens)
+        assert f_x.shape == x_image.shape
+
+    def test_ray_shooting(self):
+        beta_x, beta_y = self.single_plane.ray_shooting(self.x, self.y, self.kwargs_lens)
+        beta_x_fused, beta_y_fused = self.single_plane_fused.ray_shooting(self.x, self.y, self.kwargs_lens)
+        npt.assert_almost_equal(beta_x_fused, beta_x, decimal=10)
+        npt.assert_almost_equal(beta_y_fused, beta_y, decimal=10)
+
+    def test_spemd(self):
+        lens_model_list = ['SPEMD', 'SHEAR']
+        kwargs_lens = [self.kwargs_lens[4], self.kwargs_lens[2]]
+        single_plane = SinglePlane(lens_model_list)
+        single_plane_fused = SinglePlane(lens_model_list, fused_kernel=True)
+        # SPEMD is evaluated with the EPL kernel, the FASTELL backend of SPEMD agrees to its numerical precision
+        decimal = 10 if single_plane.func_list[0].backend == 'EPL' else 4
+        f_x, f_y = single_plane.alpha(self.x, self.y, kwargs_lens)
+        f_x_fused, f_y_fused = single_plane_fused.alpha(self.x, self.y, kwargs_lens)
+        npt.assert_almost_equal(f_x_fused, f_x, decimal=decimal)
+        npt.assert_almost_equal(f_y_fused, f_y, decimal=decimal)
+        flux = single_plane.ray_shooting_surface_brightness(self.x, self.y, kwargs_lens, self.light_model,
+                                                            self.kwargs_light)
+        flux_fused = single_plane_fused.ray_shooting_surface_brightness(self.x, self.y, kwargs_lens,
+                                                                        self.light_model, self.kwargs_light)
+        npt.assert_almost_equal(flux_fused / np.max(np.abs(flux)), flux / np.max(np.abs(flux)), decimal=decimal)
+
+    def test_ray_shooting_surface_brightness(self):
+        flux = self.single_plane.ray_shooting_surface_brightness(self.x, self.y, self.kwargs_lens, self.light_model,
+                                                                 self.kwargs_light)
+        flux_fused = self.single_plane_fused.ray_shooting_surface_brightness(self.x, self.y, self.kwargs_lens,
+                                                                             self.light_model, self.kwargs_light)
+        npt.assert_almost_equal(flux_fused / np.max(np.abs(flux)), flux / np.max(np.abs(flux)), decimal=10)
+
+        # unsupported light models fall back to the standard path
+        light_model = LightModel(['GAUSSIAN', 'SERSIC_ELLIPSE'])
+        kwargs_light = [{'amp': 1, 'sigma': 0.2}, self.kwargs_light[0]]
+        flux = self.single_plane.ray_shooting_surface_brightness(self.x, self.y, self.kwargs_lens, light_model,
+                                                                 kwargs_light)
+        flux_fused = self.single_plane_fused.ray_shooting_surface_brightness(self.x, self.y, self.kwargs_lens,
+                                                                             light_model, kwargs_light)
+        npt.assert_almost_equal(flux_fused, flux, decimal=8)
+
+    def test_image_model(self):
+        from lenstronomy.Data.imaging_data import ImageData
+        from lenstronomy.Data.psf import PSF
+        from lenstronomy.ImSim.image_model import ImageModel
+        kwargs_data = {'image_data': np.zeros((31, 31)), 'transform_pix2angle': np.diag([0.1, 0.1]),
+                       'ra_at_xy_0': -1.5, 'dec_at_xy_0': -1.5}
+        data_class = ImageData(**kwargs_data)
+        psf_class = PSF(psf_type='GAUSSIAN', fwhm=0.2)
+        kwargs_numerics = {'supersampling_factor': 2}
+        image_model = ImageModel(data_class, psf_class, lens_model_class=LensModel(self.lens_model_list),
+                                 source_model_class=self.light_model, kwargs_numerics=kwargs_numerics)
+        image_model_fused = ImageModel(data_class, psf_class,
+                                       lens_model_class=LensModel(self.lens_model_list, fused_kernel=True),
+                                       source_model_class=self.light_model, kwargs_numerics=kwargs_numerics)
+        image = image_model.image(self.kwargs_lens, self.kwargs_light)
+        image_fused = image_model_fused.image(self.kwargs_lens, self.kwargs_light)
+        npt.assert_almost_equal(image_fused / np.max(image), image / np.max(image), decimal=8)
+
+
+class TestRaise(unittest.TestCase):
+
+    def test_raise(self):
+        with self.assertRaises(ValueError):
+            FusedSinglePlane(['SIS'])
+        with self.assertRaises(ValueError):
+            FusedSinglePlane(['CNFW'])
+        with self.assertRaises(ValueError):
+            SinglePlane(['SPEP', 'SHEAR'], fused_kernel=True)
+        with self.assertRaises(ValueError):
+            LensModel(['SIS'], z_source=2, lens_redshift_list=[0.5], multi_plane=True, fused_kernel=True)
+
+
+if __name__ == '__main__':
+    pytest.main()
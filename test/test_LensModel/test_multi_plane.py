@@ -161,6 +161,24 @@ class TestMultiPlane(object):
         npt.assert_almost_equal(beta_x, beta_x_single, decimal=8)
         npt.assert_almost_equal(beta_y, beta_y_single, decimal=8)
 
+    def test_cosmo_interp(self):
+        z_source = 1.5
+        lens_model_list = ['SIS', 'SIS', 'SIS']
+        redshift_list = [0.5, 0.2, 0.9]
+        kwargs_lens = [{'theta_E': 1., 'center_x': 0, 'center_y': 0}, {'theta_E': 0.1, 'center_x': 0.5, 'center_y': 0},
+                       {'theta_E': 0.2, 'center_x': -0.5, 'center_y': 0.2}]
+        lensModel = LensModel(lens_model_list, z_source=z_source, lens_redshift_list=redshift_list, multi_plane=True)
+        lensModel_interp = LensModel(lens_model_list, z_source=z_source, lens_redshift_list=redshift_list,
+                                     multi_plane=True, cosmo_interp=True)
+        x, y = np.array([1., 0.3]), np.array([2., -0.5])
+        beta_x, beta_y = lensModel.ray_shooting(x, y, kwargs_lens)
+        beta_x_interp, beta_y_interp = lensModel_interp.ray_shooting(x, y, kwargs_lens)
+        npt.assert_almost_equal(beta_x_interp, beta_x, decimal=6)
+        npt.assert_almost_equal(beta_y_interp, beta_y, decimal=6)
+        dt = lensModel.arrival_time(x, y, kwargs_lens)
+        dt_interp = lensModel_interp.arrival_time(x, y, kwargs_lens)
+        npt.assert_almost_equal(dt_interp / dt, 1, decimal=6)
+
     def test_random_ordering(self):
         z_source = 1.5
         lens_model_list = ['SIS', 'SIS', 'SIS']
@@ -0,0 +1,117 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import unittest
+from lenstronomy.LensModel.tree_deflection import TreeDeflection
+from lenstronomy.LensModel.single_plane import SinglePlane
+from lenstronomy.LensModel.lens_model import LensModel
+import lenstronomy.Util.util as util
+
+
+class TestTreeDeflection(object):
+
+    def setup(self):
+        np.random.seed(42)
+        self.num_halos = 200
+        self.x, self.y = util.make_grid(numPix=50, deltapix=0.1)
+        center_x = np.random.uniform(-2.5, 2.5, self.num_halos)
+        center_y = np.random.uniform(-2.5, 2.5, self.num_halos)
+        self.kwargs_tnfw = [{'Rs': 0.05, 'alpha_Rs': 0.005, 'r_trunc': 0.3, 'center_x': center_x[i],
+                             'center_y': center_y[i]} for i in range(self.num_halos)]
+        self.kwargs_nfw = [{'Rs': 0.05, 'alpha_Rs': 0.005, 'center_x': center_x[i], 'center_y': center_y[i]}
+                           for i in range(self.num_halos)]
+        self.kwargs_point_mass = [{'theta_E': 0.01, 'center_x': center_x[i], 'center_y': center_y[i]}
+                                  for i in range(self.num_halos)]
+
+    def test_derivatives(self):
+        for lens_type, kwargs_list, decimal in [('POINT_MASS', self.kwargs_point_mass, 3),
+                                                ('TNFW', self.kwargs_tnfw, 2), ('NFW', self.kwargs_nfw, 2)]:
+            lens_model_list = [lens_type] * self.num_halos
+            single_plane = SinglePlane(lens_model_list)
+            f_x, f_y = single_plane.alpha(self.x, self.y, kwargs_list)
+            tree = TreeDeflection(lens_model_list, single_plane.func_list)
+            f_x_tree, f_y_tree = tree.derivatives(self.x, self.y, kwargs_list)
+            norm = np.max(np.abs(f_x))
+            npt.assert_almost_equal(f_x_tree / norm, f_x / norm, decimal=decimal)
+            npt.assert_almost_equal(f_y_tree / norm, f_y / norm, decimal=decimal)
+
+    def test_opening_angle(self):
+        lens_model_list = ['TNFW'] * self.num_halos
+        single_plane = SinglePlane(lens_model_list)
+        f_x, f_y = single_plane.alpha(self.x, self.y, self.kwargs_tnfw)
+        error_list = []
+        for opening_angle in [0.7, 0.5, 0.3]:
+            tree = TreeDeflection(lens_model_list, single_plane.func_list, opening_angle=opening_angle)
+            f_x_tree, f_y_tree = tree.derivatives(self.x, self.y, self.kwargs_tnfw)
+            error_list.append(np.max(np.abs(f_x_tree - f_x)))
+        assert error_list[2] < error_list[1] < error_list[0]
+
+        # without aggregation of several deflectors, only the interpolation of the enclosed masses remains
+        tree = TreeDeflection(lens_model_list, single_plane.func_list, opening_angle=0.000001, leaf_size=1,
+                              tolerance=0.00001)
+        f_x_tree, f_y_tree = tree.derivatives(self.x, self.y, self.kwargs_tnfw)
+        npt.assert_almost_equal(f_x_tree / np.max(np.abs(f_x)), f_x / np.max(np.abs(f_x)), decimal=5)
+
+    def test_update(self):
+        lens_model_list = ['POINT_MASS'] * self.num_halos
+        single_plane = SinglePlane(lens_model_list)
+        tree = TreeDeflection(lens_model_list, single_plane.func_list)
+        tree.derivatives(self.x, self.y, self.kwargs_point_mass)
+        moments = tree._moments
+        tree.derivatives(self.x / 2, self.y / 2, self.kwargs_point_mass)
+        assert tree._moments is moments
+        kwargs_list = [dict(kwargs, theta_E=0.02) for kwargs in self.kwargs_point_mass]
+        f_x_tree, f_y_tree = tree.derivatives(self.x, self.y, kwargs_list)
+        assert tree._moments is not moments
+        f_x, f_y = single_plane.alpha(self.x, self.y, kwargs_list)
+        norm = np.max(np.abs(f_x))
+        npt.assert_almost_equal(f_x_tree / norm, f_x / norm, decimal=3)
+
+        # shape of the input is preserved
+        f_x_tree, f_y_tree = tree.derivatives(1., 1., kwargs_list)
+        assert np.shape(f_x_tree) == ()
+        x_image, y_image = util.array2image(self.x), util.array2image(self.y)
+        f_x_tree, f_y_tree = tree.derivatives(x_image, y_image, kwargs_list)
+        assert f_x_tree.shape == x_image.shape
+
+    def test_lens_model(self):
+        lens_model_list = ['SIE', 'SHEAR'] + ['TNFW'] * self.num_halos
+        kwargs_lens = [{'theta_E': 1., 'e1': 0.1, 'e2': 0, 'center_x': 0, 'center_y': 0},
+                       {'gamma1': 0.02, 'gamma2': 0.01}] + self.kwargs_tnfw
+        tree_index = list(range(2, self.num_halos + 2))
+        lens_model = LensModel(lens_model_list)
+        lens_model_tree = LensModel(lens_model_list, tree_index=tree_index, kwargs_tree={'opening_angle': 0.3})
+        beta_x, beta_y = lens_model.ray_shooting(self.x, self.y, kwargs_lens)
+        beta_x_tree, beta_y_tree = lens_model_tree.ray_shooting(self.x, self.y, kwargs_lens)
+        npt.assert_almost_equal(beta_x_tree, beta_x, decimal=4)
+        npt.assert_almost_equal(beta_y_tree, beta_y, decimal=4)
+        # individual lens models are evaluated directly
+        f_x, f_y = lens_model.alpha(self.x, self.y, kwargs_lens, k=5)
+        f_x_tree, f_y_tree = lens_model_tree.alpha(self.x, self.y, kwargs_lens, k=5)
+        npt.assert_almost_equal(f_x_tree, f_x, decimal=10)
+
+        # in multi-plane mode, the sub-halos are aggregated per lens plane
+        lens_redshift_list = [0.5, 0.5] + [0.3, 0.5, 0.7] * int(self.num_halos / 3) + [0.5] * (self.num_halos % 3)
+        lens_model = LensModel(lens_model_list, z_source=2, lens_redshift_list=lens_redshift_list, multi_plane=True)
+        lens_model_tree = LensModel(lens_model_list, z_source=2, lens_redshift_list=lens_redshift_list,
+                                    multi_plane=True, tree_index=tree_index, kwargs_tree={'opening_angle': 0.3})
+        assert len(lens_model_tree.lens_model._multi_plane_base._trees) == 3
+        beta_x, beta_y = lens_model.ray_shooting(self.x, self.y, kwargs_lens)
+        beta_x_tree, beta_y_tree = lens_model_tree.ray_shooting(self.x, self.y, kwargs_lens)
+        npt.assert_almost_equal(beta_x_tree, beta_x, decimal=4)
+        npt.assert_almost_equal(beta_y_tree, beta_y, decimal=4)
+
+
+class TestRaise(unittest.TestCase):
+
+    def test_raise(self):
+        with self.assertRaises(ValueError):
+            TreeDeflection(['SIE'], [None])
+        with self.assertRaises(ValueError):
+            TreeDeflection(['NFW'], [None], opening_angle=1)
+        with self.assertRaises(ValueError):
+            SinglePlane(['SIE', 'NFW'], fused_kernel=True, tree_index=[1])
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -68,6 +68,22 @@ class TestPointSource(object):
         self.PointSource.set_save_cache(False)
         assert self.PointSource._point_source_list[0]._save_cache == False
 
+    def test_lens_model_cache(self):
+        self.PointSource.set_save_cache(True)
+        x_image_list, y_image_list = self.PointSource.image_position(kwargs_ps=self.kwargs_ps,
+                                                                     kwargs_lens=self.kwargs_lens)
+        cache = self.PointSource.lens_model_cache()
+        assert len(cache) == 3
+        # the saved positions are used instead of solving for the images of a different source position
+        self.PointSource.delete_lens_model_cache()
+        assert self.PointSource.lens_model_cache()[2] == {}
+        self.PointSource.set_lens_model_cache(cache)
+        kwargs_ps = [self.kwargs_ps[0], self.kwargs_ps[1], dict(self.kwargs_ps[2], ra_source=0.2)]
+        x_image_cache, y_image_cache = self.PointSource.image_position(kwargs_ps=kwargs_ps, kwargs_lens=self.kwargs_lens)
+        npt.assert_almost_equal(x_image_cache[2], x_image_list[2], decimal=10)
+        npt.assert_almost_equal(y_image_cache[2], y_image_list[2], decimal=10)
+        self.PointSource.set_save_cache(False)
+
     def test_update_lens_model(self):
         lensModel = LensModel(lens_model_list=['SIS'])
         self.PointSource.update_lens_model(lens_model_class=lensModel)
@@ -76,6 +92,48 @@ class TestPointSource(object):
                                                                      kwargs_lens=kwargs_lens)
         npt.assert_almost_equal(x_image_list[0][-1], -0.82654997748011705 , decimal=8)
 
+    def test_warm_start(self):
+        lensModel = LensModel(lens_model_list=['SPEP'])
+        point_source = PointSource(point_source_type_list=['SOURCE_POSITION'], lensModel=lensModel,
+                                   fixed_magnification_list=[True], warm_start=True)
+        point_source_cold = PointSource(point_source_type_list=['SOURCE_POSITION'], lensModel=lensModel,
+                                        fixed_magnification_list=[True])
+        kwargs_ps = [{'ra_source': self.sourcePos_x, 'dec_source': self.sourcePos_y, 'source_amp': 1}]
+        for theta_E in [1., 1.01, 0.99]:
+            kwargs_lens = [dict(self.kwargs_lens[0], theta_E=theta_E)]
+            x_image_list, y_image_list = point_source.image_position(kwargs_ps, kwargs_lens)
+            x_image_cold, y_image_cold = point_source_cold.image_position(kwargs_ps, kwargs_lens)
+            assert len(x_image_list[0]) == len(x_image_cold[0])
+            npt.assert_almost_equal(x_image_list[0], x_image_cold[0], decimal=8)
+            npt.assert_almost_equal(y_image_list[0], y_image_cold[0], decimal=8)
+        cache = point_source._point_source_list[0]._model._warm_start_cache
+        npt.assert_almost_equal(cache['x_image'], x_image_list[0], decimal=8)
+
+        # the full solver is used when the number of images changes
+        kwargs_ps_double = [{'ra_source': 0.8, 'dec_source': 0.2, 'source_amp': 1}]
+        x_image_list, y_image_list = point_source.image_position(kwargs_ps_double, kwargs_lens)
+        x_image_cold, y_image_cold = point_source_cold.image_position(kwargs_ps_double, kwargs_lens)
+        assert len(x_image_list[0]) == len(x_image_cold[0]) == 2
+        npt.assert_almost_equal(x_image_list[0], x_image_cold[0], decimal=8)
+
+        # new images appearing from a double to a quad are found
+        lensModel = LensModel(lens_model_list=['SIE', 'SHEAR'])
+        kwargs_lens = [{'theta_E': 1., 'e1': 0.3, 'e2': 0., 'center_x': 0, 'center_y': 0},
+                       {'gamma1': 0.05, 'gamma2': 0.}]
+        point_source.update_lens_model(lens_model_class=lensModel)
+        point_source_cold.update_lens_model(lens_model_class=lensModel)
+        for ra_source, num_images in [(0.8, 2), (0.01, 4)]:
+            kwargs_ps = [{'ra_source': ra_source, 'dec_source': 0.02, 'source_amp': 1}]
+            x_image_list, y_image_list = point_source.image_position(kwargs_ps, kwargs_lens)
+            x_image_cold, y_image_cold = point_source_cold.image_position(kwargs_ps, kwargs_lens)
+            assert len(x_image_list[0]) == len(x_image_cold[0]) == num_images
+            npt.assert_almost_equal(x_image_list[0], x_image_cold[0], decimal=8)
+            npt.assert_almost_equal(y_image_list[0], y_image_cold[0], decimal=8)
+
+        # the cache is reset with a new lens model
+        point_source.update_lens_model(lens_model_class=LensModel(lens_model_list=['SIS']))
+        assert point_source._point_source_list[0]._model._warm_start_cache == {}
+
     def test_set_amplitudes(self):
         amp_list = [np.ones_like(self.x_pos)*10, [100], np.ones_like(self.x_pos)*10]
         kwargs_out = self.PointSource.set_amplitudes(amp_list, self.kwargs_ps)
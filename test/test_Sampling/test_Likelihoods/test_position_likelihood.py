@@ -1,5 +1,6 @@
 import pytest
 import numpy.testing as npt
+import numpy as np
 import copy
 from lenstronomy.Sampling.Likelihoods.position_likelihood import PositionLikelihood
 from lenstronomy.PointSource.point_source import PointSource
@@ -49,6 +50,17 @@ class TestPositionLikelihood(object):
         logL = self.likelihood.astrometric_likelihood(kwargs_ps, {}, sigma=0.01)
         npt.assert_almost_equal(logL, 0, decimal=8)
 
+    def test_logL_astrometric_batch(self):
+        kwargs_ps = [{'ra_image': self._x_pos, 'dec_image': self._y_pos}]
+        delta_x = np.array([[0, 0, 0, 0.], [0, 0, 0, 0.005]]).T
+        kwargs_special = {'delta_x_image': delta_x, 'delta_y_image': np.zeros_like(delta_x)}
+        logL = self.likelihood.logL_astrometric_batch(kwargs_ps, kwargs_special)
+        for j in range(2):
+            kwargs_special_j = {'delta_x_image': delta_x[:, j], 'delta_y_image': np.zeros(4)}
+            npt.assert_almost_equal(logL[j], self.likelihood.logL_astrometric(kwargs_ps, kwargs_special_j), decimal=8)
+        npt.assert_almost_equal(logL, [0, -0.5], decimal=8)
+        assert self.likelihood.logL_astrometric_batch(kwargs_ps, {}) == 0
+
     def test_check_additional_images(self):
         point_source_class = PointSource(point_source_type_list=['LENSED_POSITION'], additional_images_list=[True],
                                          lensModel=LensModel(lens_model_list=['SIE']))
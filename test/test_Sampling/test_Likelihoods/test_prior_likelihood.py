@@ -43,6 +43,33 @@ class TestImageLikelihood(object):
                                kwargs_special=kwargs_cosmo)
         npt.assert_almost_equal(logL, -3.7732255247006443, decimal=8)
 
+    def test_logL_batch(self):
+        kwargs_lens = [{'gamma': np.array([2., 2.1, 1.8])}]
+        kwargs_cosmo = {'source_size': np.array([1., 1.1, 1.])}
+        for prior in [self.prior, self.prior_lognormal]:
+            logL = prior.logL_batch(kwargs_lens=kwargs_lens, kwargs_source=[], kwargs_lens_light=[], kwargs_ps=[],
+                                    kwargs_special=kwargs_cosmo)
+            assert len(logL) == 3
+            for j in range(3):
+                logL_j = prior.logL(kwargs_lens=[{'gamma': kwargs_lens[0]['gamma'][j]}], kwargs_source=[],
+                                    kwargs_lens_light=[], kwargs_ps=[],
+                                    kwargs_special={'source_size': kwargs_cosmo['source_size'][j]})
+                npt.assert_almost_equal(logL[j], logL_j, decimal=8)
+
+        # prior on a list of parameters, the samples are along the last axis
+        prior = PriorLikelihood(prior_ps=[[0, 'ra_image', [1, 2], 0.1]])
+        ra_image = np.array([[1, 1.1], [2, 2]])
+        logL = prior.logL_batch(kwargs_ps=[{'ra_image': ra_image}])
+        npt.assert_almost_equal(logL, [0, -0.5], decimal=8)
+
+        # prior values and widths per image
+        prior = PriorLikelihood(prior_ps=[[0, 'ra_image', np.array([1., 2.]), np.array([.1, .2])]])
+        ra_image = np.array([[1, 1.1, 1.2], [2, 2.2, 2.]])
+        logL = prior.logL_batch(kwargs_ps=[{'ra_image': ra_image}])
+        for j in range(3):
+            npt.assert_almost_equal(logL[j], prior.logL(kwargs_ps=[{'ra_image': ra_image[:, j]}]), decimal=8)
+        npt.assert_almost_equal(logL, [0, -1, -2], decimal=8)
+
     def gauss(self, x, mean, simga):
         return np.exp(-((x-mean)/(simga))**2/2) / np.sqrt(2*np.pi) / simga
 
@@ -65,6 +65,24 @@ class TestImageLikelihood(object):
         logL = td_likelihood.logL(kwargs_lens=kwargs_lens, kwargs_ps=kwargs_ps, kwargs_cosmo=kwargs_cosmo)
         npt.assert_almost_equal(logL, -0.5, decimal=8)
 
+        # vectorized evaluation for a set of time-delay distances
+        fermat_pot = lensModel.fermat_potential(x_img, y_img, kwargs_lens)
+        D_dt = lensCosmo.D_dt * np.array([0.9, 1., 1.1])
+        logL_array = td_likelihood.logL_D_dt(D_dt, fermat_pot)
+        assert logL_array.shape == (3,)
+        for i in range(3):
+            logL = td_likelihood.logL(kwargs_lens=kwargs_lens, kwargs_ps=kwargs_ps, kwargs_cosmo={'D_dt': D_dt[i]})
+            npt.assert_almost_equal(logL_array[i], logL, decimal=6)
+        logL_array = td_likelihood.logL_D_dt(D_dt, np.array([fermat_pot] * 3))
+        npt.assert_almost_equal(logL_array[1], -0.5, decimal=6)
+        npt.assert_almost_equal(td_likelihood.logL_D_dt(lensCosmo.D_dt, fermat_pot), -0.5, decimal=6)
+
+        # batch of samples
+        logL_array = td_likelihood.logL_batch([fermat_pot] * 3, D_dt)
+        for i in range(3):
+            npt.assert_almost_equal(logL_array[i], td_likelihood.logL_fermat(fermat_pot, D_dt[i]), decimal=6)
+        npt.assert_almost_equal(logL_array[1], -0.5, decimal=6)
+
 
 if __name__ == '__main__':
     pytest.main()
@@ -121,6 +121,19 @@ class TestDynestySampler(object):
         samples, means, logZ, logZ_err, logL, results = self.sampler.run(kwargs_run)
         assert len(means) == 1
 
+    def test_pool(self):
+        import pickle
+        prior_means = self.param_class.kwargs2args(kwargs_lens=self.kwargs_lens, kwargs_source=self.kwargs_source,
+                                                   kwargs_lens_light=self.kwargs_lens_light)
+        sampler = DynestySampler(self.Likelihood, prior_type='uniform', prior_means=prior_means,
+                                 prior_sigmas=np.ones_like(prior_means) * 0.1, sigma_scale=0.5, thread_count=2)
+        # the tasks sent to the pool only contain a reference to the likelihood module of the workers
+        assert len(pickle.dumps(sampler.log_likelihood)) < 2000
+        args_list = [sampler.prior(np.ones(sampler.n_dims) * u) for u in [0.3, 0.5]]
+        logL = sampler._pool.map(sampler.log_likelihood, args_list)
+        npt.assert_almost_equal(logL, [self.sampler.log_likelihood(args) for args in args_list], decimal=8)
+        sampler._pool.close()
+
     def test_sampler_init(self):
         try:
             sampler = DynestySampler(self.Likelihood, prior_type='gaussian',
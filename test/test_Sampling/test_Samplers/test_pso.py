@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from lenstronomy.Sampling.Samplers.pso import ParticleSwarmOptimizer
+
+
+def _log_likelihood(x):
+    return -np.sum((x - np.array([0.5, -0.2])) ** 2 / 0.01)
+
+
+def _log_likelihood_batch(x):
+    return -np.sum((x - np.array([0.5, -0.2])) ** 2 / 0.01, axis=1)
+
+
+class SerialPool(object):
+
+    def __init__(self):
+        self.num_calls = 0
+
+    def map(self, func, sequence):
+        self.num_calls += 1
+        return [func(x) for x in sequence]
+
+
+class TestParticleSwarmOptimizer(object):
+
+    def setup(self):
+        self.low, self.high = [-1, -1], [1, 1]
+        self._path = tempfile.mkdtemp()
+
+    def teardown(self):
+        shutil.rmtree(self._path, ignore_errors=True)
+
+    def test_optimize(self):
+        np.random.seed(42)
+        pso = ParticleSwarmOptimizer(_log_likelihood, self.low, self.high, particle_count=20)
+        position, fitness = pso.optimize(max_iter=200)
+        npt.assert_almost_equal(position, [0.5, -0.2], decimal=3)
+        npt.assert_almost_equal(fitness, 0, decimal=3)
+        assert pso.iteration <= 200
+
+    def test_map(self):
+        results = []
+        for kwargs in [{}, {'pool': SerialPool()}]:
+            np.random.seed(42)
+            pso = ParticleSwarmOptimizer(_log_likelihood, self.low, self.high, particle_count=10, **kwargs)
+            results.append(pso.optimize(max_iter=20))
+        np.random.seed(42)
+        pso = ParticleSwarmOptimizer(_log_likelihood_batch, self.low, self.high, particle_count=10, vectorized=True)
+        results.append(pso.optimize(max_iter=20))
+        for position, fitness in results[1:]:
+            npt.assert_almost_equal(position, results[0][0], decimal=10)
+            npt.assert_almost_equal(fitness, results[0][1], decimal=10)
+        pool = SerialPool()
+        pso = ParticleSwarmOptimizer(_log_likelihood, self.low, self.high, particle_count=10, pool=pool)
+        for swarm in pso.sample(max_iter=5, m=0):
+            pass
+        assert pool.num_calls == 6
+
+    def test_non_finite(self):
+        def log_likelihood(x):
+            if x[0] < 0:
+                return np.nan
+            return _log_likelihood(x)
+        np.random.seed(42)
+        pso = ParticleSwarmOptimizer(log_likelihood, self.low, self.high, particle_count=20)
+        position, fitness = pso.optimize(max_iter=100)
+        assert np.all(np.isfinite(pso.pbest_fitness) | (pso.pbest_fitness == -np.inf))
+        npt.assert_almost_equal(position, [0.5, -0.2], decimal=2)
+
+    def test_global_best(self):
+        pso = ParticleSwarmOptimizer(_log_likelihood, self.low, self.high, particle_count=5)
+        pso.set_global_best([0.5, -0.2], [0, 0], 0)
+        position, fitness = pso.optimize(max_iter=3)
+        npt.assert_almost_equal(position, [0.5, -0.2], decimal=10)
+        assert fitness == 0
+
+    def test_stagnation(self):
+        np.random.seed(42)
+        pso = ParticleSwarmOptimizer(_log_likelihood, self.low, self.high, particle_count=10)
+        pso.optimize(max_iter=1000, m=0, stagnation_iter=5, stagnation_tolerance=0.1)
+        assert pso.iteration < 1000
+        fitness_list = pso._gbest_fitness_list
+        assert len(fitness_list) == pso.iteration + 1
+        assert fitness_list[-1] - fitness_list[-6] <= 0.1
+
+    def test_checkpoint(self):
+        path = os.path.join(self._path, 'pso.npz')
+        np.random.seed(42)
+        pso = ParticleSwarmOptimizer(_log_likelihood, self.low, self.high, particle_count=10)
+        position, fitness = pso.optimize(max_iter=20, m=0)
+
+        # interrupted run, resumed from the last checkpoint
+        np.random.seed(42)
+        pso = ParticleSwarmOptimizer(_log_likelihood, self.low, self.high, particle_count=10)
+        for swarm in pso.sample(max_iter=20, m=0, checkpoint_path=path, checkpoint_interval=4):
+            if pso.iteration == 10:
+                break
+        np.random.seed(1)
+        pso_resume = ParticleSwarmOptimizer(_log_likelihood, self.low, self.high, particle_count=10)
+        pso_resume.load_state(path)
+        assert pso_resume.iteration == 8
+        position_resume, fitness_resume = pso_resume.optimize(max_iter=20, m=0, checkpoint_path=path)
+        assert pso_resume.iteration == 20
+        npt.assert_almost_equal(position_resume, position, decimal=10)
+        assert fitness_resume == fitness
+
+        # the final state is saved
+        pso_resume.load_state(path)
+        assert pso_resume.iteration == 20
+
+
+class TestRaise(unittest.TestCase):
+
+    def test_raise(self):
+        path = tempfile.mkdtemp()
+        try:
+            pso = ParticleSwarmOptimizer(_log_likelihood, [-1, -1], [1, 1], particle_count=5)
+            pso.save_state(os.path.join(path, 'pso.npz'))
+            pso = ParticleSwarmOptimizer(_log_likelihood, [-1, -1], [1, 1], particle_count=6)
+            with self.assertRaises(ValueError):
+                pso.load_state(os.path.join(path, 'pso.npz'))
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    pytest.main()
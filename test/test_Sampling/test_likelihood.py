@@ -11,6 +11,7 @@ from lenstronomy.Sampling.parameters import Param
 from lenstronomy.LightModel.light_model import LightModel
 from lenstronomy.Data.imaging_data import ImageData
 from lenstronomy.Data.psf import PSF
+from lenstronomy.LensModel.Solver.lens_equation_solver import LensEquationSolver
 
 
 class TestLikelihoodModule(object):
@@ -128,6 +129,62 @@ class TestLikelihoodModule(object):
         logL = likelihood.logL(args, verbose=True)
         npt.assert_almost_equal(logL, -3080.29, decimal=-1)
 
+    def test_logL_batch(self):
+        kwargs_likelihood = {'time_delay_likelihood': True, 'prior_lens': [[0, 'theta_E', 1, 0.1]],
+                             'prior_special': [['D_dt', 1000, 100]], 'astrometric_likelihood': True,
+                             'check_positive_flux': True}
+        likelihood = LikelihoodModule(kwargs_data_joint=self.kwargs_data, kwargs_model=self.kwargs_model,
+                                      param_class=self.param_class, **kwargs_likelihood)
+        args = self.param_class.kwargs2args(kwargs_lens=self.kwargs_lens, kwargs_source=self.kwargs_source,
+                                            kwargs_lens_light=self.kwargs_lens_light, kwargs_ps=self.kwargs_ps,
+                                            kwargs_special=self.kwargs_cosmo)
+        args_2d = np.array(args) + np.random.normal(size=(4, len(args))) * 0.001
+        # outside the bounds
+        args_2d[2, 0] = -1
+        logL = likelihood.logL_batch(args_2d)
+        assert logL[2] == -np.inf
+        for j in range(4):
+            npt.assert_almost_equal(logL[j], likelihood.logL(args_2d[j]), decimal=8)
+
+        likelihood = LikelihoodModule(kwargs_data_joint=self.kwargs_data, kwargs_model=self.kwargs_model,
+                                      param_class=self.param_class, check_bounds=False)
+        logL = likelihood.logL_batch(args_2d[:2])
+        npt.assert_almost_equal(logL, [likelihood.logL(args_2d[0]), likelihood.logL(args_2d[1])], decimal=8)
+
+        # the imaging likelihood of all the multi-band types
+        multi_band_list = self.kwargs_data['multi_band_list']
+        for multi_band_type in ['multi-linear', 'joint-linear', 'single-band']:
+            kwargs_data = dict(self.kwargs_data, multi_band_list=multi_band_list * 2, multi_band_type=multi_band_type)
+            likelihood = LikelihoodModule(kwargs_data_joint=kwargs_data, kwargs_model=self.kwargs_model,
+                                          param_class=self.param_class, source_marg=True)
+            logL = likelihood.logL_batch(args_2d[:2])
+            npt.assert_almost_equal(logL, [likelihood.logL(args_2d[0]), likelihood.logL(args_2d[1])], decimal=8)
+
+    def test_logL_batch_solver_calls(self, monkeypatch):
+        kwargs_likelihood = {'time_delay_likelihood': True, 'astrometric_likelihood': True,
+                             'image_position_likelihood': True, 'flux_ratio_likelihood': True}
+        likelihood = LikelihoodModule(kwargs_data_joint=self.kwargs_data, kwargs_model=self.kwargs_model,
+                                      param_class=self.param_class, **kwargs_likelihood)
+        args = self.param_class.kwargs2args(kwargs_lens=self.kwargs_lens, kwargs_source=self.kwargs_source,
+                                            kwargs_lens_light=self.kwargs_lens_light, kwargs_ps=self.kwargs_ps,
+                                            kwargs_special=self.kwargs_cosmo)
+        args_2d = np.array(args) + np.random.normal(size=(4, len(args))) * 0.001
+        calls = []
+        image_position_from_source = LensEquationSolver.image_position_from_source
+
+        def image_position_record(*args, **kwargs):
+            calls.append(1)
+            return image_position_from_source(*args, **kwargs)
+
+        monkeypatch.setattr(LensEquationSolver, 'image_position_from_source', image_position_record)
+        logL = [likelihood.logL(args) for args in args_2d]
+        num_calls = len(calls)
+        del calls[:]
+        npt.assert_almost_equal(likelihood.logL_batch(args_2d), logL, decimal=8)
+        # the image positions of each sample are solved once in the batch
+        assert len(calls) == len(args_2d)
+        assert len(calls) < num_calls
+
     #def test_solver(self):
         # make simulation with point source positions in image plane
     #    x_pos, y_pos = self.imageModel.PointSource.image_position(self.kwargs_ps, self.kwargs_lens)
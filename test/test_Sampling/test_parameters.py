@@ -220,6 +220,84 @@ class TestParam(object):
         kwargs_ps_out = kwargs_return['kwargs_ps']
         assert kwargs_lens_light_out[0]['center_x'] == kwargs_ps_out[0]['ra_image']
 
+    def test_index_map(self):
+        kwargs_model = {'lens_model_list': ['SPEP', 'SHEAR', 'MULTI_GAUSSIAN_KAPPA'],
+                        'source_light_model_list': ['SERSIC', 'SHAPELETS'],
+                        'lens_light_model_list': ['SERSIC'], 'point_source_model_list': ['LENSED_POSITION'],
+                        'optical_depth_model_list': ['UNIFORM']}
+        kwargs_fixed_lens = [{'gamma': 1.9}, {'ra_0': 0, 'dec_0': 0}, {'sigma': [0.5, 1, 2]}]
+        kwargs_fixed_source = [{'n_sersic': 2}, {'n_max': 2}]
+        param = Param(kwargs_model, kwargs_fixed_lens=kwargs_fixed_lens, kwargs_fixed_source=kwargs_fixed_source,
+                      kwargs_fixed_extinction=[{}], num_point_source_list=[4], Ddt_sampling=True, mass_scaling_list=[1, False, False],
+                      point_source_offset=True, source_size=True)
+        assert param._index_map is not None
+        num_param, _ = param.num_param()
+        args = list(np.random.normal(size=num_param))
+        for args_type in [list, np.array]:
+            kwargs_all = param._get_params(args_type(args))
+            kwargs_all_models = param._get_params_models(args_type(args))
+            for kwargs_list, kwargs_list_models in zip(kwargs_all, kwargs_all_models):
+                if isinstance(kwargs_list, dict):
+                    kwargs_list, kwargs_list_models = [kwargs_list], [kwargs_list_models]
+                for kwargs, kwargs_models in zip(kwargs_list, kwargs_list_models):
+                    assert list(kwargs.keys()) == list(kwargs_models.keys())
+                    for name in kwargs:
+                        assert type(kwargs[name]) == type(kwargs_models[name])
+                        npt.assert_almost_equal(kwargs[name], kwargs_models[name], decimal=10)
+        kwargs_return = param.args2kwargs(args)
+        assert kwargs_return['kwargs_lens'][1]['ra_0'] == 0
+        assert len(kwargs_return['kwargs_special']['delta_x_image']) == 4
+        npt.assert_almost_equal(param.kwargs2args(**param.args2kwargs(args, bijective=True)), args, decimal=10)
+
+        # parameters that are not plain arguments or slices of the arguments can not be compiled
+        assert Param._probe_index([0, 0, 2.5, 3.5], [0, 0, 2.25, 3.25]) is None
+        assert Param._probe_index([2.5, 3.5], [2.25, 3.25]) == slice(2, 4)
+        assert Param._probe_index(2.5, 2.25) == 2
+
+    def test_args2kwargs_batch(self):
+        kwargs_lens = [{'theta_E': 1, 'e1': 0.1, 'e2': 0.1, 'center_x': 0, 'center_y': 0}]
+        kwargs_lens_light = [{'amp': 1, 'n_sersic': 2, 'R_sersic': 0.3, 'e1': 0, 'e2': 0, 'center_x': 0.2,
+                              'center_y': 0.2}]
+        kwargs_source = [{'amp': 1}]
+        kwargs_ps = [{'point_amp': [2, 3]}]
+        args = self.param_class.kwargs2args(kwargs_lens=kwargs_lens, kwargs_source=kwargs_source,
+                                            kwargs_lens_light=kwargs_lens_light, kwargs_ps=kwargs_ps)
+        args_2d = np.array(args) + np.random.normal(size=(5, len(args))) * 0.01
+        kwargs_batch = self.param_class.args2kwargs_batch(args_2d)
+        assert np.shape(kwargs_batch['kwargs_lens'][0]['theta_E']) == (5,)
+        assert np.shape(kwargs_batch['kwargs_ps'][0]['point_amp']) == (2, 5)
+        # fixed parameters are broadcast to the batch
+        assert np.shape(kwargs_batch['kwargs_lens'][0]['gamma']) == (5,)
+        assert np.shape(kwargs_batch['kwargs_ps'][0]['ra_image']) == (2, 5)
+        self._assert_batch(self.param_class, args_2d, kwargs_batch)
+
+        # joint parameters requiring ray-shooting are mapped sample by sample
+        kwargs_model = {'lens_model_list': ['SIS'], 'source_light_model_list': ['SERSIC'],
+                        'point_source_model_list': ['LENSED_POSITION']}
+        param = Param(kwargs_model=kwargs_model, joint_source_with_point_source=[[0, 0]])
+        args = param.kwargs2args(kwargs_lens=[{'theta_E': 1, 'center_x': 0, 'center_y': 0}],
+                                 kwargs_source=[{'amp': 1, 'n_sersic': 2, 'R_sersic': 0.3}],
+                                 kwargs_ps=[{'ra_image': [0.5], 'dec_image': [0.5]}])
+        args_2d = np.array(args) + np.random.normal(size=(3, len(args))) * 0.01
+        kwargs_batch = param.args2kwargs_batch(args_2d)
+        assert np.shape(kwargs_batch['kwargs_source'][0]['center_x']) == (3,)
+        self._assert_batch(param, args_2d, kwargs_batch)
+
+        # samples that are already mapped are stacked without mapping them again
+        kwargs_list = [param.args2kwargs(args) for args in args_2d]
+        kwargs_list[1]['kwargs_lens'][0]['theta_E'] = 10.
+        kwargs_batch = param.args2kwargs_batch(args_2d, kwargs_list=kwargs_list)
+        assert kwargs_batch['kwargs_lens'][0]['theta_E'][1] == 10.
+
+    @staticmethod
+    def _assert_batch(param, args_2d, kwargs_batch):
+        for j, args in enumerate(args_2d):
+            kwargs_return = param.args2kwargs(args)
+            for key in ['kwargs_lens', 'kwargs_source', 'kwargs_lens_light', 'kwargs_ps']:
+                for kwargs, kwargs_columnar in zip(kwargs_return[key], kwargs_batch[key]):
+                    for name in kwargs:
+                        npt.assert_almost_equal(kwargs_columnar[name][..., j], kwargs[name], decimal=10)
+
     def test_with_solver(self):
         kwargs_model = {'lens_model_list': ['SPEP'], 'source_light_model_list': ['SERSIC'],
                         'point_source_model_list': ['LENSED_POSITION']}
@@ -0,0 +1,137 @@
+import pickle
+import unittest
+import pytest
+import numpy as np
+import numpy.testing as npt
+
+from lenstronomy.Sampling import pool as pool_module
+from lenstronomy.Sampling.pool import LikelihoodPool
+from lenstronomy.ImSim.Numerics.numba_convolution import NumbaConvolution
+from lenstronomy.Sampling.likelihood import LikelihoodModule
+from lenstronomy.Sampling.parameters import Param
+
+
+class QuadraticLikelihood(object):
+
+    def __init__(self, num_pix=100):
+        self.data = np.random.normal(size=(num_pix, num_pix))
+        self.data_small = np.ones(3)
+        self.data_copy = self.data
+
+    def logL(self, args):
+        return -np.sum((self.data - args[0]) ** 2) - np.sum(self.data_small * args[1] ** 2)
+
+    def data_writeable(self, args):
+        return self.data.flags.writeable
+
+    def same_data(self, args):
+        return self.data_copy is self.data
+
+
+class TestLikelihoodPool(object):
+
+    def setup(self):
+        np.random.seed(42)
+        self.likelihood = QuadraticLikelihood()
+        self.args_list = [np.random.normal(size=2) for i in range(10)]
+
+    def test_map(self):
+        log_likelihood = [self.likelihood.logL(args) for args in self.args_list]
+        with LikelihoodPool(self.likelihood, processes=2) as pool:
+            assert pool.size == 2
+            npt.assert_almost_equal(pool.map(pool.logL, self.args_list), log_likelihood, decimal=8)
+            # the functions can also be evaluated in the parent process
+            npt.assert_almost_equal(pool.logL(self.args_list[0]), log_likelihood[0], decimal=8)
+            # only a reference to the likelihood is sent with the tasks
+            assert len(pickle.dumps(pool.logL)) < 200
+
+    def test_parallel_numba(self):
+        # the workers are not forked from a process that launched numba's parallel threading layer
+        kernel = np.ones((3, 3)) / 9.
+        numba_conv = NumbaConvolution(kernel, conv_pixels=np.ones((20, 20), dtype=bool), parallel=True)
+        image_convolved = numba_conv.convolve2d(np.ones((20, 20)))
+        npt.assert_almost_equal(image_convolved[10, 10], 1, decimal=8)
+        log_likelihood = [self.likelihood.logL(args) for args in self.args_list]
+        with LikelihoodPool(self.likelihood, processes=2) as pool:
+            npt.assert_almost_equal(pool.map(pool.logL, self.args_list), log_likelihood, decimal=8)
+        assert pool_module._get_context().get_start_method() != 'fork'
+
+    def test_shared_memory(self):
+        if pool_module.shared_memory is None:
+            pytest.skip('shared memory requires python >= 3.8')
+        with LikelihoodPool(self.likelihood, processes=2, min_shared_size=1000) as pool:
+            # arrays referenced several times are shared once, small arrays are pickled
+            assert pool.num_shared_arrays == 1
+            assert not any(pool.map(pool.function('data_writeable'), self.args_list[:2]))
+            assert all(pool.map(pool.function('same_data'), self.args_list[:2]))
+            names = [shm.name for shm in pool._shared_memory_list]
+        # the shared memory is released when the pool is closed
+        for name in names:
+            with pytest.raises(FileNotFoundError):
+                pool_module.shared_memory.SharedMemory(name=name)
+        assert pool._token not in pool_module._likelihood_dict
+
+    def test_local_custom_logL_addition(self):
+        if pool_module._pickle_base is pickle:
+            pytest.skip('pickling local functions requires dill or cloudpickle')
+        theta_E_max = 1.5
+
+        def condition_definition(kwargs_lens, kwargs_source, kwargs_lens_light, kwargs_ps=None, kwargs_special=None,
+                                 kwargs_extinction=None):
+            if kwargs_lens[0]['theta_E'] > theta_E_max:
+                return -10**15
+            return 0
+
+        kwargs_model = {'lens_model_list': ['SIS']}
+        param_class = Param(kwargs_model, kwargs_lower_lens=[{'theta_E': 0, 'center_x': -1, 'center_y': -1}],
+                            kwargs_upper_lens=[{'theta_E': 3, 'center_x': 1, 'center_y': 1}])
+        likelihood = LikelihoodModule(kwargs_data_joint={}, kwargs_model=kwargs_model, param_class=param_class,
+                                      image_likelihood=False, custom_logL_addition=condition_definition)
+        args_list = [np.array([1., 0, 0]), np.array([2., 0, 0])]
+        log_likelihood = [likelihood.logL(args) for args in args_list]
+        assert log_likelihood[1] < log_likelihood[0] - 10**14
+        with LikelihoodPool(likelihood, processes=2) as pool:
+            npt.assert_almost_equal(pool.map(pool.logL, args_list), log_likelihood, decimal=8)
+
+    def test_dumps_failure(self):
+        if pool_module.shared_memory is None:
+            pytest.skip('shared memory requires python >= 3.8')
+        shared_memory_list = _RecordingList()
+        with pytest.raises(TypeError):
+            pool_module._dumps([self.likelihood.data, _Unpicklable()], 1000, shared_memory_list)
+        # the shared memory blocks created before the failure are released
+        assert len(shared_memory_list.names) == 1
+        assert len(shared_memory_list) == 0
+        with pytest.raises(FileNotFoundError):
+            pool_module.shared_memory.SharedMemory(name=shared_memory_list.names[0])
+        with pytest.raises(TypeError):
+            LikelihoodPool([self.likelihood.data, _Unpicklable()], processes=1, min_shared_size=1000)
+
+
+class _RecordingList(list):
+
+    def __init__(self):
+        list.__init__(self)
+        self.names = []
+
+    def append(self, shm):
+        self.names.append(shm.name)
+        list.append(self, shm)
+
+
+class _Unpicklable(object):
+
+    def __reduce__(self):
+        raise TypeError('not picklable')
+
+
+class TestRaise(unittest.TestCase):
+
+    def test_raise(self):
+        with LikelihoodPool(QuadraticLikelihood(num_pix=2), processes=1) as pool:
+            with self.assertRaises(AttributeError):
+                pool.function('not_a_method')([1, 1])
+
+
+if __name__ == '__main__':
+    pytest.main()
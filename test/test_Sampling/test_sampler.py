@@ -1,7 +1,11 @@
 __author__ = 'sibirrer'
 
+import os
+import shutil
+import tempfile
 import pytest
 import numpy as np
+import numpy.testing as npt
 import lenstronomy.Util.simulation_util as sim_util
 from lenstronomy.ImSim.image_model import ImageModel
 from lenstronomy.Sampling.likelihood import LikelihoodModule
@@ -9,6 +13,7 @@ from lenstronomy.Sampling.parameters import Param
 from lenstronomy.LensModel.lens_model import LensModel
 from lenstronomy.LightModel.light_model import LightModel
 from lenstronomy.Sampling.sampler import Sampler
+from lenstronomy.Sampling.pool import LikelihoodPool
 from lenstronomy.Data.imaging_data import ImageData
 from lenstronomy.Data.psf import PSF
 
@@ -94,6 +99,64 @@ class TestFittingSequence(object):
 
         assert len(result) == 16
 
+    def test_pool(self):
+        # likelihood evaluated in a LikelihoodPool with 2 processes
+        np.random.seed(42)
+        result, chain = self.sampler.pso(n_particles=4, n_iterations=2, threadCount=2)
+        np.random.seed(42)
+        result_serial, chain_serial = self.sampler.pso(n_particles=4, n_iterations=2)
+        npt.assert_almost_equal(result, result_serial, decimal=8)
+
+        mean_start = self.param_class.kwargs2args(kwargs_lens=self.kwargs_lens, kwargs_source=self.kwargs_source,
+                                                  kwargs_lens_light=self.kwargs_lens_light)
+        sigma_start = np.ones_like(mean_start) * 0.1
+        samples, dist = self.sampler.mcmc_emcee(36, 2, 1, mean_start, sigma_start, threadCount=2)
+        assert len(samples) == 36 * 2
+        npt.assert_almost_equal(dist[0], self.Likelihood.logL(samples[0]), decimal=8)
+
+    def test_pool_close(self, monkeypatch):
+        # the workers are terminated when the sampling fails
+        closed = []
+        close = LikelihoodPool.close
+
+        def close_record(pool):
+            closed.append(True)
+            close(pool)
+        monkeypatch.setattr(LikelihoodPool, 'close', close_record)
+        path = tempfile.mkdtemp()
+        checkpoint_path = os.path.join(path, 'pso.npz')
+        with open(checkpoint_path, 'w') as f:
+            f.write('not a checkpoint')
+        try:
+            with pytest.raises(Exception):
+                self.sampler.pso(n_particles=4, n_iterations=2, threadCount=2, checkpoint_path=checkpoint_path)
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+        assert len(closed) == 1
+
+        mean_start = self.param_class.kwargs2args(kwargs_lens=self.kwargs_lens, kwargs_source=self.kwargs_source,
+                                                  kwargs_lens_light=self.kwargs_lens_light)
+        sigma_start = np.ones_like(mean_start) * 0.1
+        # fewer walkers than twice the number of parameters
+        with pytest.raises(ValueError):
+            self.sampler.mcmc_emcee(2, 2, 1, mean_start, sigma_start, threadCount=2)
+        assert len(closed) == 2
+
+    def test_pso_checkpoint(self):
+        path = tempfile.mkdtemp()
+        checkpoint_path = os.path.join(path, 'pso.npz')
+        try:
+            result, chain = self.sampler.pso(n_particles=4, n_iterations=2, checkpoint_path=checkpoint_path)
+            assert os.path.exists(checkpoint_path)
+            # resumes after the 2 iterations of the first call
+            result_resume, chain_resume = self.sampler.pso(n_particles=4, n_iterations=3,
+                                                           checkpoint_path=checkpoint_path)
+            assert len(chain[0]) == 2
+            assert len(chain_resume[0]) == 1
+            assert chain_resume[0][-1] >= chain[0][-1]
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
     def test_mcmc_emcee(self):
         n_walkers = 36
         n_run = 2
@@ -105,6 +168,56 @@ class TestFittingSequence(object):
         assert len(samples) == n_walkers * n_run
         assert len(dist) == len(samples)
 
+    def test_vectorize(self):
+        mean_start = self.param_class.kwargs2args(kwargs_lens=self.kwargs_lens, kwargs_source=self.kwargs_source,
+                                                  kwargs_lens_light=self.kwargs_lens_light)
+        sigma_start = np.ones_like(mean_start) * 0.1
+        np.random.seed(42)
+        samples, dist = self.sampler.mcmc_emcee(36, 2, 1, mean_start, sigma_start, vectorize=True)
+        np.random.seed(42)
+        samples_serial, dist_serial = self.sampler.mcmc_emcee(36, 2, 1, mean_start, sigma_start)
+        npt.assert_almost_equal(samples, samples_serial, decimal=8)
+        npt.assert_almost_equal(dist, dist_serial, decimal=8)
+
+        np.random.seed(42)
+        result, chain = self.sampler.pso(n_particles=4, n_iterations=2, vectorize=True)
+        np.random.seed(42)
+        result_serial, chain_serial = self.sampler.pso(n_particles=4, n_iterations=2)
+        npt.assert_almost_equal(result, result_serial, decimal=8)
+        with pytest.raises(ValueError):
+            self.sampler.mcmc_emcee(36, 2, 1, mean_start, sigma_start, threadCount=2, vectorize=True)
+        with pytest.raises(ValueError):
+            self.sampler.pso(n_particles=4, n_iterations=2, threadCount=2, vectorize=True)
+
+    def test_mcmc_emcee_backend(self):
+        path = tempfile.mkdtemp()
+        backend_filename = os.path.join(path, 'mcmc.h5')
+        n_walkers = 36
+        mean_start = self.param_class.kwargs2args(kwargs_lens=self.kwargs_lens, kwargs_source=self.kwargs_source,
+                                                  kwargs_lens_light=self.kwargs_lens_light)
+        sigma_start = np.ones_like(mean_start) * 0.1
+        try:
+            samples, dist = self.sampler.mcmc_emcee(n_walkers, 2, 2, mean_start, sigma_start,
+                                                    backend_filename=backend_filename)
+            assert len(samples) == n_walkers * 2
+            # the interrupted chain is continued from the stored walker positions
+            samples_resume, dist_resume = self.sampler.mcmc_emcee(n_walkers, 4, 2, mean_start, sigma_start,
+                                                                  backend_filename=backend_filename,
+                                                                  start_from_backend=True)
+            assert len(samples_resume) == n_walkers * 4
+            npt.assert_almost_equal(samples_resume[:n_walkers * 2], samples, decimal=10)
+            npt.assert_almost_equal(dist_resume[:n_walkers * 2], dist, decimal=10)
+            # the stored chain does not match the number of walkers
+            with pytest.raises(ValueError):
+                self.sampler.mcmc_emcee(n_walkers + 2, 4, 2, mean_start, sigma_start,
+                                        backend_filename=backend_filename, start_from_backend=True)
+            # without start_from_backend, the backend is overwritten
+            samples, dist = self.sampler.mcmc_emcee(n_walkers, 1, 1, mean_start, sigma_start,
+                                                    backend_filename=backend_filename)
+            assert len(samples) == n_walkers
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
 
 if __name__ == '__main__':
     pytest.main()
@@ -0,0 +1,110 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import os
+import tempfile
+import shutil
+
+from lenstronomy.Util import cache_util
+
+
+class TestCacheUtil(object):
+
+    def setup(self):
+        self._path = tempfile.mkdtemp()
+        cache_util.set_cache_dir(os.path.join(self._path, 'cache'))
+        self._num_calls = 0
+
+    def teardown(self):
+        cache_util.set_cache_dir(None)
+        shutil.rmtree(self._path, ignore_errors=True)
+
+    def _function(self, a, b=1):
+        self._num_calls += 1
+        return a * b, np.arange(3)
+
+    def test_hash_key(self):
+        a = np.ones((3, 3))
+        assert cache_util.hash_key(a, 1) == cache_util.hash_key(a.copy(), 1)
+        assert cache_util.hash_key(a, 1) != cache_util.hash_key(a, 2)
+        assert cache_util.hash_key(a, 1) != cache_util.hash_key(a.astype(int), 1)
+        assert cache_util.hash_key(a, 1) != cache_util.hash_key(np.ones((1, 9)), 1)
+        assert len(cache_util.hash_key('test', None)) == 40
+
+    def test_cached(self):
+        a = np.random.normal(size=(4, 4))
+        key = cache_util.hash_key('test', a, 2)
+        assert cache_util.load(key, ['x', 'y']) is None
+        x, y = cache_util.cached(key, ['x', 'y'], self._function, a, b=2)
+        x_cached, y_cached = cache_util.cached(key, ['x', 'y'], self._function, a, b=2)
+        assert self._num_calls == 1
+        npt.assert_almost_equal(x_cached, a * 2, decimal=10)
+        npt.assert_almost_equal(y_cached, y, decimal=10)
+        x = cache_util.cached(cache_util.hash_key('test', a), ['x'], lambda: a)
+        npt.assert_almost_equal(x, a, decimal=10)
+        x = cache_util.cached(cache_util.hash_key('test', a), ['x'], lambda: a)
+        npt.assert_almost_equal(x, a, decimal=10)
+
+        # clearing the cache only removes the entries
+        other_file = os.path.join(cache_util.cache_dir(), 'other.txt')
+        open(other_file, 'w').close()
+        cache_util.clear()
+        assert cache_util.load(key, ['x', 'y']) is None
+        assert os.path.isfile(other_file)
+
+    def test_disabled(self):
+        cache_util.set_cache_dir(None)
+        if 'LENSTRONOMY_CACHE_DIR' in os.environ:
+            return
+        assert cache_util.cache_dir() is None
+        a = np.ones(3)
+        key = cache_util.hash_key('test', a)
+        cache_util.cached(key, ['x', 'y'], self._function, a)
+        cache_util.cached(key, ['x', 'y'], self._function, a)
+        assert self._num_calls == 2
+        cache_util.clear()
+
+    def test_numba_convolution_psf(self):
+        from lenstronomy.ImSim.Numerics.numba_convolution import NumbaConvolution
+        from lenstronomy.Data.psf import PSF
+        from lenstronomy.Util import kernel_util
+        kernel = kernel_util.kernel_gaussian(kernel_numPix=5, deltaPix=1, fwhm=2)
+        conv_pixels = np.zeros((20, 20), dtype=bool)
+        conv_pixels[5:10, 5:12] = True
+        image = np.random.normal(size=(20, 20))
+        numba_conv = NumbaConvolution(kernel, conv_pixels)
+        numba_conv_cached = NumbaConvolution(kernel, conv_pixels)
+        assert len(os.listdir(cache_util.cache_dir())) == 1
+        npt.assert_almost_equal(numba_conv_cached.convolve2d(image), numba_conv.convolve2d(image), decimal=10)
+        cache_util.set_cache_dir(None)
+        if 'LENSTRONOMY_CACHE_DIR' not in os.environ:
+            numba_conv_none = NumbaConvolution(kernel, conv_pixels)
+            npt.assert_almost_equal(numba_conv_cached.convolve2d(image), numba_conv_none.convolve2d(image), decimal=10)
+        cache_util.set_cache_dir(os.path.join(self._path, 'cache'))
+
+        psf = PSF(psf_type='PIXEL', kernel_point_source=kernel)
+        kernel_super = psf.kernel_point_source_supersampled(3)
+        psf_new = PSF(psf_type='PIXEL', kernel_point_source=kernel)
+        kernel_super_cached = psf_new.kernel_point_source_supersampled(3)
+        npt.assert_almost_equal(kernel_super_cached, kernel_super, decimal=10)
+        kernel_super_cached[0, 0] = 1  # the kernel is writable
+
+    def test_cache_version(self, monkeypatch):
+        from lenstronomy.ImSim.Numerics import numba_convolution
+        from lenstronomy.Data import psf
+        from lenstronomy.Util import kernel_util
+        kernel = kernel_util.kernel_gaussian(kernel_numPix=5, deltaPix=1, fwhm=2)
+        conv_pixels = np.ones((10, 10), dtype=bool)
+        numba_convolution.NumbaConvolution(kernel, conv_pixels)
+        psf.PSF(psf_type='PIXEL', kernel_point_source=kernel).kernel_point_source_supersampled(3)
+        assert len(os.listdir(cache_util.cache_dir())) == 2
+        # entries of a previous version of the computation are not re-used
+        monkeypatch.setattr(numba_convolution, '_CACHE_VERSION', numba_convolution._CACHE_VERSION + 1)
+        monkeypatch.setattr(psf, '_CACHE_VERSION', psf._CACHE_VERSION + 1)
+        numba_convolution.NumbaConvolution(kernel, conv_pixels)
+        psf.PSF(psf_type='PIXEL', kernel_point_source=kernel).kernel_point_source_supersampled(3)
+        assert len(os.listdir(cache_util.cache_dir())) == 4
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -4,6 +4,7 @@ __author__ = 'sibirrer'
 import lenstronomy.Util.class_creator as class_creator
 import pytest
 import numpy as np
+import numpy.testing as npt
 import unittest
 
 
@@ -50,6 +51,12 @@ class TestClassCreator(object):
         assert lens_model_class.lens_model_list[0] == 'SIS'
         assert lens_model_class.lens_model._observed_convention_index[0] == 0
 
+        lens_model_class, source_model_class, lens_light_model_class, point_source_class, extinction_class = class_creator.create_class_instances(
+            lens_model_list=['NFW'], z_lens=0.5, z_source=2, tabulated_index=[0], tabulation_tolerance=0.01,
+            cosmo_interp=True)
+        npt.assert_almost_equal(lens_model_class.lens_model.func_list[0]._step, np.sqrt(2 * 0.01), decimal=10)
+        assert lens_model_class._lensCosmo.background._cosmo_interp is not None
+
     def test_create_image_model(self):
         imageModel = class_creator.create_image_model(self.kwargs_data, self.kwargs_psf, kwargs_numerics={}, kwargs_model=self.kwargs_model)
         assert imageModel.LensModel.lens_model_list[0] == 'SIS'
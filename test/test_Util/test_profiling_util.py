@@ -0,0 +1,56 @@
+import numpy.testing as npt
+import pytest
+
+from lenstronomy.Util.profiling_util import Profiler
+
+
+class TestProfiler(object):
+
+    def setup(self):
+        self.profiler = Profiler(enabled=True)
+
+    def test_stage(self):
+        for i in range(3):
+            with self.profiler.stage('a'):
+                pass
+        start = self.profiler.start()
+        self.profiler.stop('b', start)
+        timings = self.profiler.timings()
+        assert timings['a']['calls'] == 3
+        assert timings['b']['calls'] == 1
+        assert timings['a']['time'] >= 0
+        npt.assert_almost_equal(timings['a']['mean'], timings['a']['time'] / 3, decimal=10)
+
+        self.profiler.reset()
+        assert self.profiler.timings() == {}
+
+    def test_count(self):
+        self.profiler.count('n')
+        self.profiler.count('n', 4)
+        assert self.profiler.counters() == {'n': 5}
+
+    def test_callback(self):
+        recorded = []
+
+        def callback(name, duration):
+            recorded.append((name, duration))
+        self.profiler.add_callback(callback)
+        self.profiler.record('a', 1.)
+        assert recorded == [('a', 1.)]
+        self.profiler.remove_callback(callback)
+        self.profiler.record('a', 1.)
+        assert len(recorded) == 1
+        assert self.profiler.timings()['a']['time'] == 2.
+
+    def test_disabled(self):
+        profiler = Profiler()
+        with profiler.stage('a'):
+            pass
+        profiler.stop('b', profiler.start())
+        profiler.count('n')
+        assert profiler.timings() == {}
+        assert profiler.counters() == {}
+
+
+if __name__ == '__main__':
+    pytest.main()
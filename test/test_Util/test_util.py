@@ -340,6 +340,16 @@ def test_convert_bool_list():
     assert bool_list[0] is False
 
 
+def test_float_array():
+    x = np.ones(3, dtype=np.float32)
+    x_out = util.float_array(x)
+    assert x_out.dtype == np.float32
+    assert x_out is not x
+    assert util.float_array([1, 2]).dtype == np.float64
+    assert util.float_array(np.ones(2, dtype=int)).dtype == np.float64
+    assert util.float_array(1.).dtype == np.float64
+
+
 class TestRaise(unittest.TestCase):
 
     def test_raise(self):